@@ -18,6 +18,7 @@
 import argparse
 import sys
 import time
+from functools import partial
 from logging import INFO, WARN
 from pathlib import Path
 from typing import Callable, ContextManager, Optional, Tuple, Union
@@ -44,6 +45,18 @@ from .message_handler.message_handler import handle_control_message
 from .node_state import NodeState
 from .numpy_client import NumPyClient
 
+ConnectionFn = Callable[
+    [str, bool, int, Union[bytes, str, None]],
+    ContextManager[
+        Tuple[
+            Callable[[], Optional[TaskIns]],
+            Callable[[TaskRes], None],
+            Optional[Callable[[], None]],
+            Optional[Callable[[], None]],
+        ]
+    ],
+]
+
 
 def run_client() -> None:
     """Run Flower client."""
@@ -158,6 +171,9 @@ def start_client(
     root_certificates: Optional[Union[bytes, str]] = None,
     insecure: Optional[bool] = None,
     transport: Optional[str] = None,
+    pool_size: int = 1,
+    timeout: Optional[Union[float, Tuple[float, float]]] = None,
+    compression: Optional[str] = None,
 ) -> None:
     """Start a Flower client node which connects to a Flower server.
 
@@ -191,6 +207,16 @@ def start_client(
         - 'grpc-bidi': gRPC, bidirectional streaming
         - 'grpc-rere': gRPC, request-response (experimental)
         - 'rest': HTTP (experimental)
+    pool_size : int (default: 1)
+        Maximum number of HTTP connections to the server which are kept open and
+        reused (`rest` transport only).
+    timeout : Optional[Union[float, Tuple[float, float]]] (default: None)
+        Timeout (in seconds) of each HTTP request, either one value or a
+        `(connect timeout, read timeout)` tuple. `None` waits forever (`rest`
+        transport only).
+    compression : Optional[str] (default: None)
+        Content encoding used to compress HTTP request bodies, either `"gzip"` or
+        `"zstd"` (`rest` transport only).
 
     Examples
     --------
@@ -232,6 +258,9 @@ def start_client(
         root_certificates=root_certificates,
         insecure=insecure,
         transport=transport,
+        pool_size=pool_size,
+        timeout=timeout,
+        compression=compression,
     )
     event(EventType.START_CLIENT_LEAVE)
 
@@ -250,6 +279,9 @@ def _start_client_internal(
     root_certificates: Optional[Union[bytes, str]] = None,
     insecure: Optional[bool] = None,
     transport: Optional[str] = None,
+    pool_size: int = 1,
+    timeout: Optional[Union[float, Tuple[float, float]]] = None,
+    compression: Optional[str] = None,
 ) -> None:
     """Start a Flower client node which connects to a Flower server.
 
@@ -285,6 +317,16 @@ def _start_client_internal(
         - 'grpc-bidi': gRPC, bidirectional streaming
         - 'grpc-rere': gRPC, request-response (experimental)
         - 'rest': HTTP (experimental)
+    pool_size : int (default: 1)
+        Maximum number of HTTP connections to the server which are kept open and
+        reused (`rest` transport only).
+    timeout : Optional[Union[float, Tuple[float, float]]] (default: None)
+        Timeout (in seconds) of each HTTP request, either one value or a
+        `(connect timeout, read timeout)` tuple. `None` waits forever (`rest`
+        transport only).
+    compression : Optional[str] (default: None)
+        Content encoding used to compress HTTP request bodies, either `"gzip"` or
+        `"zstd"` (`rest` transport only).
     """
     if insecure is None:
         insecure = root_certificates is None
@@ -316,7 +358,9 @@ def _start_client_internal(
     # Both `client` and `client_fn` must not be used directly
 
     # Initialize connection context manager
-    connection, address = _init_connection(transport, server_address)
+    connection, address = _init_connection(
+        transport, server_address, pool_size, timeout, compression
+    )
 
     node_state = NodeState()
 
@@ -395,6 +439,9 @@ def start_numpy_client(
     root_certificates: Optional[bytes] = None,
     insecure: Optional[bool] = None,
     transport: Optional[str] = None,
+    pool_size: int = 1,
+    timeout: Optional[Union[float, Tuple[float, float]]] = None,
+    compression: Optional[str] = None,
 ) -> None:
     """Start a Flower NumPyClient which connects to a gRPC server.
 
@@ -425,6 +472,16 @@ def start_numpy_client(
         - 'grpc-bidi': gRPC, bidirectional streaming
         - 'grpc-rere': gRPC, request-response (experimental)
         - 'rest': HTTP (experimental)
+    pool_size : int (default: 1)
+        Maximum number of HTTP connections to the server which are kept open and
+        reused (`rest` transport only).
+    timeout : Optional[Union[float, Tuple[float, float]]] (default: None)
+        Timeout (in seconds) of each HTTP request, either one value or a
+        `(connect timeout, read timeout)` tuple. `None` waits forever (`rest`
+        transport only).
+    compression : Optional[str] (default: None)
+        Content encoding used to compress HTTP request bodies, either `"gzip"` or
+        `"zstd"` (`rest` transport only).
 
     Examples
     --------
@@ -478,25 +535,19 @@ def start_numpy_client(
         root_certificates=root_certificates,
         insecure=insecure,
         transport=transport,
+        pool_size=pool_size,
+        timeout=timeout,
+        compression=compression,
     )
 
 
 def _init_connection(
-    transport: Optional[str], server_address: str
-) -> Tuple[
-    Callable[
-        [str, bool, int, Union[bytes, str, None]],
-        ContextManager[
-            Tuple[
-                Callable[[], Optional[TaskIns]],
-                Callable[[TaskRes], None],
-                Optional[Callable[[], None]],
-                Optional[Callable[[], None]],
-            ]
-        ],
-    ],
-    str,
-]:
+    transport: Optional[str],
+    server_address: str,
+    pool_size: int = 1,
+    timeout: Optional[Union[float, Tuple[float, float]]] = None,
+    compression: Optional[str] = None,
+) -> Tuple[ConnectionFn, str]:
     # Parse IP address
     parsed_address = parse_address(server_address)
     if not parsed_address:
@@ -519,7 +570,13 @@ def _init_connection(
                 "When using the REST API, please provide `https://` or "
                 "`http://` before the server address (e.g. `http://127.0.0.1:8080`)"
             )
-        connection = http_request_response
+        # The returned connection carries the options of the HTTP session
+        connection: ConnectionFn = partial(
+            http_request_response,
+            pool_size=pool_size,
+            timeout=timeout,
+            compression=compression,
+        )
     elif transport == TRANSPORT_TYPE_GRPC_RERE:
         connection = grpc_request_response
     elif transport == TRANSPORT_TYPE_GRPC_BIDI:
@@ -529,4 +586,12 @@ def _init_connection(
             f"Unknown transport type: {transport} (possible: {TRANSPORT_TYPES})"
         )
 
+    if transport != TRANSPORT_TYPE_REST and (
+        pool_size != 1 or timeout is not None or compression is not None
+    ):
+        raise ValueError(
+            "`pool_size`, `timeout` and `compression` are only supported by the "
+            f"`{TRANSPORT_TYPE_REST}` transport"
+        )
+
     return connection, address
@@ -15,6 +15,7 @@
 """Flower Client app tests."""
 
 
+from functools import partial
 from typing import Dict, Tuple
 
 from flwr.common import (
@@ -30,8 +31,9 @@ from flwr.common import (
     NDArrays,
     Scalar,
 )
+from flwr.common.constant import TRANSPORT_TYPE_GRPC_BIDI, TRANSPORT_TYPE_REST
 
-from .app import start_client, start_numpy_client
+from .app import _init_connection, start_client, start_numpy_client
 from .client import Client
 from .numpy_client import NumPyClient
 
@@ -126,3 +128,38 @@ def test_start_numpy_client_transport_invalid() -> None:
         raise AssertionError()  # Fail the test if no exception was raised
     except ValueError:
         pass
+
+
+def test_init_connection_rest_options() -> None:
+    """Test that the REST connection carries the HTTP session options."""
+    # Execute
+    connection, address = _init_connection(
+        TRANSPORT_TYPE_REST, "http://127.0.0.1:8080", 4, 10.0, "gzip"
+    )
+
+    # Assert
+    assert address == "http://127.0.0.1:8080"
+    assert isinstance(connection, partial)
+    assert connection.keywords == {
+        "pool_size": 4,
+        "timeout": 10.0,
+        "compression": "gzip",
+    }
+
+
+def test_start_client_rest_options_invalid() -> None:
+    """Test that REST options are rejected for gRPC transports."""
+    # Prepare
+    client: Client = PlainClient()
+
+    # Execute
+    try:
+        start_client(
+            server_address="0.0.0.0:8080",
+            client=client,
+            transport=TRANSPORT_TYPE_GRPC_BIDI,
+            compression="gzip",
+        )
+        raise AssertionError()  # Fail the test if no exception was raised
+    except ValueError:
+        pass
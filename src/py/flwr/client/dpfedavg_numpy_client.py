@@ -22,6 +22,7 @@ import numpy as np
 
 from flwr.client.numpy_client import NumPyClient
 from flwr.common.dp import add_gaussian_noise, clip_by_l2
+from flwr.common.flat_ndarrays import FlatNDArrays
 from flwr.common.typing import Config, NDArrays, Scalar
 
 
@@ -113,8 +114,19 @@ class DPFedAvgNumPyClient(NumPyClient):
         # Getting the updated model from the wrapped client
         updated_params, num_examples, metrics = self.client.fit(parameters, config)
 
-        # Update = updated model - original model
-        update = [np.subtract(x, y) for (x, y) in zip(updated_params, original_params)]
+        # Update = updated model - original model. If all layers share a dtype, the
+        # update is stored in a single contiguous buffer so that clipping and
+        # noising operate on all parameters at once
+        dtypes = {x.dtype for x in [*updated_params, *original_params]}
+        update: NDArrays
+        if len(dtypes) == 1:
+            update = FlatNDArrays.from_ndarrays(updated_params)
+            for layer, original_layer in zip(update, original_params):
+                np.subtract(layer, original_layer, out=layer)
+        else:
+            update = [
+                np.subtract(x, y) for (x, y) in zip(updated_params, original_params)
+            ]
 
         if "dpfedavg_clip_norm" not in config:
             raise Exception("Clipping threshold not supplied by the server.")
@@ -0,0 +1,54 @@
+# Copyright 2020 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""DPFedAvgNumPyClient tests."""
+
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+from flwr.common import NDArrays, Scalar
+
+from .dpfedavg_numpy_client import DPFedAvgNumPyClient
+from .numpy_client import NumPyClient
+
+
+class CounterClient(NumPyClient):
+    """Client adding one to its float32 weights and its int64 step counter."""
+
+    def fit(
+        self, parameters: NDArrays, config: Dict[str, Scalar]
+    ) -> Tuple[NDArrays, int, Dict[str, Scalar]]:
+        """Return the received parameters plus one."""
+        return [layer + 1 for layer in parameters], 1, {}
+
+
+def test_fit_keeps_layer_dtypes() -> None:
+    """Test that each layer keeps its dtype if the layers have different dtypes."""
+    # Prepare
+    client = DPFedAvgNumPyClient(CounterClient())
+    parameters: NDArrays = [
+        np.zeros((2, 3), dtype=np.float32),
+        np.array([7], dtype=np.int64),
+    ]
+
+    for ndarrays in [parameters, parameters[:1]]:
+        # Execute
+        updated, _, _ = client.fit(ndarrays, {"dpfedavg_clip_norm": 100.0})
+
+        # Assert
+        assert [layer.dtype for layer in updated] == [layer.dtype for layer in ndarrays]
+        for layer, original in zip(updated, ndarrays):
+            np.testing.assert_array_equal(layer, original + 1)
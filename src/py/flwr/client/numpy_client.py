@@ -27,6 +27,7 @@ from flwr.common import (
     ndarrays_to_parameters,
     parameters_to_ndarrays,
 )
+from flwr.common.parameter import reply_tensor_type
 from flwr.common.typing import (
     Code,
     EvaluateIns,
@@ -118,7 +119,7 @@ class NumPyClient(ABC):
         Parameters
         ----------
         parameters : NDArrays
-            The current (global) model parameters.
+            The current (global) model parameters, as writable ndarrays.
         config : Dict[str, Scalar]
             Configuration parameters which allow the
             server to influence training on the client. It can be used to
@@ -128,7 +129,8 @@ class NumPyClient(ABC):
         Returns
         -------
         parameters : NDArrays
-            The locally updated model parameters.
+            The locally updated model parameters. They are serialized in the
+            format the server sent the current parameters in.
         num_examples : int
             The number of examples used for training.
         metrics : Dict[str, Scalar]
@@ -246,7 +248,9 @@ def _fit(self: Client, ins: FitIns) -> FitRes:
 
     # Return FitRes
     parameters_prime, num_examples, metrics = results
-    parameters_prime_proto = ndarrays_to_parameters(parameters_prime)
+    parameters_prime_proto = ndarrays_to_parameters(
+        parameters_prime, tensor_type=reply_tensor_type(ins.parameters.tensor_type)
+    )
     return FitRes(
         status=Status(code=Code.OK, message="Success"),
         parameters=parameters_prime_proto,
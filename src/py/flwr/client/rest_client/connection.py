@@ -27,6 +27,7 @@ from flwr.client.message_handler.task_handler import (
     validate_task_res,
 )
 from flwr.common import GRPC_MAX_MESSAGE_LENGTH
+from flwr.common.compression import CONTENT_ENCODINGS, compress
 from flwr.common.constant import MISSING_EXTRA_REST
 from flwr.common.logger import log
 from flwr.proto.fleet_pb2 import (
@@ -43,6 +44,7 @@ from flwr.proto.task_pb2 import TaskIns, TaskRes
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ModuleNotFoundError:
     sys.exit(MISSING_EXTRA_REST)
 
@@ -56,9 +58,12 @@ PATH_DELETE_NODE: str = "api/v0/fleet/delete-node"
 PATH_PULL_TASK_INS: str = "api/v0/fleet/pull-task-ins"
 PATH_PUSH_TASK_RES: str = "api/v0/fleet/push-task-res"
 
+# Request bodies smaller than this (in bytes) are sent uncompressed
+MIN_COMPRESSION_SIZE = 1024
+
 
 @contextmanager
-# pylint: disable-next=too-many-statements
+# pylint: disable-next=too-many-statements,too-many-arguments,too-many-locals
 def http_request_response(
     server_address: str,
     insecure: bool,  # pylint: disable=unused-argument
@@ -66,6 +71,9 @@ def http_request_response(
     root_certificates: Optional[
         Union[bytes, str]
     ] = None,  # pylint: disable=unused-argument
+    pool_size: int = 1,
+    timeout: Optional[Union[float, Tuple[float, float]]] = None,
+    compression: Optional[str] = None,
 ) -> Iterator[
     Tuple[
         Callable[[], Optional[TaskIns]],
@@ -91,6 +99,16 @@ def http_request_response(
         Path of the root certificate. If provided, a secure
         connection using the certificates will be established to an SSL-enabled
         Flower server. Bytes won't work for the REST API.
+    pool_size : int (default: 1)
+        Maximum number of connections to the server which are kept open and
+        reused for subsequent requests (HTTP keep-alive).
+    timeout : Optional[Union[float, Tuple[float, float]]] (default: None)
+        Timeout (in seconds) of each request, either one value or a
+        `(connect timeout, read timeout)` tuple. `None` waits forever.
+    compression : Optional[str] (default: None)
+        Content encoding used to compress request bodies, either `"gzip"` or
+        `"zstd"` (requires the `zstandard` package). Only bodies of at least
+        `MIN_COMPRESSION_SIZE` bytes are compressed.
 
     Returns
     -------
@@ -120,6 +138,23 @@ def http_request_response(
             "must be provided as a string path to the client.",
         )
 
+    if compression is not None and compression not in CONTENT_ENCODINGS:
+        raise ValueError(f"Unsupported compression: {compression}")
+
+    # Keep connections open, such that subsequent requests do not need to
+    # establish a new TCP connection (and TLS session) with the server
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.verify = verify
+    session.headers.update(
+        {
+            "Accept": "application/protobuf",
+            "Content-Type": "application/protobuf",
+        }
+    )
+
     # Necessary state to link TaskRes to TaskIns
     state: Dict[str, Optional[TaskIns]] = {KEY_TASK_INS: None}
 
@@ -130,20 +165,22 @@ def http_request_response(
     # receive/send functions
     ###########################################################################
 
+    def _post(path: str, data: bytes) -> requests.Response:
+        """Send a POST request to the server, reusing an open connection."""
+        headers: Dict[str, str] = {}
+        if compression is not None and len(data) >= MIN_COMPRESSION_SIZE:
+            data = compress(data, compression)
+            headers["Content-Encoding"] = compression
+        return session.post(
+            url=f"{base_url}/{path}", data=data, headers=headers, timeout=timeout
+        )
+
     def create_node() -> None:
         """Set create_node."""
         create_node_req_proto = CreateNodeRequest()
         create_node_req_bytes: bytes = create_node_req_proto.SerializeToString()
 
-        res = requests.post(
-            url=f"{base_url}/{PATH_CREATE_NODE}",
-            headers={
-                "Accept": "application/protobuf",
-                "Content-Type": "application/protobuf",
-            },
-            data=create_node_req_bytes,
-            verify=verify,
-        )
+        res = _post(PATH_CREATE_NODE, create_node_req_bytes)
 
         # Check status code and headers
         if res.status_code != 200:
@@ -177,15 +214,7 @@ def http_request_response(
         node: Node = cast(Node, node_store[KEY_NODE])
         delete_node_req_proto = DeleteNodeRequest(node=node)
         delete_node_req_req_bytes: bytes = delete_node_req_proto.SerializeToString()
-        res = requests.post(
-            url=f"{base_url}/{PATH_DELETE_NODE}",
-            headers={
-                "Accept": "application/protobuf",
-                "Content-Type": "application/protobuf",
-            },
-            data=delete_node_req_req_bytes,
-            verify=verify,
-        )
+        res = _post(PATH_DELETE_NODE, delete_node_req_req_bytes)
 
         # Check status code and headers
         if res.status_code != 200:
@@ -217,15 +246,7 @@ def http_request_response(
         pull_task_ins_req_bytes: bytes = pull_task_ins_req_proto.SerializeToString()
 
         # Request instructions (task) from server
-        res = requests.post(
-            url=f"{base_url}/{PATH_PULL_TASK_INS}",
-            headers={
-                "Accept": "application/protobuf",
-                "Content-Type": "application/protobuf",
-            },
-            data=pull_task_ins_req_bytes,
-            verify=verify,
-        )
+        res = _post(PATH_PULL_TASK_INS, pull_task_ins_req_bytes)
 
         # Check status code and headers
         if res.status_code != 200:
@@ -295,15 +316,7 @@ def http_request_response(
         )
 
         # Send ClientMessage to server
-        res = requests.post(
-            url=f"{base_url}/{PATH_PUSH_TASK_RES}",
-            headers={
-                "Accept": "application/protobuf",
-                "Content-Type": "application/protobuf",
-            },
-            data=push_task_res_request_bytes,
-            verify=verify,
-        )
+        res = _post(PATH_PUSH_TASK_RES, push_task_res_request_bytes)
 
         state[KEY_TASK_INS] = None
 
@@ -340,3 +353,5 @@ def http_request_response(
         yield (receive, send, create_node, delete_node)
     except Exception as exc:  # pylint: disable=broad-except
         log(ERROR, exc)
+    finally:
+        session.close()
@@ -20,9 +20,13 @@ from dataclasses import dataclass, field
 from logging import ERROR, INFO, WARNING
 from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
+import numpy as np
+from cryptography.hazmat.primitives.asymmetric import ec
+
 from flwr.client.client import Client
 from flwr.client.numpy_client import NumPyClient
 from flwr.common import (
+    FlatNDArrays,
     bytes_to_ndarray,
     ndarray_to_bytes,
     ndarrays_to_parameters,
@@ -42,10 +46,7 @@ from flwr.common.secure_aggregation.crypto.symmetric_encryption import (
 )
 from flwr.common.secure_aggregation.ndarrays_arithmetic import (
     factor_combine,
-    parameters_addition,
-    parameters_mod,
     parameters_multiply,
-    parameters_subtraction,
 )
 from flwr.common.secure_aggregation.quantization import quantize
 from flwr.common.secure_aggregation.secaggplus_constants import (
@@ -75,7 +76,7 @@ from flwr.common.secure_aggregation.secaggplus_constants import (
     STAGES,
 )
 from flwr.common.secure_aggregation.secaggplus_utils import (
-    pseudo_rand_gen,
+    add_pseudo_rand,
     share_keys_plaintext_concat,
     share_keys_plaintext_separate,
 )
@@ -102,6 +103,9 @@ class SecAggPlusState:
     pk1: bytes = b""
     sk2: bytes = b""
     pk2: bytes = b""
+    # Deserialized secret keys, so that they are only parsed once
+    sk1_obj: Optional[ec.EllipticCurvePrivateKey] = None
+    sk2_obj: Optional[ec.EllipticCurvePrivateKey] = None
 
     # Random seed for generating the private mask
     rd_seed: bytes = b""
@@ -110,7 +114,11 @@ class SecAggPlusState:
     sk1_share_dict: Dict[int, bytes] = field(default_factory=dict)
     # The dict of the shared secrets from sk2
     ss2_dict: Dict[int, bytes] = field(default_factory=dict)
+    # The dict of the shared secrets from sk1, i.e., the seeds of the pairwise masks
+    ss1_dict: Dict[int, bytes] = field(default_factory=dict)
     public_keys_dict: Dict[int, Tuple[bytes, bytes]] = field(default_factory=dict)
+    # The deserialized first public keys of the neighbours
+    pk1_obj_dict: Dict[int, ec.EllipticCurvePublicKey] = field(default_factory=dict)
 
     client: Optional[Union[Client, NumPyClient]] = None
 
@@ -309,6 +317,8 @@ def _setup(state: SecAggPlusState, named_values: Dict[str, Value]) -> Dict[str,
     # Dictionary containing client secure IDs as keys
     # and their respective shared secrets (with this client) as values.
     state.ss2_dict = {}
+    state.ss1_dict = {}
+    state.pk1_obj_dict = {}
 
     # Create 2 sets private public key pairs
     # One for creating pairwise masks
@@ -318,6 +328,7 @@ def _setup(state: SecAggPlusState, named_values: Dict[str, Value]) -> Dict[str,
 
     state.sk1, state.pk1 = private_key_to_bytes(sk1), public_key_to_bytes(pk1)
     state.sk2, state.pk2 = private_key_to_bytes(sk2), public_key_to_bytes(pk2)
+    state.sk1_obj, state.sk2_obj = sk1, sk2
     log(INFO, "Client %d: stage 0 completes. uploading public keys...", state.sid)
     return {KEY_PUBLIC_KEY_1: state.pk1, KEY_PUBLIC_KEY_2: state.pk2}
 
@@ -361,16 +372,20 @@ def _share_keys(
 
     srcs, dsts, ciphertexts = [], [], []
 
+    # The secret keys are only missing if the state was not set up by `_setup`
+    if state.sk1_obj is None:
+        state.sk1_obj = bytes_to_private_key(state.sk1)
+    if state.sk2_obj is None:
+        state.sk2_obj = bytes_to_private_key(state.sk2)
+
     # Distribute shares
-    for idx, (sid, (_, pk2)) in enumerate(state.public_keys_dict.items()):
+    for idx, (sid, (pk1, pk2)) in enumerate(state.public_keys_dict.items()):
         if sid == state.sid:
             state.rd_seed_share_dict[state.sid] = b_shares[idx]
             state.sk1_share_dict[state.sid] = sk1_shares[idx]
         else:
-            shared_key = generate_shared_key(
-                bytes_to_private_key(state.sk2),
-                bytes_to_public_key(pk2),
-            )
+            state.pk1_obj_dict[sid] = bytes_to_public_key(pk1)
+            shared_key = generate_shared_key(state.sk2_obj, bytes_to_public_key(pk2))
             state.ss2_dict[sid] = shared_key
             plaintext = share_keys_plaintext_concat(
                 state.sid, sid, b_shares[idx], sk1_shares[idx]
@@ -438,34 +453,26 @@ def _collect_masked_input(
     quantized_parameters = parameters_multiply(quantized_parameters, parameters_factor)
     quantized_parameters = factor_combine(parameters_factor, quantized_parameters)
 
-    dimensions_list: List[Tuple[int, ...]] = [a.shape for a in quantized_parameters]
-
-    # Add private mask
-    private_mask = pseudo_rand_gen(state.rd_seed, state.mod_range, dimensions_list)
-    quantized_parameters = parameters_addition(quantized_parameters, private_mask)
+    # Add the private mask and the pairwise masks to a single flat buffer in place
+    masked_parameters = FlatNDArrays.from_ndarrays(quantized_parameters, np.int64)
+    add_pseudo_rand(masked_parameters.buffer, state.rd_seed, state.mod_range)
 
     for client_id in available_clients:
-        # Add pairwise masks
-        shared_key = generate_shared_key(
-            bytes_to_private_key(state.sk1),
-            bytes_to_public_key(state.public_keys_dict[client_id][0]),
-        )
-        pairwise_mask = pseudo_rand_gen(shared_key, state.mod_range, dimensions_list)
-        if state.sid > client_id:
-            quantized_parameters = parameters_addition(
-                quantized_parameters, pairwise_mask
-            )
-        else:
-            quantized_parameters = parameters_subtraction(
-                quantized_parameters, pairwise_mask
+        # Add pairwise masks, deriving each shared key only once per round
+        if client_id not in state.ss1_dict:
+            state.ss1_dict[client_id] = generate_shared_key(
+                cast(ec.EllipticCurvePrivateKey, state.sk1_obj),
+                state.pk1_obj_dict[client_id],
             )
+        add_pseudo_rand(
+            masked_parameters.buffer,
+            state.ss1_dict[client_id],
+            state.mod_range,
+            subtract=state.sid < client_id,
+        )
 
-    # Take mod of final weight update vector and return to server
-    quantized_parameters = parameters_mod(quantized_parameters, state.mod_range)
     log(INFO, "Client %d: stage 2 completes. uploading masked parameters...", state.sid)
-    return {
-        KEY_MASKED_PARAMETERS: [ndarray_to_bytes(arr) for arr in quantized_parameters]
-    }
+    return {KEY_MASKED_PARAMETERS: [ndarray_to_bytes(arr) for arr in masked_parameters]}
 
 
 def _unmask(state: SecAggPlusState, named_values: Dict[str, Value]) -> Dict[str, Value]:
@@ -16,16 +16,23 @@
 
 import unittest
 from itertools import product
-from typing import Any, Dict, List, cast
+from typing import Any, Dict, List, Tuple, cast
+
+import numpy as np
 
 from flwr.client import NumPyClient
+from flwr.common import NDArrays, Scalar, bytes_to_ndarray, ndarray_to_bytes
 from flwr.common.secure_aggregation.secaggplus_constants import (
     KEY_ACTIVE_SECURE_ID_LIST,
     KEY_CIPHERTEXT_LIST,
     KEY_CLIPPING_RANGE,
     KEY_DEAD_SECURE_ID_LIST,
+    KEY_DESTINATION_LIST,
+    KEY_MASKED_PARAMETERS,
     KEY_MOD_RANGE,
     KEY_PARAMETERS,
+    KEY_PUBLIC_KEY_1,
+    KEY_PUBLIC_KEY_2,
     KEY_SAMPLE_NUMBER,
     KEY_SECURE_ID,
     KEY_SHARE_NUMBER,
@@ -39,6 +46,7 @@ from flwr.common.secure_aggregation.secaggplus_constants import (
     STAGE_UNMASK,
     STAGES,
 )
+from flwr.common.secure_aggregation.secaggplus_utils import pseudo_rand_gen
 from flwr.common.typing import Value
 
 from .secaggplus_handler import SecAggPlusHandler, check_named_values
@@ -48,6 +56,19 @@ class EmptyFlowerNumPyClient(NumPyClient, SecAggPlusHandler):
     """Empty NumPyClient."""
 
 
+class ConstantFlowerNumPyClient(NumPyClient, SecAggPlusHandler):
+    """NumPyClient returning parameters which are quantized deterministically."""
+
+    def __init__(self, value: float) -> None:
+        self.value = value
+
+    def fit(
+        self, parameters: NDArrays, config: Dict[str, Scalar]
+    ) -> Tuple[NDArrays, int, Dict[str, Scalar]]:
+        """Return constant parameters."""
+        return [np.full((2, 3), self.value), np.array([-1.0, 1.0])], 2, {}
+
+
 class TestSecAggPlusHandler(unittest.TestCase):
     """Test the SecAgg+ protocol handler."""
 
@@ -107,6 +128,78 @@ class TestSecAggPlusHandler(unittest.TestCase):
             # pylint: disable-next=protected-access
             assert handler._current_stage == current_stage
 
+    # pylint: disable-next=too-many-locals,no-self-use
+    def test_pairwise_masks_cancel_out(self) -> None:
+        """Test that the masked parameters of all clients sum up correctly."""
+        # Prepare
+        mod_range = 1 << 30
+        handlers = {
+            sid: ConstantFlowerNumPyClient(value)
+            for sid, value in [(3, -1.0), (7, 0.0), (9, 1.0)]
+        }
+        setup_values: Dict[str, Value] = {
+            KEY_SAMPLE_NUMBER: 3,
+            KEY_SHARE_NUMBER: 3,
+            KEY_THRESHOLD: 2,
+            KEY_CLIPPING_RANGE: 1.0,
+            KEY_TARGET_RANGE: 4,
+            KEY_MOD_RANGE: mod_range,
+        }
+
+        # Execute
+        public_keys: Dict[str, Value] = {}
+        for sid, handler in handlers.items():
+            res = handler.handle_secure_aggregation(
+                {**setup_values, KEY_STAGE: STAGE_SETUP, KEY_SECURE_ID: sid}
+            )
+            public_keys[str(sid)] = [
+                cast(bytes, res[KEY_PUBLIC_KEY_1]),
+                cast(bytes, res[KEY_PUBLIC_KEY_2]),
+            ]
+        inboxes: Dict[int, List[Tuple[int, bytes]]] = {sid: [] for sid in handlers}
+        for sid, handler in handlers.items():
+            res = handler.handle_secure_aggregation(
+                {**public_keys, KEY_STAGE: STAGE_SHARE_KEYS}
+            )
+            for dst, ciphertext in zip(
+                cast(List[int], res[KEY_DESTINATION_LIST]),
+                cast(List[bytes], res[KEY_CIPHERTEXT_LIST]),
+            ):
+                inboxes[dst].append((sid, ciphertext))
+        masked_sum = np.zeros(1 + 6 + 2, dtype=np.int64)
+        for sid, handler in handlers.items():
+            res = handler.handle_secure_aggregation(
+                {
+                    KEY_STAGE: STAGE_COLLECT_MASKED_INPUT,
+                    KEY_SOURCE_LIST: [src for src, _ in inboxes[sid]],
+                    KEY_CIPHERTEXT_LIST: [ctxt for _, ctxt in inboxes[sid]],
+                    KEY_PARAMETERS: [ndarray_to_bytes(np.zeros(3))],
+                }
+            )
+            private_mask = pseudo_rand_gen(
+                handler._shared_state.rd_seed,  # pylint: disable=protected-access
+                mod_range,
+                [(1,), (2, 3), (2,)],
+            )
+            masked_sum -= np.concatenate([arr.ravel() for arr in private_mask])
+            masked_sum += np.concatenate(
+                [
+                    bytes_to_ndarray(arr).ravel()
+                    for arr in cast(List[bytes], res[KEY_MASKED_PARAMETERS])
+                ]
+            )
+
+        # Assert
+        # Factor 2 per client, then the quantized values 0, 2 and 4 times 2
+        np.testing.assert_array_equal(
+            masked_sum % mod_range, [6, 12, 12, 12, 12, 12, 12, 0, 24]
+        )
+        for sid, handler in handlers.items():
+            # pylint: disable-next=protected-access
+            for other_sid, shared_key in handler._shared_state.ss1_dict.items():
+                # pylint: disable-next=protected-access
+                assert handlers[other_sid]._shared_state.ss1_dict[sid] == shared_key
+
     def test_stage_setup_check(self) -> None:
         """Test content checking for the setup stage."""
         handler = EmptyFlowerNumPyClient()
@@ -16,6 +16,7 @@
 
 
 from .date import now as now
+from .flat_ndarrays import FlatNDArrays as FlatNDArrays
 from .grpc import GRPC_MAX_MESSAGE_LENGTH
 from .logger import configure as configure
 from .logger import log as log
@@ -61,6 +62,7 @@ __all__ = [
     "EventType",
     "FitIns",
     "FitRes",
+    "FlatNDArrays",
     "GetParametersIns",
     "GetParametersRes",
     "GetPropertiesIns",
@@ -0,0 +1,99 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Compression of HTTP message bodies."""
+
+
+import gzip
+import zlib
+from typing import Any, List, Optional, cast
+
+CONTENT_ENCODING_GZIP = "gzip"
+CONTENT_ENCODING_ZSTD = "zstd"
+CONTENT_ENCODINGS = [CONTENT_ENCODING_GZIP, CONTENT_ENCODING_ZSTD]
+
+# Window size of zlib which expects a gzip header and trailer
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+MISSING_ZSTANDARD = """
+The `zstandard` package is required to use the `zstd` content encoding.
+
+Install it using `pip install zstandard`.
+"""
+
+
+class DecompressedSizeError(ValueError):
+    """Decompressed data exceeds the maximum size."""
+
+
+def compress(data: bytes, content_encoding: str) -> bytes:
+    """Compress `data` using the given HTTP `Content-Encoding`."""
+    if content_encoding == CONTENT_ENCODING_GZIP:
+        # A low level keeps compression cheap compared to the transfer it saves
+        return gzip.compress(data, compresslevel=1)
+    if content_encoding == CONTENT_ENCODING_ZSTD:
+        return cast(bytes, _zstandard().ZstdCompressor().compress(data))
+    raise ValueError(f"Unsupported content encoding: {content_encoding}")
+
+
+def decompress(
+    data: bytes, content_encoding: str, max_size: Optional[int] = None
+) -> bytes:
+    """Decompress `data` that was compressed using the given `Content-Encoding`.
+
+    Raises a `DecompressedSizeError` as soon as the decompressed data exceeds
+    `max_size` bytes, so that small bodies cannot expand to arbitrary sizes
+    (decompression bombs). `None` does not limit the size.
+    """
+    if content_encoding == CONTENT_ENCODING_GZIP:
+        decompressor = zlib.decompressobj(wbits=GZIP_WBITS)
+        # One byte more than allowed tells whether the limit was exceeded
+        decompressed = decompressor.decompress(
+            data, 0 if max_size is None else max_size + 1
+        )
+        _check_size(len(decompressed), max_size)
+        if not decompressor.eof:
+            raise ValueError("Incomplete gzip data")
+        return decompressed
+    if content_encoding == CONTENT_ENCODING_ZSTD:
+        zstandard = _zstandard()
+        chunks: List[bytes] = []
+        size = 0
+        with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+            while True:
+                chunk = reader.read(zstandard.DECOMPRESSION_RECOMMENDED_OUTPUT_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                _check_size(size, max_size)
+                chunks.append(chunk)
+        return b"".join(chunks)
+    raise ValueError(f"Unsupported content encoding: {content_encoding}")
+
+
+def _check_size(size: int, max_size: Optional[int]) -> None:
+    """Raise a `DecompressedSizeError` if `size` exceeds `max_size`."""
+    if max_size is not None and size > max_size:
+        raise DecompressedSizeError(
+            f"Decompressed data exceeds the maximum size of {max_size} bytes"
+        )
+
+
+def _zstandard() -> Any:
+    """Import the optional `zstandard` package."""
+    try:
+        import zstandard  # pylint: disable=import-outside-toplevel
+    except ModuleNotFoundError as err:
+        raise ModuleNotFoundError(MISSING_ZSTANDARD) from err
+    return zstandard
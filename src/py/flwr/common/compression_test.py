@@ -0,0 +1,91 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for compression of HTTP message bodies."""
+
+
+import importlib.util
+
+import pytest
+
+from .compression import (
+    CONTENT_ENCODING_GZIP,
+    CONTENT_ENCODING_ZSTD,
+    DecompressedSizeError,
+    compress,
+    decompress,
+)
+
+DATA = b"flower" * 1000
+
+
+def test_gzip_round_trip() -> None:
+    """Test that gzip-compressed data is smaller and decompresses to the input."""
+    # Execute
+    compressed = compress(DATA, CONTENT_ENCODING_GZIP)
+    actual = decompress(compressed, CONTENT_ENCODING_GZIP)
+
+    # Assert
+    assert len(compressed) < len(DATA)
+    assert actual == DATA
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("zstandard") is None, reason="requires zstandard"
+)
+def test_zstd_round_trip() -> None:
+    """Test that zstd-compressed data decompresses to the input."""
+    # Execute
+    actual = decompress(compress(DATA, CONTENT_ENCODING_ZSTD), CONTENT_ENCODING_ZSTD)
+
+    # Assert
+    assert actual == DATA
+
+
+def test_decompress_max_size() -> None:
+    """Test that decompression stops once the maximum size is exceeded."""
+    # Prepare
+    encodings = [CONTENT_ENCODING_GZIP]
+    if importlib.util.find_spec("zstandard") is not None:
+        encodings.append(CONTENT_ENCODING_ZSTD)
+
+    for content_encoding in encodings:
+        compressed = compress(DATA, content_encoding)
+
+        # Execute
+        actual = decompress(compressed, content_encoding, max_size=len(DATA))
+
+        # Assert
+        assert actual == DATA
+        with pytest.raises(DecompressedSizeError):
+            decompress(compressed, content_encoding, max_size=len(DATA) - 1)
+
+
+def test_decompress_truncated_gzip() -> None:
+    """Test that truncated gzip data is rejected."""
+    # Prepare
+    compressed = compress(DATA, CONTENT_ENCODING_GZIP)
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        decompress(compressed[:-8], CONTENT_ENCODING_GZIP)
+
+
+def test_unsupported_content_encoding() -> None:
+    """Test that unknown content encodings are rejected."""
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        compress(DATA, "br")
+    with pytest.raises(ValueError):
+        decompress(DATA, "br")
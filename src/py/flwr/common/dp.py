@@ -19,19 +19,26 @@ from typing import Tuple
 
 import numpy as np
 
+from flwr.common.flat_ndarrays import FlatNDArrays
 from flwr.common.typing import NDArrays
 
 
 # Calculates the L2-norm of a potentially ragged array
 def _get_update_norm(update: NDArrays) -> float:
-    flattened_update = update[0]
-    for i in range(1, len(update)):
-        flattened_update = np.append(flattened_update, update[i])
-    return float(np.sqrt(np.sum(np.square(flattened_update))))
+    if isinstance(update, FlatNDArrays):
+        return float(np.linalg.norm(update.buffer))
+    return float(np.sqrt(sum(np.vdot(layer, layer) for layer in update)))
 
 
 def add_gaussian_noise(update: NDArrays, std_dev: float) -> NDArrays:
-    """Add iid Gaussian noise to each floating point value in the update."""
+    """Add iid Gaussian noise to each floating point value in the update.
+
+    The noise of a `FlatNDArrays` update is drawn and added in a single step.
+    """
+    if isinstance(update, FlatNDArrays):
+        return update.with_buffer(
+            update.buffer + np.random.normal(0, std_dev, update.buffer.shape)
+        )
     update_noised = [
         layer + np.random.normal(0, std_dev, layer.shape) for layer in update
     ]
@@ -42,5 +49,9 @@ def clip_by_l2(update: NDArrays, threshold: float) -> Tuple[NDArrays, bool]:
     """Scales the update so thats its L2 norm is upper-bound to threshold."""
     update_norm = _get_update_norm(update)
     scaling_factor = min(1, threshold / update_norm)
-    update_clipped: NDArrays = [layer * scaling_factor for layer in update]
+    update_clipped: NDArrays
+    if isinstance(update, FlatNDArrays):
+        update_clipped = update.with_buffer(update.buffer * scaling_factor)
+    else:
+        update_clipped = [layer * scaling_factor for layer in update]
     return update_clipped, (scaling_factor < 1)
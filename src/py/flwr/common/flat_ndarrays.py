@@ -0,0 +1,104 @@
+# Copyright 2020 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""NDArrays stored in a single contiguous buffer."""
+
+
+from functools import reduce
+from itertools import accumulate
+from math import prod
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .typing import NDArray, NDArrays
+
+
+class FlatNDArrays(List[NDArray]):
+    """NDArrays stored in a single contiguous buffer.
+
+    The layers are reshaped views into `buffer`, a one-dimensional array holding all
+    parameters back to back. Code operating on all parameters at once (computing
+    norms or distances, scaling, adding noise, comparing models) can use `buffer`
+    directly instead of walking the layers or concatenating them. Being a list of
+    NDArrays, a `FlatNDArrays` can be used wherever NDArrays are expected.
+
+    Layers should only be modified in place: assigning or appending list items
+    does not update `buffer`.
+
+    Parameters
+    ----------
+    buffer : NDArray
+        One-dimensional array holding the values of all layers.
+    shapes : Sequence[Tuple[int, ...]]
+        Shapes of the layers, in order.
+    """
+
+    def __init__(self, buffer: NDArray, shapes: Sequence[Tuple[int, ...]]) -> None:
+        self.shapes: List[Tuple[int, ...]] = [tuple(shape) for shape in shapes]
+        offsets = list(accumulate((prod(shape) for shape in self.shapes), initial=0))
+        if buffer.ndim != 1 or buffer.size != offsets[-1]:
+            raise ValueError(
+                f"Expected a one-dimensional buffer of size {offsets[-1]}, "
+                f"got shape {buffer.shape}."
+            )
+        super().__init__(
+            buffer[start:stop].reshape(shape)
+            for start, stop, shape in zip(offsets, offsets[1:], self.shapes)
+        )
+        self.buffer = buffer
+
+    @classmethod
+    def from_ndarrays(
+        cls, ndarrays: NDArrays, dtype: Optional[npt.DTypeLike] = None
+    ) -> "FlatNDArrays":
+        """Copy `ndarrays` into a new contiguous buffer.
+
+        The buffer has the common dtype of all layers, unless `dtype` is given.
+        """
+        if dtype is None:
+            dtype = reduce(
+                np.promote_types, [layer.dtype for layer in ndarrays], np.dtype(bool)
+            )
+        flat = cls(
+            np.empty(sum(layer.size for layer in ndarrays), dtype=dtype),
+            [layer.shape for layer in ndarrays],
+        )
+        for view, layer in zip(flat, ndarrays):
+            view[...] = layer
+        return flat
+
+    def with_buffer(self, buffer: NDArray) -> "FlatNDArrays":
+        """Return a `FlatNDArrays` with the same layers as this one for `buffer`."""
+        return FlatNDArrays(buffer, self.shapes)
+
+    def __reduce__(self) -> Tuple[Callable[..., Any], Tuple[Any, ...]]:
+        """Keep the layers views into the buffer when copying or pickling."""
+        return FlatNDArrays, (self.buffer, self.shapes)
+
+
+def flat_weights(list_of_weights: Sequence[NDArrays]) -> Optional[List[FlatNDArrays]]:
+    """Return `list_of_weights` if all are `FlatNDArrays` with the same layers.
+
+    Otherwise, return None, i.e., the weights have to be processed layer by layer.
+    """
+    flat = [weights for weights in list_of_weights if isinstance(weights, FlatNDArrays)]
+    if (
+        not flat
+        or len(flat) != len(list_of_weights)
+        or any(weights.shapes != flat[0].shapes for weights in flat)
+    ):
+        return None
+    return flat
@@ -0,0 +1,108 @@
+# Copyright 2020 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""FlatNDArrays tests."""
+
+
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+from .dp import _get_update_norm, add_gaussian_noise, clip_by_l2
+from .flat_ndarrays import FlatNDArrays, flat_weights
+from .typing import NDArrays
+
+
+def _ndarrays() -> NDArrays:
+    return [
+        np.arange(6, dtype=np.float32).reshape(2, 3),
+        np.zeros((0, 4), dtype=np.float32),
+        np.arange(4, dtype=np.float64),
+    ]
+
+
+def test_from_ndarrays() -> None:
+    """Test that the layers are views into a single buffer."""
+    # Prepare
+    ndarrays = _ndarrays()
+
+    # Execute
+    flat = FlatNDArrays.from_ndarrays(ndarrays)
+    flat[0][1, 2] = 42.0
+
+    # Assert
+    assert flat.buffer.dtype == np.float64
+    assert flat.buffer.shape == (10,)
+    assert flat.shapes == [(2, 3), (0, 4), (4,)]
+    assert all(np.shares_memory(layer, flat.buffer) for layer in flat if layer.size)
+    assert flat.buffer[5] == 42.0
+    np.testing.assert_equal(flat[2], ndarrays[2])
+
+
+def test_invalid_buffer() -> None:
+    """Test that the buffer size has to match the shapes."""
+    with pytest.raises(ValueError):
+        FlatNDArrays(np.zeros(5), [(2, 3)])
+
+
+def test_copy_and_pickle() -> None:
+    """Test that copies keep their layers views into their own buffer."""
+    # Prepare
+    flat = FlatNDArrays.from_ndarrays(_ndarrays())
+
+    for flat_copy in [copy.deepcopy(flat), pickle.loads(pickle.dumps(flat))]:
+        # Execute
+        flat_copy.buffer[0] = -1.0
+
+        # Assert
+        assert isinstance(flat_copy, FlatNDArrays)
+        assert flat_copy[0][0, 0] == -1.0
+        assert flat[0][0, 0] == 0.0
+
+
+def test_flat_weights() -> None:
+    """Test that only FlatNDArrays with the same layers are returned."""
+    # Prepare
+    flat = FlatNDArrays.from_ndarrays(_ndarrays())
+    other = FlatNDArrays.from_ndarrays([np.zeros(10)])
+
+    # Execute & Assert
+    assert flat_weights([flat, copy.deepcopy(flat)]) is not None
+    assert flat_weights([flat, other]) is None
+    assert flat_weights([flat, _ndarrays()]) is None
+    assert flat_weights([]) is None
+
+
+def test_dp_matches_layerwise() -> None:
+    """Test that clipping and noising FlatNDArrays matches the layerwise version."""
+    # Prepare
+    ndarrays = _ndarrays()
+    flat = FlatNDArrays.from_ndarrays(ndarrays)
+
+    # Execute
+    clipped, was_clipped = clip_by_l2(ndarrays, 1.0)
+    flat_clipped, flat_was_clipped = clip_by_l2(flat, 1.0)
+    np.random.seed(0)
+    noised = add_gaussian_noise(clipped, 0.1)
+    np.random.seed(0)
+    flat_noised = add_gaussian_noise(flat_clipped, 0.1)
+
+    # Assert
+    assert _get_update_norm(flat) == pytest.approx(_get_update_norm(ndarrays))
+    assert was_clipped and flat_was_clipped
+    assert isinstance(flat_noised, FlatNDArrays)
+    for layer, flat_layer in zip(noised, flat_noised):
+        np.testing.assert_allclose(flat_layer, layer, rtol=1e-6)
@@ -15,25 +15,79 @@
 """Parameter conversion."""
 
 
+import json
+import threading
 from io import BytesIO
-from typing import cast
+from typing import List, Tuple, cast
 
 import numpy as np
 
+from .flat_ndarrays import FlatNDArrays
 from .typing import NDArray, NDArrays, Parameters
 
+TENSOR_TYPE_NDARRAY = "numpy.ndarray"
+TENSOR_TYPE_RAWBUFFER = "numpy.rawbuffer"
+SUPPORTED_TENSOR_TYPES = [TENSOR_TYPE_NDARRAY, TENSOR_TYPE_RAWBUFFER]
 
-def ndarrays_to_parameters(ndarrays: NDArrays) -> Parameters:
-    """Convert NumPy ndarrays to parameters object."""
+# `np.load` parses the header of each ndarray with `ast.literal_eval`, which is not
+# thread-safe on some CPython versions (https://github.com/python/cpython/issues/106905)
+_NPY_LOAD_LOCK = threading.Lock()
+
+
+def ndarrays_to_parameters(
+    ndarrays: NDArrays, tensor_type: str = TENSOR_TYPE_NDARRAY
+) -> Parameters:
+    """Convert NumPy ndarrays to parameters object.
+
+    Parameters
+    ----------
+    ndarrays : NDArrays
+        The NumPy ndarrays to convert.
+    tensor_type : str (default: "numpy.ndarray")
+        The serialization format. "numpy.ndarray" serializes each ndarray in the
+        `.npy` format. "numpy.rawbuffer" stores the dtypes and shapes of all
+        ndarrays once, in a header tensor, followed by the raw data buffer of each
+        ndarray. The latter avoids the copies and header parsing of `np.save` and
+        `np.load`. Both formats deserialize into writable ndarrays.
+
+    Returns
+    -------
+    parameters : Parameters
+        The serialized ndarrays.
+    """
+    if tensor_type == TENSOR_TYPE_RAWBUFFER:
+        return Parameters(
+            tensors=_ndarrays_to_rawbuffers(ndarrays), tensor_type=tensor_type
+        )
+    if tensor_type != TENSOR_TYPE_NDARRAY:
+        raise ValueError(f"Unsupported tensor type: {tensor_type}")
     tensors = [ndarray_to_bytes(ndarray) for ndarray in ndarrays]
-    return Parameters(tensors=tensors, tensor_type="numpy.ndarray")
+    return Parameters(tensors=tensors, tensor_type=tensor_type)
 
 
 def parameters_to_ndarrays(parameters: Parameters) -> NDArrays:
-    """Convert parameters object to NumPy ndarrays."""
+    """Convert parameters object to NumPy ndarrays.
+
+    Parameters serialized as "numpy.rawbuffer" are copied once, without parsing
+    a header per ndarray. If all of them share a dtype, they are returned as
+    `FlatNDArrays`, i.e., as views into a single contiguous buffer. The returned
+    ndarrays are writable in both formats.
+    """
+    if parameters.tensor_type == TENSOR_TYPE_RAWBUFFER:
+        return _rawbuffers_to_ndarrays(parameters.tensors)
     return [bytes_to_ndarray(tensor) for tensor in parameters.tensors]
 
 
+def reply_tensor_type(received_tensor_type: str) -> str:
+    """Return the serialization format to reply with to `received_tensor_type`.
+
+    This is the received format, if it is supported, and "numpy.ndarray" otherwise.
+    """
+    if received_tensor_type in SUPPORTED_TENSOR_TYPES:
+        return received_tensor_type
+    return TENSOR_TYPE_NDARRAY
+
+
 def ndarray_to_bytes(ndarray: NDArray) -> bytes:
     """Serialize NumPy ndarray to bytes."""
     bytes_io = BytesIO()
@@ -50,5 +104,42 @@ def bytes_to_ndarray(tensor: bytes) -> NDArray:
     # WARNING: NEVER set allow_pickle to true.
     # Reason: loading pickled data can execute arbitrary code
     # Source: https://numpy.org/doc/stable/reference/generated/numpy.load.html
-    ndarray_deserialized = np.load(bytes_io, allow_pickle=False)
+    with _NPY_LOAD_LOCK:
+        ndarray_deserialized = np.load(bytes_io, allow_pickle=False)
     return cast(NDArray, ndarray_deserialized)
+
+
+def _ndarrays_to_rawbuffers(ndarrays: NDArrays) -> List[bytes]:
+    """Serialize NumPy ndarrays to a header followed by their raw data buffers."""
+    layout: List[Tuple[str, List[int]]] = []
+    for ndarray in ndarrays:
+        if ndarray.dtype.hasobject:
+            raise ValueError("Cannot serialize ndarrays with object dtype.")
+        layout.append((ndarray.dtype.str, list(ndarray.shape)))
+    header = json.dumps(layout).encode("utf-8")
+    # `tobytes` returns the data in C order, independent of the memory layout
+    return [header] + [ndarray.tobytes() for ndarray in ndarrays]
+
+
+def _rawbuffers_to_ndarrays(tensors: List[bytes]) -> NDArrays:
+    """Deserialize NumPy ndarrays from a header and their raw data buffers."""
+    if not tensors:
+        raise ValueError("Missing header of raw buffer parameters.")
+    layout = json.loads(tensors[0])
+    if len(layout) != len(tensors) - 1:
+        raise ValueError(
+            f"Header describes {len(layout)} tensors, but got {len(tensors) - 1}."
+        )
+    dtypes = [np.dtype(dtype_str) for dtype_str, _ in layout]
+    if any(dtype.hasobject for dtype in dtypes):
+        raise ValueError("Cannot deserialize ndarrays with object dtype.")
+    if dtypes and all(dtype == dtypes[0] for dtype in dtypes):
+        # Copy all tensors into one buffer, such that aggregation can operate on
+        # all parameters at once
+        buffer = np.frombuffer(bytearray().join(tensors[1:]), dtype=dtypes[0])
+        return FlatNDArrays(buffer, [tuple(shape) for _, shape in layout])
+    # Copy each tensor into a writable buffer, like `np.load` does
+    return [
+        np.frombuffer(bytearray(tensor), dtype=dtype).reshape(shape)
+        for dtype, (_, shape), tensor in zip(dtypes, layout, tensors[1:])
+    ]
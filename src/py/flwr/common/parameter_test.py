@@ -18,10 +18,19 @@ tests.
 """
 
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pytest
 
-from .parameter import bytes_to_ndarray, ndarray_to_bytes
+from .flat_ndarrays import FlatNDArrays
+from .parameter import (
+    TENSOR_TYPE_RAWBUFFER,
+    bytes_to_ndarray,
+    ndarray_to_bytes,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
 
 
 def test_serialisation_deserialisation() -> None:
@@ -37,3 +46,90 @@ def test_serialisation_deserialisation() -> None:
     # Test false positive
     with pytest.raises(AssertionError, match="Arrays are not equal"):
         np.testing.assert_equal(arr_deserialized, np.ones((3, 2)))
+
+
+def test_deserialisation_concurrent() -> None:
+    """Test that ndarrays can be deserialized from several threads at once."""
+    # Prepare
+    tensors = [ndarray_to_bytes(np.full((2, i + 1), i)) for i in range(400)]
+
+    # Execute
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        actual = list(executor.map(bytes_to_ndarray, tensors))
+
+    # Assert
+    for i, ndarray in enumerate(actual):
+        np.testing.assert_equal(ndarray, np.full((2, i + 1), i))
+
+
+def test_rawbuffer_serialisation_deserialisation() -> None:
+    """Test if ndarrays are identical after (de-)serialization as raw buffers."""
+    # Prepare
+    ndarrays = [
+        np.array([[1, 2], [3, 4], [5, 6]]),
+        np.arange(12, dtype=np.float32).reshape(3, 4).T,  # Not C-contiguous
+        np.array(3.5, dtype=">f8"),  # Zero-dimensional and big-endian
+        np.zeros((0, 4), dtype=np.int8),
+        np.array([True, False]),
+    ]
+
+    # Execute
+    parameters = ndarrays_to_parameters(ndarrays, tensor_type=TENSOR_TYPE_RAWBUFFER)
+    actual = parameters_to_ndarrays(parameters)
+
+    # Assert
+    assert parameters.tensor_type == TENSOR_TYPE_RAWBUFFER
+    assert len(parameters.tensors) == len(ndarrays) + 1
+    for expected_ndarray, actual_ndarray in zip(ndarrays, actual):
+        assert actual_ndarray.dtype == expected_ndarray.dtype
+        assert actual_ndarray.flags.writeable
+        np.testing.assert_equal(actual_ndarray, expected_ndarray)
+
+
+def test_rawbuffer_deserialisation_flat() -> None:
+    """Test that raw buffers sharing a dtype are deserialized into one buffer."""
+    # Prepare
+    ndarrays = [np.ones((2, 3), dtype=np.float32), np.arange(4, dtype=np.float32)]
+    parameters = ndarrays_to_parameters(ndarrays, tensor_type=TENSOR_TYPE_RAWBUFFER)
+
+    # Execute
+    actual = parameters_to_ndarrays(parameters)
+
+    # Assert
+    assert isinstance(actual, FlatNDArrays)
+    assert actual.buffer.flags.writeable
+    for expected_ndarray, actual_ndarray in zip(ndarrays, actual):
+        np.testing.assert_equal(actual_ndarray, expected_ndarray)
+
+
+def test_rawbuffer_empty() -> None:
+    """Test (de-)serialization of an empty list of ndarrays as raw buffers."""
+    parameters = ndarrays_to_parameters([], tensor_type=TENSOR_TYPE_RAWBUFFER)
+    assert not parameters_to_ndarrays(parameters)
+
+
+def test_rawbuffer_object_dtype() -> None:
+    """Test that ndarrays with object dtype are rejected."""
+    with pytest.raises(ValueError):
+        ndarrays_to_parameters(
+            [np.array([{}], dtype=object)], tensor_type=TENSOR_TYPE_RAWBUFFER
+        )
+
+
+def test_rawbuffer_missing_tensor() -> None:
+    """Test that a header not matching the tensors is rejected."""
+    # Prepare
+    parameters = ndarrays_to_parameters(
+        [np.ones(2), np.ones(3)], tensor_type=TENSOR_TYPE_RAWBUFFER
+    )
+    parameters.tensors.pop()
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        parameters_to_ndarrays(parameters)
+
+
+def test_unsupported_tensor_type() -> None:
+    """Test that unsupported tensor types are rejected."""
+    with pytest.raises(ValueError):
+        ndarrays_to_parameters([np.ones(2)], tensor_type="numpy.unknown")
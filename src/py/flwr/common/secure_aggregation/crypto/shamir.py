@@ -12,64 +12,141 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
-"""Shamir's secret sharing."""
+"""Shamir's secret sharing.
 
+The secret is split into 3-byte symbols, each of which is shared with its own random
+polynomial over the prime field GF(2**31 - 1). All symbols of all recipients are
+processed at once with NumPy. Field elements and share indices are below 2**31, so no
+intermediate result overflows int64.
 
-import pickle
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Tuple, cast
+A share is encoded in a fixed little-endian layout without pickle::
 
-from Crypto.Protocol.SecretSharing import Shamir
-from Crypto.Util.Padding import pad, unpad
+    uint32 x | uint32 secret length | uint32 y[num_symbols]
 
+where `x` is the (1-based) index of the share and `y` are the evaluations of the
+polynomials at `x`.
+"""
 
-def create_shares(secret: bytes, threshold: int, num: int) -> List[bytes]:
-    """Return list of shares (bytes)."""
-    secret_padded = pad(secret, 16)
-    secret_padded_chunk = [
-        (threshold, num, secret_padded[i : i + 16])
-        for i in range(0, len(secret_padded), 16)
-    ]
-    share_list: List[List[Tuple[int, bytes]]] = [[] for _ in range(num)]
 
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        for chunk_shares in executor.map(
-            lambda arg: _shamir_split(*arg), secret_padded_chunk
-        ):
-            for idx, share in chunk_shares:
-                # Index in `chunk_shares` starts from 1
-                share_list[idx - 1].append((idx, share))
+import os
+import struct
+from typing import List
 
-    return [pickle.dumps(shares) for shares in share_list]
+import numpy as np
 
+from flwr.common.typing import NDArrayInt
 
-def _shamir_split(threshold: int, num: int, chunk: bytes) -> List[Tuple[int, bytes]]:
-    return Shamir.split(threshold, num, chunk, ssss=False)
+PRIME = (1 << 31) - 1
+SYMBOL_SIZE = 3
+HEADER = struct.Struct("<II")
 
 
-# Reconstructing secret with PyCryptodome
-def combine_shares(share_list: List[bytes]) -> bytes:
-    """Reconstruct secret from shares."""
-    unpickled_share_list: List[List[Tuple[int, bytes]]] = [
-        cast(List[Tuple[int, bytes]], pickle.loads(share)) for share in share_list
+def create_shares(secret: bytes, threshold: int, num: int) -> List[bytes]:
+    """Return list of shares (bytes).
+
+    Any `threshold` of the `num` shares suffice to reconstruct the secret.
+    """
+    if not 1 <= threshold <= num < PRIME:
+        raise ValueError(f"Cannot create {num} shares with a threshold of {threshold}.")
+    symbols = _bytes_to_symbols(secret)
+
+    # Random coefficients of all polynomials, the constant terms are the secret
+    # The bias of reducing 64 random bits modulo PRIME is below 2**-32
+    random_bits = np.frombuffer(
+        os.urandom(8 * (threshold - 1) * symbols.size), dtype="<u8"
+    )
+    coefficients = (random_bits % PRIME).astype(np.int64)
+    coefficients = coefficients.reshape(threshold - 1, symbols.size)
+
+    # Evaluate all polynomials at x = 1, ..., num with Horner's method
+    x_values = np.arange(1, num + 1, dtype=np.int64).reshape(-1, 1)
+    y_values = np.zeros((num, symbols.size), dtype=np.int64)
+    for coefficient in coefficients[::-1]:
+        y_values += coefficient
+        y_values *= x_values
+        y_values %= PRIME
+    y_values += symbols
+    y_values %= PRIME
+
+    encoded = y_values.astype("<u4")
+    return [
+        HEADER.pack(x, len(secret)) + encoded[x - 1].tobytes()
+        for x in range(1, num + 1)
     ]
 
-    chunk_num = len(unpickled_share_list[0])
-    secret_padded = bytearray(0)
-    chunk_shares_list: List[List[Tuple[int, bytes]]] = []
-    for i in range(chunk_num):
-        chunk_shares: List[Tuple[int, bytes]] = []
-        for share in unpickled_share_list:
-            chunk_shares.append(share[i])
-        chunk_shares_list.append(chunk_shares)
 
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        for chunk in executor.map(_shamir_combine, chunk_shares_list):
-            secret_padded += chunk
-
-    secret = unpad(secret_padded, 16)
-    return bytes(secret)
-
-
-def _shamir_combine(shares: List[Tuple[int, bytes]]) -> bytes:
-    return Shamir.combine(shares, ssss=False)
+def combine_shares(share_list: List[bytes]) -> bytes:
+    """Reconstruct secret from shares."""
+    if not share_list:
+        raise ValueError("Cannot reconstruct a secret without shares.")
+    for share in share_list:
+        if len(share) < HEADER.size or (len(share) - HEADER.size) % 4 != 0:
+            raise ValueError("The shares are truncated or malformed.")
+    x_list, secret_len = [], HEADER.unpack_from(share_list[0])[1]
+    if len(share_list[0]) - HEADER.size != 4 * (-(-secret_len // SYMBOL_SIZE)):
+        raise ValueError("The shares are truncated or malformed.")
+    for share in share_list:
+        x_value, share_secret_len = HEADER.unpack_from(share)
+        if share_secret_len != secret_len or len(share) != len(share_list[0]):
+            raise ValueError("The shares belong to different secrets.")
+        x_list.append(x_value)
+    x_values = np.array(x_list, dtype=np.int64)
+    if len(np.unique(x_values)) != len(x_values) or not np.all(
+        (0 < x_values) & (x_values < PRIME)
+    ):
+        raise ValueError("The shares must have distinct indices in [1, PRIME).")
+    y_values = np.frombuffer(
+        b"".join(share[HEADER.size :] for share in share_list), dtype="<u4"
+    ).reshape(len(share_list), -1)
+
+    # Interpolate all polynomials at 0
+    secret = np.zeros(y_values.shape[1], dtype=np.int64)
+    for basis, y_row in zip(_lagrange_basis_at_zero(x_values), y_values):
+        secret += (basis * y_row.astype(np.int64)) % PRIME
+        secret %= PRIME
+    return _symbols_to_bytes(secret, secret_len)
+
+
+def _bytes_to_symbols(data: bytes) -> NDArrayInt:
+    """Split `data` into 3-byte little-endian integers, zero-padding the last one."""
+    padded = np.frombuffer(data + bytes(-len(data) % SYMBOL_SIZE), dtype=np.uint8)
+    groups = padded.reshape(-1, SYMBOL_SIZE).astype(np.int64)
+    result: NDArrayInt = groups[:, 0] | (groups[:, 1] << 8) | (groups[:, 2] << 16)
+    return result
+
+
+def _symbols_to_bytes(symbols: NDArrayInt, length: int) -> bytes:
+    """Join 3-byte little-endian integers to `length` bytes."""
+    if np.any(symbols >= 1 << (8 * SYMBOL_SIZE)):
+        raise ValueError("The shares are invalid or too few to reconstruct the secret.")
+    data = symbols.astype("<u4").view(np.uint8).reshape(-1, 4)[:, :SYMBOL_SIZE]
+    return data.tobytes()[:length]
+
+
+def _lagrange_basis_at_zero(x_values: NDArrayInt) -> NDArrayInt:
+    """Return the Lagrange basis polynomials of `x_values` evaluated at 0.
+
+    The i-th value is the product of x_j / (x_j - x_i) over all j != i, modulo PRIME.
+    """
+    numerators = np.ones_like(x_values)
+    denominators = np.ones_like(x_values)
+    for x_j in x_values:
+        other = x_values != x_j
+        numerators[other] = numerators[other] * x_j % PRIME
+        differences = (x_j - x_values[other]) % PRIME
+        denominators[other] = denominators[other] * differences % PRIME
+    result: NDArrayInt = numerators * _inverse(denominators) % PRIME
+    return result
+
+
+def _inverse(values: NDArrayInt) -> NDArrayInt:
+    """Return the modular inverses of `values` with Fermat's little theorem."""
+    result = np.ones_like(values)
+    base = values % PRIME
+    exponent = PRIME - 2
+    while exponent:
+        if exponent & 1:
+            result = result * base % PRIME
+        base = base * base % PRIME
+        exponent >>= 1
+    return result
@@ -0,0 +1,70 @@
+# Copyright 2020 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Shamir's secret sharing tests."""
+
+
+import os
+import random
+
+import pytest
+
+from .shamir import HEADER, combine_shares, create_shares
+
+
+def test_combine_any_threshold_shares() -> None:
+    """Test that any `threshold` shares reconstruct the secret."""
+    rng = random.Random(42)
+    for secret_len, threshold, num in [
+        (0, 1, 1),
+        (1, 2, 3),
+        (32, 3, 5),
+        (185, 51, 100),
+    ]:
+        # Prepare
+        secret = os.urandom(secret_len)
+
+        # Execute
+        shares = create_shares(secret, threshold, num)
+
+        # Assert
+        assert len(shares) == num
+        assert all(
+            len(share) == HEADER.size + 4 * (-(-secret_len // 3)) for share in shares
+        )
+        for _ in range(3):
+            subset = rng.sample(shares, rng.randint(threshold, num))
+            assert combine_shares(subset) == secret
+
+
+def test_invalid_arguments() -> None:
+    """Test that invalid thresholds and shares are rejected."""
+    # Prepare
+    shares = create_shares(b"secret", 2, 3)
+    other_shares = create_shares(b"other secret", 2, 3)
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        create_shares(b"secret", 4, 3)
+    with pytest.raises(ValueError):
+        create_shares(b"secret", 0, 3)
+    with pytest.raises(ValueError):
+        combine_shares([shares[0], shares[0]])
+    with pytest.raises(ValueError):
+        combine_shares([shares[0], other_shares[1]])
+    with pytest.raises(ValueError):
+        combine_shares([])
+    for truncated in [b"ab", shares[0][: HEADER.size + 2], shares[0][:-4]]:
+        with pytest.raises(ValueError):
+            combine_shares([truncated, shares[1]])
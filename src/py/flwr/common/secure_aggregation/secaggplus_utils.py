@@ -15,12 +15,19 @@
 """Utility functions for the SecAgg/SecAgg+ protocol."""
 
 
+from math import prod
 from typing import List, Tuple
 
 import numpy as np
 
+from flwr.common.flat_ndarrays import FlatNDArrays
 from flwr.common.typing import NDArrayInt
 
+# Number of mask values generated at once by `add_pseudo_rand`. It is part of the
+# protocol: for ranges which are not a power of two, the generated masks depend on
+# it. It must be even.
+MASK_BLOCK_SIZE = 1 << 16
+
 
 def share_keys_plaintext_concat(
     source: int, destination: int, b_share: bytes, sk_share: bytes
@@ -85,18 +92,61 @@ def share_keys_plaintext_separate(plaintext: bytes) -> Tuple[int, int, bytes, by
 def pseudo_rand_gen(
     seed: bytes, num_range: int, dimensions_list: List[Tuple[int, ...]]
 ) -> List[NDArrayInt]:
-    """Seeded pseudo-random number generator for noise generation with Numpy."""
-    assert len(seed) & 0x3 == 0
-    seed32 = 0
-    for i in range(0, len(seed), 4):
-        seed32 ^= int.from_bytes(seed[i : i + 4], "little")
-    # pylint: disable-next=no-member
-    gen = np.random.RandomState(seed32)
-    output = []
-    for dimension in dimensions_list:
-        if len(dimension) == 0:
-            arr = np.array(gen.randint(0, num_range - 1), dtype=int)
+    """Seeded pseudo-random number generator for noise generation with Numpy.
+
+    The masks of all arrays are drawn from a single stream, in order, see
+    `add_pseudo_rand`.
+    """
+    masks = FlatNDArrays(
+        np.zeros(sum(prod(dimension) for dimension in dimensions_list), np.int64),
+        dimensions_list,
+    )
+    add_pseudo_rand(masks.buffer, seed, num_range)
+    return masks
+
+
+def add_pseudo_rand(
+    buffer: NDArrayInt, seed: bytes, num_range: int, subtract: bool = False
+) -> None:
+    """Add the mask generated from `seed` to `buffer` modulo `num_range` in place.
+
+    The mask consists of uniformly distributed integers in [0, num_range), drawn from
+    a PCG64 generator seeded with all bits of `seed`. For a power of two
+    `num_range` of at most 2**32, every 64 random bits give two mask values. Masks
+    are generated in blocks of `MASK_BLOCK_SIZE` values and accumulated into the
+    block right away, so no mask-sized array is allocated.
+
+    Parameters
+    ----------
+    buffer : NDArrayInt
+        One-dimensional int64 array, e.g., the buffer of a `FlatNDArrays`. Its
+        values are in [0, num_range) afterwards.
+    seed : bytes
+        The seed of the mask, e.g., a shared key.
+    num_range : int
+        The modulus.
+    subtract : bool (default: False)
+        Subtract the mask instead of adding it.
+    """
+    gen = np.random.Generator(np.random.PCG64(int.from_bytes(seed, "little")))
+    power_of_two = num_range & (num_range - 1) == 0
+    for start in range(0, buffer.size, MASK_BLOCK_SIZE):
+        block = buffer[start : start + MASK_BLOCK_SIZE]
+        mask: NDArrayInt
+        if power_of_two and num_range <= 1 << 32:
+            raw = gen.bit_generator.random_raw((block.size + 1) // 2)
+            # Split the 64 random bits the same way on every platform
+            mask = raw.astype("<u8", copy=False).view("<u4")[: block.size]
+        elif power_of_two:
+            mask = gen.bit_generator.random_raw(block.size).view(np.int64)
+        else:
+            mask = gen.integers(0, num_range, block.size, dtype=np.int64)
+        if subtract:
+            np.subtract(block, mask, out=block)
+        else:
+            np.add(block, mask, out=block)
+        # Higher bits of the raw random values are cut off here
+        if power_of_two:
+            np.bitwise_and(block, num_range - 1, out=block)
         else:
-            arr = gen.randint(0, num_range - 1, dimension)
-        output.append(arr)
-    return output
+            np.remainder(block, num_range, out=block)
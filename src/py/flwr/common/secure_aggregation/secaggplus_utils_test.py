@@ -0,0 +1,81 @@
+# Copyright 2020 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""SecAgg+ utility tests."""
+
+
+import numpy as np
+
+from .secaggplus_utils import MASK_BLOCK_SIZE, add_pseudo_rand, pseudo_rand_gen
+
+SEED_A = bytes(range(32))
+SEED_B = bytes(range(1, 33))
+
+
+def test_pseudo_rand_gen_range_and_determinism() -> None:
+    """Test that masks are deterministic and within range."""
+    dimensions_list = [(2, 3), (), (MASK_BLOCK_SIZE + 5,)]
+    for num_range in [1 << 20, 1 << 40, 1000]:
+        # Execute
+        masks = pseudo_rand_gen(SEED_A, num_range, dimensions_list)
+        masks_again = pseudo_rand_gen(SEED_A, num_range, dimensions_list)
+        other_masks = pseudo_rand_gen(SEED_B, num_range, dimensions_list)
+
+        # Assert
+        assert [mask.shape for mask in masks] == dimensions_list
+        for mask, mask_again in zip(masks, masks_again):
+            assert mask.dtype == np.int64
+            assert 0 <= mask.min() and mask.max() < num_range
+            np.testing.assert_array_equal(mask, mask_again)
+        assert not np.array_equal(masks[2], other_masks[2])
+
+
+def test_add_pseudo_rand_matches_pseudo_rand_gen() -> None:
+    """Test that masks added in place are the masks of `pseudo_rand_gen`."""
+    # Prepare
+    num_range = 1 << 30
+    values = np.arange(MASK_BLOCK_SIZE * 2 + 1, dtype=np.int64)
+    mask = np.concatenate(
+        [
+            m.ravel()
+            for m in pseudo_rand_gen(SEED_A, num_range, [(7,), (values.size - 7,)])
+        ]
+    )
+
+    # Execute
+    buffer = values.copy()
+    add_pseudo_rand(buffer, SEED_A, num_range)
+
+    # Assert
+    np.testing.assert_array_equal(buffer, (values + mask) % num_range)
+
+
+def test_pairwise_masks_cancel_out() -> None:
+    """Test that masks added by one client and subtracted by another cancel out."""
+    for num_range in [1 << 30, 12345]:
+        # Prepare
+        rng = np.random.default_rng(0)
+        values_a = rng.integers(0, 100, 1000)
+        values_b = rng.integers(0, 100, 1000)
+        masked_a, masked_b = values_a.copy(), values_b.copy()
+
+        # Execute
+        add_pseudo_rand(masked_a, SEED_A, num_range)
+        add_pseudo_rand(masked_b, SEED_A, num_range, subtract=True)
+
+        # Assert
+        assert not np.array_equal(masked_a, values_a)
+        np.testing.assert_array_equal(
+            (masked_a + masked_b) % num_range, values_a + values_b
+        )
@@ -17,12 +17,21 @@
 
 from typing import Dict, Union, cast
 
+import numpy as np
+
 from flwr.common import typing
 from flwr.proto import transport_pb2 as pb2
 
+from .parameter import (
+    TENSOR_TYPE_RAWBUFFER,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
 from .serde import (
     named_values_from_proto,
     named_values_to_proto,
+    parameters_from_proto,
+    parameters_to_proto,
     scalar_from_proto,
     scalar_to_proto,
     status_from_proto,
@@ -47,6 +56,24 @@ def test_serialisation_deserialisation() -> None:
         assert actual == scalar
 
 
+def test_rawbuffer_parameters_serialization_deserialization() -> None:
+    """Test raw buffer `Parameters` message (de-)serialization."""
+    # Prepare
+    ndarrays = [np.arange(6, dtype=np.float32).reshape(2, 3), np.array([1, 2])]
+    parameters = ndarrays_to_parameters(ndarrays, tensor_type=TENSOR_TYPE_RAWBUFFER)
+
+    # Execute
+    msg = pb2.Parameters.FromString(parameters_to_proto(parameters).SerializeToString())
+    actual = parameters_from_proto(msg)
+
+    # Assert
+    assert actual == parameters
+    for expected_ndarray, actual_ndarray in zip(
+        ndarrays, parameters_to_ndarrays(actual)
+    ):
+        np.testing.assert_equal(actual_ndarray, expected_ndarray)
+
+
 def test_status_to_proto() -> None:
     """Test status message (de-)serialization."""
     # Prepare
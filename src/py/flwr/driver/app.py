@@ -32,7 +32,11 @@ from flwr.server.history import History
 from flwr.server.server import Server
 from flwr.server.strategy import Strategy
 
-from .driver_client_proxy import DriverClientProxy
+from .driver_client_proxy import (
+    DriverClientProxy,
+    evaluate_clients_batched,
+    fit_clients_batched,
+)
 from .grpc_driver import GrpcDriver
 
 DEFAULT_SERVER_ADDRESS_DRIVER = "[::]:9091"
@@ -122,6 +126,12 @@ def start_driver(  # pylint: disable=too-many-arguments, too-many-locals
         strategy=strategy,
         client_manager=client_manager,
     )
+    # Send the instructions of each round in one batch instead of one thread
+    # (and one request) per client
+    initialized_server.set_dispatch_fns(
+        fit_clients_fn=fit_clients_batched,
+        evaluate_clients_fn=evaluate_clients_batched,
+    )
     log(
         INFO,
         "Starting Flower server, config: %s",
@@ -90,13 +90,20 @@ class Driver:
         res = grpc_driver.push_task_ins(PushTaskInsRequest(task_ins_list=task_ins_list))
         return list(res.task_ids)
 
-    def pull_task_res(self, task_ids: Iterable[str]) -> List[TaskRes]:
-        """Get task results."""
+    def pull_task_res(
+        self, task_ids: Iterable[str], timeout: float = 0.0
+    ) -> List[TaskRes]:
+        """Get task results.
+
+        If `timeout` is greater than zero and none of the results are available
+        yet, the Driver API waits up to `timeout` seconds for the first of them
+        before replying.
+        """
         grpc_driver, _ = self._get_grpc_driver_and_workload_id()
 
         # Call GrpcDriver method
         res = grpc_driver.pull_task_res(
-            PullTaskResRequest(node=self.node, task_ids=task_ids)
+            PullTaskResRequest(node=self.node, task_ids=task_ids, timeout=timeout)
         )
         return list(res.task_res_list)
 
@@ -16,16 +16,26 @@
 
 
 import time
-from typing import List, Optional, cast
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union, cast
+
+import grpc
 
 from flwr import common
 from flwr.common import serde
 from flwr.proto import driver_pb2, node_pb2, task_pb2, transport_pb2
 from flwr.server.client_proxy import ClientProxy
+from flwr.server.server import (
+    EvaluateResultsAndFailures,
+    FitResultsAndFailures,
+    evaluate_clients,
+    fit_clients,
+)
 
 from .grpc_driver import GrpcDriver
 
 SLEEP_TIME = 1
+# Maximum time (in seconds) the Driver API waits for a TaskRes per PullTaskRes call
+PULL_TIMEOUT = 30.0
 
 
 class DriverClientProxy(ClientProxy):
@@ -103,22 +113,7 @@ class DriverClientProxy(ClientProxy):
     def _send_receive_msg(
         self, server_message: transport_pb2.ServerMessage, timeout: Optional[float]
     ) -> transport_pb2.ClientMessage:
-        task_ins = task_pb2.TaskIns(
-            task_id="",
-            group_id="",
-            workload_id=self.workload_id,
-            task=task_pb2.Task(
-                producer=node_pb2.Node(
-                    node_id=0,
-                    anonymous=True,
-                ),
-                consumer=node_pb2.Node(
-                    node_id=self.node_id,
-                    anonymous=self.anonymous,
-                ),
-                legacy_server_message=server_message,
-            ),
-        )
+        task_ins = _create_task_ins(self, server_message)
         push_task_ins_req = driver_pb2.PushTaskInsRequest(task_ins_list=[task_ins])
 
         # Send TaskIns to Driver API
@@ -131,16 +126,18 @@ class DriverClientProxy(ClientProxy):
         if task_id == "":
             raise ValueError(f"Failed to schedule task for node {self.node_id}")
 
-        if timeout:
-            start_time = time.time()
-
+        deadline = None if timeout is None else time.monotonic() + timeout
         while True:
+            wait = _pull_timeout(deadline)
             pull_task_res_req = driver_pb2.PullTaskResRequest(
                 node=node_pb2.Node(node_id=0, anonymous=True),
                 task_ids=[task_id],
+                timeout=wait,
             )
 
-            # Ask Driver API for TaskRes
+            # Ask Driver API for TaskRes, it replies as soon as the TaskRes is
+            # available or after `wait` seconds
+            pull_start = time.monotonic()
             pull_task_res_res = self.driver.pull_task_res(req=pull_task_res_req)
 
             task_res_list: List[task_pb2.TaskRes] = list(
@@ -152,6 +149,219 @@ class DriverClientProxy(ClientProxy):
                     task_res.task.legacy_client_message
                 )
 
-            if timeout is not None and time.time() > start_time + timeout:
+            if deadline is not None and time.monotonic() > deadline:
                 raise RuntimeError("Timeout reached")
+            # Driver APIs which do not support waiting reply immediately
+            if time.monotonic() - pull_start < wait:
+                time.sleep(SLEEP_TIME)
+
+
+def fit_clients_batched(
+    client_instructions: List[Tuple[ClientProxy, common.FitIns]],
+    max_workers: Optional[int],
+    timeout: Optional[float],
+    on_result: Optional[Callable[[Tuple[ClientProxy, common.FitRes]], None]] = None,
+) -> FitResultsAndFailures:
+    """Refine parameters on all selected clients using one batch of TaskIns.
+
+    Instead of sending one TaskIns per client (each one in its own thread), all
+    TaskIns are pushed in a single request and the TaskRes of all clients are
+    pulled in a single loop. Falls back to `flwr.server.server.fit_clients` if
+    not all clients are `DriverClientProxy` instances sharing one driver.
+    """
+    driver = _common_driver(client_instructions)
+    if driver is None:
+        return fit_clients(client_instructions, max_workers, timeout, on_result)
+
+    results: List[Tuple[ClientProxy, common.FitRes]] = []
+    failures: List[Union[Tuple[ClientProxy, common.FitRes], BaseException]] = []
+    messages = [
+        (
+            cast(DriverClientProxy, proxy),
+            serde.server_message_to_proto(common.ServerMessage(fit_ins=ins)),
+        )
+        for proxy, ins in client_instructions
+    ]
+    for proxy, reply in _send_receive_batch(driver, messages, timeout):
+        if isinstance(reply, BaseException):
+            failures.append(reply)
+            continue
+        try:
+            res = cast(common.FitRes, serde.client_message_from_proto(reply).fit_res)
+        except Exception as ex:  # pylint: disable=broad-except
+            failures.append(ex)
+            continue
+        result: Tuple[ClientProxy, common.FitRes] = (proxy, res)
+        if res.status.code != common.Code.OK:
+            failures.append(result)
+            continue
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    return results, failures
+
+
+def evaluate_clients_batched(
+    client_instructions: List[Tuple[ClientProxy, common.EvaluateIns]],
+    max_workers: Optional[int],
+    timeout: Optional[float],
+) -> EvaluateResultsAndFailures:
+    """Evaluate parameters on all selected clients using one batch of TaskIns.
+
+    See `fit_clients_batched`, falls back to `flwr.server.server.evaluate_clients`
+    if not all clients are `DriverClientProxy` instances sharing one driver.
+    """
+    driver = _common_driver(client_instructions)
+    if driver is None:
+        return evaluate_clients(client_instructions, max_workers, timeout)
+
+    results: List[Tuple[ClientProxy, common.EvaluateRes]] = []
+    failures: List[Union[Tuple[ClientProxy, common.EvaluateRes], BaseException]] = []
+    messages = [
+        (
+            cast(DriverClientProxy, proxy),
+            serde.server_message_to_proto(common.ServerMessage(evaluate_ins=ins)),
+        )
+        for proxy, ins in client_instructions
+    ]
+    for proxy, reply in _send_receive_batch(driver, messages, timeout):
+        if isinstance(reply, BaseException):
+            failures.append(reply)
+            continue
+        try:
+            res = cast(
+                common.EvaluateRes, serde.client_message_from_proto(reply).evaluate_res
+            )
+        except Exception as ex:  # pylint: disable=broad-except
+            failures.append(ex)
+            continue
+        result: Tuple[ClientProxy, common.EvaluateRes] = (proxy, res)
+        if res.status.code != common.Code.OK:
+            failures.append(result)
+            continue
+        results.append(result)
+    return results, failures
+
+
+def _common_driver(
+    client_instructions: Union[
+        List[Tuple[ClientProxy, common.FitIns]],
+        List[Tuple[ClientProxy, common.EvaluateIns]],
+    ]
+) -> Optional[GrpcDriver]:
+    """Return the driver shared by all clients, if any."""
+    drivers = {
+        id(proxy.driver): proxy.driver
+        for proxy, _ in client_instructions
+        if isinstance(proxy, DriverClientProxy)
+    }
+    if len(drivers) != 1 or not all(
+        isinstance(proxy, DriverClientProxy) for proxy, _ in client_instructions
+    ):
+        return None
+    return next(iter(drivers.values()))
+
+
+def _send_receive_batch(
+    driver: GrpcDriver,
+    messages: List[Tuple[DriverClientProxy, transport_pb2.ServerMessage]],
+    timeout: Optional[float],
+) -> Iterator[
+    Tuple[DriverClientProxy, Union[transport_pb2.ClientMessage, BaseException]]
+]:
+    """Push all messages at once and yield each reply as soon as it arrives.
+
+    Clients which cannot be reached (or which do not reply before `timeout`) are
+    yielded together with an exception instead of a reply. This includes all
+    clients still waited for if the Driver API fails.
+    """
+    task_ins_list = [_create_task_ins(proxy, msg) for proxy, msg in messages]
+    try:
+        push_task_ins_res = driver.push_task_ins(
+            req=driver_pb2.PushTaskInsRequest(task_ins_list=task_ins_list)
+        )
+        if len(push_task_ins_res.task_ids) != len(messages):
+            raise ValueError("Unexpected number of task_ids")
+    except (grpc.RpcError, ValueError) as ex:
+        for proxy, _ in messages:
+            yield proxy, ex
+        return
+
+    # Clients still waited for, by the ID of the TaskIns sent to them
+    pending: Dict[str, DriverClientProxy] = {}
+    for (proxy, _), task_id in zip(messages, push_task_ins_res.task_ids):
+        if task_id == "":
+            yield proxy, ValueError(f"Failed to schedule task for node {proxy.node_id}")
+        else:
+            pending[task_id] = proxy
+
+    yield from _receive_batch(driver, pending, timeout)
+
+
+def _receive_batch(
+    driver: GrpcDriver,
+    pending: Dict[str, DriverClientProxy],
+    timeout: Optional[float],
+) -> Iterator[
+    Tuple[DriverClientProxy, Union[transport_pb2.ClientMessage, BaseException]]
+]:
+    """Pull the replies to the TaskIns in `pending` until all arrived."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while pending:
+        wait = _pull_timeout(deadline)
+        pull_start = time.monotonic()
+        try:
+            pull_task_res_res = driver.pull_task_res(
+                req=driver_pb2.PullTaskResRequest(
+                    node=node_pb2.Node(node_id=0, anonymous=True),
+                    task_ids=list(pending),
+                    timeout=wait,
+                )
+            )
+        except grpc.RpcError as ex:
+            for proxy in pending.values():
+                yield proxy, ex
+            break
+        for task_res in pull_task_res_res.task_res_list:
+            task_id = task_res.task.ancestry[0]
+            if task_id in pending:
+                yield pending.pop(task_id), task_res.task.legacy_client_message
+
+        if not pending:
+            break
+        if deadline is not None and time.monotonic() > deadline:
+            for proxy in pending.values():
+                yield proxy, RuntimeError("Timeout reached")
+            break
+        # Driver APIs which do not support waiting reply immediately
+        if not pull_task_res_res.task_res_list and time.monotonic() - pull_start < wait:
             time.sleep(SLEEP_TIME)
+
+
+def _create_task_ins(
+    proxy: DriverClientProxy, server_message: transport_pb2.ServerMessage
+) -> task_pb2.TaskIns:
+    """Create the TaskIns sending `server_message` to the node of `proxy`."""
+    return task_pb2.TaskIns(
+        task_id="",
+        group_id="",
+        workload_id=proxy.workload_id,
+        task=task_pb2.Task(
+            producer=node_pb2.Node(
+                node_id=0,
+                anonymous=True,
+            ),
+            consumer=node_pb2.Node(
+                node_id=proxy.node_id,
+                anonymous=proxy.anonymous,
+            ),
+            legacy_server_message=server_message,
+        ),
+    )
+
+
+def _pull_timeout(deadline: Optional[float]) -> float:
+    """Return how long the Driver API should wait for TaskRes."""
+    if deadline is None:
+        return PULL_TIMEOUT
+    return max(0.0, min(PULL_TIMEOUT, deadline - time.monotonic()))
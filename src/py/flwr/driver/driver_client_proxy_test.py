@@ -16,15 +16,20 @@
 
 
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
+import grpc
 import numpy as np
 
 import flwr
 from flwr.common.typing import Config, GetParametersIns
-from flwr.driver.driver_client_proxy import DriverClientProxy
+from flwr.driver.driver_client_proxy import (
+    DriverClientProxy,
+    evaluate_clients_batched,
+    fit_clients_batched,
+)
 from flwr.proto import driver_pb2, node_pb2, task_pb2
-from flwr.proto.transport_pb2 import ClientMessage, Parameters, Scalar
+from flwr.proto.transport_pb2 import ClientMessage, Code, Parameters, Scalar, Status
 
 MESSAGE_PARAMETERS = Parameters(tensors=[b"abc"], tensor_type="np")
 
@@ -183,3 +188,176 @@ class DriverClientProxyTestCase(unittest.TestCase):
         # Assert
         assert 0.0 == evaluate_res.loss
         assert 0 == evaluate_res.num_examples
+
+    def test_evaluate_waits_for_task_res(self) -> None:
+        """Test that the Driver API is asked to wait until the TaskRes arrives."""
+        # Prepare
+        self.driver.push_task_ins.return_value = driver_pb2.PushTaskInsResponse(
+            task_ids=["19341fd7-62e1-4eb4-beb4-9876d3acda32"]
+        )
+        self.driver.pull_task_res.side_effect = [
+            driver_pb2.PullTaskResResponse(task_res_list=[]),
+            driver_pb2.PullTaskResResponse(
+                task_res_list=[
+                    task_pb2.TaskRes(
+                        task_id="554bd3c8-8474-4b93-a7db-c7bec1bf0012",
+                        group_id="",
+                        workload_id=0,
+                        task=task_pb2.Task(
+                            legacy_client_message=ClientMessage(
+                                evaluate_res=ClientMessage.EvaluateRes(
+                                    loss=0.0, num_examples=0
+                                )
+                            )
+                        ),
+                    )
+                ]
+            ),
+        ]
+        client = DriverClientProxy(
+            node_id=1, driver=self.driver, anonymous=True, workload_id=0
+        )
+        parameters = flwr.common.Parameters(tensors=[], tensor_type="np")
+        evaluate_ins: flwr.common.EvaluateIns = flwr.common.EvaluateIns(parameters, {})
+
+        # Execute
+        with patch("flwr.driver.driver_client_proxy.time.sleep") as sleep:
+            evaluate_res = client.evaluate(evaluate_ins, timeout=60.0)
+
+        # Assert
+        assert 0 == evaluate_res.num_examples
+        assert self.driver.pull_task_res.call_count == 2
+        for call in self.driver.pull_task_res.call_args_list:
+            assert 0.0 < call.kwargs["req"].timeout <= 30.0
+        # The mocked Driver API replied without waiting, so the proxy backs off
+        sleep.assert_called_once()
+
+    def test_fit_clients_batched(self) -> None:
+        """Test that all clients are instructed with one push."""
+        # Prepare
+        task_ids = [f"19341fd7-62e1-4eb4-beb4-9876d3acda3{idx}" for idx in range(3)]
+        self.driver.push_task_ins.return_value = driver_pb2.PushTaskInsResponse(
+            task_ids=task_ids
+        )
+
+        def _task_res(task_id: str, code: "Code.ValueType") -> task_pb2.TaskRes:
+            return task_pb2.TaskRes(
+                task=task_pb2.Task(
+                    ancestry=[task_id],
+                    legacy_client_message=ClientMessage(
+                        fit_res=ClientMessage.FitRes(
+                            status=Status(code=code),
+                            parameters=MESSAGE_PARAMETERS,
+                            num_examples=10,
+                        )
+                    ),
+                ),
+            )
+
+        self.driver.pull_task_res.side_effect = [
+            driver_pb2.PullTaskResResponse(
+                task_res_list=[_task_res(task_ids[2], Code.OK)]
+            ),
+            driver_pb2.PullTaskResResponse(
+                task_res_list=[
+                    _task_res(task_ids[0], Code.OK),
+                    _task_res(task_ids[1], Code.FIT_NOT_IMPLEMENTED),
+                ]
+            ),
+        ]
+        clients = [
+            DriverClientProxy(
+                node_id=node_id, driver=self.driver, anonymous=False, workload_id=0
+            )
+            for node_id in range(3)
+        ]
+        ins = flwr.common.FitIns(flwr.common.Parameters(tensors=[], tensor_type=""), {})
+        received = MagicMock()
+
+        # Execute
+        results, failures = fit_clients_batched(
+            [(client, ins) for client in clients], None, 60.0, received
+        )
+
+        # Assert
+        self.driver.push_task_ins.assert_called_once()
+        assert self.driver.pull_task_res.call_count == 2
+        second_pull = self.driver.pull_task_res.call_args_list[1].kwargs["req"]
+        assert set(second_pull.task_ids) == set(task_ids[:2])
+        assert [client for client, _ in results] == [clients[2], clients[0]]
+        assert received.call_count == 2
+        assert len(failures) == 1
+
+    def test_evaluate_clients_batched_timeout(self) -> None:
+        """Test that clients without TaskRes fail once the timeout is reached."""
+        # Prepare
+        self.driver.push_task_ins.return_value = driver_pb2.PushTaskInsResponse(
+            task_ids=["19341fd7-62e1-4eb4-beb4-9876d3acda32", ""]
+        )
+        self.driver.pull_task_res.return_value = driver_pb2.PullTaskResResponse()
+        clients = [
+            DriverClientProxy(
+                node_id=node_id, driver=self.driver, anonymous=False, workload_id=0
+            )
+            for node_id in range(2)
+        ]
+        ins = flwr.common.EvaluateIns(
+            flwr.common.Parameters(tensors=[], tensor_type=""), {}
+        )
+
+        # Execute
+        results, failures = evaluate_clients_batched(
+            [(client, ins) for client in clients], None, 0.0
+        )
+
+        # Assert
+        assert not results
+        assert len(failures) == 2
+        assert self.driver.pull_task_res.call_count == 1
+
+    def test_fit_clients_batched_driver_errors(self) -> None:
+        """Test that Driver API errors fail the clients instead of the round."""
+        # Prepare
+        task_ids = [f"19341fd7-62e1-4eb4-beb4-9876d3acda3{idx}" for idx in range(2)]
+        clients = [
+            DriverClientProxy(
+                node_id=node_id, driver=self.driver, anonymous=False, workload_id=0
+            )
+            for node_id in range(2)
+        ]
+        ins = flwr.common.FitIns(flwr.common.Parameters(tensors=[], tensor_type=""), {})
+        push_errors = [
+            grpc.RpcError(),
+            driver_pb2.PushTaskInsResponse(task_ids=task_ids[:1]),
+        ]
+
+        for push_error in push_errors:
+            self.driver.reset_mock()
+            self.driver.push_task_ins.side_effect = [push_error]
+
+            # Execute
+            results, failures = fit_clients_batched(
+                [(client, ins) for client in clients], None, 60.0
+            )
+
+            # Assert
+            assert not results
+            assert len(failures) == 2
+            self.driver.pull_task_res.assert_not_called()
+
+        # Prepare
+        self.driver.push_task_ins.side_effect = None
+        self.driver.push_task_ins.return_value = driver_pb2.PushTaskInsResponse(
+            task_ids=task_ids
+        )
+        self.driver.pull_task_res.side_effect = grpc.RpcError()
+
+        # Execute
+        results, failures = fit_clients_batched(
+            [(client, ins) for client in clients], None, 60.0
+        )
+
+        # Assert
+        assert not results
+        assert len(failures) == 2
+        assert all(isinstance(failure, grpc.RpcError) for failure in failures)
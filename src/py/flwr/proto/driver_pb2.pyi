@@ -85,17 +85,26 @@ class PullTaskResRequest(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
     NODE_FIELD_NUMBER: builtins.int
     TASK_IDS_FIELD_NUMBER: builtins.int
+    TIMEOUT_FIELD_NUMBER: builtins.int
     @property
     def node(self) -> flwr.proto.node_pb2.Node: ...
     @property
     def task_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[typing.Text]: ...
+    timeout: builtins.float
+    """If greater than zero and none of the requested TaskRes are available yet,
+    wait (at most `timeout` seconds) until at least one of them is stored. The
+    server may wait less. Zero (the default) returns the available TaskRes
+    immediately.
+    """
+
     def __init__(self,
         *,
         node: typing.Optional[flwr.proto.node_pb2.Node] = ...,
         task_ids: typing.Optional[typing.Iterable[typing.Text]] = ...,
+        timeout: builtins.float = ...,
         ) -> None: ...
     def HasField(self, field_name: typing_extensions.Literal["node",b"node"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["node",b"node","task_ids",b"task_ids"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["node",b"node","task_ids",b"task_ids","timeout",b"timeout"]) -> None: ...
 global___PullTaskResRequest = PullTaskResRequest
 
 class PullTaskResResponse(google.protobuf.message.Message):
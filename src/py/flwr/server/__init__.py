@@ -21,12 +21,14 @@ from .app import run_driver_api as run_driver_api
 from .app import run_fleet_api as run_fleet_api
 from .app import run_server as run_server
 from .app import start_server as start_server
+from .async_server import AsyncServer as AsyncServer
 from .client_manager import ClientManager as ClientManager
 from .client_manager import SimpleClientManager as SimpleClientManager
 from .history import History as History
 from .server import Server as Server
 
 __all__ = [
+    "AsyncServer",
     "ClientManager",
     "History",
     "run_driver_api",
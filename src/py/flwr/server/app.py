@@ -19,7 +19,9 @@ import argparse
 import importlib.util
 import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from datetime import timedelta
 from logging import ERROR, INFO, WARN
 from os.path import isfile
 from pathlib import Path
@@ -52,13 +54,14 @@ from flwr.server.fleet.grpc_bidi.grpc_server import (
 from flwr.server.fleet.grpc_rere.fleet_servicer import FleetServicer
 from flwr.server.history import History
 from flwr.server.server import Server
-from flwr.server.state import StateFactory
+from flwr.server.state import StateFactory, TaskSweeper
 from flwr.server.strategy import FedAvg, Strategy
 
 ADDRESS_DRIVER_API = "0.0.0.0:9091"
 ADDRESS_FLEET_API_GRPC_RERE = "0.0.0.0:9092"
 ADDRESS_FLEET_API_GRPC_BIDI = "[::]:8080"  # IPv6 to keep start_server compatible
 ADDRESS_FLEET_API_REST = "0.0.0.0:9093"
+STATE_WORKERS_FLEET_API_REST = 32
 
 DATABASE = ":flwr-in-memory-state:"
 
@@ -252,7 +255,13 @@ def run_driver_api() -> None:
     certificates = _try_obtain_certificates(args)
 
     # Initialize StateFactory
-    state_factory = StateFactory(args.database)
+    state_factory = StateFactory(
+        args.database, task_ttl=timedelta(seconds=args.task_ttl)
+    )
+
+    # Delete expired TaskIns/TaskRes in the background
+    task_sweeper = TaskSweeper(state_factory, interval=args.task_sweep_interval)
+    task_sweeper.start()
 
     # Start server
     grpc_server: grpc.Server = _run_driver_api_grpc(
@@ -266,6 +275,7 @@ def run_driver_api() -> None:
         grpc_servers=[grpc_server],
         bckg_threads=[],
         event_type=EventType.RUN_DRIVER_API_LEAVE,
+        task_sweeper=task_sweeper,
     )
 
     # Block
@@ -282,7 +292,13 @@ def run_fleet_api() -> None:
     certificates = _try_obtain_certificates(args)
 
     # Initialize StateFactory
-    state_factory = StateFactory(args.database)
+    state_factory = StateFactory(
+        args.database, task_ttl=timedelta(seconds=args.task_ttl)
+    )
+
+    # Delete expired TaskIns/TaskRes in the background
+    task_sweeper = TaskSweeper(state_factory, interval=args.task_sweep_interval)
+    task_sweeper.start()
 
     grpc_servers = []
     bckg_threads = []
@@ -309,6 +325,7 @@ def run_fleet_api() -> None:
                 args.ssl_certfile,
                 state_factory,
                 args.rest_fleet_api_workers,
+                args.rest_fleet_api_state_workers,
             ),
         )
         fleet_thread.start()
@@ -347,6 +364,7 @@ def run_fleet_api() -> None:
         grpc_servers=grpc_servers,
         bckg_threads=bckg_threads,
         event_type=EventType.RUN_FLEET_API_LEAVE,
+        task_sweeper=task_sweeper,
     )
 
     # Block
@@ -374,7 +392,13 @@ def run_server() -> None:
     certificates = _try_obtain_certificates(args)
 
     # Initialize StateFactory
-    state_factory = StateFactory(args.database)
+    state_factory = StateFactory(
+        args.database, task_ttl=timedelta(seconds=args.task_ttl)
+    )
+
+    # Delete expired TaskIns/TaskRes in the background
+    task_sweeper = TaskSweeper(state_factory, interval=args.task_sweep_interval)
+    task_sweeper.start()
 
     # Start Driver API
     driver_server: grpc.Server = _run_driver_api_grpc(
@@ -408,6 +432,7 @@ def run_server() -> None:
                 args.ssl_certfile,
                 state_factory,
                 args.rest_fleet_api_workers,
+                args.rest_fleet_api_state_workers,
             ),
         )
         fleet_thread.start()
@@ -446,6 +471,7 @@ def run_server() -> None:
         grpc_servers=grpc_servers,
         bckg_threads=bckg_threads,
         event_type=EventType.RUN_SERVER_LEAVE,
+        task_sweeper=task_sweeper,
     )
 
     # Block
@@ -484,6 +510,7 @@ def _register_exit_handlers(
     grpc_servers: List[grpc.Server],
     bckg_threads: List[threading.Thread],
     event_type: EventType,
+    task_sweeper: Optional[TaskSweeper] = None,
 ) -> None:
     default_handlers = {
         SIGINT: None,
@@ -510,6 +537,10 @@ def _register_exit_handlers(
         for bckg_thread in bckg_threads:
             bckg_thread.join()
 
+        if task_sweeper is not None:
+            task_sweeper.stop()
+            log(INFO, "TaskSweeper metrics: %s", task_sweeper.metrics())
+
         # Ensure event has happend
         event_res.result()
 
@@ -587,7 +618,7 @@ def _run_fleet_api_grpc_rere(
     """Run Fleet API (gRPC, request-response)."""
     # Create Fleet API gRPC server
     fleet_servicer = FleetServicer(
-        state=state_factory.state(),
+        state_factory=state_factory,
     )
     fleet_add_servicer_to_server_fn = add_FleetServicer_to_server
     fleet_grpc_server = generic_create_grpc_server(
@@ -611,6 +642,7 @@ def _run_fleet_api_rest(
     ssl_certfile: Optional[str],
     state_factory: StateFactory,
     workers: int,
+    state_workers: int,
 ) -> None:
     """Run Driver API (REST-based)."""
     try:
@@ -629,6 +661,9 @@ def _run_fleet_api_rest(
 
     # See: https://www.starlette.io/applications/#accessing-the-app-instance
     fast_api_app.state.STATE_FACTORY = state_factory
+    fast_api_app.state.STATE_EXECUTOR = ThreadPoolExecutor(
+        max_workers=state_workers, thread_name_prefix="flwr-rest-state"
+    )
 
     validation_exceptions = _validate_ssl_files(
         ssl_certfile=ssl_certfile, ssl_keyfile=ssl_keyfile
@@ -751,6 +786,20 @@ def _add_args_common(parser: argparse.ArgumentParser) -> None:
         "Flower will just create a state in memory.",
         default=DATABASE,
     )
+    parser.add_argument(
+        "--task-ttl",
+        type=float,
+        help="Time (in seconds) after which TaskIns and TaskRes expire. Expired "
+        "tasks are deleted, whether they were delivered or not.",
+        default=timedelta(hours=24).total_seconds(),
+    )
+    parser.add_argument(
+        "--task-sweep-interval",
+        type=float,
+        help="Time (in seconds) between two consecutive deletions of expired "
+        "TaskIns and TaskRes.",
+        default=60.0,
+    )
 
 
 def _add_args_driver_api(parser: argparse.ArgumentParser) -> None:
@@ -822,6 +871,13 @@ def _add_args_fleet_api(parser: argparse.ArgumentParser) -> None:
         type=int,
         default=1,
     )
+    rest_group.add_argument(
+        "--rest-fleet-api-state-workers",
+        help="Set the number of threads the Fleet API REST server uses to access "
+        "the state without blocking its event loop.",
+        type=int,
+        default=STATE_WORKERS_FLEET_API_REST,
+    )
 
     # Fleet API gRPC-bidi options
     grpc_bidi_group = parser.add_argument_group(
@@ -0,0 +1,354 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Flower server aggregating buffered updates asynchronously (FedBuff).
+
+Paper: arxiv.org/abs/2106.06639
+"""
+
+
+import concurrent.futures
+import timeit
+from logging import DEBUG, INFO
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from flwr.common import (
+    EvaluateIns,
+    FitRes,
+    NDArrays,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.common.logger import log
+from flwr.server.client_dispatcher import ClientDispatcher
+from flwr.server.client_manager import ClientManager
+from flwr.server.client_proxy import ClientProxy
+from flwr.server.history import History
+from flwr.server.strategy import Strategy
+
+from .server import Server, _handle_finished_future_after_fit, fit_client
+
+StalenessFn = Callable[[int], float]
+
+
+def polynomial_staleness(staleness: int, exponent: float = 0.5) -> float:
+    """Return the weight `(1 + staleness) ** -exponent` of a stale update."""
+    return float((1 + staleness) ** -exponent)
+
+
+# pylint: disable=too-many-instance-attributes
+class AsyncServer(Server):
+    """Flower server training without synchronous rounds.
+
+    Instead of waiting for all clients of a round, `AsyncServer` keeps
+    `concurrency` clients training at all times. As soon as `buffer_size` of
+    them finished (successfully or not), their results are aggregated with
+    `Strategy.aggregate_fit` and the global model is updated. Each finished
+    client is replaced right away by a client training on the latest global
+    model, so slow clients do not hold back the others. Every aggregation counts
+    as one round, i.e., it is followed by centralized and federated evaluation
+    and recorded in the `History` under its round number.
+
+    Clients are selected with `Strategy.configure_fit` and
+    `Strategy.configure_evaluate`, skipping clients which are still training.
+    Both training and evaluation requests are sent through the `dispatcher`.
+    The strategy should therefore sample more clients than `concurrency` (e.g.,
+    `fraction_fit=1.0`).
+
+    The staleness of a result is the number of times the global model was
+    updated since its client started training. The update of a stale client (its
+    parameters minus the parameters it trained on) is weighted with
+    `staleness_fn(staleness)` and added to the current global parameters before
+    it is aggregated. The staleness of each aggregated result is kept in
+    `staleness` and its mean and maximum per round are added to the distributed
+    fit metrics.
+
+    Parameters
+    ----------
+    client_manager : ClientManager
+        Manager of the available clients.
+    strategy : Optional[Strategy] (default: None)
+        Strategy aggregating the buffered results. Defaults to `FedAvg`.
+    dispatcher : Optional[ClientDispatcher] (default: None)
+        Long-lived thread pool sending instructions to the clients. Defaults to a
+        `ClientDispatcher` with `2 * concurrency` threads, such that federated
+        evaluation does not wait for clients which are training. With fewer than
+        `concurrency` threads, clients wait for a free thread before they start
+        training.
+    concurrency : int (default: 10)
+        Number of clients training at the same time.
+    buffer_size : int (default: 5)
+        Number of finished clients after which results are aggregated.
+    max_staleness : Optional[int] (default: None)
+        Results with a higher staleness are treated as failures. `None` accepts
+        all results.
+    staleness_fn : Optional[Callable[[int], float]] (default: polynomial_staleness)
+        Weight of an update given its staleness. `None` aggregates stale results
+        as they are, which is required if the parameters are not NumPy arrays.
+    background_evaluation : bool (default: False)
+        Whether to evaluate the global model with `Strategy.evaluate` in a
+        background thread while training continues (see `Server`).
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        *,
+        client_manager: ClientManager,
+        strategy: Optional[Strategy] = None,
+        dispatcher: Optional[ClientDispatcher] = None,
+        concurrency: int = 10,
+        buffer_size: int = 5,
+        max_staleness: Optional[int] = None,
+        staleness_fn: Optional[StalenessFn] = polynomial_staleness,
+        background_evaluation: bool = False,
+    ) -> None:
+        super().__init__(
+            client_manager=client_manager,
+            strategy=strategy,
+            dispatcher=(
+                dispatcher
+                if dispatcher is not None
+                else ClientDispatcher(max_workers=2 * concurrency)
+            ),
+            background_evaluation=background_evaluation,
+        )
+        if not 1 <= buffer_size <= concurrency:
+            raise ValueError(
+                "buffer_size must be at least 1 and at most concurrency, "
+                f"got {buffer_size} and {concurrency}."
+            )
+        self.concurrency = concurrency
+        self.buffer_size = buffer_size
+        self.max_staleness = max_staleness
+        self.staleness_fn = staleness_fn
+        # (server_round, cid, staleness) of each aggregated result
+        self.staleness: List[Tuple[int, str, int]] = []
+        # Number of global model updates, i.e., of completed rounds
+        self._version = 0
+        # Client ID and model version of each client which is training
+        self._in_flight: Dict[
+            "concurrent.futures.Future[Tuple[ClientProxy, FitRes]]", Tuple[str, int]
+        ] = {}
+        # Global parameters of the versions clients are training on
+        self._base_ndarrays: Dict[int, NDArrays] = {}
+        self._results: List[Tuple[ClientProxy, FitRes]] = []
+        self._failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
+        self._buffer_staleness: List[Tuple[str, int]] = []
+
+    def fit(self, num_rounds: int, timeout: Optional[float]) -> History:
+        """Run asynchronous federated learning for a number of rounds."""
+        history = History()
+
+        # Initialize and evaluate parameters
+        self._initialize(history, timeout)
+
+        # Run federated learning until num_rounds buffers were aggregated
+        log(INFO, "FL starting")
+        start_time = timeit.default_timer()
+        self._reset()
+        try:
+            while self._version < num_rounds:
+                # Stop early if the evaluation of a previous buffer failed
+                self._check_evaluation(history, start_time)
+                self._dispatch(timeout)
+                if not self._in_flight:
+                    log(
+                        INFO,
+                        "fit_round %s: no clients selected, cancel",
+                        self._version + 1,
+                    )
+                    break
+                finished_fs, _ = concurrent.futures.wait(
+                    fs=self._in_flight,
+                    timeout=None,  # Handled in the respective communication stack
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                for future in finished_fs:
+                    self._collect(future)
+                if len(self._results) + len(self._failures) >= self.buffer_size:
+                    self._aggregate(history, start_time, timeout)
+
+            # Wait for the evaluation of the last round
+            self._wait_for_evaluation(history, start_time)
+        finally:
+            # Results of clients which are still training are discarded
+            for future in self._in_flight:
+                future.cancel()
+            self._in_flight.clear()
+            self._shutdown_evaluation()
+            self.strategy.shutdown()
+
+        # Bookkeeping
+        end_time = timeit.default_timer()
+        elapsed = end_time - start_time
+        log(INFO, "FL finished in %s", elapsed)
+        return history
+
+    def _reset(self) -> None:
+        """Start from the current global parameters without pending results."""
+        self._version = 0
+        self._base_ndarrays.clear()
+        if self.staleness_fn is not None:
+            self._base_ndarrays[0] = parameters_to_ndarrays(self.parameters)
+        self._results, self._failures, self._buffer_staleness = [], [], []
+        self.staleness = []
+
+    def _dispatch(self, timeout: Optional[float]) -> None:
+        """Start training on idle clients until `concurrency` clients train."""
+        num_missing = self.concurrency - len(self._in_flight)
+        if num_missing <= 0:
+            return
+        client_instructions = self.strategy.configure_fit(
+            server_round=self._version + 1,
+            parameters=self.parameters,
+            client_manager=self._client_manager,
+        )
+        busy = {cid for cid, _ in self._in_flight.values()}
+        for client, ins in client_instructions:
+            if num_missing == 0:
+                break
+            if client.cid in busy:
+                continue
+            future = self.dispatcher.submit(fit_client, client, ins, timeout)
+            self._in_flight[future] = (client.cid, self._version)
+            busy.add(client.cid)
+            num_missing -= 1
+
+    def _collect(
+        self, future: "concurrent.futures.Future[Tuple[ClientProxy, FitRes]]"
+    ) -> None:
+        """Add the result of a finished client to the buffer."""
+        _, version = self._in_flight.pop(future)
+        num_results = len(self._results)
+        _handle_finished_future_after_fit(
+            future=future, results=self._results, failures=self._failures
+        )
+        if len(self._results) == num_results:
+            return
+
+        client, fit_res = self._results.pop()
+        staleness = self._version - version
+        if self.max_staleness is not None and staleness > self.max_staleness:
+            log(
+                DEBUG,
+                "fit_round %s: discarding result of client %s with staleness %s",
+                self._version + 1,
+                client.cid,
+                staleness,
+            )
+            self._failures.append((client, fit_res))
+            return
+        if staleness > 0 and self.staleness_fn is not None:
+            fit_res = _rebase_fit_res(
+                fit_res,
+                base=self._base_ndarrays[version],
+                current=self._base_ndarrays[self._version],
+                weight=self.staleness_fn(staleness),
+            )
+        result = (client, fit_res)
+        self._results.append(result)
+        self._buffer_staleness.append((client.cid, staleness))
+        self.strategy.accumulate_fit(self._version + 1, result)
+
+    def _aggregate(
+        self, history: History, start_time: float, timeout: Optional[float]
+    ) -> None:
+        """Aggregate the buffered results into a new global model and evaluate it."""
+        server_round = self._version + 1
+        log(
+            DEBUG,
+            "fit_round %s received %s results and %s failures",
+            server_round,
+            len(self._results),
+            len(self._failures),
+        )
+        parameters_aggregated, fit_metrics = self.strategy.aggregate_fit(
+            server_round, self._results, self._failures
+        )
+        if parameters_aggregated:
+            self.parameters = parameters_aggregated
+        if self._buffer_staleness:
+            staleness_values = [staleness for _, staleness in self._buffer_staleness]
+            fit_metrics = {
+                **fit_metrics,
+                "staleness_mean": float(np.mean(staleness_values)),
+                "staleness_max": max(staleness_values),
+            }
+        history.add_metrics_distributed_fit(
+            server_round=server_round, metrics=fit_metrics
+        )
+        self.staleness.extend(
+            (server_round, cid, staleness) for cid, staleness in self._buffer_staleness
+        )
+        self._results, self._failures, self._buffer_staleness = [], [], []
+
+        # Keep the parameters of the versions clients are still training on
+        self._version = server_round
+        if self.staleness_fn is not None:
+            versions = {version for _, version in self._in_flight.values()}
+            for version in list(self._base_ndarrays):
+                if version not in versions:
+                    del self._base_ndarrays[version]
+            self._base_ndarrays[server_round] = parameters_to_ndarrays(self.parameters)
+
+        # Evaluate model using strategy implementation
+        self._evaluate_centralized(server_round, history, start_time)
+
+        # Evaluate model on a sample of available clients
+        self._evaluate_federated(server_round, history, timeout)
+
+    def _configure_evaluate(
+        self, server_round: int
+    ) -> List[Tuple[ClientProxy, EvaluateIns]]:
+        """Get the clients evaluating this round, skipping clients which train."""
+        client_instructions = super()._configure_evaluate(server_round)
+        busy = {cid for cid, _ in self._in_flight.values()}
+        idle = [
+            (client, ins)
+            for client, ins in client_instructions
+            if client.cid not in busy
+        ]
+        if len(idle) < len(client_instructions):
+            log(
+                DEBUG,
+                "evaluate_round %s: skipping %s clients which are training",
+                server_round,
+                len(client_instructions) - len(idle),
+            )
+        return idle
+
+
+def _rebase_fit_res(
+    fit_res: FitRes, base: NDArrays, current: NDArrays, weight: float
+) -> FitRes:
+    """Apply the weighted update of a client to the current global parameters.
+
+    The update is the difference between the parameters in `fit_res` and the
+    parameters `base` the client trained on.
+    """
+    updated = [
+        (layer + weight * (new - old)).astype(layer.dtype, copy=False)
+        for layer, new, old in zip(
+            current, parameters_to_ndarrays(fit_res.parameters), base
+        )
+    ]
+    return FitRes(
+        status=fit_res.status,
+        parameters=ndarrays_to_parameters(updated),
+        num_examples=fit_res.num_examples,
+        metrics=fit_res.metrics,
+    )
@@ -0,0 +1,289 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""AsyncServer tests."""
+
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pytest
+
+from flwr.common import (
+    Code,
+    DisconnectRes,
+    EvaluateIns,
+    EvaluateRes,
+    FitIns,
+    FitRes,
+    GetParametersIns,
+    GetParametersRes,
+    GetPropertiesIns,
+    GetPropertiesRes,
+    NDArrays,
+    ReconnectIns,
+    Scalar,
+    Status,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.server.client_manager import SimpleClientManager
+from flwr.server.strategy import FedAvg
+
+from .async_server import AsyncServer, polynomial_staleness
+from .client_dispatcher import ClientDispatcher
+from .client_proxy import ClientProxy
+
+
+class IncrementClient(ClientProxy):
+    """Test class adding one to all parameters, once `release` is set."""
+
+    def __init__(self, cid: str, release: Optional[threading.Event] = None):
+        super().__init__(cid)
+        self.release = release
+        self.num_fit = 0
+        self.num_evaluate = 0
+        self.training = False
+        self.done = threading.Event()
+
+    def get_properties(
+        self, ins: GetPropertiesIns, timeout: Optional[float]
+    ) -> GetPropertiesRes:
+        """Raise an Exception because this method is not expected to be called."""
+        raise Exception()
+
+    def get_parameters(
+        self, ins: GetParametersIns, timeout: Optional[float]
+    ) -> GetParametersRes:
+        """Raise an Exception because this method is not expected to be called."""
+        raise Exception()
+
+    def fit(self, ins: FitIns, timeout: Optional[float]) -> FitRes:
+        """Return the received parameters plus one."""
+        self.training = True
+        if self.release is not None:
+            assert self.release.wait(timeout=10.0)
+        self.num_fit += 1
+        self.training = False
+        self.done.set()
+        ndarrays = parameters_to_ndarrays(ins.parameters)
+        return FitRes(
+            status=Status(code=Code.OK, message="Success"),
+            parameters=ndarrays_to_parameters([layer + 1 for layer in ndarrays]),
+            num_examples=1,
+            metrics={},
+        )
+
+    def evaluate(self, ins: EvaluateIns, timeout: Optional[float]) -> EvaluateRes:
+        """Return the first received parameter as loss, unless still training."""
+        if self.training:
+            # Like `GrpcBridge`, a client cannot evaluate while it trains
+            raise Exception("This should not happen")
+        self.num_evaluate += 1
+        return EvaluateRes(
+            status=Status(code=Code.OK, message="Success"),
+            loss=float(parameters_to_ndarrays(ins.parameters)[0][0]),
+            num_examples=1,
+            metrics={},
+        )
+
+    def reconnect(self, ins: ReconnectIns, timeout: Optional[float]) -> DisconnectRes:
+        """Raise an Exception because this method is not expected to be called."""
+        raise Exception()
+
+
+def _create_server(
+    clients: List[ClientProxy],
+    on_round: Optional[Dict[int, Callable[[], object]]] = None,
+    fraction_evaluate: float = 0.0,
+    **kwargs: Any,
+) -> Tuple[AsyncServer, List[float]]:
+    """Create an AsyncServer whose centralized evaluation records the model."""
+    evaluated: List[float] = []
+
+    def evaluate(
+        server_round: int, ndarrays: NDArrays, config: Dict[str, Scalar]
+    ) -> Optional[Tuple[float, Dict[str, Scalar]]]:
+        # pylint: disable=unused-argument
+        evaluated.append(float(ndarrays[0][0]))
+        if on_round is not None and server_round in on_round:
+            on_round[server_round]()
+        return 0.0, {}
+
+    client_manager = SimpleClientManager()
+    for client in clients:
+        client_manager.register(client)
+    strategy = FedAvg(
+        min_available_clients=len(clients),
+        fraction_evaluate=fraction_evaluate,
+        accept_failures=False,
+        evaluate_fn=evaluate,
+        initial_parameters=ndarrays_to_parameters([np.zeros(4)]),
+    )
+    server = AsyncServer(client_manager=client_manager, strategy=strategy, **kwargs)
+    return server, evaluated
+
+
+def test_stragglers_do_not_block_rounds() -> None:
+    """Test that rounds complete while a client is still training."""
+    # Prepare
+    release = threading.Event()
+    fast = [IncrementClient(str(i)) for i in range(3)]
+    slow = IncrementClient("slow", release)
+    server, evaluated = _create_server(
+        [*fast, slow], concurrency=4, buffer_size=2, staleness_fn=None
+    )
+
+    # Execute
+    history = server.fit(num_rounds=5, timeout=None)
+    release.set()
+
+    # Assert
+    assert slow.num_fit == 0
+    assert sum(client.num_fit for client in fast) >= 10
+    assert [server_round for server_round, _ in history.losses_centralized] == list(
+        range(6)
+    )
+    assert all(cid != "slow" for _, cid, _ in server.staleness)
+    assert evaluated[0] == 0.0 and evaluated[-1] > 0.0
+
+
+def test_federated_evaluation_skips_training_clients() -> None:
+    """Test that clients which are still training are not asked to evaluate."""
+    # Prepare
+    release = threading.Event()
+    fast = [IncrementClient(str(i)) for i in range(3)]
+    slow = IncrementClient("slow", release)
+    server, _ = _create_server(
+        [*fast, slow],
+        fraction_evaluate=1.0,
+        concurrency=4,
+        buffer_size=2,
+        staleness_fn=None,
+    )
+
+    # Execute
+    history = server.fit(num_rounds=3, timeout=None)
+    release.set()
+
+    # Assert
+    assert slow.num_evaluate == 0
+    assert sum(client.num_evaluate for client in fast) >= 3
+    assert [server_round for server_round, _ in history.losses_distributed] == [
+        1,
+        2,
+        3,
+    ]
+
+
+def test_stale_updates_are_weighted() -> None:
+    """Test that stale updates are rebased onto the current global model."""
+    # Prepare
+    release = threading.Event()
+    clients = [IncrementClient("0"), IncrementClient("1")]
+    slow = IncrementClient("slow", release)
+    server, evaluated = _create_server(
+        [*clients, slow],
+        on_round={2: release.set},
+        concurrency=3,
+        buffer_size=2,
+    )
+
+    # Execute
+    history = server.fit(num_rounds=6, timeout=None)
+
+    # Assert
+    slow_staleness = [s for _, cid, s in server.staleness if cid == "slow"]
+    assert slow_staleness and slow_staleness[0] >= 2
+    # Each round adds the mean weight of its updates to the global model
+    expected = 0.0
+    for server_round in range(1, 7):
+        weights = [
+            polynomial_staleness(staleness)
+            for round_, _, staleness in server.staleness
+            if round_ == server_round
+        ]
+        expected += float(np.mean(weights))
+        assert evaluated[server_round] == pytest.approx(expected)
+    staleness_max = dict(history.metrics_distributed_fit["staleness_max"])
+    assert max(staleness_max.values()) == max(slow_staleness)
+
+
+def test_max_staleness_discards_stale_updates() -> None:
+    """Test that results above max_staleness are not aggregated."""
+    # Prepare
+    release = threading.Event()
+    clients = [IncrementClient("0"), IncrementClient("1")]
+    slow = IncrementClient("slow", release)
+    server, _ = _create_server(
+        [*clients, slow],
+        on_round={2: release.set, 4: lambda: slow.done.wait(timeout=10.0)},
+        concurrency=3,
+        buffer_size=2,
+        max_staleness=1,
+    )
+
+    # Execute
+    server.fit(num_rounds=6, timeout=None)
+
+    # Assert
+    assert slow.num_fit >= 1
+    assert all(staleness <= 1 for _, _, staleness in server.staleness)
+
+
+def test_buffer_size_larger_than_concurrency() -> None:
+    """Test that the buffer cannot be larger than the number of clients training."""
+    with pytest.raises(ValueError):
+        AsyncServer(client_manager=SimpleClientManager(), concurrency=2, buffer_size=3)
+
+
+class CountingDispatcher(ClientDispatcher):
+    """Test class counting the requests submitted one by one."""
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        super().__init__(max_workers=max_workers)
+        self.num_submitted = 0
+
+    def submit(self, *args: Any, **kwargs: Any) -> Any:
+        """Count the request and submit it."""
+        self.num_submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def test_requests_are_sent_through_dispatcher() -> None:
+    """Test that training and evaluation requests use the given dispatcher."""
+    # Prepare
+    clients: List[ClientProxy] = [IncrementClient(str(i)) for i in range(3)]
+    dispatcher = CountingDispatcher(max_workers=6)
+    server, _ = _create_server(
+        clients,
+        fraction_evaluate=1.0,
+        dispatcher=dispatcher,
+        concurrency=2,
+        buffer_size=2,
+    )
+
+    # Execute
+    server.fit(num_rounds=2, timeout=None)
+
+    # Assert
+    assert server.dispatcher is dispatcher
+    # At least the results of both buffers were requested through the dispatcher
+    assert dispatcher.num_submitted >= 4
+    assert [server_round for server_round, name, _ in server.dispatch_metrics] == [
+        1,
+        2,
+    ]
+    assert all(name == "evaluate" for _, name, _ in server.dispatch_metrics)
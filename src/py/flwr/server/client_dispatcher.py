@@ -0,0 +1,209 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Long-lived thread pool sending instructions to clients."""
+
+
+import concurrent.futures
+import os
+import queue
+import threading
+import timeit
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+from flwr.server.client_proxy import ClientProxy
+
+InsT = TypeVar("InsT")
+ResT = TypeVar("ResT")
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class DispatchMetrics:
+    """Timings of sending instructions to the clients of one round.
+
+    Queue times are measured from submitting a request until a worker starts it,
+    latencies from the start of a request until the client responded. All times are in
+    seconds.
+    """
+
+    num_requests: int
+    num_failures: int
+    max_in_flight: int
+    duration: float
+    queue_time_mean: float
+    latency_mean: float
+    latency_p95: float
+    latency_max: float
+
+
+class ClientDispatcher:
+    """Send instructions to clients on a long-lived, bounded thread pool.
+
+    The thread pool is created on first use and reused for all rounds. At most
+    `max_in_flight` requests are submitted at once, further requests are only
+    submitted when earlier ones finished, so a round with thousands of clients
+    does not queue all of them on the pool at once.
+
+    Parameters
+    ----------
+    max_workers : Optional[int] (default: None)
+        Number of threads. `None` uses the `ThreadPoolExecutor` default,
+        `min(32, os.cpu_count() + 4)`.
+    max_in_flight : Optional[int] (default: None)
+        Maximum number of submitted, unfinished requests. `None` uses twice the
+        number of threads, which keeps all threads busy.
+    """
+
+    def __init__(
+        self, max_workers: Optional[int] = None, max_in_flight: Optional[int] = None
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight
+        # Metrics of the last call to `dispatch`
+        self.last_metrics: Optional[DispatchMetrics] = None
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def set_max_workers(self, max_workers: Optional[int]) -> None:
+        """Change the number of threads, replacing the thread pool if needed."""
+        if max_workers != self.max_workers:
+            self.shutdown()
+        self.max_workers = max_workers
+
+    def dispatch(
+        self,
+        func: Callable[[ClientProxy, InsT, Optional[float]], ResT],
+        client_instructions: Sequence[Tuple[ClientProxy, InsT]],
+        timeout: Optional[float],
+    ) -> Iterator["concurrent.futures.Future[ResT]"]:
+        """Call `func(client, ins, timeout)` for all instructions on the pool.
+
+        Yields the futures of the calls in the order they finish. The metrics are
+        available in `last_metrics` once the iterator is exhausted.
+        """
+        executor = self._get_executor()
+        max_in_flight = self.max_in_flight or 2 * _num_workers(self.max_workers)
+        timings: List[Tuple[float, float]] = []
+        remaining = iter(client_instructions)
+        # Finished futures in the order they finish, timeouts are handled in the
+        # respective communication stack
+        finished: "queue.SimpleQueue[concurrent.futures.Future[ResT]]" = (
+            queue.SimpleQueue()
+        )
+        num_in_flight, peak, num_failures = 0, 0, 0
+        start_time = timeit.default_timer()
+        while True:
+            # Only submit as many requests as finished before (back-pressure)
+            for instruction in islice(remaining, max_in_flight - num_in_flight):
+                executor.submit(
+                    _timed_call,
+                    func,
+                    instruction,
+                    timeout,
+                    timeit.default_timer(),
+                    timings,
+                ).add_done_callback(finished.put_nowait)
+                num_in_flight += 1
+            if num_in_flight == 0:
+                break
+            peak = max(peak, num_in_flight)
+            future = finished.get()
+            num_in_flight -= 1
+            if future.exception() is not None:
+                num_failures += 1
+            yield future
+
+        self.last_metrics = _summarize(
+            timings, num_failures, peak, timeit.default_timer() - start_time
+        )
+
+    def submit(
+        self,
+        func: Callable[[ClientProxy, InsT, Optional[float]], ResT],
+        client: ClientProxy,
+        ins: InsT,
+        timeout: Optional[float],
+    ) -> "concurrent.futures.Future[ResT]":
+        """Call `func(client, ins, timeout)` on the pool, without waiting for it.
+
+        Unlike `dispatch`, the number of requests in flight is not bounded and no
+        metrics are recorded, both are left to the caller.
+        """
+        return self._get_executor().submit(func, client, ins, timeout)
+
+    def shutdown(self) -> None:
+        """Stop the threads once they finished their requests."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=_num_workers(self.max_workers),
+                    thread_name_prefix="flwr-dispatch",
+                )
+            return self._executor
+
+
+def _num_workers(max_workers: Optional[int]) -> int:
+    """Return the number of threads `ThreadPoolExecutor` uses for `max_workers`."""
+    if max_workers is not None:
+        return max_workers
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def _timed_call(
+    func: Callable[[ClientProxy, InsT, Optional[float]], ResT],
+    instruction: Tuple[ClientProxy, InsT],
+    timeout: Optional[float],
+    submitted: float,
+    timings: List[Tuple[float, float]],
+) -> ResT:
+    """Call `func` and append its queue time and latency to `timings`."""
+    start = timeit.default_timer()
+    try:
+        return func(*instruction, timeout)
+    finally:
+        # list.append is atomic, the timings are read after all calls finished
+        timings.append((start - submitted, timeit.default_timer() - start))
+
+
+def _summarize(
+    timings: List[Tuple[float, float]],
+    num_failures: int,
+    max_in_flight: int,
+    duration: float,
+) -> DispatchMetrics:
+    """Aggregate the timings of the requests of one round."""
+    if not timings:
+        return DispatchMetrics(0, 0, 0, duration, 0.0, 0.0, 0.0, 0.0)
+    queue_times, latencies = np.array(timings).T
+    return DispatchMetrics(
+        num_requests=len(timings),
+        num_failures=num_failures,
+        max_in_flight=max_in_flight,
+        duration=duration,
+        queue_time_mean=float(queue_times.mean()),
+        latency_mean=float(latencies.mean()),
+        latency_p95=float(np.percentile(latencies, 95)),
+        latency_max=float(latencies.max()),
+    )
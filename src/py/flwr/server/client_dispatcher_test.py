@@ -0,0 +1,133 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""ClientDispatcher tests."""
+
+
+import threading
+import time
+from typing import List, Optional, Set, Tuple
+from unittest.mock import MagicMock
+
+from flwr.server.client_proxy import ClientProxy
+
+from .client_dispatcher import ClientDispatcher
+
+
+class _Recorder:
+    """Call target recording concurrency and the threads it runs on."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.threads: Set[threading.Thread] = set()
+
+    def __call__(
+        self, client: ClientProxy, ins: int, timeout: Optional[float]
+    ) -> Tuple[ClientProxy, int]:
+        """Return `ins` squared after a short delay, raise for negative `ins`."""
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            self.threads.add(threading.current_thread())
+        time.sleep(0.001)
+        with self.lock:
+            self.running -= 1
+        if ins < 0:
+            raise ValueError()
+        return client, ins * ins
+
+
+def _instructions(values: List[int]) -> List[Tuple[ClientProxy, int]]:
+    return [(MagicMock(), value) for value in values]
+
+
+def test_dispatch_bounds_requests_in_flight() -> None:
+    """Test that at most max_in_flight requests are submitted at once."""
+    # Prepare
+    recorder = _Recorder()
+    dispatcher = ClientDispatcher(max_workers=2, max_in_flight=3)
+
+    # Execute
+    squares = sorted(
+        future.result()[1]
+        for future in dispatcher.dispatch(recorder, _instructions(list(range(20))), 1.0)
+    )
+
+    # Assert
+    assert squares == [i * i for i in range(20)]
+    assert recorder.max_running <= 2
+    metrics = dispatcher.last_metrics
+    assert metrics is not None
+    assert metrics.num_requests == 20
+    assert metrics.num_failures == 0
+    assert metrics.max_in_flight == 3
+    assert 0.0 < metrics.latency_mean <= metrics.latency_p95 <= metrics.latency_max
+    dispatcher.shutdown()
+
+
+def test_dispatch_counts_failures() -> None:
+    """Test that calls raising an exception are yielded and counted."""
+    # Prepare
+    dispatcher = ClientDispatcher(max_workers=4)
+
+    # Execute
+    futures = list(dispatcher.dispatch(_Recorder(), _instructions([1, -1, 2, -2]), 1.0))
+
+    # Assert
+    assert sum(future.exception() is not None for future in futures) == 2
+    assert dispatcher.last_metrics is not None
+    assert dispatcher.last_metrics.num_requests == 4
+    assert dispatcher.last_metrics.num_failures == 2
+    dispatcher.shutdown()
+
+
+def test_dispatch_reuses_threads_across_rounds() -> None:
+    """Test that all rounds run on the same threads until shutdown."""
+    # Prepare
+    recorder = _Recorder()
+    dispatcher = ClientDispatcher(max_workers=3)
+
+    # Execute
+    for _ in range(5):
+        for future in dispatcher.dispatch(recorder, _instructions([1] * 10), 1.0):
+            future.result()
+    threads_before_shutdown = set(recorder.threads)
+    dispatcher.shutdown()
+    list(dispatcher.dispatch(recorder, _instructions([1] * 10), 1.0))
+
+    # Assert
+    assert len(threads_before_shutdown) <= 3
+    assert len(recorder.threads) > len(threads_before_shutdown)
+    dispatcher.shutdown()
+
+
+def test_submit_runs_on_the_pool() -> None:
+    """Test that single requests run on the threads of the dispatcher."""
+    # Prepare
+    recorder = _Recorder()
+    dispatcher = ClientDispatcher(max_workers=2)
+    client = MagicMock()
+
+    # Execute
+    futures = [dispatcher.submit(recorder, client, value, 1.0) for value in range(6)]
+
+    # Assert
+    assert [future.result() for future in futures] == [
+        (client, value * value) for value in range(6)
+    ]
+    assert recorder.max_running <= 2
+    assert all(thread.name.startswith("flwr-dispatch") for thread in recorder.threads)
+    dispatcher.shutdown()
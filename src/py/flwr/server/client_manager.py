@@ -15,16 +15,20 @@
 """Flower ClientManager."""
 
 
+import heapq
 import random
 import threading
 from abc import ABC, abstractmethod
+from bisect import bisect_right
+from itertools import accumulate
 from logging import INFO
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Union, cast, overload
 
+from flwr.common import Properties, Scalar
 from flwr.common.logger import log
 
 from .client_proxy import ClientProxy
-from .criterion import Criterion
+from .criterion import Criterion, PropertyCriterion
 
 
 class ClientManager(ABC):
@@ -85,11 +89,40 @@ class ClientManager(ABC):
 
 
 class SimpleClientManager(ClientManager):
-    """Provides a pool of available clients."""
-
-    def __init__(self) -> None:
+    """Provides a pool of available clients.
+
+    Clients are kept in an array, so that sampling `k` clients takes O(k) time
+    instead of O(number of clients).
+
+    Parameters
+    ----------
+    index_properties : Optional[List[str]] (default: None)
+        Client properties to maintain indexes on. `sample` evaluates a
+        `PropertyCriterion` on these properties with the indexes, and
+        `sample_stratified` requires its property to be indexed. Properties are
+        read from `ClientProxy.properties` on registration or passed to
+        `update_properties`.
+    weight_property : Optional[str] (default: None)
+        Numeric client property used as the sampling weight by
+        `sample_weighted`. Clients without it have a weight of 0.
+    """
+
+    def __init__(
+        self,
+        index_properties: Optional[List[str]] = None,
+        weight_property: Optional[str] = None,
+    ) -> None:
         self.clients: Dict[str, ClientProxy] = {}
         self._cv = threading.Condition()
+        self._all = _IndexedCids()
+        # Property key -> property value -> clients with that value
+        self._indexes: Dict[str, Dict[Scalar, _IndexedCids]] = {
+            key: {} for key in index_properties or []
+        }
+        # The indexed property values of each client when it was indexed
+        self._indexed_values: Dict[str, Dict[str, Scalar]] = {}
+        self.weight_property = weight_property
+        self._weights = _FenwickTree()
 
     def __len__(self) -> int:
         """Return the number of available clients.
@@ -146,11 +179,14 @@ class SimpleClientManager(ClientManager):
             Indicating if registration was successful. False if ClientProxy is
             already registered or can not be registered for any reason.
         """
-        if client.cid in self.clients:
-            return False
-
-        self.clients[client.cid] = client
         with self._cv:
+            if client.cid in self.clients:
+                return False
+
+            self.clients[client.cid] = client
+            self._all.add(client.cid)
+            self._weights.append(self._weight(client))
+            self._index(client)
             self._cv.notify_all()
 
         return True
@@ -164,12 +200,31 @@ class SimpleClientManager(ClientManager):
         ----------
         client : flwr.server.client_proxy.ClientProxy
         """
-        if client.cid in self.clients:
-            del self.clients[client.cid]
+        with self._cv:
+            if client.cid in self.clients:
+                del self.clients[client.cid]
+                self._unindex(client.cid)
+                self._weights.swap_remove(self._all.remove(client.cid))
 
-            with self._cv:
                 self._cv.notify_all()
 
+    def update_properties(self, cid: str, properties: Properties) -> None:
+        """Update the properties of a registered client and its index entries.
+
+        Parameters
+        ----------
+        cid : str
+            The ID of the client.
+        properties : Properties
+            The properties to add to or overwrite in `ClientProxy.properties`.
+        """
+        with self._cv:
+            client = self.clients[cid]
+            client.properties.update(properties)
+            self._unindex(cid)
+            self._index(client)
+            self._weights.set(self._all.positions[cid], self._weight(client))
+
     def all(self) -> Dict[str, ClientProxy]:
         """Return all available clients."""
         return self.clients
@@ -185,22 +240,287 @@ class SimpleClientManager(ClientManager):
         if min_num_clients is None:
             min_num_clients = num_clients
         self.wait_for(min_num_clients)
-        # Sample clients which meet the criterion
-        available_cids = list(self.clients)
-        if criterion is not None:
-            available_cids = [
-                cid for cid in available_cids if criterion.select(self.clients[cid])
+        with self._cv:
+            # Sample clients which meet the criterion
+            available_cids = self._candidates(criterion)
+            if not _check_available(num_clients, len(available_cids)):
+                return []
+            sampled_cids = random.sample(available_cids, num_clients)
+            return [self.clients[cid] for cid in sampled_cids]
+
+    def sample_weighted(
+        self,
+        num_clients: int,
+        min_num_clients: Optional[int] = None,
+        criterion: Optional[Criterion] = None,
+    ) -> List[ClientProxy]:
+        """Sample clients with probabilities proportional to their weights.
+
+        Clients are drawn one after the other without replacement, each with a
+        probability proportional to its `weight_property`. Without a criterion,
+        this takes O(k log n) time for `k` of `n` clients.
+        """
+        if self.weight_property is None:
+            raise ValueError("Weighted sampling requires a `weight_property`.")
+        if min_num_clients is None:
+            min_num_clients = num_clients
+        self.wait_for(min_num_clients)
+        with self._cv:
+            if criterion is None:
+                num_weighted = self._weights.num_positive
+                if not _check_available(num_clients, num_weighted):
+                    return []
+                positions = self._weights.sample(num_clients)
+                return [self.clients[self._all.cids[pos]] for pos in positions]
+
+            # Random keys (Efraimidis and Spirakis), the largest keys are sampled
+            keys = []
+            for cid in self._candidates(criterion):
+                weight = self._weights.weights[self._all.positions[cid]]
+                if weight > 0:
+                    keys.append((random.random() ** (1.0 / weight), cid))
+            if not _check_available(num_clients, len(keys)):
+                return []
+            return [self.clients[cid] for _, cid in heapq.nlargest(num_clients, keys)]
+
+    def sample_stratified(
+        self,
+        num_clients: int,
+        key: str,
+        min_num_clients: Optional[int] = None,
+        criterion: Optional[Criterion] = None,
+    ) -> List[ClientProxy]:
+        """Sample clients proportionally from each value of an indexed property.
+
+        Each stratum (the clients with the same value of property `key`) gets a
+        share of `num_clients` proportional to its size, rounded with the
+        largest remainder method. Clients without the property are not sampled.
+        Without a criterion, this takes O(k) time for `k` sampled clients.
+        """
+        if key not in self._indexes:
+            raise ValueError(f"Stratified sampling requires an index on '{key}'.")
+        if min_num_clients is None:
+            min_num_clients = num_clients
+        self.wait_for(min_num_clients)
+        with self._cv:
+            strata: List[Sequence[str]] = [
+                stratum.cids for stratum in self._indexes[key].values()
             ]
+            if criterion is not None:
+                strata = [
+                    [cid for cid in stratum if criterion.select(self.clients[cid])]
+                    for stratum in strata
+                ]
+            sizes = [len(stratum) for stratum in strata]
+            if not _check_available(num_clients, sum(sizes)):
+                return []
+
+            sampled_cids: List[str] = []
+            for stratum, num in zip(strata, _allocate(num_clients, sizes)):
+                sampled_cids += random.sample(stratum, num)
+            return [self.clients[cid] for cid in sampled_cids]
+
+    def _candidates(self, criterion: Optional[Criterion]) -> Sequence[str]:
+        """Return the IDs of the clients which meet the criterion."""
+        if criterion is None:
+            return self._all.cids
+        if isinstance(criterion, PropertyCriterion):
+            indexed_keys = [key for key in criterion.conditions if key in self._indexes]
+            if indexed_keys:
+                # Start from the smallest set of clients found in an index
+                buckets_per_key = {
+                    key: [
+                        self._indexes[key][value]
+                        for value in criterion.conditions[key]
+                        if value in self._indexes[key]
+                    ]
+                    for key in indexed_keys
+                }
+                key = min(
+                    indexed_keys,
+                    key=lambda k: sum(len(bucket) for bucket in buckets_per_key[k]),
+                )
+                candidates = _ConcatenatedCids(buckets_per_key[key])
+                if len(criterion.conditions) == 1:
+                    return candidates
+                return [
+                    cid for cid in candidates if criterion.select(self.clients[cid])
+                ]
+        return [cid for cid in self._all.cids if criterion.select(self.clients[cid])]
+
+    def _weight(self, client: ClientProxy) -> float:
+        if self.weight_property is None:
+            return 0.0
+        return float(cast(float, client.properties.get(self.weight_property, 0.0)))
+
+    def _index(self, client: ClientProxy) -> None:
+        values: Dict[str, Scalar] = {}
+        for key, index in self._indexes.items():
+            if key in client.properties:
+                value = client.properties[key]
+                index.setdefault(value, _IndexedCids()).add(client.cid)
+                values[key] = value
+        self._indexed_values[client.cid] = values
+
+    def _unindex(self, cid: str) -> None:
+        for key, value in self._indexed_values.pop(cid, {}).items():
+            bucket = self._indexes[key][value]
+            bucket.remove(cid)
+            if not bucket:
+                del self._indexes[key][value]
+
+
+class _IndexedCids:
+    """Client IDs in an array, with O(1) insertion and removal by ID."""
 
-        if num_clients > len(available_cids):
-            log(
-                INFO,
-                "Sampling failed: number of available clients"
-                " (%s) is less than number of requested clients (%s).",
-                len(available_cids),
-                num_clients,
-            )
-            return []
+    def __init__(self) -> None:
+        self.cids: List[str] = []
+        self.positions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.cids)
 
-        sampled_cids = random.sample(available_cids, num_clients)
-        return [self.clients[cid] for cid in sampled_cids]
+    def add(self, cid: str) -> None:
+        """Append `cid`."""
+        self.positions[cid] = len(self.cids)
+        self.cids.append(cid)
+
+    def remove(self, cid: str) -> int:
+        """Remove `cid` by moving the last ID into its position, return it."""
+        position = self.positions.pop(cid)
+        last = self.cids.pop()
+        if last != cid:
+            self.cids[position] = last
+            self.positions[last] = position
+        return position
+
+
+class _ConcatenatedCids(Sequence[str]):
+    """Read-only concatenation of several `_IndexedCids`."""
+
+    def __init__(self, parts: List[_IndexedCids]) -> None:
+        self.parts = parts
+        self.ends = list(accumulate(len(part) for part in parts))
+
+    def __len__(self) -> int:
+        return self.ends[-1] if self.ends else 0
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[str]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, Sequence[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        part = bisect_right(self.ends, index)
+        start = self.ends[part - 1] if part else 0
+        return self.parts[part].cids[index - start]
+
+
+class _FenwickTree:
+    """Weights in a Fenwick tree for O(log n) updates and weighted sampling."""
+
+    def __init__(self) -> None:
+        self.weights: List[float] = []
+        # 1-based partial sums, `tree[i]` is the sum of (i - lowbit(i), i]
+        self.tree: List[float] = [0.0]
+        self.num_positive = 0
+
+    def append(self, weight: float) -> None:
+        """Append a weight."""
+        i = len(self.tree)
+        self.tree.append(self._prefix_sum(i - 1) - self._prefix_sum(i - (i & -i)))
+        self.weights.append(0.0)
+        self.set(i - 1, weight)
+
+    def set(self, position: int, weight: float) -> None:
+        """Set the weight at `position`, negative weights are set to 0."""
+        weight = max(weight, 0.0)
+        self.num_positive += (weight > 0) - (self.weights[position] > 0)
+        self._add(position, weight - self.weights[position])
+        self.weights[position] = weight
+
+    def swap_remove(self, position: int) -> None:
+        """Move the last weight to `position` and remove the last one."""
+        last = len(self.weights) - 1
+        last_weight = self.weights[last]
+        self.set(last, 0.0)
+        if position != last:
+            self.set(position, last_weight)
+        self.weights.pop()
+        self.tree.pop()
+
+    def sample(self, num: int) -> List[int]:
+        """Draw `num` positions without replacement, proportional to weight."""
+        sampled: List[int] = []
+        removed: List[float] = []
+        while len(sampled) < num and self.num_positive > 0:
+            position = self._find(random.random() * self._prefix_sum(len(self.weights)))
+            # Rounding errors can lead to a position without weight
+            if self.weights[position] <= 0:
+                continue
+            sampled.append(position)
+            removed.append(self.weights[position])
+            self.set(position, 0.0)
+        for position, weight in zip(sampled, removed):
+            self.set(position, weight)
+        return sampled
+
+    def _add(self, position: int, delta: float) -> None:
+        i = position + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def _prefix_sum(self, i: int) -> float:
+        """Return the sum of the first `i` weights."""
+        total = 0.0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def _find(self, value: float) -> int:
+        """Return the first position whose cumulative weight exceeds `value`."""
+        position, step = 0, 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            nxt = position + step
+            if nxt < len(self.tree) and self.tree[nxt] <= value:
+                position = nxt
+                value -= self.tree[nxt]
+            step >>= 1
+        return min(position, len(self.weights) - 1)
+
+
+def _check_available(num_clients: int, num_available: int) -> bool:
+    if num_clients > num_available:
+        log(
+            INFO,
+            "Sampling failed: number of available clients"
+            " (%s) is less than number of requested clients (%s).",
+            num_available,
+            num_clients,
+        )
+        return False
+    return True
+
+
+def _allocate(num: int, sizes: List[int]) -> List[int]:
+    """Split `num` proportionally to `sizes` with the largest remainder method."""
+    total = sum(sizes)
+    quotas = [num * size / total for size in sizes]
+    allocation = [int(quota) for quota in quotas]
+    by_remainder = sorted(
+        range(len(sizes)), key=lambda i: quotas[i] - allocation[i], reverse=True
+    )
+    for i in by_remainder[: num - sum(allocation)]:
+        allocation[i] += 1
+    return allocation
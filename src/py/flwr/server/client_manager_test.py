@@ -15,9 +15,13 @@
 """Tests for ClientManager."""
 
 
+from collections import Counter
+from typing import List, cast
 from unittest.mock import MagicMock
 
+from flwr.common import Scalar
 from flwr.server.client_manager import SimpleClientManager
+from flwr.server.criterion import PropertyCriterion
 from flwr.server.fleet.grpc_bidi.grpc_client_proxy import GrpcClientProxy
 
 
@@ -53,3 +57,92 @@ def test_simple_client_manager_unregister() -> None:
 
     # Assert
     assert len(client_manager) == 0
+
+
+def _register_clients(
+    client_manager: SimpleClientManager, num_clients: int
+) -> List[GrpcClientProxy]:
+    """Register clients in three regions with weights 0, 1, 2, and 3."""
+    clients = []
+    for i in range(num_clients):
+        client = GrpcClientProxy(cid=str(i), bridge=MagicMock())
+        client.properties = {"region": ["eu", "us", "asia"][i % 3], "weight": i % 4}
+        client_manager.register(client)
+        clients.append(client)
+    return clients
+
+
+def test_simple_client_manager_indexes_after_unregister() -> None:
+    """Test that indexes and weights stay consistent when clients leave."""
+    # Prepare
+    client_manager = SimpleClientManager(
+        index_properties=["region"], weight_property="weight"
+    )
+    clients = _register_clients(client_manager, 60)
+
+    # Execute
+    for client in clients[::4]:
+        client_manager.unregister(client)
+    client_manager.update_properties("1", {"region": "mars", "weight": 5})
+    sampled = client_manager.sample(
+        16, criterion=PropertyCriterion({"region": ["eu", "mars"]})
+    )
+    all_weights = [
+        client.properties["weight"] for client in client_manager.sample_weighted(45)
+    ]
+
+    # Assert
+    assert len(client_manager) == 45
+    assert len(sampled) == 16
+    assert {client.properties["region"] for client in sampled} == {"eu", "mars"}
+    assert all(client.cid in client_manager.all() for client in sampled)
+    # Clients with weight 0 were unregistered, so all remaining ones are sampled
+    assert sorted(all_weights) == sorted(
+        client.properties["weight"] for client in client_manager.all().values()
+    )
+
+
+def test_simple_client_manager_sample_weighted() -> None:
+    """Test that clients are sampled proportionally to their weights."""
+    # Prepare
+    client_manager = SimpleClientManager(
+        index_properties=["region"], weight_property="weight"
+    )
+    _register_clients(client_manager, 120)
+    counts: Counter[Scalar] = Counter()
+
+    # Execute
+    for _ in range(500):
+        sampled = client_manager.sample_weighted(3)
+        counts.update(client.properties["weight"] for client in sampled)
+        assert len({client.cid for client in sampled}) == 3
+    eu_sampled = client_manager.sample_weighted(
+        20, criterion=PropertyCriterion({"region": ["eu"]})
+    )
+
+    # Assert
+    assert counts[0] == 0
+    assert counts[1] < counts[2] < counts[3]
+    assert {client.properties["region"] for client in eu_sampled} == {"eu"}
+    assert all(cast(int, client.properties["weight"]) > 0 for client in eu_sampled)
+    assert not client_manager.sample_weighted(100, min_num_clients=1)
+
+
+def test_simple_client_manager_sample_stratified() -> None:
+    """Test that strata are sampled proportionally to their sizes."""
+    # Prepare
+    client_manager = SimpleClientManager(index_properties=["region"])
+    clients = _register_clients(client_manager, 60)
+    for client in clients[:10]:
+        client_manager.update_properties(client.cid, {"region": "eu"})
+
+    # Execute
+    sampled = client_manager.sample_stratified(10, "region")
+
+    # Assert
+    # 26 clients in "eu" and 17 in "us" and "asia" each
+    assert Counter(client.properties["region"] for client in sampled) == {
+        "eu": 4,
+        "us": 3,
+        "asia": 3,
+    }
@@ -16,6 +16,9 @@
 
 
 from abc import ABC, abstractmethod
+from typing import Dict, List
+
+from flwr.common import Scalar
 
 from .client_proxy import ClientProxy
 
@@ -26,3 +29,28 @@ class Criterion(ABC):
     @abstractmethod
     def select(self, client: ClientProxy) -> bool:
         """Decide whether a client should be eligible for sampling or not."""
+
+
+class PropertyCriterion(Criterion):
+    """Select clients by the values of their properties.
+
+    A client is eligible if, for every key in `conditions`, its property of that
+    key is one of the given values. `SimpleClientManager` evaluates the criterion
+    with its property indexes instead of calling `select` for every client.
+
+    Parameters
+    ----------
+    conditions : Dict[str, List[Scalar]]
+        The accepted values of each property, e.g.,
+        `{"device_class": ["phone"], "region": ["eu", "us"]}`.
+    """
+
+    def __init__(self, conditions: Dict[str, List[Scalar]]) -> None:
+        self.conditions = {key: set(values) for key, values in conditions.items()}
+
+    def select(self, client: ClientProxy) -> bool:
+        """Decide whether a client should be eligible for sampling or not."""
+        return all(
+            key in client.properties and client.properties[key] in values
+            for key, values in self.conditions.items()
+        )
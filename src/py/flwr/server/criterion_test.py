@@ -15,11 +15,12 @@
 """Tests for criterion sampling."""
 
 
+from typing import List
 from unittest.mock import MagicMock
 
 from flwr.server.client_manager import SimpleClientManager
 from flwr.server.client_proxy import ClientProxy
-from flwr.server.criterion import Criterion
+from flwr.server.criterion import Criterion, PropertyCriterion
 from flwr.server.fleet.grpc_bidi.grpc_client_proxy import GrpcClientProxy
 
 
@@ -75,3 +76,27 @@ def test_criterion_not_applied() -> None:
     assert client2 in sampled_clients
     assert client3 in sampled_clients
     assert client4 in sampled_clients
+
+
+def test_property_criterion_applied() -> None:
+    """Test sampling w/ a property criterion with and without an index."""
+    # Prepare
+    bridge = MagicMock()
+    clients = [GrpcClientProxy(cid=str(i), bridge=bridge) for i in range(6)]
+    for i, client in enumerate(clients):
+        client.properties = {"device": ["phone", "tablet"][i % 2], "region": i % 3}
+    criterion = PropertyCriterion({"device": ["phone"], "region": [0, 1]})
+
+    index_properties_list: List[List[str]] = [[], ["region"], ["device", "region"]]
+    for index_properties in index_properties_list:
+        client_manager = SimpleClientManager(index_properties=index_properties)
+        for client in clients:
+            client_manager.register(client)
+
+        # Execute
+        sampled_clients = client_manager.sample(2, criterion=criterion)
+
+        # Assert
+        assert sorted(client.cid for client in sampled_clients) == ["0", "4"]
+        assert criterion.select(clients[0])
+        assert not criterion.select(clients[2])
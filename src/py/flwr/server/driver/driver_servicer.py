@@ -15,6 +15,8 @@
 """Driver API servicer."""
 
 
+import threading
+import time
 from logging import INFO
 from typing import List, Optional, Set
 from uuid import UUID
@@ -38,12 +40,35 @@ from flwr.proto.task_pb2 import TaskRes
 from flwr.server.state import State, StateFactory
 from flwr.server.utils.validator import validate_task_ins_or_res
 
+# Maximum time (in seconds) between two State queries while waiting for TaskRes.
+# TaskRes stored through a StateFactory of another process (e.g., a Fleet API
+# sharing the same SQLite database) do not trigger a notification.
+PULL_TASK_RES_POLL_INTERVAL = 1.0
+# Maximum time (in seconds) a PullTaskRes call waits for TaskRes, independent of
+# the requested timeout
+MAX_PULL_TASK_RES_TIMEOUT = 30.0
+# Default maximum number of PullTaskRes calls waiting for TaskRes at the same time.
+# Each of them blocks a worker thread of the gRPC server.
+DEFAULT_MAX_WAITING_PULLS = 64
 
-class DriverServicer(driver_pb2_grpc.DriverServicer):
-    """Driver API servicer."""
 
-    def __init__(self, state_factory: StateFactory) -> None:
+class DriverServicer(driver_pb2_grpc.DriverServicer):
+    """Driver API servicer.
+
+    PullTaskRes waits for TaskRes if its request has a `timeout` greater than zero.
+    The wait is limited to `MAX_PULL_TASK_RES_TIMEOUT` seconds, and at most
+    `max_waiting_pulls` calls wait at the same time, such that waiting calls cannot
+    exhaust the worker threads of the gRPC server. Further calls return the
+    available TaskRes right away, like calls with `timeout=0` (the default).
+    """
+
+    def __init__(
+        self,
+        state_factory: StateFactory,
+        max_waiting_pulls: int = DEFAULT_MAX_WAITING_PULLS,
+    ) -> None:
         self.state_factory = state_factory
+        self._waiting_pulls = threading.BoundedSemaphore(max_waiting_pulls)
 
     def GetNodes(
         self, request: GetNodesRequest, context: grpc.ServicerContext
@@ -112,17 +137,51 @@ class DriverServicer(driver_pb2_grpc.DriverServicer):
             if context.code() != grpc.StatusCode.OK:
                 return
 
-            # Delete delivered TaskIns and TaskRes
-            state.delete_tasks(task_ids=task_ids)
+            # Delete delivered TaskIns and TaskRes. The callback may run in a
+            # different thread, so obtain the State for this thread
+            self.state_factory.state().delete_tasks(task_ids=task_ids)
 
         context.add_callback(on_rpc_done)
 
-        # Read from state
-        task_res_list: List[TaskRes] = state.get_task_res(task_ids=task_ids, limit=None)
+        # Read from state, waiting for at least one TaskRes if requested
+        task_res_list: List[TaskRes] = self._get_task_res(
+            state=state, task_ids=task_ids, timeout=request.timeout, context=context
+        )
 
         context.set_code(grpc.StatusCode.OK)
         return PullTaskResResponse(task_res_list=task_res_list)
 
+    def _get_task_res(
+        self,
+        state: State,
+        task_ids: Set[UUID],
+        timeout: float,
+        context: grpc.ServicerContext,
+    ) -> List[TaskRes]:
+        """Get TaskRes, waiting up to `timeout` seconds until one is available."""
+        # Released once the wait is over, see below
+        # pylint: disable-next=consider-using-with
+        if timeout <= 0 or not self._waiting_pulls.acquire(blocking=False):
+            return state.get_task_res(task_ids=task_ids, limit=None)
+
+        # Subscribe before the first query, such that no TaskRes stored in
+        # between can be missed
+        task_ins_ids = [str(task_id) for task_id in task_ids]
+        notifier = self.state_factory.notifier
+        stored = notifier.subscribe(task_ins_ids)
+        try:
+            deadline = time.monotonic() + min(timeout, MAX_PULL_TASK_RES_TIMEOUT)
+            while True:
+                task_res_list = state.get_task_res(task_ids=task_ids, limit=None)
+                remaining = deadline - time.monotonic()
+                if task_res_list or remaining <= 0 or not context.is_active():
+                    return task_res_list
+                stored.wait(min(remaining, PULL_TASK_RES_POLL_INTERVAL))
+                stored.clear()
+        finally:
+            notifier.unsubscribe(task_ins_ids, stored)
+            self._waiting_pulls.release()
+
 
 def _raise_if(validation_error: bool, detail: str) -> None:
     if validation_error:
@@ -15,7 +15,15 @@
 """DriverServicer tests."""
 
 
-from flwr.server.driver.driver_servicer import _raise_if
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from flwr.proto.driver_pb2 import PullTaskResRequest
+from flwr.server.driver import driver_servicer
+from flwr.server.driver.driver_servicer import DriverServicer, _raise_if
+from flwr.server.state import StateFactory
+from flwr.server.state.state_test import create_task_ins, create_task_res
 
 # pylint: disable=broad-except
 
@@ -54,3 +62,112 @@ def test_raise_if_true() -> None:
         assert str(err) == "Malformed PushTaskInsRequest: test"
     except Exception as err:
         raise AssertionError() from err
+
+
+def test_pull_task_res_waits_for_task_res() -> None:
+    """Test that PullTaskRes returns as soon as the TaskRes is stored."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    servicer = DriverServicer(state_factory=state_factory)
+    state = state_factory.state()
+    workload_id = state.create_workload()
+    task_ins_id = state.store_task_ins(
+        create_task_ins(consumer_node_id=0, anonymous=True, workload_id=workload_id)
+    )
+    task_res = create_task_res(
+        producer_node_id=0,
+        anonymous=True,
+        ancestry=[str(task_ins_id)],
+        workload_id=workload_id,
+    )
+    timer = threading.Timer(0.1, state.store_task_res, args=(task_res,))
+    request = PullTaskResRequest(task_ids=[str(task_ins_id)], timeout=10.0)
+
+    # Execute
+    start = time.monotonic()
+    timer.start()
+    response = servicer.PullTaskRes(request, MagicMock())
+    elapsed = time.monotonic() - start
+    timer.join()
+
+    # Assert
+    assert len(response.task_res_list) == 1  # pylint: disable=no-member
+    assert elapsed < 5.0
+
+
+def test_pull_task_res_timeout() -> None:
+    """Test that PullTaskRes returns no TaskRes once the timeout is reached."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    servicer = DriverServicer(state_factory=state_factory)
+    state = state_factory.state()
+    workload_id = state.create_workload()
+    task_ins_id = state.store_task_ins(
+        create_task_ins(consumer_node_id=0, anonymous=True, workload_id=workload_id)
+    )
+    request = PullTaskResRequest(task_ids=[str(task_ins_id)], timeout=0.1)
+
+    # Execute
+    response = servicer.PullTaskRes(request, MagicMock())
+
+    # Assert
+    assert len(response.task_res_list) == 0  # pylint: disable=no-member
+    assert not state_factory.notifier._events  # pylint: disable=protected-access
+
+
+def test_pull_task_res_timeout_is_capped() -> None:
+    """Test that PullTaskRes waits at most `MAX_PULL_TASK_RES_TIMEOUT` seconds."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    servicer = DriverServicer(state_factory=state_factory)
+    state = state_factory.state()
+    workload_id = state.create_workload()
+    task_ins_id = state.store_task_ins(
+        create_task_ins(consumer_node_id=0, anonymous=True, workload_id=workload_id)
+    )
+    request = PullTaskResRequest(task_ids=[str(task_ins_id)], timeout=3600.0)
+
+    # Execute
+    start = time.monotonic()
+    with patch.object(driver_servicer, "MAX_PULL_TASK_RES_TIMEOUT", 0.1):
+        response = servicer.PullTaskRes(request, MagicMock())
+    elapsed = time.monotonic() - start
+
+    # Assert
+    assert len(response.task_res_list) == 0  # pylint: disable=no-member
+    assert elapsed < 5.0
+
+
+def test_pull_task_res_limits_waiting_calls() -> None:
+    """Test that calls beyond `max_waiting_pulls` return without waiting."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    servicer = DriverServicer(state_factory=state_factory, max_waiting_pulls=1)
+    state = state_factory.state()
+    workload_id = state.create_workload()
+    task_ins_id = state.store_task_ins(
+        create_task_ins(consumer_node_id=0, anonymous=True, workload_id=workload_id)
+    )
+    request = PullTaskResRequest(task_ids=[str(task_ins_id)], timeout=10.0)
+    waiting = threading.Thread(target=servicer.PullTaskRes, args=(request, MagicMock()))
+    waiting.start()
+    while not state_factory.notifier._events:  # pylint: disable=protected-access
+        time.sleep(0.01)
+
+    # Execute
+    start = time.monotonic()
+    response = servicer.PullTaskRes(request, MagicMock())
+    elapsed = time.monotonic() - start
+    state.store_task_res(
+        create_task_res(
+            producer_node_id=0,
+            anonymous=True,
+            ancestry=[str(task_ins_id)],
+            workload_id=workload_id,
+        )
+    )
+    waiting.join()
+
+    # Assert
+    assert len(response.task_res_list) == 0  # pylint: disable=no-member
+    assert elapsed < 5.0
@@ -15,8 +15,13 @@
 """Experimental REST API server."""
 
 
+import asyncio
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
 
+from flwr.common import GRPC_MAX_MESSAGE_LENGTH
+from flwr.common.compression import CONTENT_ENCODINGS, DecompressedSizeError, decompress
 from flwr.common.constant import MISSING_EXTRA_REST
 from flwr.proto.fleet_pb2 import (
     CreateNodeRequest,
@@ -38,23 +43,28 @@ except ModuleNotFoundError:
     sys.exit(MISSING_EXTRA_REST)
 
 
+DEFAULT_STATE_WORKERS = 32
+# Maximum size (in bytes) of a decompressed request body, same as for gRPC messages
+MAX_DECOMPRESSED_SIZE = GRPC_MAX_MESSAGE_LENGTH
+
+RequestT = TypeVar("RequestT")
+ResponseT = TypeVar("ResponseT")
+
+
 async def create_node(request: Request) -> Response:
     """Create Node."""
     _check_headers(request.headers)
 
     # Get the request body as raw bytes
-    create_node_request_bytes: bytes = await request.body()
+    create_node_request_bytes: bytes = await _read_body(request)
 
     # Deserialize ProtoBuf
     create_node_request_proto = CreateNodeRequest()
     create_node_request_proto.ParseFromString(create_node_request_bytes)
 
-    # Get state from app
-    state: State = app.state.STATE_FACTORY.state()
-
     # Handle message
-    create_node_response_proto = message_handler.create_node(
-        request=create_node_request_proto, state=state
+    create_node_response_proto = await _handle(
+        message_handler.create_node, create_node_request_proto
     )
 
     # Return serialized ProtoBuf
@@ -71,18 +81,15 @@ async def delete_node(request: Request) -> Response:
     _check_headers(request.headers)
 
     # Get the request body as raw bytes
-    delete_node_request_bytes: bytes = await request.body()
+    delete_node_request_bytes: bytes = await _read_body(request)
 
     # Deserialize ProtoBuf
     delete_node_request_proto = DeleteNodeRequest()
     delete_node_request_proto.ParseFromString(delete_node_request_bytes)
 
-    # Get state from app
-    state: State = app.state.STATE_FACTORY.state()
-
     # Handle message
-    delete_node_response_proto = message_handler.delete_node(
-        request=delete_node_request_proto, state=state
+    delete_node_response_proto = await _handle(
+        message_handler.delete_node, delete_node_request_proto
     )
 
     # Return serialized ProtoBuf
@@ -99,19 +106,15 @@ async def pull_task_ins(request: Request) -> Response:
     _check_headers(request.headers)
 
     # Get the request body as raw bytes
-    pull_task_ins_request_bytes: bytes = await request.body()
+    pull_task_ins_request_bytes: bytes = await _read_body(request)
 
     # Deserialize ProtoBuf
     pull_task_ins_request_proto = PullTaskInsRequest()
     pull_task_ins_request_proto.ParseFromString(pull_task_ins_request_bytes)
 
-    # Get state from app
-    state: State = app.state.STATE_FACTORY.state()
-
     # Handle message
-    pull_task_ins_response_proto = message_handler.pull_task_ins(
-        request=pull_task_ins_request_proto,
-        state=state,
+    pull_task_ins_response_proto = await _handle(
+        message_handler.pull_task_ins, pull_task_ins_request_proto
     )
 
     # Return serialized ProtoBuf
@@ -128,19 +131,15 @@ async def push_task_res(request: Request) -> Response:  # Check if token is need
     _check_headers(request.headers)
 
     # Get the request body as raw bytes
-    push_task_res_request_bytes: bytes = await request.body()
+    push_task_res_request_bytes: bytes = await _read_body(request)
 
     # Deserialize ProtoBuf
     push_task_res_request_proto = PushTaskResRequest()
     push_task_res_request_proto.ParseFromString(push_task_res_request_bytes)
 
-    # Get state from app
-    state: State = app.state.STATE_FACTORY.state()
-
     # Handle message
-    push_task_res_response_proto = message_handler.push_task_res(
-        request=push_task_res_request_proto,
-        state=state,
+    push_task_res_response_proto = await _handle(
+        message_handler.push_task_res, push_task_res_request_proto
     )
 
     # Return serialized ProtoBuf
@@ -165,6 +164,38 @@ app: Starlette = Starlette(
 )
 
 
+def _state_executor() -> ThreadPoolExecutor:
+    """Return the thread pool for State access and decompression (created lazily)."""
+    executor: ThreadPoolExecutor
+    try:
+        executor = app.state.STATE_EXECUTOR
+    except AttributeError:
+        executor = ThreadPoolExecutor(
+            max_workers=DEFAULT_STATE_WORKERS, thread_name_prefix="flwr-rest-state"
+        )
+        app.state.STATE_EXECUTOR = executor
+    return executor
+
+
+async def _handle(
+    handler: Callable[[RequestT, State], ResponseT], request: RequestT
+) -> ResponseT:
+    """Run `handler` with the State in a worker thread of the State thread pool.
+
+    State implementations are synchronous (SqliteState blocks on database I/O), so they
+    must not be called from the event loop, which would otherwise serve only one request
+    at a time. The pool is bounded, so that the number of concurrent State users (and
+    SQLite connections) stays fixed no matter how many clients poll at the same time.
+    """
+
+    def _run() -> ResponseT:
+        state: State = app.state.STATE_FACTORY.state()
+        return handler(request, state)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_state_executor(), _run)
+
+
 def _check_headers(headers: Headers) -> None:
     """Check if expected headers are set."""
     if "content-type" not in headers:
@@ -175,3 +206,30 @@ def _check_headers(headers: Headers) -> None:
         raise HTTPException(status_code=400, detail="Missing header `Accept`")
     if headers["accept"] != "application/protobuf":
         raise HTTPException(status_code=400, detail="Unsupported `Accept`")
+
+
+async def _read_body(request: Request) -> bytes:
+    """Return the request body, decompressed according to `Content-Encoding`.
+
+    Decompression runs in the State thread pool to keep the event loop responsive
+    and is limited to `MAX_DECOMPRESSED_SIZE` bytes.
+    """
+    body: bytes = await request.body()
+    content_encoding = request.headers.get("content-encoding", "identity")
+    if content_encoding == "identity":
+        return body
+    if content_encoding not in CONTENT_ENCODINGS:
+        raise HTTPException(status_code=415, detail="Unsupported `Content-Encoding`")
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            _state_executor(), decompress, body, content_encoding, MAX_DECOMPRESSED_SIZE
+        )
+    except DecompressedSizeError as err:
+        raise HTTPException(status_code=413, detail="Body too large") from err
+    except ModuleNotFoundError as err:
+        raise HTTPException(
+            status_code=415, detail="Unsupported `Content-Encoding`"
+        ) from err
+    except Exception as err:  # pylint: disable=broad-except
+        raise HTTPException(status_code=400, detail="Malformed body") from err
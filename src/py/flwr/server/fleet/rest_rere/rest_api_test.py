@@ -0,0 +1,202 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the REST Fleet API."""
+
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, MutableMapping, Optional, Tuple
+from unittest.mock import patch
+
+from flwr.common.compression import CONTENT_ENCODING_GZIP, compress
+from flwr.proto.fleet_pb2 import (
+    CreateNodeRequest,
+    CreateNodeResponse,
+    PullTaskInsRequest,
+    PullTaskInsResponse,
+)
+from flwr.proto.node_pb2 import Node
+from flwr.server.fleet.message_handler import message_handler
+from flwr.server.state import State, StateFactory
+
+from . import rest_api
+from .rest_api import app
+
+PATH_CREATE_NODE = "/api/v0/fleet/create-node"
+PATH_PULL_TASK_INS = "/api/v0/fleet/pull-task-ins"
+
+
+async def _post(
+    path: str, body: bytes, content_encoding: Optional[str] = None
+) -> Tuple[int, bytes]:
+    """Send a POST request directly to the ASGI app, return status and body."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"application/protobuf"),
+            (b"accept", b"application/protobuf"),
+            *(
+                [(b"content-encoding", content_encoding.encode())]
+                if content_encoding is not None
+                else []
+            ),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    requests = [{"type": "http.request", "body": body, "more_body": False}]
+    status_code = 0
+    chunks: List[bytes] = []
+
+    async def receive() -> Dict[str, Any]:
+        return requests.pop(0) if requests else {"type": "http.disconnect"}
+
+    async def send(message: MutableMapping[str, Any]) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status_code, b"".join(chunks)
+
+
+class RestApiTest(unittest.TestCase):
+    """Tests for the REST Fleet API."""
+
+    # pylint: disable=no-self-use
+
+    def setUp(self) -> None:
+        """Use a fresh InMemoryState for each test."""
+        app.state.STATE_FACTORY = StateFactory(":flwr-in-memory-state:")
+
+    def tearDown(self) -> None:
+        """Shut down the State thread pool."""
+        executor = getattr(app.state, "STATE_EXECUTOR", None)
+        if executor is not None:
+            executor.shutdown()
+            del app.state.STATE_EXECUTOR
+        del app.state.STATE_FACTORY
+
+    def test_concurrent_polls(self) -> None:
+        """Test that many concurrent clients are all served."""
+        # Prepare
+        num_clients = 1000
+
+        async def _run() -> List[Tuple[int, bytes]]:
+            _, body = await _post(
+                PATH_CREATE_NODE, CreateNodeRequest().SerializeToString()
+            )
+            node = CreateNodeResponse.FromString(body).node
+            request = PullTaskInsRequest(node=node).SerializeToString()
+            return await asyncio.gather(
+                *[_post(PATH_PULL_TASK_INS, request) for _ in range(num_clients)]
+            )
+
+        # Execute
+        responses = asyncio.run(_run())
+
+        # Assert
+        assert len(responses) == num_clients
+        for status_code, body in responses:
+            assert status_code == 200
+            assert not PullTaskInsResponse.FromString(body).task_ins_list
+
+    def test_state_access_is_offloaded_and_bounded(self) -> None:
+        """Test that blocking State access runs in the bounded thread pool."""
+        # Prepare
+        num_clients, max_workers, delay = 8, 2, 0.05
+        app.state.STATE_EXECUTOR = ThreadPoolExecutor(max_workers=max_workers)
+        lock = threading.Lock()
+        active: List[int] = [0, 0]  # [current, maximum]
+
+        def blocking_pull_task_ins(
+            request: PullTaskInsRequest,  # pylint: disable=unused-argument
+            state: State,  # pylint: disable=unused-argument
+        ) -> PullTaskInsResponse:
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(delay)
+            with lock:
+                active[0] -= 1
+            return PullTaskInsResponse()
+
+        async def _run() -> Tuple[List[Tuple[int, bytes]], int]:
+            ticks = 0
+
+            async def _tick() -> None:
+                nonlocal ticks
+                while active[1] == 0 or active[0] > 0:
+                    ticks += 1
+                    await asyncio.sleep(0.001)
+
+            request = PullTaskInsRequest(node=Node(node_id=0, anonymous=True))
+            responses, _ = await asyncio.gather(
+                asyncio.gather(
+                    *[
+                        _post(PATH_PULL_TASK_INS, request.SerializeToString())
+                        for _ in range(num_clients)
+                    ]
+                ),
+                _tick(),
+            )
+            return responses, ticks
+
+        # Execute
+        with patch.object(message_handler, "pull_task_ins", blocking_pull_task_ins):
+            responses, ticks = asyncio.run(_run())
+
+        # Assert
+        assert [status_code for status_code, _ in responses] == [200] * num_clients
+        assert active[1] == max_workers
+        # The event loop kept running while the State was blocked
+        assert ticks > num_clients
+
+    def test_compressed_body_size_is_limited(self) -> None:
+        """Test that bodies expanding beyond the limit are rejected with 413."""
+        # Prepare
+        request = PullTaskInsRequest(node=Node(node_id=0, anonymous=True))
+        body = request.SerializeToString()
+        padded = compress(body + b"\x00" * 10_000, CONTENT_ENCODING_GZIP)
+
+        async def _run() -> List[Tuple[int, bytes]]:
+            return [
+                await _post(
+                    PATH_PULL_TASK_INS,
+                    compress(body, CONTENT_ENCODING_GZIP),
+                    CONTENT_ENCODING_GZIP,
+                ),
+                await _post(PATH_PULL_TASK_INS, padded, CONTENT_ENCODING_GZIP),
+            ]
+
+        # Execute
+        with patch.object(rest_api, "MAX_DECOMPRESSED_SIZE", 1_000):
+            responses = asyncio.run(_run())
+
+        # Assert
+        assert [status_code for status_code, _ in responses] == [200, 413]
@@ -17,8 +17,10 @@
 
 import concurrent.futures
 import timeit
-from logging import DEBUG, INFO
-from typing import Dict, List, Optional, Tuple, Union
+from contextlib import contextmanager
+from functools import partial
+from logging import DEBUG, ERROR, INFO
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from flwr.common import (
     Code,
@@ -33,6 +35,7 @@ from flwr.common import (
 )
 from flwr.common.logger import log
 from flwr.common.typing import GetParametersIns
+from flwr.server.client_dispatcher import ClientDispatcher, DispatchMetrics
 from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
 from flwr.server.history import History
@@ -50,16 +53,57 @@ ReconnectResultsAndFailures = Tuple[
     List[Tuple[ClientProxy, DisconnectRes]],
     List[Union[Tuple[ClientProxy, DisconnectRes], BaseException]],
 ]
+CentralizedEvaluation = Tuple[
+    Optional[Tuple[float, Dict[str, Scalar]]],
+    float,
+]
+FitClientsFn = Callable[
+    [
+        List[Tuple[ClientProxy, FitIns]],
+        Optional[int],
+        Optional[float],
+        Optional[Callable[[Tuple[ClientProxy, FitRes]], None]],
+    ],
+    FitResultsAndFailures,
+]
+EvaluateClientsFn = Callable[
+    [List[Tuple[ClientProxy, EvaluateIns]], Optional[int], Optional[float]],
+    EvaluateResultsAndFailures,
+]
 
 
+# pylint: disable=too-many-instance-attributes
 class Server:
-    """Flower server."""
+    """Flower server.
+
+    Parameters
+    ----------
+    client_manager : ClientManager
+        Manager of the available clients.
+    strategy : Optional[Strategy] (default: None)
+        Strategy of the federated learning process. Defaults to `FedAvg`.
+    dispatcher : Optional[ClientDispatcher] (default: None)
+        Long-lived thread pool sending instructions to the clients of all rounds.
+        Defaults to a `ClientDispatcher` with `max_workers` threads. The timings
+        of each round are kept in `dispatch_metrics`.
+    background_evaluation : bool (default: False)
+        Whether to evaluate the global model of each round with
+        `Strategy.evaluate` in a background thread, on a snapshot of the
+        parameters, while federated evaluation and the next round proceed. At
+        most one evaluation runs alongside training, a round waits for the
+        evaluation of the previous round before it starts another one. Results
+        are recorded in the `History` under the round they belong to.
+        `Strategy.evaluate` must then be safe to call concurrently with the other
+        methods of the strategy.
+    """
 
     def __init__(
         self,
         *,
         client_manager: ClientManager,
         strategy: Optional[Strategy] = None,
+        dispatcher: Optional[ClientDispatcher] = None,
+        background_evaluation: bool = False,
     ) -> None:
         self._client_manager: ClientManager = client_manager
         self.parameters: Parameters = Parameters(
@@ -67,25 +111,100 @@ class Server:
         )
         self.strategy: Strategy = strategy if strategy is not None else FedAvg()
         self.max_workers: Optional[int] = None
+        self.dispatcher = dispatcher if dispatcher is not None else ClientDispatcher()
+        # (server_round, "fit" or "evaluate", metrics) of each dispatched round
+        self.dispatch_metrics: List[Tuple[int, str, DispatchMetrics]] = []
+        self.fit_clients_fn: FitClientsFn = partial(
+            fit_clients, dispatcher=self.dispatcher
+        )
+        self.evaluate_clients_fn: EvaluateClientsFn = partial(
+            evaluate_clients, dispatcher=self.dispatcher
+        )
+        self.background_evaluation = background_evaluation
+        self._evaluation_executor: Optional[
+            concurrent.futures.ThreadPoolExecutor
+        ] = None
+        # Round and result of the centralized evaluation running in the background
+        self._evaluation: Optional[
+            Tuple[int, "concurrent.futures.Future[CentralizedEvaluation]"]
+        ] = None
 
     def set_max_workers(self, max_workers: Optional[int]) -> None:
         """Set the max_workers used by ThreadPoolExecutor."""
         self.max_workers = max_workers
+        self.dispatcher.set_max_workers(max_workers)
 
     def set_strategy(self, strategy: Strategy) -> None:
         """Replace server strategy."""
         self.strategy = strategy
 
+    def set_dispatch_fns(
+        self,
+        fit_clients_fn: FitClientsFn,
+        evaluate_clients_fn: EvaluateClientsFn,
+    ) -> None:
+        """Replace the functions sending instructions to the clients of a round.
+
+        Both functions receive the instructions for all clients of a round, the
+        `max_workers`, and the round timeout. `fit_clients_fn` additionally
+        receives a callback for each successful result (see `fit_clients`).
+        """
+        self.fit_clients_fn = fit_clients_fn
+        self.evaluate_clients_fn = evaluate_clients_fn
+
     def client_manager(self) -> ClientManager:
         """Return ClientManager."""
         return self._client_manager
 
-    # pylint: disable=too-many-locals
     def fit(self, num_rounds: int, timeout: Optional[float]) -> History:
         """Run federated averaging for a number of rounds."""
         history = History()
 
-        # Initialize parameters
+        # Initialize and evaluate parameters
+        self._initialize(history, timeout)
+
+        # Run federated learning for num_rounds
+        log(INFO, "FL starting")
+        start_time = timeit.default_timer()
+
+        try:
+            for current_round in range(1, num_rounds + 1):
+                # Stop early if the evaluation of the previous round failed
+                self._check_evaluation(history, start_time)
+
+                # Train model and replace previous global model
+                res_fit = self.fit_round(
+                    server_round=current_round,
+                    timeout=timeout,
+                )
+                if res_fit is not None:
+                    parameters_prime, fit_metrics, _ = res_fit  # fit_metrics_aggregated
+                    if parameters_prime:
+                        self.parameters = parameters_prime
+                    history.add_metrics_distributed_fit(
+                        server_round=current_round, metrics=fit_metrics
+                    )
+
+                # Evaluate model using strategy implementation
+                self._evaluate_centralized(current_round, history, start_time)
+
+                # Evaluate model on a sample of available clients
+                self._evaluate_federated(current_round, history, timeout)
+
+            # Wait for the evaluation of the last round
+            self._wait_for_evaluation(history, start_time)
+        finally:
+            self._shutdown_evaluation()
+            self.strategy.shutdown()
+
+        # Bookkeeping
+        end_time = timeit.default_timer()
+        elapsed = end_time - start_time
+        log(INFO, "FL finished in %s", elapsed)
+        return history
+
+    def _initialize(self, history: History, timeout: Optional[float]) -> None:
+        """Initialize the global parameters and evaluate them on the server."""
         log(INFO, "Initializing global parameters")
         self.parameters = self._get_initial_parameters(timeout=timeout)
         log(INFO, "Evaluating initial parameters")
@@ -100,59 +219,73 @@ class Server:
             history.add_loss_centralized(server_round=0, loss=res[0])
             history.add_metrics_centralized(server_round=0, metrics=res[1])
 
-        # Run federated learning for num_rounds
-        log(INFO, "FL starting")
-        start_time = timeit.default_timer()
-
-        for current_round in range(1, num_rounds + 1):
-            # Train model and replace previous global model
-            res_fit = self.fit_round(
-                server_round=current_round,
-                timeout=timeout,
+    def _evaluate_centralized(
+        self, server_round: int, history: History, start_time: float
+    ) -> None:
+        """Evaluate the current global model with the strategy and record it."""
+        if not self.background_evaluation:
+            res_cen = _run_centralized_evaluation(
+                self.strategy, server_round, self.parameters
             )
-            if res_fit is not None:
-                parameters_prime, fit_metrics, _ = res_fit  # fit_metrics_aggregated
-                if parameters_prime:
-                    self.parameters = parameters_prime
-                history.add_metrics_distributed_fit(
-                    server_round=current_round, metrics=fit_metrics
-                )
-
-            # Evaluate model using strategy implementation
-            res_cen = self.strategy.evaluate(current_round, parameters=self.parameters)
-            if res_cen is not None:
-                loss_cen, metrics_cen = res_cen
-                log(
-                    INFO,
-                    "fit progress: (%s, %s, %s, %s)",
-                    current_round,
-                    loss_cen,
-                    metrics_cen,
-                    timeit.default_timer() - start_time,
-                )
-                history.add_loss_centralized(server_round=current_round, loss=loss_cen)
-                history.add_metrics_centralized(
-                    server_round=current_round, metrics=metrics_cen
+            _record_centralized(server_round, res_cen, history, start_time)
+            return
+
+        # Keep at most one evaluation running alongside training
+        self._wait_for_evaluation(history, start_time)
+        if self._evaluation_executor is None:
+            self._evaluation_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="flwr-evaluate"
+            )
+        # `self.parameters` is replaced, not modified, by the next round
+        future = self._evaluation_executor.submit(
+            _run_centralized_evaluation, self.strategy, server_round, self.parameters
+        )
+        self._evaluation = (server_round, future)
+
+    def _wait_for_evaluation(self, history: History, start_time: float) -> None:
+        """Record the result of the background evaluation once it finished."""
+        if self._evaluation is None:
+            return
+        server_round, future = self._evaluation
+        self._evaluation = None
+        _record_centralized(server_round, future.result(), history, start_time)
+
+    def _check_evaluation(self, history: History, start_time: float) -> None:
+        """Record the background evaluation if it already finished.
+
+        Raises the exception of a failed evaluation without waiting for the evaluation
+        of the next round.
+        """
+        if self._evaluation is not None and self._evaluation[1].done():
+            self._wait_for_evaluation(history, start_time)
+
+    def _shutdown_evaluation(self) -> None:
+        """Stop the thread running background evaluations, without waiting for it.
+
+        An evaluation which is still running cannot be interrupted, it finishes in the
+        background.
+        """
+        # Only left over if training failed, its result is discarded
+        if self._evaluation is not None:
+            self._evaluation[1].cancel()
+            self._evaluation = None
+        if self._evaluation_executor is not None:
+            self._evaluation_executor.shutdown(wait=False)
+            self._evaluation_executor = None
+
+    def _evaluate_federated(
+        self, server_round: int, history: History, timeout: Optional[float]
+    ) -> None:
+        """Evaluate the current global model on clients and record it."""
+        res_fed = self.evaluate_round(server_round=server_round, timeout=timeout)
+        if res_fed is not None:
+            loss_fed, evaluate_metrics_fed, _ = res_fed
+            if loss_fed is not None:
+                history.add_loss_distributed(server_round=server_round, loss=loss_fed)
+                history.add_metrics_distributed(
+                    server_round=server_round, metrics=evaluate_metrics_fed
                 )
 
-            # Evaluate model on a sample of available clients
-            res_fed = self.evaluate_round(server_round=current_round, timeout=timeout)
-            if res_fed is not None:
-                loss_fed, evaluate_metrics_fed, _ = res_fed
-                if loss_fed is not None:
-                    history.add_loss_distributed(
-                        server_round=current_round, loss=loss_fed
-                    )
-                    history.add_metrics_distributed(
-                        server_round=current_round, metrics=evaluate_metrics_fed
-                    )
-
-        # Bookkeeping
-        end_time = timeit.default_timer()
-        elapsed = end_time - start_time
-        log(INFO, "FL finished in %s", elapsed)
-        return history
-
     def evaluate_round(
         self,
         server_round: int,
@@ -162,11 +295,7 @@ class Server:
     ]:
         """Validate current global model on a number of clients."""
         # Get clients and their respective instructions from strategy
-        client_instructions = self.strategy.configure_evaluate(
-            server_round=server_round,
-            parameters=self.parameters,
-            client_manager=self._client_manager,
-        )
+        client_instructions = self._configure_evaluate(server_round)
         if not client_instructions:
             log(INFO, "evaluate_round %s: no clients selected, cancel", server_round)
             return None
@@ -179,11 +308,13 @@ class Server:
         )
 
         # Collect `evaluate` results from all clients participating in this round
-        results, failures = evaluate_clients(
+        previous_metrics = self.dispatcher.last_metrics
+        results, failures = self.evaluate_clients_fn(
             client_instructions,
-            max_workers=self.max_workers,
-            timeout=timeout,
+            self.max_workers,
+            timeout,
         )
+        self._record_dispatch(server_round, "evaluate", previous_metrics)
         log(
             DEBUG,
             "evaluate_round %s received %s results and %s failures",
@@ -201,6 +332,16 @@ class Server:
         loss_aggregated, metrics_aggregated = aggregated_result
         return loss_aggregated, metrics_aggregated, (results, failures)
 
+    def _configure_evaluate(
+        self, server_round: int
+    ) -> List[Tuple[ClientProxy, EvaluateIns]]:
+        """Get the clients evaluating this round and their instructions."""
+        return self.strategy.configure_evaluate(
+            server_round=server_round,
+            parameters=self.parameters,
+            client_manager=self._client_manager,
+        )
+
     def fit_round(
         self,
         server_round: int,
@@ -228,11 +369,14 @@ class Server:
         )
 
         # Collect `fit` results from all clients participating in this round
-        results, failures = fit_clients(
-            client_instructions=client_instructions,
-            max_workers=self.max_workers,
-            timeout=timeout,
+        previous_metrics = self.dispatcher.last_metrics
+        results, failures = self.fit_clients_fn(
+            client_instructions,
+            self.max_workers,
+            timeout,
+            partial(self.strategy.accumulate_fit, server_round),
         )
+        self._record_dispatch(server_round, "fit", previous_metrics)
         log(
             DEBUG,
             "fit_round %s received %s results and %s failures",
@@ -250,6 +394,19 @@ class Server:
         parameters_aggregated, metrics_aggregated = aggregated_result
         return parameters_aggregated, metrics_aggregated, (results, failures)
 
+    def _record_dispatch(
+        self,
+        server_round: int,
+        name: str,
+        previous_metrics: Optional[DispatchMetrics],
+    ) -> None:
+        """Keep the metrics of a round if it was sent through the dispatcher."""
+        metrics = self.dispatcher.last_metrics
+        if metrics is None or metrics is previous_metrics:
+            return
+        self.dispatch_metrics.append((server_round, name, metrics))
+        log(DEBUG, "%s_round %s dispatch: %s", name, server_round, metrics)
+
     def disconnect_all_clients(self, timeout: Optional[float]) -> None:
         """Send shutdown signal to all clients."""
         all_clients = self._client_manager.all()
@@ -260,7 +417,9 @@ class Server:
             client_instructions=client_instructions,
             max_workers=self.max_workers,
             timeout=timeout,
+            dispatcher=self.dispatcher,
         )
+        self.dispatcher.shutdown()
 
     def _get_initial_parameters(self, timeout: Optional[float]) -> Parameters:
         """Get initial parameters from one of the available clients."""
@@ -281,32 +440,69 @@ class Server:
         return get_parameters_res.parameters
 
 
+def _run_centralized_evaluation(
+    strategy: Strategy, server_round: int, parameters: Parameters
+) -> CentralizedEvaluation:
+    """Evaluate `parameters` with the strategy and return the time it finished."""
+    res = strategy.evaluate(server_round, parameters=parameters)
+    return res, timeit.default_timer()
+
+
+def _record_centralized(
+    server_round: int,
+    evaluation: CentralizedEvaluation,
+    history: History,
+    start_time: float,
+) -> None:
+    """Log and record the result of a centralized evaluation."""
+    res_cen, end_time = evaluation
+    if res_cen is not None:
+        loss_cen, metrics_cen = res_cen
+        log(
+            INFO,
+            "fit progress: (%s, %s, %s, %s)",
+            server_round,
+            loss_cen,
+            metrics_cen,
+            end_time - start_time,
+        )
+        history.add_loss_centralized(server_round=server_round, loss=loss_cen)
+        history.add_metrics_centralized(server_round=server_round, metrics=metrics_cen)
+
+
+@contextmanager
+def _dispatching(
+    dispatcher: Optional[ClientDispatcher], max_workers: Optional[int]
+) -> Iterator[ClientDispatcher]:
+    """Use `dispatcher`, or a dispatcher for a single round if it is None."""
+    if dispatcher is not None:
+        yield dispatcher
+        return
+    dispatcher = ClientDispatcher(max_workers=max_workers)
+    try:
+        yield dispatcher
+    finally:
+        dispatcher.shutdown()
+
+
 def reconnect_clients(
     client_instructions: List[Tuple[ClientProxy, ReconnectIns]],
     max_workers: Optional[int],
     timeout: Optional[float],
+    dispatcher: Optional[ClientDispatcher] = None,
 ) -> ReconnectResultsAndFailures:
     """Instruct clients to disconnect and never reconnect."""
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        submitted_fs = {
-            executor.submit(reconnect_client, client_proxy, ins, timeout)
-            for client_proxy, ins in client_instructions
-        }
-        finished_fs, _ = concurrent.futures.wait(
-            fs=submitted_fs,
-            timeout=None,  # Handled in the respective communication stack
-        )
-
-    # Gather results
     results: List[Tuple[ClientProxy, DisconnectRes]] = []
     failures: List[Union[Tuple[ClientProxy, DisconnectRes], BaseException]] = []
-    for future in finished_fs:
-        failure = future.exception()
-        if failure is not None:
-            failures.append(failure)
-        else:
-            result = future.result()
-            results.append(result)
+    with _dispatching(dispatcher, max_workers) as active_dispatcher:
+        for future in active_dispatcher.dispatch(
+            reconnect_client, client_instructions, timeout
+        ):
+            failure = future.exception()
+            if failure is not None:
+                failures.append(failure)
+            else:
+                results.append(future.result())
     return results, failures
 
 
@@ -327,25 +523,35 @@ def fit_clients(
     client_instructions: List[Tuple[ClientProxy, FitIns]],
     max_workers: Optional[int],
     timeout: Optional[float],
+    on_result: Optional[Callable[[Tuple[ClientProxy, FitRes]], None]] = None,
+    dispatcher: Optional[ClientDispatcher] = None,
 ) -> FitResultsAndFailures:
-    """Refine parameters concurrently on all selected clients."""
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        submitted_fs = {
-            executor.submit(fit_client, client_proxy, ins, timeout)
-            for client_proxy, ins in client_instructions
-        }
-        finished_fs, _ = concurrent.futures.wait(
-            fs=submitted_fs,
-            timeout=None,  # Handled in the respective communication stack
-        )
+    """Refine parameters concurrently on all selected clients.
 
-    # Gather results
+    If `on_result` is given, it is called (in the calling thread) with each
+    successful result as soon as it arrives. If it raises, the result is counted as
+    a failure instead. Without a `dispatcher`, a thread pool with `max_workers`
+    threads is created for this call.
+    """
     results: List[Tuple[ClientProxy, FitRes]] = []
     failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
-    for future in finished_fs:
-        _handle_finished_future_after_fit(
-            future=future, results=results, failures=failures
-        )
+    with _dispatching(dispatcher, max_workers) as active_dispatcher:
+        # Gather results as they complete, timeouts are handled in the
+        # respective communication stack
+        for future in active_dispatcher.dispatch(
+            fit_client, client_instructions, timeout
+        ):
+            num_results = len(results)
+            _handle_finished_future_after_fit(
+                future=future, results=results, failures=failures
+            )
+            if on_result is not None and len(results) > num_results:
+                try:
+                    on_result(results[-1])
+                except Exception as ex:  # pylint: disable=broad-except
+                    log(ERROR, "Failed to process the result of a client: %s", ex)
+                    results.pop()
+                    failures.append(ex)
     return results, failures
 
 
@@ -386,25 +592,22 @@ def evaluate_clients(
     client_instructions: List[Tuple[ClientProxy, EvaluateIns]],
     max_workers: Optional[int],
     timeout: Optional[float],
+    dispatcher: Optional[ClientDispatcher] = None,
 ) -> EvaluateResultsAndFailures:
-    """Evaluate parameters concurrently on all selected clients."""
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        submitted_fs = {
-            executor.submit(evaluate_client, client_proxy, ins, timeout)
-            for client_proxy, ins in client_instructions
-        }
-        finished_fs, _ = concurrent.futures.wait(
-            fs=submitted_fs,
-            timeout=None,  # Handled in the respective communication stack
-        )
+    """Evaluate parameters concurrently on all selected clients.
 
-    # Gather results
+    Without a `dispatcher`, a thread pool with `max_workers` threads is created
+    for this call.
+    """
     results: List[Tuple[ClientProxy, EvaluateRes]] = []
     failures: List[Union[Tuple[ClientProxy, EvaluateRes], BaseException]] = []
-    for future in finished_fs:
-        _handle_finished_future_after_evaluate(
-            future=future, results=results, failures=failures
-        )
+    with _dispatching(dispatcher, max_workers) as active_dispatcher:
+        for future in active_dispatcher.dispatch(
+            evaluate_client, client_instructions, timeout
+        ):
+            _handle_finished_future_after_evaluate(
+                future=future, results=results, failures=failures
+            )
     return results, failures
 
 
@@ -15,9 +15,12 @@
 """Flower server tests."""
 
 
-from typing import List, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
+from unittest.mock import MagicMock
 
 import numpy as np
+import pytest
 
 from flwr.common import (
     Code,
@@ -30,15 +33,25 @@ from flwr.common import (
     GetParametersRes,
     GetPropertiesIns,
     GetPropertiesRes,
+    NDArrays,
     Parameters,
     ReconnectIns,
+    Scalar,
     Status,
     ndarray_to_bytes,
+    ndarrays_to_parameters,
 )
 from flwr.server.client_manager import SimpleClientManager
+from flwr.server.strategy import FedAvg
 
 from .client_proxy import ClientProxy
-from .server import Server, evaluate_clients, fit_clients
+from .server import (
+    EvaluateResultsAndFailures,
+    FitResultsAndFailures,
+    Server,
+    evaluate_clients,
+    fit_clients,
+)
 
 
 class SuccessClient(ClientProxy):
@@ -130,6 +143,50 @@ def test_fit_clients() -> None:
     assert results[0][1].num_examples == 1
 
 
+def test_fit_clients_on_result() -> None:
+    """Test that fit_clients passes each successful result to on_result."""
+    # Prepare
+    clients: List[ClientProxy] = [
+        FailingClient("0"),
+        SuccessClient("1"),
+        SuccessClient("2"),
+    ]
+    arr = np.array([[1, 2], [3, 4], [5, 6]])
+    arr_serialized = ndarray_to_bytes(arr)
+    ins: FitIns = FitIns(Parameters(tensors=[arr_serialized], tensor_type=""), {})
+    client_instructions = [(c, ins) for c in clients]
+    received: List[Tuple[ClientProxy, FitRes]] = []
+
+    # Execute
+    results, failures = fit_clients(
+        client_instructions, None, None, on_result=received.append
+    )
+
+    # Assert
+    assert len(failures) == 1
+    assert received == results
+
+
+def test_fit_clients_on_result_failure() -> None:
+    """Test that results on_result fails to process are counted as failures."""
+    # Prepare
+    clients: List[ClientProxy] = [SuccessClient("0"), SuccessClient("1")]
+    arr = np.array([[1, 2], [3, 4], [5, 6]])
+    arr_serialized = ndarray_to_bytes(arr)
+    ins: FitIns = FitIns(Parameters(tensors=[arr_serialized], tensor_type=""), {})
+    client_instructions = [(c, ins) for c in clients]
+    on_result = MagicMock(side_effect=[ValueError("Cannot decode"), None])
+
+    # Execute
+    results, failures = fit_clients(client_instructions, None, None, on_result)
+
+    # Assert
+    assert on_result.call_count == 2
+    assert len(results) == 1
+    assert len(failures) == 1
+    assert isinstance(failures[0], ValueError)
+
+
 def test_eval_clients() -> None:
     """Test eval_clients."""
     # Prepare
@@ -169,3 +226,197 @@ def test_set_max_workers() -> None:
 
     # Assert
     assert server.max_workers == 42
+
+
+def test_set_dispatch_fns() -> None:
+    """Test that fit and evaluate dispatch functions can be replaced."""
+    # Prepare
+    server = Server(client_manager=SimpleClientManager())
+
+    def _fit_clients(*_: object) -> FitResultsAndFailures:
+        return [], []
+
+    def _evaluate_clients(*_: object) -> EvaluateResultsAndFailures:
+        return [], []
+
+    # Execute
+    server.set_dispatch_fns(
+        fit_clients_fn=_fit_clients, evaluate_clients_fn=_evaluate_clients
+    )
+
+    # Assert
+    assert server.fit_clients_fn is _fit_clients
+    assert server.evaluate_clients_fn is _evaluate_clients
+
+
+class RoundEventClient(SuccessClient):
+    """Test class setting an event once it trains in a given round."""
+
+    def __init__(self, cid: str, server_round: int) -> None:
+        super().__init__(cid)
+        self.server_round = server_round
+        self.event = threading.Event()
+
+    def fit(self, ins: FitIns, timeout: Optional[float]) -> FitRes:
+        """Set the event in the configured round and return a success FitRes."""
+        if ins.config["round"] == self.server_round:
+            self.event.set()
+        return super().fit(ins, timeout)
+
+
+def test_background_evaluation_overlaps_next_round() -> None:
+    """Test that centralized evaluation runs while the next round trains."""
+    # Prepare
+    client = RoundEventClient("0", server_round=2)
+    client_manager = SimpleClientManager()
+    client_manager.register(client)
+    overlapped: List[bool] = []
+
+    def evaluate(
+        server_round: int, ndarrays: NDArrays, config: Dict[str, Scalar]
+    ) -> Optional[Tuple[float, Dict[str, Scalar]]]:
+        # pylint: disable=unused-argument
+        if server_round == 1:
+            # Returns False if round 2 does not start before this evaluation ends
+            overlapped.append(client.event.wait(timeout=10.0))
+        return float(server_round), {"round": server_round}
+
+    strategy = FedAvg(
+        fraction_evaluate=0.0,
+        min_fit_clients=1,
+        min_available_clients=1,
+        evaluate_fn=evaluate,
+        on_fit_config_fn=lambda server_round: {"round": server_round},
+        initial_parameters=ndarrays_to_parameters([np.zeros(2)]),
+    )
+    server = Server(
+        client_manager=client_manager, strategy=strategy, background_evaluation=True
+    )
+
+    # Execute
+    history = server.fit(num_rounds=3, timeout=None)
+
+    # Assert
+    assert overlapped == [True]
+    assert history.losses_centralized == [(0, 0.0), (1, 1.0), (2, 2.0), (3, 3.0)]
+    assert history.metrics_centralized["round"] == [(0, 0), (1, 1), (2, 2), (3, 3)]
+
+
+def test_background_evaluation_failure_stops_training() -> None:
+    """Test that a failed background evaluation is raised and cleaned up."""
+    # Prepare
+    client_manager = SimpleClientManager()
+    client_manager.register(SuccessClient("0"))
+    fit_rounds: List[int] = []
+
+    def evaluate(
+        server_round: int, ndarrays: NDArrays, config: Dict[str, Scalar]
+    ) -> Optional[Tuple[float, Dict[str, Scalar]]]:
+        # pylint: disable=unused-argument
+        if server_round == 1:
+            raise ValueError("Evaluation failed")
+        return 0.0, {}
+
+    def on_fit_config(server_round: int) -> Dict[str, Scalar]:
+        fit_rounds.append(server_round)
+        return {}
+
+    strategy = FedAvg(
+        fraction_evaluate=0.0,
+        min_fit_clients=1,
+        min_available_clients=1,
+        evaluate_fn=evaluate,
+        on_fit_config_fn=on_fit_config,
+        initial_parameters=ndarrays_to_parameters([np.zeros(2)]),
+    )
+    server = Server(
+        client_manager=client_manager, strategy=strategy, background_evaluation=True
+    )
+
+    # Execute
+    with pytest.raises(ValueError, match="Evaluation failed"):
+        server.fit(num_rounds=5, timeout=None)
+
+    # Assert
+    assert fit_rounds in ([1], [1, 2])
+    assert server._evaluation is None  # pylint: disable=protected-access
+    assert server._evaluation_executor is None  # pylint: disable=protected-access
+
+
+def test_fit_round_records_dispatch_metrics() -> None:
+    """Test that the server keeps the dispatch metrics of each round."""
+    # Prepare
+    client_manager = SimpleClientManager()
+    for cid in ["0", "1", "2"]:
+        client_manager.register(SuccessClient(cid))
+    strategy = FedAvg(
+        min_fit_clients=3,
+        min_evaluate_clients=3,
+        min_available_clients=3,
+        initial_parameters=ndarrays_to_parameters([np.zeros(2)]),
+    )
+    server = Server(client_manager=client_manager, strategy=strategy)
+    server.set_max_workers(2)
+
+    # Execute
+    server.fit(num_rounds=2, timeout=None)
+    server.disconnect_all_clients(timeout=None)
+
+    # Assert
+    assert [(r, name) for r, name, _ in server.dispatch_metrics] == [
+        (1, "fit"),
+        (1, "evaluate"),
+        (2, "fit"),
+        (2, "evaluate"),
+    ]
+    for _, _, metrics in server.dispatch_metrics:
+        assert metrics.num_requests == 3
+        assert metrics.num_failures == 0
+
+
+def test_training_failure_does_not_wait_for_background_evaluation() -> None:
+    """Test that a failed round is raised while an evaluation is still running."""
+    # Prepare
+    client_manager = SimpleClientManager()
+    client_manager.register(SuccessClient("0"))
+    release = threading.Event()
+    finished = threading.Event()
+
+    def evaluate(
+        server_round: int, ndarrays: NDArrays, config: Dict[str, Scalar]
+    ) -> Optional[Tuple[float, Dict[str, Scalar]]]:
+        # pylint: disable=unused-argument
+        if server_round == 1:
+            release.wait(timeout=10.0)
+            finished.set()
+        return 0.0, {}
+
+    def on_fit_config(server_round: int) -> Dict[str, Scalar]:
+        if server_round == 2:
+            raise ValueError("Training failed")
+        return {}
+
+    strategy = FedAvg(
+        fraction_evaluate=0.0,
+        min_fit_clients=1,
+        min_available_clients=1,
+        evaluate_fn=evaluate,
+        on_fit_config_fn=on_fit_config,
+        initial_parameters=ndarrays_to_parameters([np.zeros(2)]),
+    )
+    server = Server(
+        client_manager=client_manager, strategy=strategy, background_evaluation=True
+    )
+
+    # Execute
+    try:
+        with pytest.raises(ValueError, match="Training failed"):
+            server.fit(num_rounds=3, timeout=None)
+        still_running = not finished.is_set()
+    finally:
+        release.set()
+
+    # Assert
+    assert still_running
+    assert server._evaluation is None  # pylint: disable=protected-access
+    assert server._evaluation_executor is None  # pylint: disable=protected-access
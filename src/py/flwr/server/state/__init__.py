@@ -19,10 +19,14 @@ from .in_memory_state import InMemoryState as InMemoryState
 from .sqlite_state import SqliteState as SqliteState
 from .state import State as State
 from .state_factory import StateFactory as StateFactory
+from .task_res_notifier import TaskResNotifier as TaskResNotifier
+from .task_sweeper import TaskSweeper as TaskSweeper
 
 __all__ = [
     "InMemoryState",
     "SqliteState",
     "State",
     "StateFactory",
+    "TaskResNotifier",
+    "TaskSweeper",
 ]
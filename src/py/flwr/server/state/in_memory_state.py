@@ -16,25 +16,54 @@
 
 
 import os
+import threading
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
 from logging import ERROR
-from typing import Dict, List, Optional, Set
+from typing import Deque, Dict, List, Optional, Set, Tuple, Union
 from uuid import UUID, uuid4
 
 from flwr.common import log, now
 from flwr.proto.task_pb2 import TaskIns, TaskRes
-from flwr.server.state.state import State
+from flwr.server.state.state import DEFAULT_TASK_TTL, State
+from flwr.server.state.task_res_notifier import TaskResNotifier
 from flwr.server.utils import validate_task_ins_or_res
 
 
 class InMemoryState(State):
-    """In-memory State implementation."""
-
-    def __init__(self) -> None:
+    """In-memory State implementation.
+
+    Undelivered TaskIns are kept in one FIFO queue per consumer node (anonymous
+    TaskIns share the queue with key `None`) and TaskRes are indexed by the
+    TaskIns they answer, so pulling and deleting tasks does not depend on the
+    total number of stored tasks. All methods are thread-safe.
+
+    Parameters
+    ----------
+    task_ttl : timedelta (default: 24 hours)
+        Time after which stored TaskIns and TaskRes expire and can be deleted
+        using `delete_expired_tasks`.
+    notifier : Optional[TaskResNotifier] (default: None)
+        If set, `notifier` is notified of each stored TaskRes.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        task_ttl: timedelta = DEFAULT_TASK_TTL,
+        notifier: Optional[TaskResNotifier] = None,
+    ) -> None:
+        self.task_ttl = task_ttl
+        self.notifier = notifier
         self.node_ids: Set[int] = set()
         self.workload_ids: Set[int] = set()
         self.task_ins_store: Dict[UUID, TaskIns] = {}
         self.task_res_store: Dict[UUID, TaskRes] = {}
+        # Undelivered TaskIns IDs, per consumer node_id (`None` if anonymous)
+        self.task_ins_queues: Dict[Optional[int], Deque[UUID]] = defaultdict(deque)
+        # TaskRes IDs, per ID (str) of the TaskIns they are a reply to
+        self.task_res_by_ancestry: Dict[str, List[UUID]] = defaultdict(list)
+        self.lock = threading.Lock()
 
     def store_task_ins(self, task_ins: TaskIns) -> Optional[UUID]:
         """Store one TaskIns."""
@@ -51,13 +80,16 @@ class InMemoryState(State):
         # Create task_id, created_at and ttl
         task_id = uuid4()
         created_at: datetime = now()
-        ttl: datetime = created_at + timedelta(hours=24)
+        ttl: datetime = created_at + self.task_ttl
 
         # Store TaskIns
         task_ins.task_id = str(task_id)
         task_ins.task.created_at = created_at.isoformat()
         task_ins.task.ttl = ttl.isoformat()
-        self.task_ins_store[task_id] = task_ins
+        with self.lock:
+            self.task_ins_store[task_id] = task_ins
+            if task_ins.task.delivered_at == "":
+                self.task_ins_queues[_consumer_key(task_ins)].append(task_id)
 
         # Return the new task_id
         return task_id
@@ -69,29 +101,21 @@ class InMemoryState(State):
         if limit is not None and limit < 1:
             raise AssertionError("`limit` must be >= 1")
 
-        # Find TaskIns for node_id that were not delivered yet
+        # Take TaskIns for node_id that were not delivered yet from its queue
         task_ins_list: List[TaskIns] = []
-        for _, task_ins in self.task_ins_store.items():
-            # pylint: disable=too-many-boolean-expressions
-            if (
-                node_id is not None  # Not anonymous
-                and task_ins.task.consumer.anonymous is False
-                and task_ins.task.consumer.node_id == node_id
-                and task_ins.task.delivered_at == ""
-            ) or (
-                node_id is None  # Anonymous
-                and task_ins.task.consumer.anonymous is True
-                and task_ins.task.consumer.node_id == 0
-                and task_ins.task.delivered_at == ""
-            ):
-                task_ins_list.append(task_ins)
-            if limit and len(task_ins_list) == limit:
-                break
-
-        # Mark all of them as delivered
         delivered_at = now().isoformat()
-        for task_ins in task_ins_list:
-            task_ins.task.delivered_at = delivered_at
+        with self.lock:
+            queue = self.task_ins_queues.get(node_id)
+            while queue and (limit is None or len(task_ins_list) < limit):
+                task_ins = self.task_ins_store.get(queue.popleft())
+                # Skip TaskIns which have been deleted in the meantime
+                if task_ins is None or task_ins.task.delivered_at != "":
+                    continue
+                # Mark as delivered
+                task_ins.task.delivered_at = delivered_at
+                task_ins_list.append(task_ins)
+            if queue is not None and not queue:
+                del self.task_ins_queues[node_id]
 
         # Return TaskIns
         return task_ins_list
@@ -112,13 +136,17 @@ class InMemoryState(State):
         # Create task_id, created_at and ttl
         task_id = uuid4()
         created_at: datetime = now()
-        ttl: datetime = created_at + timedelta(hours=24)
+        ttl: datetime = created_at + self.task_ttl
 
         # Store TaskRes
         task_res.task_id = str(task_id)
         task_res.task.created_at = created_at.isoformat()
         task_res.task.ttl = ttl.isoformat()
-        self.task_res_store[task_id] = task_res
+        with self.lock:
+            self.task_res_store[task_id] = task_res
+            self.task_res_by_ancestry[task_res.task.ancestry[0]].append(task_id)
+        if self.notifier is not None:
+            self.notifier.notify(task_res.task.ancestry[0])
 
         # Return the new task_id
         return task_id
@@ -130,43 +158,79 @@ class InMemoryState(State):
 
         # Find TaskRes that were not delivered yet
         task_res_list: List[TaskRes] = []
-        for _, task_res in self.task_res_store.items():
-            if (
-                UUID(task_res.task.ancestry[0]) in task_ids
-                and task_res.task.delivered_at == ""
-            ):
-                task_res_list.append(task_res)
-            if limit and len(task_res_list) == limit:
-                break
-
-        # Mark all of them as delivered
         delivered_at = now().isoformat()
-        for task_res in task_res_list:
-            task_res.task.delivered_at = delivered_at
+        with self.lock:
+            for task_ins_id in task_ids:
+                for task_res_id in self.task_res_by_ancestry.get(str(task_ins_id), []):
+                    task_res = self.task_res_store[task_res_id]
+                    if task_res.task.delivered_at == "":
+                        task_res_list.append(task_res)
+                    if limit and len(task_res_list) == limit:
+                        break
+                if limit and len(task_res_list) == limit:
+                    break
+
+            # Mark all of them as delivered
+            for task_res in task_res_list:
+                task_res.task.delivered_at = delivered_at
 
         # Return TaskRes
         return task_res_list
 
     def delete_tasks(self, task_ids: Set[UUID]) -> None:
         """Delete all delivered TaskIns/TaskRes pairs."""
-        task_ins_to_be_deleted: Set[UUID] = set()
-        task_res_to_be_deleted: Set[UUID] = set()
-
-        for task_ins_id in task_ids:
-            # Find the task_id of the matching task_res
-            for task_res_id, task_res in self.task_res_store.items():
-                if UUID(task_res.task.ancestry[0]) != task_ins_id:
-                    continue
-                if task_res.task.delivered_at == "":
+        with self.lock:
+            for task_ins_id in task_ids:
+                # Find the task_ids of the matching task_res
+                ancestry = str(task_ins_id)
+                delivered: List[UUID] = []
+                undelivered: List[UUID] = []
+                for task_res_id in self.task_res_by_ancestry.get(ancestry, []):
+                    if self.task_res_store[task_res_id].task.delivered_at == "":
+                        undelivered.append(task_res_id)
+                    else:
+                        delivered.append(task_res_id)
+                if not delivered:
                     continue
 
-                task_ins_to_be_deleted.add(task_ins_id)
-                task_res_to_be_deleted.add(task_res_id)
+                self.task_ins_store.pop(task_ins_id, None)
+                for task_res_id in delivered:
+                    del self.task_res_store[task_res_id]
+                if undelivered:
+                    self.task_res_by_ancestry[ancestry] = undelivered
+                else:
+                    del self.task_res_by_ancestry[ancestry]
+
+    def delete_expired_tasks(self, limit: Optional[int]) -> Tuple[int, int]:
+        """Delete TaskIns and TaskRes whose `ttl` has passed."""
+        if limit is not None and limit < 1:
+            raise AssertionError("`limit` must be >= 1")
 
-        for task_id in task_ins_to_be_deleted:
-            del self.task_ins_store[task_id]
-        for task_id in task_res_to_be_deleted:
-            del self.task_res_store[task_id]
+        # All tasks share the same TTL, so the insertion order of the stores is
+        # also the order in which tasks expire and the scan can stop early
+        current = now().isoformat()
+        with self.lock:
+            expired_ins = _expired(self.task_ins_store, current, limit)
+            consumer_keys: Set[Optional[int]] = set()
+            for task_id in expired_ins:
+                consumer_keys.add(_consumer_key(self.task_ins_store.pop(task_id)))
+            # Drop the IDs of deleted TaskIns from the head of their queues
+            for key in consumer_keys:
+                queue = self.task_ins_queues.get(key)
+                while queue and queue[0] not in self.task_ins_store:
+                    queue.popleft()
+                if queue is not None and not queue:
+                    del self.task_ins_queues[key]
+
+            expired_res = _expired(self.task_res_store, current, limit)
+            for task_id in expired_res:
+                ancestry = self.task_res_store.pop(task_id).task.ancestry[0]
+                siblings = self.task_res_by_ancestry[ancestry]
+                siblings.remove(task_id)
+                if not siblings:
+                    del self.task_res_by_ancestry[ancestry]
+
+        return len(expired_ins), len(expired_res)
 
     def num_task_ins(self) -> int:
         """Calculate the number of task_ins in store.
@@ -187,17 +251,19 @@ class InMemoryState(State):
         # Sample a random int64 as node_id
         node_id: int = int.from_bytes(os.urandom(8), "little", signed=True)
 
-        if node_id not in self.node_ids:
-            self.node_ids.add(node_id)
-            return node_id
+        with self.lock:
+            if node_id not in self.node_ids:
+                self.node_ids.add(node_id)
+                return node_id
         log(ERROR, "Unexpected node registration failure.")
         return 0
 
     def delete_node(self, node_id: int) -> None:
         """Delete a client node."""
-        if node_id not in self.node_ids:
-            raise ValueError(f"Node {node_id} not found")
-        self.node_ids.remove(node_id)
+        with self.lock:
+            if node_id not in self.node_ids:
+                raise ValueError(f"Node {node_id} not found")
+            self.node_ids.remove(node_id)
 
     def get_nodes(self, workload_id: int) -> Set[int]:
         """Return all available client nodes.
@@ -207,17 +273,40 @@ class InMemoryState(State):
         If the provided `workload_id` does not exist or has no matching nodes,
         an empty `Set` MUST be returned.
         """
-        if workload_id not in self.workload_ids:
-            return set()
-        return self.node_ids
+        with self.lock:
+            if workload_id not in self.workload_ids:
+                return set()
+            return set(self.node_ids)
 
     def create_workload(self) -> int:
         """Create one workload."""
         # Sample a random int64 as workload_id
         workload_id: int = int.from_bytes(os.urandom(8), "little", signed=True)
 
-        if workload_id not in self.workload_ids:
-            self.workload_ids.add(workload_id)
-            return workload_id
+        with self.lock:
+            if workload_id not in self.workload_ids:
+                self.workload_ids.add(workload_id)
+                return workload_id
         log(ERROR, "Unexpected workload creation failure.")
         return 0
+
+
+def _expired(
+    store: Union[Dict[UUID, TaskIns], Dict[UUID, TaskRes]],
+    current: str,
+    limit: Optional[int],
+) -> List[UUID]:
+    """Return the IDs of the oldest tasks in `store` that expired at `current`."""
+    task_ids: List[UUID] = []
+    for task_id, task in store.items():
+        if (limit is not None and len(task_ids) == limit) or task.task.ttl > current:
+            break
+        task_ids.append(task_id)
+    return task_ids
+
+
+def _consumer_key(task_ins: TaskIns) -> Optional[int]:
+    """Return the key of the queue a TaskIns is delivered from."""
+    if task_ins.task.consumer.anonymous:
+        return None
+    return task_ins.task.consumer.node_id
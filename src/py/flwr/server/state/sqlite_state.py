@@ -19,6 +19,7 @@ import os
 import re
 import sqlite3
 from datetime import datetime, timedelta
+from functools import lru_cache
 from logging import DEBUG, ERROR
 from typing import Any, Dict, List, Optional, Set, Tuple, Union, cast
 from uuid import UUID, uuid4
@@ -29,7 +30,8 @@ from flwr.proto.task_pb2 import Task, TaskIns, TaskRes
 from flwr.proto.transport_pb2 import ClientMessage, ServerMessage
 from flwr.server.utils.validator import validate_task_ins_or_res
 
-from .state import State
+from .state import DEFAULT_TASK_TTL, State
+from .task_res_notifier import TaskResNotifier
 
 SQL_CREATE_TABLE_NODE = """
 CREATE TABLE IF NOT EXISTS node(
@@ -82,6 +84,32 @@ CREATE TABLE IF NOT EXISTS task_res(
 );
 """
 
+SQL_CREATE_INDEX_TASK_INS_CONSUMER = """
+CREATE INDEX IF NOT EXISTS idx_task_ins_consumer
+ON task_ins (consumer_anonymous, consumer_node_id, delivered_at);
+"""
+
+SQL_CREATE_INDEX_TASK_INS_WORKLOAD = """
+CREATE INDEX IF NOT EXISTS idx_task_ins_workload_id ON task_ins (workload_id);
+"""
+
+SQL_CREATE_INDEX_TASK_RES_ANCESTRY = """
+CREATE INDEX IF NOT EXISTS idx_task_res_ancestry
+ON task_res (ancestry, delivered_at);
+"""
+
+SQL_CREATE_INDEX_TASK_RES_WORKLOAD = """
+CREATE INDEX IF NOT EXISTS idx_task_res_workload_id ON task_res (workload_id);
+"""
+
+SQL_CREATE_INDEX_TASK_INS_TTL = """
+CREATE INDEX IF NOT EXISTS idx_task_ins_ttl ON task_ins (ttl);
+"""
+
+SQL_CREATE_INDEX_TASK_RES_TTL = """
+CREATE INDEX IF NOT EXISTS idx_task_res_ttl ON task_res (ttl);
+"""
+
 DictOrTuple = Union[Tuple[Any], Dict[str, Any]]
 
 
@@ -91,6 +119,8 @@ class SqliteState(State):
     def __init__(
         self,
         database_path: str,
+        task_ttl: timedelta = DEFAULT_TASK_TTL,
+        notifier: Optional[TaskResNotifier] = None,
     ) -> None:
         """Initialize an SqliteState.
 
@@ -99,8 +129,15 @@ class SqliteState(State):
         database : (path-like object)
             The path to the database file to be opened. Pass ":memory:" to open
             a connection to a database that is in RAM, instead of on disk.
+        task_ttl : timedelta (default: 24 hours)
+            Time after which stored TaskIns and TaskRes expire and can be deleted
+            using `delete_expired_tasks`.
+        notifier : Optional[TaskResNotifier] (default: None)
+            If set, `notifier` is notified of each stored TaskRes.
         """
         self.database_path = database_path
+        self.task_ttl = task_ttl
+        self.notifier = notifier
         self.conn: Optional[sqlite3.Connection] = None
 
     def initialize(self, log_queries: bool = False) -> List[Tuple[str]]:
@@ -113,6 +150,11 @@ class SqliteState(State):
         """
         self.conn = sqlite3.connect(self.database_path)
         self.conn.execute("PRAGMA foreign_keys = ON;")
+        if self.database_path != ":memory:":
+            # Write-ahead logging lets readers proceed while another connection
+            # writes; with WAL, `synchronous = NORMAL` is still corruption-safe
+            self.conn.execute("PRAGMA journal_mode = WAL;")
+            self.conn.execute("PRAGMA synchronous = NORMAL;")
         self.conn.row_factory = dict_factory
         if log_queries:
             self.conn.set_trace_callback(lambda query: log(DEBUG, query))
@@ -123,6 +165,12 @@ class SqliteState(State):
         cur.execute(SQL_CREATE_TABLE_TASK_INS)
         cur.execute(SQL_CREATE_TABLE_TASK_RES)
         cur.execute(SQL_CREATE_TABLE_NODE)
+        cur.execute(SQL_CREATE_INDEX_TASK_INS_CONSUMER)
+        cur.execute(SQL_CREATE_INDEX_TASK_INS_WORKLOAD)
+        cur.execute(SQL_CREATE_INDEX_TASK_RES_ANCESTRY)
+        cur.execute(SQL_CREATE_INDEX_TASK_RES_WORKLOAD)
+        cur.execute(SQL_CREATE_INDEX_TASK_INS_TTL)
+        cur.execute(SQL_CREATE_INDEX_TASK_RES_TTL)
         res = cur.execute("SELECT name FROM sqlite_schema;")
 
         return res.fetchall()
@@ -140,7 +188,7 @@ class SqliteState(State):
             data = []
 
         # Clean up whitespace to make the logs nicer
-        query = re.sub(r"\s+", " ", query)
+        query = _clean_query(query)
 
         try:
             with self.conn:
@@ -188,7 +236,7 @@ class SqliteState(State):
         # Create task_id, created_at and ttl
         task_id = uuid4()
         created_at: datetime = now()
-        ttl: datetime = created_at + timedelta(hours=24)
+        ttl: datetime = created_at + self.task_ttl
 
         # Store TaskIns
         task_ins.task_id = str(task_id)
@@ -244,56 +292,31 @@ class SqliteState(State):
             )
             raise AssertionError(msg)
 
-        data: Dict[str, Union[str, int]] = {}
-
-        if node_id is None:
-            # Retrieve all anonymous Tasks
-            query = """
+        # Select and mark the TaskIns as delivered in a single statement. The query
+        # text does not depend on the arguments, so SQLite can reuse the prepared
+        # statement, and the `idx_task_ins_consumer` index avoids a full scan.
+        data: Dict[str, Union[str, int]] = {
+            "anonymous": node_id is None,
+            "node_id": 0 if node_id is None else node_id,
+            "delivered_at": now().isoformat(),
+            # A negative LIMIT means no limit in SQLite
+            "limit": -1 if limit is None else limit,
+        }
+        query = """
+            UPDATE task_ins
+            SET delivered_at = :delivered_at
+            WHERE task_id IN (
                 SELECT task_id
                 FROM task_ins
-                WHERE consumer_anonymous == 1
-                AND   consumer_node_id == 0
-                AND   delivered_at = ""
-            """
-        else:
-            # Retrieve all TaskIns for node_id
-            query = """
-                SELECT task_id
-                FROM task_ins
-                WHERE consumer_anonymous == 0
+                WHERE consumer_anonymous == :anonymous
                 AND   consumer_node_id == :node_id
                 AND   delivered_at = ""
-            """
-            data["node_id"] = node_id
-
-        if limit is not None:
-            query += " LIMIT :limit"
-            data["limit"] = limit
-
-        query += ";"
-
+                LIMIT :limit
+            )
+            RETURNING *;
+        """
         rows = self.query(query, data)
 
-        if rows:
-            # Prepare query
-            task_ids = [row["task_id"] for row in rows]
-            placeholders: str = ",".join([f":id_{i}" for i in range(len(task_ids))])
-            query = f"""
-                UPDATE task_ins
-                SET delivered_at = :delivered_at
-                WHERE task_id IN ({placeholders})
-                RETURNING *;
-            """
-
-            # Prepare data for query
-            delivered_at = now().isoformat()
-            data = {"delivered_at": delivered_at}
-            for index, task_id in enumerate(task_ids):
-                data[f"id_{index}"] = str(task_id)
-
-            # Run query
-            rows = self.query(query, data)
-
         result = [dict_to_task_ins(row) for row in rows]
 
         return result
@@ -323,7 +346,7 @@ class SqliteState(State):
         # Create task_id, created_at and ttl
         task_id = uuid4()
         created_at: datetime = now()
-        ttl: datetime = created_at + timedelta(hours=24)
+        ttl: datetime = created_at + self.task_ttl
 
         # Store TaskIns
         task_res.task_id = str(task_id)
@@ -341,6 +364,8 @@ class SqliteState(State):
             log(ERROR, "`workload` is invalid")
             return None
 
+        if self.notifier is not None:
+            self.notifier.notify(task_res.task.ancestry[0])
         return task_id
 
     def get_task_res(self, task_ids: Set[UUID], limit: Optional[int]) -> List[TaskRes]:
@@ -467,6 +492,36 @@ class SqliteState(State):
 
         return None
 
+    def delete_expired_tasks(self, limit: Optional[int]) -> Tuple[int, int]:
+        """Delete TaskIns and TaskRes whose `ttl` has passed."""
+        if limit is not None and limit < 1:
+            raise AssertionError("`limit` must be >= 1")
+
+        # `ttl` is stored as an ISO 8601 string in UTC, so comparing strings
+        # compares points in time
+        data = {"now": now().isoformat(), "limit": -1 if limit is None else limit}
+        query_1 = """
+            DELETE FROM task_ins
+            WHERE rowid IN (
+                SELECT rowid FROM task_ins WHERE ttl <= :now LIMIT :limit
+            );
+        """
+        query_2 = """
+            DELETE FROM task_res
+            WHERE rowid IN (
+                SELECT rowid FROM task_res WHERE ttl <= :now LIMIT :limit
+            );
+        """
+
+        if self.conn is None:
+            raise Exception("State not intitialized")
+
+        with self.conn:
+            num_task_ins = self.conn.execute(query_1, data).rowcount
+            num_task_res = self.conn.execute(query_2, data).rowcount
+
+        return num_task_ins, num_task_res
+
     def create_node(self) -> int:
         """Create, store in state, and return `node_id`."""
         # Sample a random int64 as node_id
@@ -520,6 +575,12 @@ class SqliteState(State):
         return 0
 
 
+@lru_cache(maxsize=256)
+def _clean_query(query: str) -> str:
+    """Collapse whitespace in a query (cached, most queries are constants)."""
+    return re.sub(r"\s+", " ", query)
+
+
 def dict_factory(
     cursor: sqlite3.Cursor,
     row: sqlite3.Row,
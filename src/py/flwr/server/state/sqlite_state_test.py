@@ -17,7 +17,7 @@
 
 import unittest
 
-from flwr.server.state.sqlite_state import task_ins_to_dict
+from flwr.server.state.sqlite_state import SqliteState, task_ins_to_dict
 from flwr.server.state.state_test import create_task_ins
 
 
@@ -51,6 +51,26 @@ class SqliteStateTest(unittest.TestCase):
         for key in expected_keys:
             assert key in result
 
+    def test_get_task_ins_uses_index(self) -> None:
+        """Check that pulling TaskIns for a node does not scan all TaskIns."""
+        # Prepare
+        state = SqliteState(":memory:")
+        state.initialize()
+
+        # Execute
+        rows = state.query(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT task_id FROM task_ins
+            WHERE consumer_anonymous == 0
+            AND consumer_node_id == 1
+            AND delivered_at = "";
+            """
+        )
+
+        # Assert
+        assert any("idx_task_ins_consumer" in row["detail"] for row in rows)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -16,11 +16,15 @@
 
 
 import abc
-from typing import List, Optional, Set
+from datetime import timedelta
+from typing import List, Optional, Set, Tuple
 from uuid import UUID
 
 from flwr.proto.task_pb2 import TaskIns, TaskRes
 
+# Time after which stored TaskIns and TaskRes expire
+DEFAULT_TASK_TTL = timedelta(hours=24)
+
 
 class State(abc.ABC):
     """Abstract State."""
@@ -131,6 +135,19 @@ class State(abc.ABC):
     def delete_tasks(self, task_ids: Set[UUID]) -> None:
         """Delete all delivered TaskIns/TaskRes pairs."""
 
+    @abc.abstractmethod
+    def delete_expired_tasks(self, limit: Optional[int]) -> Tuple[int, int]:
+        """Delete TaskIns and TaskRes whose `ttl` has passed.
+
+        Tasks are deleted regardless of whether they have been delivered or not.
+        Returns the number of deleted TaskIns and the number of deleted TaskRes.
+
+        Constraints
+        -----------
+        If `limit` is not `None`, delete, at most, `limit` TaskIns and, at most,
+        `limit` TaskRes. If `limit` is set, it has to be greater zero.
+        """
+
     @abc.abstractmethod
     def create_node(self) -> int:
         """Create, store in state, and return `node_id`."""
@@ -15,6 +15,9 @@
 """Factory class that creates State instances."""
 
 
+import threading
+import weakref
+from datetime import timedelta
 from logging import DEBUG
 from typing import Optional
 
@@ -22,27 +25,61 @@ from flwr.common.logger import log
 
 from .in_memory_state import InMemoryState
 from .sqlite_state import SqliteState
-from .state import State
+from .state import DEFAULT_TASK_TTL, State
+from .task_res_notifier import TaskResNotifier
 
 
 class StateFactory:
-    """Factory class that creates State instances."""
+    """Factory class that creates State instances.
 
-    def __init__(self, database: str) -> None:
+    SqliteState instances are created once per thread and reused for all subsequent
+    calls from the same thread, such that each thread keeps a persistent database
+    connection (SQLite connections cannot be shared between threads). The connection
+    is closed once its thread exits. All State instances share `notifier`, which is
+    notified whenever a TaskRes is stored.
+    """
+
+    def __init__(self, database: str, task_ttl: timedelta = DEFAULT_TASK_TTL) -> None:
         self.database = database
+        self.task_ttl = task_ttl
+        self.notifier = TaskResNotifier()
         self.state_instance: Optional[State] = None
+        self._thread_local = threading.local()
 
     def state(self) -> State:
         """Return a State instance and create it, if necessary."""
         # InMemoryState
         if self.database == ":flwr-in-memory-state:":
             if self.state_instance is None:
-                self.state_instance = InMemoryState()
+                self.state_instance = InMemoryState(
+                    task_ttl=self.task_ttl, notifier=self.notifier
+                )
             log(DEBUG, "Using InMemoryState")
             return self.state_instance
 
         # SqliteState
-        state = SqliteState(self.database)
-        state.initialize()
+        thread_state: Optional[_ThreadState] = getattr(
+            self._thread_local, "thread_state", None
+        )
+        if thread_state is None:
+            state = SqliteState(
+                self.database, task_ttl=self.task_ttl, notifier=self.notifier
+            )
+            state.initialize()
+            thread_state = _ThreadState(state)
+            self._thread_local.thread_state = thread_state
         log(DEBUG, "Using SqliteState")
-        return state
+        return thread_state.state
+
+
+class _ThreadState:
+    """SqliteState of a single thread, closing its connection when the thread exits.
+
+    Instances are only referenced by thread-local storage, which is cleared when its
+    thread exits, such that the connection is closed in the thread that opened it.
+    """
+
+    def __init__(self, state: SqliteState) -> None:
+        self.state = state
+        if state.conn is not None:
+            weakref.finalize(self, state.conn.close)
@@ -0,0 +1,117 @@
+# Copyright 2020 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for StateFactory."""
+# pylint: disable=no-self-use
+
+
+import sqlite3
+import tempfile
+import threading
+import unittest
+from typing import List
+
+from .in_memory_state import InMemoryState
+from .sqlite_state import SqliteState
+from .state import State
+from .state_factory import StateFactory
+
+
+class StateFactoryTest(unittest.TestCase):
+    """Test StateFactory."""
+
+    def setUp(self) -> None:
+        """Create a temporary database file."""
+        # pylint: disable-next=consider-using-with
+        self.tmp_file = tempfile.NamedTemporaryFile()
+
+    def tearDown(self) -> None:
+        """Remove the temporary database file."""
+        self.tmp_file.close()
+
+    def test_in_memory_state_is_shared(self) -> None:
+        """Test that all calls return the same InMemoryState."""
+        # Prepare
+        state_factory = StateFactory(":flwr-in-memory-state:")
+
+        # Execute
+        state_1 = state_factory.state()
+        state_2 = state_factory.state()
+
+        # Assert
+        assert isinstance(state_1, InMemoryState)
+        assert state_1 is state_2
+
+    def test_sqlite_state_is_reused_within_thread(self) -> None:
+        """Test that calls from the same thread reuse one SqliteState."""
+        # Prepare
+        state_factory = StateFactory(self.tmp_file.name)
+
+        # Execute
+        state_1 = state_factory.state()
+        state_2 = state_factory.state()
+
+        # Assert
+        assert isinstance(state_1, SqliteState)
+        assert state_1 is state_2
+
+    def test_sqlite_state_per_thread(self) -> None:
+        """Test that each thread gets its own SqliteState on the same database."""
+        # Prepare
+        state_factory = StateFactory(self.tmp_file.name)
+        states: List[State] = []
+        workload_id = state_factory.state().create_workload()
+
+        def _create_node() -> None:
+            state = state_factory.state()
+            state.create_node()
+            states.append(state)
+
+        # Execute
+        thread = threading.Thread(target=_create_node)
+        thread.start()
+        thread.join()
+
+        # Assert
+        assert len(states) == 1
+        assert states[0] is not state_factory.state()
+        assert len(state_factory.state().get_nodes(workload_id)) == 1
+
+    def test_sqlite_connection_closed_when_thread_exits(self) -> None:
+        """Test that the connection of a thread is closed once it exits."""
+        # Prepare
+        state_factory = StateFactory(self.tmp_file.name)
+        connections: List[sqlite3.Connection] = []
+
+        def _create_node() -> None:
+            state = state_factory.state()
+            state.create_node()
+            assert isinstance(state, SqliteState) and state.conn is not None
+            connections.append(state.conn)
+
+        # Execute
+        thread = threading.Thread(target=_create_node)
+        thread.start()
+        thread.join()
+
+        # Assert
+        assert len(connections) == 1
+        with self.assertRaises(sqlite3.ProgrammingError):
+            connections[0].execute("SELECT 1;")
+        # Connections of other threads stay open
+        state_factory.state().create_node()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -16,16 +16,18 @@
 # pylint: disable=no-self-use, invalid-name, disable=R0904
 
 import tempfile
+import threading
 import unittest
 from abc import abstractmethod
-from datetime import datetime, timezone
-from typing import List
-from uuid import uuid4
+from datetime import datetime, timedelta, timezone
+from typing import List, Set
+from uuid import UUID, uuid4
 
 from flwr.proto.node_pb2 import Node
 from flwr.proto.task_pb2 import Task, TaskIns, TaskRes
 from flwr.proto.transport_pb2 import ClientMessage, ServerMessage
 from flwr.server.state import InMemoryState, SqliteState, State
+from flwr.server.state.state import DEFAULT_TASK_TTL
 
 
 class StateTest(unittest.TestCase):
@@ -35,7 +37,7 @@ class StateTest(unittest.TestCase):
     __test__ = False
 
     @abstractmethod
-    def state_factory(self) -> State:
+    def state_factory(self, task_ttl: timedelta = DEFAULT_TASK_TTL) -> State:
         """Provide state implementation to test."""
         raise NotImplementedError()
 
@@ -414,6 +416,71 @@ class StateTest(unittest.TestCase):
         # Assert
         assert num == 2
 
+    def test_delete_expired_tasks(self) -> None:
+        """Test that expired TaskIns and TaskRes are deleted."""
+        # Prepare
+        state: State = self.state_factory(task_ttl=timedelta(0))
+        workload_id = state.create_workload()
+        task_ins_id = state.store_task_ins(
+            create_task_ins(consumer_node_id=0, anonymous=True, workload_id=workload_id)
+        )
+        state.store_task_res(
+            create_task_res(
+                producer_node_id=0,
+                anonymous=True,
+                ancestry=[str(task_ins_id)],
+                workload_id=workload_id,
+            )
+        )
+
+        # Execute
+        result = state.delete_expired_tasks(limit=None)
+
+        # Assert
+        assert result == (1, 1)
+        assert state.num_task_ins() == 0
+        assert state.num_task_res() == 0
+        assert not state.get_task_ins(node_id=None, limit=None)
+        assert task_ins_id is not None
+        assert not state.get_task_res(task_ids={task_ins_id}, limit=None)
+
+    def test_delete_expired_tasks_keeps_unexpired(self) -> None:
+        """Test that tasks whose ttl has not passed are kept."""
+        # Prepare
+        state: State = self.state_factory()
+        workload_id = state.create_workload()
+        state.store_task_ins(
+            create_task_ins(consumer_node_id=0, anonymous=True, workload_id=workload_id)
+        )
+
+        # Execute
+        result = state.delete_expired_tasks(limit=None)
+
+        # Assert
+        assert result == (0, 0)
+        assert len(state.get_task_ins(node_id=None, limit=None)) == 1
+
+    def test_delete_expired_tasks_limit(self) -> None:
+        """Test that at most `limit` expired tasks are deleted at once."""
+        # Prepare
+        state: State = self.state_factory(task_ttl=timedelta(0))
+        workload_id = state.create_workload()
+        for _ in range(3):
+            state.store_task_ins(
+                create_task_ins(
+                    consumer_node_id=0, anonymous=True, workload_id=workload_id
+                )
+            )
+
+        # Execute
+        result_0 = state.delete_expired_tasks(limit=2)
+        result_1 = state.delete_expired_tasks(limit=2)
+
+        # Assert
+        assert result_0 == (2, 0)
+        assert result_1 == (1, 0)
+        assert state.num_task_ins() == 0
+
 
 def create_task_ins(
     consumer_node_id: int,
@@ -470,9 +537,80 @@ class InMemoryStateTest(StateTest):
 
     __test__ = True
 
-    def state_factory(self) -> State:
+    def state_factory(self, task_ttl: timedelta = DEFAULT_TASK_TTL) -> State:
         """Return InMemoryState."""
-        return InMemoryState()
+        return InMemoryState(task_ttl=task_ttl)
+
+    def test_get_task_ins_fifo(self) -> None:
+        """Test that TaskIns are delivered in the order they were stored."""
+        # Prepare
+        state = self.state_factory()
+        workload_id = state.create_workload()
+        task_ids = [
+            state.store_task_ins(
+                create_task_ins(
+                    consumer_node_id=1, anonymous=False, workload_id=workload_id
+                )
+            )
+            for _ in range(5)
+        ]
+
+        # Execute
+        first = state.get_task_ins(node_id=1, limit=2)
+        rest = state.get_task_ins(node_id=1, limit=None)
+
+        # Assert
+        actual = [UUID(task_ins.task_id) for task_ins in first + rest]
+        assert actual == task_ids
+        assert not state.get_task_ins(node_id=1, limit=None)
+
+    def test_concurrent_store_and_get_task_ins(self) -> None:
+        """Test that concurrently stored TaskIns are delivered exactly once."""
+        # Prepare
+        state = self.state_factory()
+        workload_id = state.create_workload()
+        num_nodes, num_tasks_per_node = 8, 200
+        stored: List[UUID] = []
+        delivered: List[UUID] = []
+        stored_lock = threading.Lock()
+
+        def _store(node_id: int) -> None:
+            for _ in range(num_tasks_per_node):
+                task_id = state.store_task_ins(
+                    create_task_ins(
+                        consumer_node_id=node_id,
+                        anonymous=False,
+                        workload_id=workload_id,
+                    )
+                )
+                assert task_id is not None
+                with stored_lock:
+                    stored.append(task_id)
+
+        def _pull(node_id: int) -> None:
+            received: Set[UUID] = set()
+            while len(received) < num_tasks_per_node:
+                for task_ins in state.get_task_ins(node_id=node_id, limit=3):
+                    assert task_ins.task.consumer.node_id == node_id
+                    received.add(UUID(task_ins.task_id))
+            with stored_lock:
+                delivered.extend(received)
+
+        threads = [
+            threading.Thread(target=target, args=(node_id,), daemon=True)
+            for node_id in range(1, num_nodes + 1)
+            for target in (_store, _pull)
+        ]
+
+        # Execute
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+
+        # Assert
+        assert len(delivered) == len(set(delivered)) == num_nodes * num_tasks_per_node
+        assert set(delivered) == set(stored)
 
 
 class SqliteInMemoryStateTest(StateTest, unittest.TestCase):
@@ -480,9 +618,9 @@ class SqliteInMemoryStateTest(StateTest, unittest.TestCase):
 
     __test__ = True
 
-    def state_factory(self) -> SqliteState:
+    def state_factory(self, task_ttl: timedelta = DEFAULT_TASK_TTL) -> SqliteState:
         """Return SqliteState with in-memory database."""
-        state = SqliteState(":memory:")
+        state = SqliteState(":memory:", task_ttl=task_ttl)
         state.initialize()
         return state
 
@@ -495,7 +633,7 @@ class SqliteInMemoryStateTest(StateTest, unittest.TestCase):
         result = state.query("SELECT name FROM sqlite_schema;")
 
         # Assert
-        assert len(result) == 8
+        assert len(result) == 14
 
 
 class SqliteFileBasedTest(StateTest, unittest.TestCase):
@@ -503,11 +641,11 @@ class SqliteFileBasedTest(StateTest, unittest.TestCase):
 
     __test__ = True
 
-    def state_factory(self) -> SqliteState:
+    def state_factory(self, task_ttl: timedelta = DEFAULT_TASK_TTL) -> SqliteState:
         """Return SqliteState with file-based database."""
         # pylint: disable-next=consider-using-with,attribute-defined-outside-init
         self.tmp_file = tempfile.NamedTemporaryFile()
-        state = SqliteState(database_path=self.tmp_file.name)
+        state = SqliteState(database_path=self.tmp_file.name, task_ttl=task_ttl)
         state.initialize()
         return state
 
@@ -520,7 +658,7 @@ class SqliteFileBasedTest(StateTest, unittest.TestCase):
         result = state.query("SELECT name FROM sqlite_schema;")
 
         # Assert
-        assert len(result) == 8
+        assert len(result) == 14
 
 
 if __name__ == "__main__":
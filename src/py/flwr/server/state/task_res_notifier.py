@@ -0,0 +1,61 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Notification of threads waiting for TaskRes."""
+
+
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+
+class TaskResNotifier:
+    """Wake up threads waiting for the TaskRes of specific TaskIns.
+
+    State implementations call `notify` whenever they store a TaskRes. Waiting
+    threads `subscribe` to the IDs of the TaskIns they expect a reply to and
+    wait on the returned event, which is set as soon as a TaskRes for any of
+    these TaskIns was stored. The event only signals that the State should be
+    queried again, it does not carry the TaskRes itself.
+    """
+
+    def __init__(self) -> None:
+        self._events: Dict[str, List[threading.Event]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, task_ins_ids: Iterable[str]) -> threading.Event:
+        """Return an event that is set once a TaskRes for one of the TaskIns arrives."""
+        event = threading.Event()
+        with self._lock:
+            for task_ins_id in task_ins_ids:
+                self._events[task_ins_id].append(event)
+        return event
+
+    def unsubscribe(self, task_ins_ids: Iterable[str], event: threading.Event) -> None:
+        """Stop setting `event` for the given TaskIns."""
+        with self._lock:
+            for task_ins_id in task_ins_ids:
+                events = self._events.get(task_ins_id)
+                if events is None:
+                    continue
+                events.remove(event)
+                if not events:
+                    del self._events[task_ins_id]
+
+    def notify(self, task_ins_id: str) -> None:
+        """Signal that a TaskRes for `task_ins_id` was stored."""
+        with self._lock:
+            events = list(self._events.get(task_ins_id, []))
+        for event in events:
+            event.set()
@@ -0,0 +1,75 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for TaskResNotifier."""
+
+
+from .state_factory import StateFactory
+from .state_test import create_task_ins, create_task_res
+from .task_res_notifier import TaskResNotifier
+
+
+def test_notify_sets_subscribed_events() -> None:
+    """Test that only events subscribed to the TaskIns are set."""
+    # Prepare
+    notifier = TaskResNotifier()
+    event_0 = notifier.subscribe(["a", "b"])
+    event_1 = notifier.subscribe(["c"])
+
+    # Execute
+    notifier.notify("b")
+
+    # Assert
+    assert event_0.is_set()
+    assert not event_1.is_set()
+
+
+def test_unsubscribe() -> None:
+    """Test that unsubscribed events are no longer set."""
+    # Prepare
+    notifier = TaskResNotifier()
+    event = notifier.subscribe(["a"])
+
+    # Execute
+    notifier.unsubscribe(["a"], event)
+    notifier.notify("a")
+
+    # Assert
+    assert not event.is_set()
+
+
+def test_store_task_res_notifies() -> None:
+    """Test that State instances of a StateFactory notify stored TaskRes."""
+    for database in [":flwr-in-memory-state:", ":memory:"]:
+        # Prepare
+        state_factory = StateFactory(database)
+        state = state_factory.state()
+        workload_id = state.create_workload()
+        task_ins_id = state.store_task_ins(
+            create_task_ins(consumer_node_id=0, anonymous=True, workload_id=workload_id)
+        )
+        event = state_factory.notifier.subscribe([str(task_ins_id)])
+
+        # Execute
+        state.store_task_res(
+            create_task_res(
+                producer_node_id=0,
+                anonymous=True,
+                ancestry=[str(task_ins_id)],
+                workload_id=workload_id,
+            )
+        )
+
+        # Assert
+        assert event.is_set()
@@ -0,0 +1,129 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Background deletion of expired TaskIns and TaskRes."""
+
+
+import threading
+from logging import DEBUG, ERROR, INFO
+from typing import Dict, Optional, Tuple
+
+from flwr.common.logger import log
+
+from .state_factory import StateFactory
+
+
+class TaskSweeper:
+    """Periodically delete expired TaskIns and TaskRes from State.
+
+    Tasks which are never pulled (e.g., TaskIns for nodes that disappeared, or
+    TaskRes the Driver never asked for) are only removed once their `ttl` has
+    passed. The sweeper deletes them in batches of `batch_size`, so that other
+    users of the State are not blocked for long, and keeps counters that can be
+    read through `metrics`.
+
+    Parameters
+    ----------
+    state_factory : StateFactory
+        The factory providing the State to sweep. The sweeper obtains its State
+        from its own thread.
+    interval : float (default: 60.0)
+        Time in seconds between two sweeps.
+    batch_size : int (default: 1000)
+        Maximum number of TaskIns and TaskRes deleted per batch.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        state_factory: StateFactory,
+        interval: float = 60.0,
+        batch_size: int = 1000,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("`interval` must be > 0")
+        if batch_size < 1:
+            raise ValueError("`batch_size` must be >= 1")
+        self.state_factory = state_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self.num_sweeps = 0
+        self.num_task_ins_reaped = 0
+        self.num_task_res_reaped = 0
+        self.num_task_ins = 0
+        self.num_task_res = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sweep(self) -> Tuple[int, int]:
+        """Delete all expired tasks, return the number of deleted TaskIns/TaskRes."""
+        state = self.state_factory.state()
+        reaped_ins, reaped_res = 0, 0
+        while True:
+            num_ins, num_res = state.delete_expired_tasks(limit=self.batch_size)
+            reaped_ins += num_ins
+            reaped_res += num_res
+            if num_ins < self.batch_size and num_res < self.batch_size:
+                break
+
+        self.num_sweeps += 1
+        self.num_task_ins_reaped += reaped_ins
+        self.num_task_res_reaped += reaped_res
+        self.num_task_ins = state.num_task_ins()
+        self.num_task_res = state.num_task_res()
+        log(
+            INFO if reaped_ins or reaped_res else DEBUG,
+            "TaskSweeper: deleted %s expired TaskIns and %s expired TaskRes, "
+            "%s TaskIns and %s TaskRes remaining",
+            reaped_ins,
+            reaped_res,
+            self.num_task_ins,
+            self.num_task_res,
+        )
+        return reaped_ins, reaped_res
+
+    def metrics(self) -> Dict[str, int]:
+        """Return the number of reaped tasks and the size of the task stores."""
+        return {
+            "num_sweeps": self.num_sweeps,
+            "num_task_ins_reaped": self.num_task_ins_reaped,
+            "num_task_res_reaped": self.num_task_res_reaped,
+            "num_task_ins": self.num_task_ins,
+            "num_task_res": self.num_task_res,
+        }
+
+    def start(self) -> None:
+        """Start sweeping every `interval` seconds in a background thread."""
+        if self._thread is not None:
+            raise RuntimeError("TaskSweeper already started")
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and wait for the current sweep to finish."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as ex:  # pylint: disable=broad-except
+                # Keep sweeping, the next attempt might succeed (e.g., the
+                # SQLite database was locked)
+                log(ERROR, "TaskSweeper: sweep failed: %s", ex)
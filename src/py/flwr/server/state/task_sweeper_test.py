@@ -0,0 +1,116 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for TaskSweeper."""
+# pylint: disable=no-self-use
+
+
+import time
+import unittest
+from datetime import timedelta
+
+from .state_factory import StateFactory
+from .state_test import create_task_ins, create_task_res
+from .task_sweeper import TaskSweeper
+
+
+def _store_tasks(state_factory: StateFactory, num_tasks: int) -> None:
+    """Store `num_tasks` anonymous TaskIns, each with one TaskRes."""
+    state = state_factory.state()
+    workload_id = state.create_workload()
+    for _ in range(num_tasks):
+        task_ins_id = state.store_task_ins(
+            create_task_ins(consumer_node_id=0, anonymous=True, workload_id=workload_id)
+        )
+        state.store_task_res(
+            create_task_res(
+                producer_node_id=0,
+                anonymous=True,
+                ancestry=[str(task_ins_id)],
+                workload_id=workload_id,
+            )
+        )
+
+
+class TaskSweeperTest(unittest.TestCase):
+    """Test TaskSweeper."""
+
+    def test_sweep_in_batches(self) -> None:
+        """Test that a sweep deletes all expired tasks, one batch at a time."""
+        # Prepare
+        state_factory = StateFactory(":flwr-in-memory-state:", task_ttl=timedelta(0))
+        _store_tasks(state_factory, num_tasks=5)
+        sweeper = TaskSweeper(state_factory, batch_size=2)
+
+        # Execute
+        result = sweeper.sweep()
+
+        # Assert
+        assert result == (5, 5)
+        assert sweeper.metrics() == {
+            "num_sweeps": 1,
+            "num_task_ins_reaped": 5,
+            "num_task_res_reaped": 5,
+            "num_task_ins": 0,
+            "num_task_res": 0,
+        }
+
+    def test_sweep_keeps_unexpired(self) -> None:
+        """Test that a sweep keeps tasks whose ttl has not passed."""
+        # Prepare
+        state_factory = StateFactory(":memory:")
+        _store_tasks(state_factory, num_tasks=3)
+        sweeper = TaskSweeper(state_factory)
+
+        # Execute
+        result = sweeper.sweep()
+
+        # Assert
+        assert result == (0, 0)
+        assert sweeper.metrics()["num_task_ins"] == 3
+        assert sweeper.metrics()["num_task_res"] == 3
+
+    def test_start_and_stop(self) -> None:
+        """Test that the background thread sweeps until it is stopped."""
+        # Prepare
+        state_factory = StateFactory(":flwr-in-memory-state:", task_ttl=timedelta(0))
+        _store_tasks(state_factory, num_tasks=3)
+        sweeper = TaskSweeper(state_factory, interval=0.01)
+
+        # Execute
+        sweeper.start()
+        deadline = time.monotonic() + 5.0
+        while sweeper.num_sweeps == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        sweeper.stop()
+
+        # Assert
+        assert sweeper.num_sweeps > 0
+        assert sweeper.num_task_ins_reaped == 3
+        assert state_factory.state().num_task_ins() == 0
+
+    def test_invalid_arguments(self) -> None:
+        """Test that non-positive interval and batch size are rejected."""
+        # Prepare
+        state_factory = StateFactory(":flwr-in-memory-state:")
+
+        # Execute & Assert
+        with self.assertRaises(ValueError):
+            TaskSweeper(state_factory, interval=0)
+        with self.assertRaises(ValueError):
+            TaskSweeper(state_factory, batch_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -15,12 +15,18 @@
 """Aggregation functions for strategy implementations."""
 # mypy: disallow_untyped_calls=False
 
+from concurrent.futures import ThreadPoolExecutor
 from functools import reduce
-from typing import Any, Callable, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
+import numpy.typing as npt
 
-from flwr.common import NDArray, NDArrays
+from flwr.common import FlatNDArrays, NDArray, NDArrays
+from flwr.common.flat_ndarrays import flat_weights
+
+# Number of parameters per client processed at once when computing distances
+DISTANCE_BLOCK_SIZE = 2**16
 
 
 def aggregate(results: List[Tuple[NDArrays, int]]) -> NDArrays:
@@ -28,6 +34,17 @@ def aggregate(results: List[Tuple[NDArrays, int]]) -> NDArrays:
     # Calculate the total number of examples used during training
     num_examples_total = sum([num_examples for _, num_examples in results])
 
+    flat = flat_weights([weights for weights, _ in results])
+    if flat is not None:
+        # Average all parameters at once instead of layer by layer
+        weighted_buffers = [
+            weights.buffer * num_examples
+            for weights, (_, num_examples) in zip(flat, results)
+        ]
+        return flat[0].with_buffer(
+            reduce(np.add, weighted_buffers) / num_examples_total
+        )
+
     # Create a list of weights, each multiplied by the related number of examples
     weighted_weights = [
         [layer * num_examples for layer in weights] for weights, num_examples in results
@@ -41,45 +58,127 @@ def aggregate(results: List[Tuple[NDArrays, int]]) -> NDArrays:
     return weights_prime
 
 
-def aggregate_median(results: List[Tuple[NDArrays, int]]) -> NDArrays:
-    """Compute median."""
+class InplaceAggregator:
+    """Compute a weighted average by folding in one result at a time.
+
+    Unlike `aggregate`, which keeps a weighted copy of every result in memory
+    before summing them up, this accumulates each result into a single set of
+    preallocated float64 buffers and divides only once at the end. Peak memory
+    is therefore independent of the number of results.
+    """
+
+    def __init__(self) -> None:
+        self._buffers: Optional[FlatNDArrays] = None
+        self._dtypes: List[np.dtype[Any]] = []
+        self.num_examples_total: int = 0
+        self.num_results: int = 0
+
+    def add(self, ndarrays: NDArrays, num_examples: int) -> None:
+        """Fold the NDArrays of a single result into the running sum."""
+        if self._buffers is None:
+            self._buffers = FlatNDArrays(
+                np.zeros(sum(layer.size for layer in ndarrays), np.float64),
+                [layer.shape for layer in ndarrays],
+            )
+            self._dtypes = [layer.dtype for layer in ndarrays]
+        elif len(ndarrays) != len(self._buffers):
+            raise ValueError(
+                f"Expected {len(self._buffers)} layers, but got {len(ndarrays)}."
+            )
+        for buffer, layer in zip(self._buffers, ndarrays):
+            # Only a single layer-sized temporary is allocated at a time
+            buffer += layer * float(num_examples)
+        self.num_examples_total += num_examples
+        self.num_results += 1
+
+    def result(self) -> NDArrays:
+        """Return the weighted average of all results added so far.
+
+        Floating point layers keep the dtype they were received with, all other
+        layers are returned as float64 (the same as `aggregate`). If all layers end
+        up with the same dtype, they are returned as `FlatNDArrays`. The
+        aggregator is reset afterwards.
+        """
+        if self._buffers is None:
+            raise ValueError("Cannot compute the average of zero results.")
+        self._buffers.buffer /= self.num_examples_total
+        dtypes = [
+            dtype if np.issubdtype(dtype, np.floating) else np.dtype(np.float64)
+            for dtype in self._dtypes
+        ]
+        weights_prime: NDArrays
+        if len(set(dtypes)) == 1:
+            weights_prime = self._buffers.with_buffer(
+                self._buffers.buffer.astype(dtypes[0], copy=False)
+            )
+        else:
+            weights_prime = [
+                buffer.astype(dtype, copy=False)
+                for buffer, dtype in zip(self._buffers, dtypes)
+            ]
+        # The buffers have been handed out, start over
+        self._buffers = None
+        self._dtypes = []
+        self.num_examples_total = 0
+        self.num_results = 0
+        return weights_prime
+
+
+def aggregate_inplace(results: List[Tuple[NDArrays, int]]) -> NDArrays:
+    """Compute weighted average in place using `InplaceAggregator`."""
+    aggregator = InplaceAggregator()
+    for weights, num_examples in results:
+        aggregator.add(weights, num_examples)
+    return aggregator.result()
+
+
+def aggregate_median(
+    results: List[Tuple[NDArrays, int]],
+    block_bytes: Optional[int] = None,
+    num_threads: int = 1,
+) -> NDArrays:
+    """Compute median.
+
+    See `_reduce_columns` for `block_bytes` and `num_threads`.
+    """
     # Create a list of weights and ignore the number of examples
     weights = [weights for weights, _ in results]
 
-    # Compute median weight of each layer
+    # Compute median weight of each layer, or of all parameters at once
+    flat = flat_weights(weights)
+    layers = zip(*weights) if flat is None else [[w.buffer for w in flat]]
     median_w: NDArrays = [
-        np.median(np.asarray(layer), axis=0) for layer in zip(*weights)
+        _reduce_columns(
+            layer,
+            lambda block, _: np.median(block, axis=0),
+            block_bytes=block_bytes,
+            num_threads=num_threads,
+        )
+        for layer in layers
     ]
-    return median_w
+    return median_w if flat is None else flat[0].with_buffer(median_w[0])
 
 
 def aggregate_krum(
-    results: List[Tuple[NDArrays, int]], num_malicious: int, to_keep: int
+    results: List[Tuple[NDArrays, int]],
+    num_malicious: int,
+    to_keep: int,
+    distance_dtype: npt.DTypeLike = np.float64,
 ) -> NDArrays:
     """Choose one parameter vector according to the Krum function.
 
-    If to_keep is not None, then MultiKrum is applied.
+    If to_keep is not None, then MultiKrum is applied. Distances are computed
+    using `distance_dtype`, float32 is faster but less precise.
     """
     # Create a list of weights and ignore the number of examples
     weights = [weights for weights, _ in results]
 
     # Compute distances between vectors
-    distance_matrix = _compute_distances(weights)
-
-    # For each client, take the n-f-2 closest parameters vectors
-    num_closest = max(1, len(weights) - num_malicious - 2)
-    closest_indices = []
-    for i, _ in enumerate(distance_matrix):
-        closest_indices.append(
-            np.argsort(distance_matrix[i])[1 : num_closest + 1].tolist()  # noqa: E203
-        )
+    distance_matrix = _compute_distances(weights, dtype=distance_dtype)
 
     # Compute the score for each client, that is the sum of the distances
     # of the n-f-2 closest parameters vectors
-    scores = [
-        np.sum(distance_matrix[i, closest_indices[i]])
-        for i in range(len(distance_matrix))
-    ]
+    scores = _krum_scores(distance_matrix, num_malicious)
 
     if to_keep > 0:
         # Choose to_keep clients and return their average (MultiKrum)
@@ -96,6 +195,9 @@ def aggregate_bulyan(
     results: List[Tuple[NDArrays, int]],
     num_malicious: int,
     aggregation_rule: Callable,  # type: ignore
+    *,
+    block_bytes: Optional[int] = None,
+    num_threads: int = 1,
     **aggregation_rule_kwargs: Any,
 ) -> NDArrays:
     """Perform Bulyan aggregation.
@@ -108,6 +210,11 @@ def aggregate_bulyan(
         The maximum number of malicious clients.
     aggregation_rule: Callable
         Byzantine resilient aggregation rule used as the first step of the Bulyan
+    block_bytes: Optional[int] (default: None)
+        Block size of the coordinate-wise median and averaging steps, see
+        `_reduce_columns`.
+    num_threads: int (default: 1)
+        Number of threads of the coordinate-wise steps, see `_reduce_columns`.
     aggregation_rule_kwargs: Any
         The arguments to the aggregation rule.
 
@@ -134,42 +241,65 @@ def aggregate_bulyan(
     theta = len(results) - 2 * num_malicious
     beta = theta - 2 * num_malicious
 
-    for _ in range(theta):
-        best_model = aggregation_rule(
-            results=results, num_malicious=num_malicious, **aggregation_rule_kwargs
+    # Krum only depends on the pairwise distances, which do not change when a
+    # client is removed, so compute them once instead of once per selection
+    if aggregation_rule is aggregate_krum and not aggregation_rule_kwargs.get(
+        "to_keep"
+    ):
+        selected_models_set = _select_krum(
+            results,
+            num_malicious,
+            num_selected=theta,
+            distance_dtype=aggregation_rule_kwargs.get("distance_dtype", np.float64),
         )
-        list_of_weights = [weights for weights, num_samples in results]
-        # This group gives exact result
-        if aggregation_rule in byzantine_resilient_single_ret_model_aggregation:
-            best_idx = _find_reference_weights(best_model, list_of_weights)
-        # This group requires finding the closest model to the returned one
-        # (weights distance wise)
-        elif aggregation_rule in byzantine_resilient_many_return_models_aggregation:
-            # when different aggregation strategies available
-            # write a function to find the closest model
-            raise NotImplementedError(
-                "aggregate_bulyan currently does not support the aggregation rules that"
-                " return many models as results. "
-                "Such aggregation rules are currently not available in Flower."
+    else:
+        # Fingerprints of the models, computed at most once per model
+        fingerprints: Dict[int, bytes] = {}
+        results = list(results)
+        for _ in range(theta):
+            best_model = aggregation_rule(
+                results=results, num_malicious=num_malicious, **aggregation_rule_kwargs
             )
-        else:
-            raise ValueError(
-                "The given aggregation rule is not added as Byzantine resilient. "
-                "Please choose from Byzantine resilient rules."
-            )
-
-        selected_models_set.append(results[best_idx])
-
-        # remove idx from tracker and weights_results
-        results.pop(best_idx)
+            list_of_weights = [weights for weights, num_samples in results]
+            # This group gives exact result
+            if aggregation_rule in byzantine_resilient_single_ret_model_aggregation:
+                best_idx = _find_weights_index(
+                    best_model, list_of_weights, fingerprints
+                )
+            # This group requires finding the closest model to the returned one
+            # (weights distance wise)
+            elif aggregation_rule in byzantine_resilient_many_return_models_aggregation:
+                # when different aggregation strategies available
+                # write a function to find the closest model
+                raise NotImplementedError(
+                    "aggregate_bulyan currently does not support the aggregation "
+                    "rules that return many models as results. "
+                    "Such aggregation rules are currently not available in Flower."
+                )
+            else:
+                raise ValueError(
+                    "The given aggregation rule is not added as Byzantine resilient. "
+                    "Please choose from Byzantine resilient rules."
+                )
+
+            selected_models_set.append(results[best_idx])
+
+            # remove idx from tracker and weights_results
+            results.pop(best_idx)
 
     # Compute median parameter vector across selected_models_set
-    median_vect = aggregate_median(selected_models_set)
+    median_vect = aggregate_median(
+        selected_models_set, block_bytes=block_bytes, num_threads=num_threads
+    )
 
     # Take the averaged beta parameters of the closest distance to the median
     # (coordinate-wise)
     parameters_aggregated = _aggregate_n_closest_weights(
-        median_vect, selected_models_set, beta_closest=beta
+        median_vect,
+        selected_models_set,
+        beta_closest=beta,
+        block_bytes=block_bytes,
+        num_threads=num_threads,
     )
     return parameters_aggregated
 
@@ -186,35 +316,99 @@ def aggregate_qffl(
 ) -> NDArrays:
     """Compute weighted average based on Q-FFL paper."""
     demominator: float = np.sum(np.asarray(hs_fll))
-    scaled_deltas = []
-    for client_delta in deltas:
-        scaled_deltas.append([layer * 1.0 / demominator for layer in client_delta])
-    updates = []
-    for i in range(len(deltas[0])):
-        tmp = scaled_deltas[0][i]
-        for j in range(1, len(deltas)):
-            tmp += scaled_deltas[j][i]
-        updates.append(tmp)
-    new_parameters = [(u - v) * 1.0 for u, v in zip(parameters, updates)]
+    new_parameters = []
+    for layer, client_layers in zip(parameters, zip(*deltas)):
+        # Sum up the deltas of all clients first and scale the sum only once
+        update = np.array(
+            client_layers[0], dtype=np.result_type(*client_layers, demominator)
+        )
+        for client_layer in client_layers[1:]:
+            update += client_layer
+        update /= demominator
+        new_parameters.append(layer - update)
     return new_parameters
 
 
-def _compute_distances(weights: List[NDArrays]) -> NDArray:
+def _compute_distances(
+    weights: List[NDArrays],
+    dtype: npt.DTypeLike = np.float64,
+    block_size: int = DISTANCE_BLOCK_SIZE,
+) -> NDArray:
     """Compute distances between vectors.
 
     Input: weights - list of weights vectors
     Output: distances - matrix distance_matrix of squared distances between the vectors
+
+    The squared distances are obtained from the Gram matrix G of the vectors as
+    ||a - b||^2 = G[a, a] + G[b, b] - 2 * G[a, b]. G is accumulated over blocks of
+    `block_size` parameters of all clients at once (cast to `dtype`), so that no
+    flattened copy of the models is needed. Each block is centered on the mean of
+    all clients first: this does not change the distances, but avoids the loss of
+    precision of the formula above for models that are close to each other.
+    `FlatNDArrays` are processed in blocks of their buffers, across layers.
     """
-    flat_w = np.array([np.concatenate(p, axis=None).ravel() for p in weights])
-    distance_matrix = np.zeros((len(weights), len(weights)))
-    for i, _ in enumerate(flat_w):
-        for j, _ in enumerate(flat_w):
-            delta = flat_w[i] - flat_w[j]
-            norm = np.linalg.norm(delta)
-            distance_matrix[i, j] = norm**2
+    num_clients = len(weights)
+    gram = np.zeros((num_clients, num_clients), dtype=np.float64)
+    block_buffer = np.empty((num_clients, block_size), dtype=dtype)
+    flat = flat_weights(weights)
+    for layers in zip(*weights) if flat is None else [[w.buffer for w in flat]]:
+        flat_layers = [np.ravel(layer) for layer in layers]
+        layer_size = flat_layers[0].size
+        for start in range(0, layer_size, block_size):
+            stop = min(start + block_size, layer_size)
+            block = block_buffer[:, : stop - start]
+            for i, flat_layer in enumerate(flat_layers):
+                block[i] = flat_layer[start:stop]
+            block -= block.mean(axis=0)
+            gram += block @ block.T
+
+    squared_norms = np.diag(gram)
+    distance_matrix: NDArray = (
+        squared_norms[:, np.newaxis] + squared_norms[np.newaxis, :] - 2 * gram
+    )
+    # Remove rounding errors
+    np.fill_diagonal(distance_matrix, 0.0)
+    np.maximum(distance_matrix, 0.0, out=distance_matrix)
     return distance_matrix
 
 
+def _krum_scores(distance_matrix: NDArray, num_malicious: int) -> NDArray:
+    """Compute the Krum score of each client from the squared distances.
+
+    The score of a client is the sum of the distances to its n-f-2 closest neighbours
+    (the smallest distance, which is the client itself, is skipped).
+    """
+    num_closest = max(1, len(distance_matrix) - num_malicious - 2)
+    closest_distances = np.sort(distance_matrix, axis=1)[:, 1 : num_closest + 1]
+    scores: NDArray = np.sum(closest_distances, axis=1)
+    return scores
+
+
+def _select_krum(
+    results: List[Tuple[NDArrays, int]],
+    num_malicious: int,
+    num_selected: int,
+    distance_dtype: npt.DTypeLike = np.float64,
+) -> List[Tuple[NDArrays, int]]:
+    """Select `num_selected` results by repeatedly applying Krum.
+
+    Equivalent to calling `aggregate_krum` and removing the chosen result
+    `num_selected` times, but the distance matrix is only computed once. Removed
+    clients are masked out of it instead.
+    """
+    distance_matrix = _compute_distances(
+        [weights for weights, _ in results], dtype=distance_dtype
+    )
+    remaining = list(range(len(results)))
+    selected = []
+    for _ in range(num_selected):
+        scores = _krum_scores(
+            distance_matrix[np.ix_(remaining, remaining)], num_malicious
+        )
+        selected.append(results[remaining.pop(int(np.argmin(scores)))])
+    return selected
+
+
 def _trim_mean(array: NDArray, proportiontocut: float) -> NDArray:
     """Compute trimmed mean along axis=0.
 
@@ -239,24 +433,103 @@ def _trim_mean(array: NDArray, proportiontocut: float) -> NDArray:
 
 
 def aggregate_trimmed_avg(
-    results: List[Tuple[NDArrays, int]], proportiontocut: float
+    results: List[Tuple[NDArrays, int]],
+    proportiontocut: float,
+    block_bytes: Optional[int] = None,
+    num_threads: int = 1,
 ) -> NDArrays:
-    """Compute trimmed average."""
+    """Compute trimmed average.
+
+    See `_reduce_columns` for `block_bytes` and `num_threads`.
+    """
     # Create a list of weights and ignore the number of examples
     weights = [weights for weights, _ in results]
 
+    flat = flat_weights(weights)
+    layers = zip(*weights) if flat is None else [[w.buffer for w in flat]]
     trimmed_w: NDArrays = [
-        _trim_mean(np.asarray(layer), proportiontocut=proportiontocut)
-        for layer in zip(*weights)
+        _reduce_columns(
+            layer,
+            lambda block, _: _trim_mean(block, proportiontocut=proportiontocut),
+            block_bytes=block_bytes,
+            num_threads=num_threads,
+        )
+        for layer in layers
     ]
 
-    return trimmed_w
+    return trimmed_w if flat is None else flat[0].with_buffer(trimmed_w[0])
+
+
+def _reduce_columns(
+    layers: Sequence[NDArray],
+    reduce_fn: Callable[[NDArray, slice], NDArray],
+    block_bytes: Optional[int] = None,
+    num_threads: int = 1,
+) -> NDArray:
+    """Apply a coordinate-wise reduction across clients to one layer.
+
+    Parameters
+    ----------
+    layers: Sequence[NDArray]
+        The same layer of each client.
+    reduce_fn: Callable[[NDArray, slice], NDArray]
+        Function that reduces a (clients x columns) block of the flattened layers
+        to one value per column. It also receives the slice of columns the block
+        covers.
+    block_bytes: Optional[int] (default: None)
+        If given, the layer is processed in blocks of columns such that a block
+        of all clients takes at most `block_bytes` (but at least one column).
+        Otherwise, all clients' layers are stacked at once. Peak memory is about
+        `num_threads` times the block size plus what `reduce_fn` allocates.
+    num_threads: int (default: 1)
+        Number of threads processing blocks concurrently. NumPy releases the GIL
+        in most reductions, so this can speed up large layers.
+
+    Returns
+    -------
+    reduced: NDArray
+        The reduced layer, in the shape of the input layers.
+    """
+    flat_layers = [np.ravel(layer) for layer in layers]
+    layer_size = flat_layers[0].size
+    if block_bytes is None:
+        block_size = max(1, layer_size)
+    else:
+        bytes_per_column = np.result_type(*flat_layers).itemsize * len(flat_layers)
+        block_size = max(1, block_bytes // bytes_per_column)
+
+    def _reduce(start: int) -> NDArray:
+        columns = slice(start, start + block_size)
+        return reduce_fn(np.stack([layer[columns] for layer in flat_layers]), columns)
+
+    starts = range(0, max(1, layer_size), block_size)
+    first_block = _reduce(0)
+    if len(starts) == 1:
+        return first_block.reshape(layers[0].shape)
+
+    reduced = np.empty(layer_size, dtype=first_block.dtype)
+    reduced[:block_size] = first_block
+
+    def _reduce_into(start: int) -> None:
+        reduced[start : start + block_size] = _reduce(start)
+
+    if num_threads > 1:
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            # Consume the iterator to raise exceptions of the workers
+            list(executor.map(_reduce_into, starts[1:]))
+    else:
+        for start in starts[1:]:
+            _reduce_into(start)
+    return reduced.reshape(layers[0].shape)
 
 
 def _check_weights_equality(weights1: NDArrays, weights2: NDArrays) -> bool:
     """Check if weights are the same."""
     if len(weights1) != len(weights2):
         return False
+    flat = flat_weights([weights1, weights2])
+    if flat is not None:
+        return bool(np.array_equal(flat[0].buffer, flat[1].buffer))
     return all(
         np.array_equal(layer_weights1, layer_weights2)
         for layer_weights1, layer_weights2 in zip(weights1, weights2)
@@ -293,8 +566,49 @@ def _find_reference_weights(
     raise ValueError("The reference weights not found in list_of_weights.")
 
 
+def _weights_fingerprint(weights: NDArrays, samples_per_layer: int = 16) -> bytes:
+    """Compute a cheap content hash from evenly spaced values of each layer."""
+    fingerprint = []
+    for layer in weights:
+        indices = np.linspace(0, layer.size - 1, min(layer.size, samples_per_layer))
+        fingerprint.append(f"{layer.dtype.str}{layer.shape}".encode())
+        fingerprint.append(layer.flat[indices.astype(np.intp)].tobytes())
+    return b"".join(fingerprint)
+
+
+def _find_weights_index(
+    reference_weights: NDArrays,
+    list_of_weights: List[NDArrays],
+    fingerprints: Dict[int, bytes],
+) -> int:
+    """Find the index of the reference weights in the `list_of_weights`.
+
+    Same as `_find_reference_weights`, but the reference weights are looked up by
+    identity first and by a fingerprint of a few values per layer second, which is
+    cached by `id` of the weights in `fingerprints`. Only weights with a matching
+    fingerprint are compared elementwise, unless none matches (e.g., 0.0 and -0.0
+    are equal but have different fingerprints).
+    """
+    for idx, weights in enumerate(list_of_weights):
+        if weights is reference_weights:
+            return idx
+    reference_fingerprint = _weights_fingerprint(reference_weights)
+    for idx, weights in enumerate(list_of_weights):
+        if id(weights) not in fingerprints:
+            fingerprints[id(weights)] = _weights_fingerprint(weights)
+        if fingerprints[id(weights)] == reference_fingerprint and (
+            _check_weights_equality(reference_weights, weights)
+        ):
+            return idx
+    return _find_reference_weights(reference_weights, list_of_weights)
+
+
 def _aggregate_n_closest_weights(
-    reference_weights: NDArrays, results: List[Tuple[NDArrays, int]], beta_closest: int
+    reference_weights: NDArrays,
+    results: List[Tuple[NDArrays, int]],
+    beta_closest: int,
+    block_bytes: Optional[int] = None,
+    num_threads: int = 1,
 ) -> NDArrays:
     """Calculate element-wise mean of the `N` closest values.
 
@@ -310,6 +624,10 @@ def _aggregate_n_closest_weights(
         The weights from models
     beta_closest: int
         The number of the closest distance weights that will be averaged
+    block_bytes: Optional[int] (default: None)
+        See `_reduce_columns`.
+    num_threads: int (default: 1)
+        See `_reduce_columns`.
 
     Returns
     -------
@@ -321,20 +639,32 @@ def _aggregate_n_closest_weights(
     aggregated_weights = []
 
     for layer_id, layer_weights in enumerate(reference_weights):
-        other_weights_layer_list = []
-        for other_w in list_of_weights:
-            other_weights_layer = other_w[layer_id]
-            other_weights_layer_list.append(other_weights_layer)
-        other_weights_layer_np = np.array(other_weights_layer_list)
-        diff_np = np.abs(layer_weights - other_weights_layer_np)
-        # Create indices of the smallest differences
-        # We do not need the exact order but just the beta closest weights
-        # therefore np.argpartition is used instead of np.argsort
-        indices = np.argpartition(diff_np, kth=beta_closest - 1, axis=0)
-        # Take the weights (coordinate-wise) corresponding to the beta of the
-        # closest distances
-        beta_closest_weights = np.take_along_axis(
-            other_weights_layer_np, indices=indices, axis=0
-        )[:beta_closest]
-        aggregated_weights.append(np.mean(beta_closest_weights, axis=0))
+        flat_reference = np.ravel(layer_weights)
+
+        def _mean_of_closest(
+            other_weights_layer_np: NDArray,
+            columns: slice,
+            flat_reference: NDArray = flat_reference,
+        ) -> NDArray:
+            diff_np = np.abs(flat_reference[columns] - other_weights_layer_np)
+            # Create indices of the smallest differences
+            # We do not need the exact order but just the beta closest weights
+            # therefore np.argpartition is used instead of np.argsort
+            indices = np.argpartition(diff_np, kth=beta_closest - 1, axis=0)
+            # Take the weights (coordinate-wise) corresponding to the beta of the
+            # closest distances
+            beta_closest_weights = np.take_along_axis(
+                other_weights_layer_np, indices=indices, axis=0
+            )[:beta_closest]
+            mean: NDArray = np.mean(beta_closest_weights, axis=0)
+            return mean
+
+        aggregated_weights.append(
+            _reduce_columns(
+                [other_w[layer_id] for other_w in list_of_weights],
+                _mean_of_closest,
+                block_bytes=block_bytes,
+                num_threads=num_threads,
+            )
+        )
     return aggregated_weights
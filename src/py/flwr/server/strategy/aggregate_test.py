@@ -15,15 +15,29 @@
 """Aggregation function tests."""
 
 
-from typing import List, Tuple
+import copy
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+from unittest.mock import patch
 
 import numpy as np
 
+from flwr.common import FlatNDArrays, NDArrays
+
 from .aggregate import (
     _aggregate_n_closest_weights,
     _check_weights_equality,
+    _compute_distances,
     _find_reference_weights,
+    _find_weights_index,
+    _select_krum,
     aggregate,
+    aggregate_bulyan,
+    aggregate_inplace,
+    aggregate_krum,
+    aggregate_median,
+    aggregate_qffl,
+    aggregate_trimmed_avg,
     weighted_loss_avg,
 )
 
@@ -46,6 +60,50 @@ def test_aggregate() -> None:
     np.testing.assert_equal(expected, actual)
 
 
+def test_aggregate_inplace() -> None:
+    """Test in-place aggregation against the reference implementation."""
+    # Prepare
+    rng = np.random.default_rng(42)
+    results = [
+        (
+            [
+                rng.standard_normal((3, 4)).astype(np.float32),
+                rng.standard_normal(5).astype(np.float32),
+            ],
+            num_examples,
+        )
+        for num_examples in [1, 7, 3]
+    ]
+
+    # Execute
+    expected = aggregate(results)
+    actual = aggregate_inplace(results)
+
+    # Assert
+    for expected_layer, actual_layer in zip(expected, actual):
+        assert actual_layer.dtype == np.float32
+        np.testing.assert_allclose(actual_layer, expected_layer, rtol=1e-6)
+
+
+def test_aggregate_inplace_int() -> None:
+    """Test in-place aggregation of integer layers."""
+    # Prepare
+    results = [
+        ([np.array([[1, 2, 3], [4, 5, 6]]), np.array([7, 8, 9, 10])], 1),
+        ([np.array([[3, 4, 5], [6, 7, 8]]), np.array([7, 8, 9, 10])], 3),
+    ]
+    expected = [
+        np.array([[2.5, 3.5, 4.5], [5.5, 6.5, 7.5]]),
+        np.array([7.0, 8.0, 9.0, 10.0]),
+    ]
+
+    # Execute
+    actual = aggregate_inplace(results)
+
+    # Assert
+    np.testing.assert_equal(expected, actual)
+
+
 def test_weighted_loss_avg_single_value() -> None:
     """Test weighted loss averaging."""
     # Prepare
@@ -139,3 +197,217 @@ def test_aggregate_n_closest_weights_mean() -> None:
             for expected, result in zip(expected_averaged, beta_closest_weights)
         )
     )
+
+
+def _random_weights(num_clients: int) -> List[NDArrays]:
+    """Create models with two layers that are close to each other."""
+    rng = np.random.default_rng(42)
+    center = [rng.standard_normal((3, 7)) + 100.0, rng.standard_normal(11)]
+    return [
+        [layer + 0.01 * rng.standard_normal(layer.shape) for layer in center]
+        for _ in range(num_clients)
+    ]
+
+
+def test_compute_distances() -> None:
+    """Test that blockwise distances match the pairwise squared norms."""
+    # Prepare
+    weights = _random_weights(num_clients=6)
+    flat = [np.concatenate([layer.ravel() for layer in w]) for w in weights]
+    expected = np.array([[np.sum((a - b) ** 2) for b in flat] for a in flat])
+
+    # Execute
+    distances = _compute_distances(weights, block_size=4)
+    distances_float32 = _compute_distances(weights, dtype=np.float32, block_size=4)
+
+    # Assert
+    np.testing.assert_allclose(distances, expected, rtol=1e-9)
+    np.testing.assert_allclose(distances_float32, expected, rtol=1e-3)
+    assert np.all(np.diag(distances) == 0.0)
+
+
+def test_select_krum() -> None:
+    """Test that selection on the masked distance matrix matches repeated Krum."""
+    # Prepare
+    results = [(weights, 1) for weights in _random_weights(num_clients=11)]
+    remaining = list(results)
+    expected = []
+    for _ in range(7):
+        best = aggregate_krum(remaining, num_malicious=2, to_keep=0)
+        best_idx = _find_reference_weights(best, [w for w, _ in remaining])
+        expected.append(remaining.pop(best_idx))
+
+    # Execute
+    selected = _select_krum(results, num_malicious=2, num_selected=7)
+
+    # Assert
+    assert [id(weights) for weights, _ in selected] == [
+        id(weights) for weights, _ in expected
+    ]
+
+
+def test_aggregate_median_chunked() -> None:
+    """Test that blockwise median matches the median of the stacked layers."""
+    # Prepare
+    results = [(weights, 1) for weights in _random_weights(num_clients=7)]
+    expected = [
+        np.median(np.asarray(layer), axis=0)
+        for layer in zip(*[weights for weights, _ in results])
+    ]
+
+    # Execute
+    chunked = aggregate_median(results, block_bytes=7 * 8 * 3)
+    threaded = aggregate_median(results, block_bytes=7 * 8 * 3, num_threads=3)
+
+    # Assert
+    for expected_layer, chunked_layer, threaded_layer in zip(
+        expected, chunked, threaded
+    ):
+        assert chunked_layer.shape == expected_layer.shape
+        np.testing.assert_array_equal(chunked_layer, expected_layer)
+        np.testing.assert_array_equal(threaded_layer, expected_layer)
+
+
+def test_aggregate_trimmed_avg_chunked() -> None:
+    """Test that blockwise trimmed mean matches the unchunked result."""
+    # Prepare
+    results = [(weights, 1) for weights in _random_weights(num_clients=10)]
+    expected = aggregate_trimmed_avg(results, proportiontocut=0.2)
+
+    # Execute
+    chunked = aggregate_trimmed_avg(
+        results, proportiontocut=0.2, block_bytes=1, num_threads=2
+    )
+
+    # Assert
+    for expected_layer, chunked_layer in zip(expected, chunked):
+        assert chunked_layer.shape == expected_layer.shape
+        np.testing.assert_allclose(chunked_layer, expected_layer, rtol=1e-12)
+
+
+def test_aggregate_n_closest_weights_chunked() -> None:
+    """Test that blockwise averaging of the closest weights is unchanged."""
+    # Prepare
+    results = [(weights, 1) for weights in _random_weights(num_clients=8)]
+    reference = aggregate_median(results)
+    expected = _aggregate_n_closest_weights(reference, results, beta_closest=3)
+
+    # Execute
+    chunked = _aggregate_n_closest_weights(
+        reference, results, beta_closest=3, block_bytes=100, num_threads=2
+    )
+
+    # Assert
+    for expected_layer, chunked_layer in zip(expected, chunked):
+        np.testing.assert_allclose(chunked_layer, expected_layer, rtol=1e-12)
+
+
+def test_aggregate_qffl() -> None:
+    """Test that q-FFL aggregation matches scaling each delta separately."""
+    # Prepare
+    rng = np.random.default_rng(0)
+    parameters: NDArrays = [rng.standard_normal((3, 4)), rng.standard_normal(5)]
+    deltas = [
+        [rng.standard_normal(layer.shape) for layer in parameters] for _ in range(4)
+    ]
+    deltas_copy = [[layer.copy() for layer in delta] for delta in deltas]
+    hs_ffl = [[np.asarray(h)] for h in rng.uniform(1.0, 2.0, 4)]
+    demominator = np.sum(np.asarray(hs_ffl))
+    expected = [
+        layer - sum(delta[i] / demominator for delta in deltas)
+        for i, layer in enumerate(parameters)
+    ]
+
+    # Execute
+    actual = aggregate_qffl(parameters, deltas, hs_ffl)
+
+    # Assert
+    for expected_layer, actual_layer in zip(expected, actual):
+        np.testing.assert_allclose(actual_layer, expected_layer)
+    np.testing.assert_equal(deltas, deltas_copy)
+
+
+def test_flat_ndarrays_aggregation() -> None:
+    """Test that FlatNDArrays are aggregated like the corresponding NDArrays."""
+    # Prepare
+    rng = np.random.default_rng(0)
+    results: List[Tuple[NDArrays, int]] = [
+        ([rng.standard_normal((3, 4)), rng.standard_normal(5)], i + 1) for i in range(6)
+    ]
+    flat_results: List[Tuple[NDArrays, int]] = [
+        (FlatNDArrays.from_ndarrays(weights), num_examples)
+        for weights, num_examples in results
+    ]
+    aggregations: List[Callable[[List[Tuple[NDArrays, int]]], NDArrays]] = [
+        aggregate,
+        aggregate_inplace,
+        aggregate_median,
+        partial(aggregate_trimmed_avg, proportiontocut=0.2),
+    ]
+
+    for aggregation in aggregations:
+        # Execute
+        expected = aggregation(results)
+        actual = aggregation(flat_results)
+
+        # Assert
+        assert isinstance(actual, FlatNDArrays)
+        for expected_layer, actual_layer in zip(expected, actual):
+            np.testing.assert_allclose(actual_layer, expected_layer)
+
+    np.testing.assert_allclose(
+        _compute_distances([weights for weights, _ in flat_results], block_size=7),
+        _compute_distances([weights for weights, _ in results]),
+    )
+    assert _check_weights_equality(
+        flat_results[0][0], copy.deepcopy(flat_results[0][0])
+    )
+    assert not _check_weights_equality(flat_results[0][0], flat_results[1][0])
+
+
+def test_find_weights_index() -> None:
+    """Test that weights are found by identity, fingerprint or value."""
+    # Prepare
+    list_of_weights = _random_weights(num_clients=5)
+    fingerprints: Dict[int, bytes] = {}
+
+    with patch(
+        "flwr.server.strategy.aggregate._find_reference_weights",
+        wraps=_find_reference_weights,
+    ) as mock_find:
+        # Execute & Assert
+        assert (
+            _find_weights_index(list_of_weights[3], list_of_weights, fingerprints) == 3
+        )
+        assert not fingerprints
+        reference = copy.deepcopy(list_of_weights[2])
+        assert _find_weights_index(reference, list_of_weights, fingerprints) == 2
+        assert len(fingerprints) == 3
+        assert mock_find.call_count == 0
+
+        # 0.0 and -0.0 are equal, but have different fingerprints
+        list_of_weights[4][1][0] = 0.0
+        reference = copy.deepcopy(list_of_weights[4])
+        reference[1][0] = -0.0
+        assert _find_weights_index(reference, list_of_weights, {}) == 4
+        assert mock_find.call_count == 1
+
+
+def test_aggregate_bulyan_multikrum_selection() -> None:
+    """Test that Bulyan selects the same models with Krum and MultiKrum(1)."""
+    # Prepare
+    results = [(weights, 1) for weights in _random_weights(num_clients=11)]
+    results_copy = list(results)
+    expected = aggregate_bulyan(
+        results, num_malicious=2, aggregation_rule=aggregate_krum
+    )
+
+    # Execute
+    actual = aggregate_bulyan(
+        results, num_malicious=2, aggregation_rule=aggregate_krum, to_keep=1
+    )
+
+    # Assert
+    assert results == results_copy
+    for expected_layer, actual_layer in zip(expected, actual):
+        np.testing.assert_allclose(actual_layer, expected_layer)
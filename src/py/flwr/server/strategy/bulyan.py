@@ -28,13 +28,13 @@ from flwr.common import (
     Parameters,
     Scalar,
     ndarrays_to_parameters,
-    parameters_to_ndarrays,
 )
 from flwr.common.logger import log
+from flwr.common.parameter import reply_tensor_type
 from flwr.server.client_proxy import ClientProxy
 
 from .aggregate import aggregate_bulyan, aggregate_krum
-from .fedavg import FedAvg
+from .fedavg import FedAvg, discard_prefetched
 
 
 # flake8: noqa: E501
@@ -70,6 +70,16 @@ class Bulyan(FedAvg):
         Initial global model parameters.
     first_aggregation_rule: Callable
         Byzantine resilient aggregation rule that is used as the first step of the Bulyan (e.g., Krum)
+    block_bytes : Optional[int], optional
+        If given, the coordinate-wise steps aggregate each layer in blocks of
+        columns of at most this many bytes (over all clients). Defaults to None.
+    num_threads : int, optional
+        Number of threads aggregating blocks concurrently. Defaults to 1.
+    inplace : bool, optional
+        Enable (True) or disable (False) in-place aggregation of model updates,
+        see `FedAvg`. Defaults to False.
+    decode_workers : Optional[int], optional
+        Number of threads decoding model updates, see `FedAvg`. Defaults to None.
     **aggregation_rule_kwargs: Any
         arguments to the first_aggregation rule
     """
@@ -97,6 +107,10 @@ class Bulyan(FedAvg):
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         first_aggregation_rule: Callable = aggregate_krum,  # type: ignore
+        block_bytes: Optional[int] = None,
+        num_threads: int = 1,
+        inplace: bool = False,
+        decode_workers: Optional[int] = None,
         **aggregation_rule_kwargs: Any,
     ) -> None:
         super().__init__(
@@ -112,9 +126,13 @@ class Bulyan(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            inplace=inplace,
+            decode_workers=decode_workers,
         )
         self.num_malicious_clients = num_malicious_clients
         self.first_aggregation_rule = first_aggregation_rule
+        self.block_bytes = block_bytes
+        self.num_threads = num_threads
         self.aggregation_rule_kwargs = aggregation_rule_kwargs
 
     def __repr__(self) -> str:
@@ -122,6 +140,7 @@ class Bulyan(FedAvg):
         rep = f"Bulyan(accept_failures={self.accept_failures})"
         return rep
 
+    @discard_prefetched
     def aggregate_fit(
         self,
         server_round: int,
@@ -136,10 +155,7 @@ class Bulyan(FedAvg):
             return None, {}
 
         # Convert results
-        weights_results = [
-            (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
-            for _, fit_res in results
-        ]
+        weights_results = self._decode_fit_results(results)
 
         # Aggregate weights
         parameters_aggregated = ndarrays_to_parameters(
@@ -147,8 +163,11 @@ class Bulyan(FedAvg):
                 weights_results,
                 self.num_malicious_clients,
                 self.first_aggregation_rule,
+                block_bytes=self.block_bytes,
+                num_threads=self.num_threads,
                 **self.aggregation_rule_kwargs,
-            )
+            ),
+            tensor_type=reply_tensor_type(results[0][1].parameters.tensor_type),
         )
 
         # Aggregate custom metrics if aggregation fn was provided
@@ -22,7 +22,11 @@ from typing import Dict, List, Optional, Tuple, Union
 
 from flwr.common import EvaluateIns, EvaluateRes, FitIns, FitRes, Parameters, Scalar
 from flwr.common.dp import add_gaussian_noise
-from flwr.common.parameter import ndarrays_to_parameters, parameters_to_ndarrays
+from flwr.common.parameter import (
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+    reply_tensor_type,
+)
 from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
 from flwr.server.strategy.strategy import Strategy
@@ -154,7 +158,8 @@ class DPFedAvgFixed(Strategy):
                 add_gaussian_noise(
                     parameters_to_ndarrays(fit_res.parameters),
                     self._calc_client_noise_stddev(),
-                )
+                ),
+                tensor_type=reply_tensor_type(fit_res.parameters.tensor_type),
             )
 
         return self.strategy.aggregate_fit(server_round, results, failures)
@@ -26,19 +26,28 @@ from flwr.common import (
     Parameters,
     Scalar,
     ndarrays_to_parameters,
-    parameters_to_ndarrays,
 )
 from flwr.common.logger import log
+from flwr.common.parameter import reply_tensor_type
 from flwr.server.client_proxy import ClientProxy
 
 from .aggregate import aggregate, weighted_loss_avg
-from .fedavg import FedAvg
+from .fedavg import FedAvg, discard_prefetched
 
 
 class FaultTolerantFedAvg(FedAvg):
-    """Configurable fault-tolerant FedAvg strategy implementation."""
-
-    # pylint: disable=too-many-arguments,too-many-instance-attributes
+    """Configurable fault-tolerant FedAvg strategy implementation.
+
+    Parameters
+    ----------
+    inplace : bool, optional
+        Enable (True) or disable (False) in-place aggregation of model updates,
+        see `FedAvg`. Defaults to False.
+    decode_workers : Optional[int], optional
+        Number of threads decoding model updates, see `FedAvg`. Defaults to None.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes,too-many-locals
     def __init__(
         self,
         *,
@@ -60,6 +69,8 @@ class FaultTolerantFedAvg(FedAvg):
         initial_parameters: Optional[Parameters] = None,
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
+        inplace: bool = False,
+        decode_workers: Optional[int] = None,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -74,6 +85,8 @@ class FaultTolerantFedAvg(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            inplace=inplace,
+            decode_workers=decode_workers,
         )
         self.completion_rate_fit = min_completion_rate_fit
         self.completion_rate_evaluate = min_completion_rate_evaluate
@@ -82,6 +95,7 @@ class FaultTolerantFedAvg(FedAvg):
         """Compute a string representation of the strategy."""
         return "FaultTolerantFedAvg()"
 
+    @discard_prefetched
     def aggregate_fit(
         self,
         server_round: int,
@@ -98,11 +112,11 @@ class FaultTolerantFedAvg(FedAvg):
             return None, {}
 
         # Convert results
-        weights_results = [
-            (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
-            for client, fit_res in results
-        ]
-        parameters_aggregated = ndarrays_to_parameters(aggregate(weights_results))
+        weights_results = self._decode_fit_results(results)
+        parameters_aggregated = ndarrays_to_parameters(
+            aggregate(weights_results),
+            tensor_type=reply_tensor_type(results[0][1].parameters.tensor_type),
+        )
 
         # Aggregate custom metrics if aggregation fn was provided
         metrics_aggregated = {}
@@ -31,10 +31,11 @@ from flwr.common import (
     Parameters,
     Scalar,
     ndarrays_to_parameters,
-    parameters_to_ndarrays,
 )
+from flwr.common.parameter import reply_tensor_type
 from flwr.server.client_proxy import ClientProxy
 
+from .fedavg import discard_prefetched
 from .fedopt import FedOpt
 
 
@@ -76,8 +77,16 @@ class FedAdagrad(FedOpt):
         Client-side learning rate. Defaults to 1e-1.
     tau : float, optional
         Controls the algorithm's degree of adaptability. Defaults to 1e-9.
+    inplace : bool, optional
+        Enable (True) or disable (False) in-place aggregation of model updates,
+        see `FedAvg`. Defaults to False.
+    decode_workers : Optional[int], optional
+        Number of threads decoding model updates, see `FedAvg`. Defaults to None.
     """
 
+    # `aggregate_fit` aggregates through `_aggregate_fit_ndarrays`
+    _accumulates_fit = True
+
     # pylint: disable=too-many-arguments,too-many-locals,too-many-instance-attributes
     def __init__(
         self,
@@ -102,6 +111,8 @@ class FedAdagrad(FedOpt):
         eta: float = 1e-1,
         eta_l: float = 1e-1,
         tau: float = 1e-9,
+        inplace: bool = False,
+        decode_workers: Optional[int] = None,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -121,6 +132,8 @@ class FedAdagrad(FedOpt):
             beta_1=0.0,
             beta_2=0.0,
             tau=tau,
+            inplace=inplace,
+            decode_workers=decode_workers,
         )
 
     def __repr__(self) -> str:
@@ -128,6 +141,7 @@ class FedAdagrad(FedOpt):
         rep = f"FedAdagrad(accept_failures={self.accept_failures})"
         return rep
 
+    @discard_prefetched
     def aggregate_fit(
         self,
         server_round: int,
@@ -135,37 +149,28 @@ class FedAdagrad(FedOpt):
         failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
     ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
         """Aggregate fit results using weighted average."""
-        fedavg_parameters_aggregated, metrics_aggregated = super().aggregate_fit(
+        fedavg_weights_aggregate, metrics_aggregated = self._aggregate_fit_ndarrays(
             server_round=server_round, results=results, failures=failures
         )
-        if fedavg_parameters_aggregated is None:
+        if fedavg_weights_aggregate is None:
             return None, {}
 
-        fedavg_weights_aggregate = parameters_to_ndarrays(fedavg_parameters_aggregated)
-
         # Adagrad
-        delta_t: NDArrays = [
-            x - y for x, y in zip(fedavg_weights_aggregate, self.current_weights)
-        ]
+        delta_t = self._compute_delta(fedavg_weights_aggregate)
 
         # m_t
-        if not self.m_t:
-            self.m_t = [np.zeros_like(x) for x in delta_t]
-        self.m_t = [
-            np.multiply(self.beta_1, x) + (1 - self.beta_1) * y
-            for x, y in zip(self.m_t, delta_t)
-        ]
+        self._update_first_moment(delta_t)
 
         # v_t
-        if not self.v_t:
-            self.v_t = [np.zeros_like(x) for x in delta_t]
-        self.v_t = [x + np.multiply(y, y) for x, y in zip(self.v_t, delta_t)]
+        _, v_t, scratch = self._optimizer_state()
+        for moment, delta, tmp in zip(v_t, delta_t, scratch):
+            np.multiply(delta, delta, out=tmp)
+            moment += tmp
 
-        new_weights = [
-            x + self.eta * y / (np.sqrt(z) + self.tau)
-            for x, y, z in zip(self.current_weights, self.m_t, self.v_t)
-        ]
+        self._update_weights(delta_t)
 
-        self.current_weights = new_weights
-
-        return ndarrays_to_parameters(self.current_weights), metrics_aggregated
+        parameters_aggregated = ndarrays_to_parameters(
+            self.current_weights,
+            tensor_type=reply_tensor_type(results[0][1].parameters.tensor_type),
+        )
+        return parameters_aggregated, metrics_aggregated
@@ -18,8 +18,9 @@ Paper: arxiv.org/abs/1602.05629
 """
 
 
+from functools import wraps
 from logging import WARNING
-from typing import Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union, cast
 
 from flwr.common import (
     EvaluateIns,
@@ -34,10 +35,12 @@ from flwr.common import (
     parameters_to_ndarrays,
 )
 from flwr.common.logger import log
+from flwr.common.parameter import reply_tensor_type
 from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
 
-from .aggregate import aggregate, weighted_loss_avg
+from .aggregate import InplaceAggregator, aggregate, weighted_loss_avg
+from .parameters_decoder import ParametersDecoder
 from .strategy import Strategy
 
 WARNING_MIN_AVAILABLE_CLIENTS_TOO_LOW = """
@@ -47,6 +50,28 @@ connected to the server. `min_available_clients` must be set to a value larger
 than or equal to the values of `min_fit_clients` and `min_evaluate_clients`.
 """
 
+AggregateFitFn = TypeVar("AggregateFitFn", bound=Callable[..., Any])
+
+
+def discard_prefetched(aggregate_fit: AggregateFitFn) -> AggregateFitFn:
+    """Discard the parameters prefetched for a round once it was aggregated.
+
+    Decorates `aggregate_fit` of strategies decoding results with
+    `_decode_fit_results`, so that prefetched parameters and the running sum of
+    `accumulate_fit` are also released if it returns early, e.g., because failures
+    are not accepted.
+    """
+
+    @wraps(aggregate_fit)
+    def wrapper(self: "FedAvg", *args: Any, **kwargs: Any) -> Any:
+        try:
+            return aggregate_fit(self, *args, **kwargs)
+        finally:
+            self._decoder.clear()  # pylint: disable=protected-access
+            self._reset_accumulator(0)  # pylint: disable=protected-access
+
+    return cast(AggregateFitFn, wrapper)
+
 
 # pylint: disable=line-too-long
 class FedAvg(Strategy):
@@ -84,9 +109,24 @@ class FedAvg(Strategy):
         Metrics aggregation function, optional.
     evaluate_metrics_aggregation_fn : Optional[MetricsAggregationFn]
         Metrics aggregation function, optional.
+    inplace : bool (default: False)
+        Enable (True) or disable (False) in-place aggregation of model updates.
+        In-place aggregation folds each update into a single running sum, as soon
+        as it is received, instead of keeping all decoded updates in memory.
+    decode_workers : Optional[int] (default: None)
+        Number of threads decoding model updates. Updates that are not aggregated
+        in place are decoded concurrently and, from the second round on, as soon
+        as they are received. `None` uses the `ThreadPoolExecutor` default, `0`
+        decodes all updates sequentially.
     """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes, line-too-long
+
+    # Whether `aggregate_fit` of the class defining it aggregates through
+    # `_aggregate_fit_ndarrays`, i.e., uses the results folded in on arrival.
+    # Subclasses overriding `aggregate_fit` have to opt in again.
+    _accumulates_fit = True
+
     def __init__(
         self,
         *,
@@ -107,6 +147,8 @@ class FedAvg(Strategy):
         initial_parameters: Optional[Parameters] = None,
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
+        inplace: bool = False,
+        decode_workers: Optional[int] = None,
     ) -> None:
         super().__init__()
 
@@ -128,6 +170,11 @@ class FedAvg(Strategy):
         self.initial_parameters = initial_parameters
         self.fit_metrics_aggregation_fn = fit_metrics_aggregation_fn
         self.evaluate_metrics_aggregation_fn = evaluate_metrics_aggregation_fn
+        self.inplace = inplace
+        self._accumulated_round = 0
+        self._accumulated_fit_res: Set[int] = set()
+        self._aggregator = InplaceAggregator()
+        self._decoder = ParametersDecoder(max_workers=decode_workers)
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
@@ -213,6 +260,7 @@ class FedAvg(Strategy):
         # Return client/config pairs
         return [(client, evaluate_ins) for client in clients]
 
+    @discard_prefetched
     def aggregate_fit(
         self,
         server_round: int,
@@ -220,18 +268,42 @@ class FedAvg(Strategy):
         failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
     ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
         """Aggregate fit results using weighted average."""
+        aggregated_ndarrays, metrics_aggregated = self._aggregate_fit_ndarrays(
+            server_round, results, failures
+        )
+        if aggregated_ndarrays is None:
+            return None, {}
+
+        # Reply in the serialization format chosen by the clients, if possible
+        parameters_aggregated = ndarrays_to_parameters(
+            aggregated_ndarrays,
+            tensor_type=reply_tensor_type(results[0][1].parameters.tensor_type),
+        )
+        return parameters_aggregated, metrics_aggregated
+
+    def _aggregate_fit_ndarrays(
+        self,
+        server_round: int,
+        results: List[Tuple[ClientProxy, FitRes]],
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[NDArrays], Dict[str, Scalar]]:
+        """Aggregate fit results using weighted average, without serializing them.
+
+        The returned NDArrays are newly allocated, so callers may modify them.
+        """
         if not results:
             return None, {}
         # Do not aggregate if there are failures and failures are not accepted
         if not self.accept_failures and failures:
             return None, {}
 
-        # Convert results
-        weights_results = [
-            (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
-            for _, fit_res in results
-        ]
-        parameters_aggregated = ndarrays_to_parameters(aggregate(weights_results))
+        if self.inplace:
+            # Fold in the results which have not been accumulated on arrival
+            aggregated_ndarrays = self._aggregate_inplace(server_round, results)
+        else:
+            # Convert results
+            weights_results = self._decode_fit_results(results)
+            aggregated_ndarrays = aggregate(weights_results)
 
         # Aggregate custom metrics if aggregation fn was provided
         metrics_aggregated = {}
@@ -241,7 +313,71 @@ class FedAvg(Strategy):
         elif server_round == 1:  # Only log this warning once
             log(WARNING, "No fit_metrics_aggregation_fn provided")
 
-        return parameters_aggregated, metrics_aggregated
+        return aggregated_ndarrays, metrics_aggregated
+
+    def accumulate_fit(
+        self,
+        server_round: int,
+        result: Tuple[ClientProxy, FitRes],
+    ) -> None:
+        """Fold a single training result into the running weighted average.
+
+        If the result is not aggregated in place, start decoding it instead.
+        """
+        # Other implementations of `aggregate_fit` would never use the running sum
+        if not self.inplace or not _accumulates_fit(type(self)):
+            # Only prefetch for `aggregate_fit` implementations using the decoder
+            if self._decoder.used:
+                self._decoder.prefetch(result[1].parameters)
+            return
+        if server_round != self._accumulated_round:
+            self._reset_accumulator(server_round)
+        _, fit_res = result
+        try:
+            self._aggregator.add(
+                parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples
+            )
+        except Exception:
+            # The running sum may be incomplete, `_aggregate_inplace` starts over
+            self._reset_accumulator(server_round)
+            raise
+        self._accumulated_fit_res.add(id(fit_res))
+
+    def _aggregate_inplace(
+        self, server_round: int, results: List[Tuple[ClientProxy, FitRes]]
+    ) -> NDArrays:
+        """Complete the running weighted average with the remaining results."""
+        fit_res_ids = {id(fit_res) for _, fit_res in results}
+        if (
+            server_round != self._accumulated_round
+            or not self._accumulated_fit_res <= fit_res_ids
+        ):
+            # The accumulated results do not belong to this aggregation
+            self._reset_accumulator(server_round)
+        for _, fit_res in results:
+            if id(fit_res) not in self._accumulated_fit_res:
+                self._aggregator.add(
+                    parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples
+                )
+        aggregated_ndarrays = self._aggregator.result()
+        self._reset_accumulator(0)
+        return aggregated_ndarrays
+
+    def _decode_fit_results(
+        self, results: List[Tuple[ClientProxy, FitRes]]
+    ) -> List[Tuple[NDArrays, int]]:
+        """Decode the parameters of all results concurrently."""
+        return self._decoder.decode(results)
+
+    def shutdown(self) -> None:
+        """Discard prefetched parameters and stop the decoding threads."""
+        self._decoder.shutdown()
+
+    def _reset_accumulator(self, server_round: int) -> None:
+        """Discard all accumulated results and start over for `server_round`."""
+        self._accumulated_round = server_round
+        self._accumulated_fit_res = set()
+        self._aggregator = InplaceAggregator()
 
     def aggregate_evaluate(
         self,
@@ -273,3 +409,11 @@ class FedAvg(Strategy):
             log(WARNING, "No evaluate_metrics_aggregation_fn provided")
 
         return loss_aggregated, metrics_aggregated
+
+
+def _accumulates_fit(strategy_type: type) -> bool:
+    """Return whether `aggregate_fit` of `strategy_type` uses `accumulate_fit`."""
+    for cls in strategy_type.__mro__:
+        if "aggregate_fit" in vars(cls):
+            return bool(vars(cls).get("_accumulates_fit", False))
+    return False
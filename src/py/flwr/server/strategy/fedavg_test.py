@@ -15,7 +15,34 @@
 """FedAvg tests."""
 
 
+from typing import List, Tuple
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from flwr.common import Code, FitRes, Status, parameters_to_ndarrays
+from flwr.common.parameter import (
+    TENSOR_TYPE_NDARRAY,
+    TENSOR_TYPE_RAWBUFFER,
+    ndarrays_to_parameters,
+)
+from flwr.server.client_proxy import ClientProxy
+from flwr.server.fleet.grpc_bidi.grpc_client_proxy import GrpcClientProxy
+
+from .bulyan import Bulyan
+from .fault_tolerant_fedavg import FaultTolerantFedAvg
+from .fedadagrad import FedAdagrad
+from .fedadam import FedAdam
 from .fedavg import FedAvg
+from .fedavgm import FedAvgM
+from .fedmedian import FedMedian
+from .fedopt import FedOpt
+from .fedprox import FedProx
+from .fedtrimmedavg import FedTrimmedAvg
+from .fedyogi import FedYogi
+from .krum import Krum
+from .qfedavg import QFedAvg
 
 
 def test_fedavg_num_fit_clients_20_available() -> None:
@@ -120,3 +147,178 @@ def test_fedavg_num_evaluation_clients_minimum() -> None:
 
     # Assert
     assert expected == actual
+
+
+def _fit_results(
+    tensor_type: str = TENSOR_TYPE_NDARRAY,
+) -> List[Tuple[ClientProxy, FitRes]]:
+    """Create fit results of three clients with different weights."""
+    bridge = MagicMock()
+    return [
+        (
+            GrpcClientProxy(cid=str(idx), bridge=bridge),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters(
+                    [np.full((2, 3), value, dtype=np.float32), np.full(4, value)],
+                    tensor_type=tensor_type,
+                ),
+                num_examples=num_examples,
+                metrics={},
+            ),
+        )
+        for idx, (value, num_examples) in enumerate([(1.0, 1), (2.0, 2), (4.0, 5)])
+    ]
+
+
+def test_aggregate_fit_inplace() -> None:
+    """Test that in-place aggregation matches the reference aggregation."""
+    # Prepare
+    results = _fit_results()
+
+    # Execute
+    expected, _ = FedAvg(inplace=False).aggregate_fit(1, results, [])
+    actual, _ = FedAvg(inplace=True).aggregate_fit(1, results, [])
+
+    # Assert
+    assert expected is not None and actual is not None
+    for expected_layer, actual_layer in zip(
+        parameters_to_ndarrays(expected), parameters_to_ndarrays(actual)
+    ):
+        assert actual_layer.dtype == expected_layer.dtype
+        np.testing.assert_allclose(actual_layer, expected_layer)
+
+
+def test_aggregate_fit_accumulated() -> None:
+    """Test aggregation of results which were (partially) folded on arrival."""
+    # Prepare
+    results = _fit_results()
+    strategy = FedAvg(inplace=True)
+    expected = [np.full((2, 3), 3.125, dtype=np.float32), np.full(4, 3.125)]
+
+    # Execute
+    for result in results[:2]:
+        strategy.accumulate_fit(1, result)
+    actual, _ = strategy.aggregate_fit(1, results, [])
+
+    # Assert
+    assert actual is not None
+    for expected_layer, actual_layer in zip(expected, parameters_to_ndarrays(actual)):
+        np.testing.assert_allclose(actual_layer, expected_layer)
+
+
+def test_aggregate_fit_accumulated_other_results() -> None:
+    """Test that results folded on arrival are discarded if not aggregated."""
+    # Prepare
+    results = _fit_results()
+    strategy = FedAvg(inplace=True)
+    expected = [np.full((2, 3), 2.0, dtype=np.float32), np.full(4, 2.0)]
+
+    # Execute
+    for result in results:
+        strategy.accumulate_fit(1, result)
+    actual, _ = strategy.aggregate_fit(1, results[1:2], [])
+
+    # Assert
+    assert actual is not None
+    for expected_layer, actual_layer in zip(expected, parameters_to_ndarrays(actual)):
+        np.testing.assert_allclose(actual_layer, expected_layer)
+
+
+def test_aggregate_fit_rejected_failures_resets_accumulator() -> None:
+    """Test that the running sum is released if a round is not aggregated."""
+    # Prepare
+    results = _fit_results()
+    strategy = FedAvg(inplace=True, accept_failures=False)
+    for result in results:
+        strategy.accumulate_fit(1, result)
+
+    # Execute
+    actual, _ = strategy.aggregate_fit(1, results, [Exception()])
+
+    # Assert
+    assert actual is None
+    # pylint: disable-next=protected-access
+    assert strategy._aggregator.num_results == 0
+
+
+def test_accumulate_fit_failure_starts_over() -> None:
+    """Test that a result failing to accumulate does not corrupt the running sum."""
+    # Prepare
+    results = _fit_results()
+    _, broken_fit_res = results[1]
+    broken_fit_res.parameters = ndarrays_to_parameters([np.ones(3)])
+    strategy = FedAvg(inplace=True)
+    expected, _ = FedAvg().aggregate_fit(1, [results[0], results[2]], [])
+
+    # Execute
+    strategy.accumulate_fit(1, results[0])
+    with pytest.raises(ValueError):
+        strategy.accumulate_fit(1, results[1])
+    actual, _ = strategy.aggregate_fit(1, [results[0], results[2]], [])
+
+    # Assert
+    assert expected is not None and actual is not None
+    for expected_layer, actual_layer in zip(
+        parameters_to_ndarrays(expected), parameters_to_ndarrays(actual)
+    ):
+        np.testing.assert_allclose(actual_layer, expected_layer)
+
+
+def test_subclasses_accept_inplace_and_decode_workers() -> None:
+    """Test that subclasses forward `inplace` and `decode_workers` to FedAvg."""
+    # Prepare
+    initial_parameters = ndarrays_to_parameters([np.zeros(2)])
+    strategies = [
+        Bulyan(inplace=True, decode_workers=0),
+        FaultTolerantFedAvg(inplace=True, decode_workers=0),
+        FedAvgM(inplace=True, decode_workers=0),
+        FedProx(proximal_mu=0.1, inplace=True, decode_workers=0),
+        FedTrimmedAvg(inplace=True, decode_workers=0),
+        Krum(inplace=True, decode_workers=0),
+        QFedAvg(inplace=True, decode_workers=0),
+    ]
+    for fedopt_type in [FedOpt, FedAdam, FedYogi, FedAdagrad]:
+        strategies.append(
+            fedopt_type(
+                initial_parameters=initial_parameters,
+                inplace=True,
+                decode_workers=0,
+            )
+        )
+
+    # Execute & Assert
+    for strategy in strategies:
+        assert strategy.inplace
+        # pylint: disable-next=protected-access
+        assert strategy._decoder.max_workers == 0
+
+
+def test_aggregate_fit_replies_in_tensor_type_of_clients() -> None:
+    """Test that strategies serialize the aggregate like the clients did."""
+    # Prepare
+    initial_parameters = ndarrays_to_parameters(
+        [np.zeros((2, 3), dtype=np.float32), np.zeros(4)]
+    )
+    strategies = [
+        Bulyan(),
+        FaultTolerantFedAvg(),
+        FedAdagrad(initial_parameters=initial_parameters),
+        FedAdam(initial_parameters=initial_parameters),
+        FedAvg(),
+        FedAvgM(initial_parameters=initial_parameters, server_momentum=0.9),
+        FedMedian(),
+        FedTrimmedAvg(),
+        FedYogi(initial_parameters=initial_parameters),
+        Krum(),
+    ]
+
+    for tensor_type in [TENSOR_TYPE_NDARRAY, TENSOR_TYPE_RAWBUFFER]:
+        for strategy in strategies:
+            # Execute
+            actual, _ = strategy.aggregate_fit(1, _fit_results(tensor_type), [])
+
+            # Assert
+            assert actual is not None
+            assert actual.tensor_type == tensor_type
+            assert len(parameters_to_ndarrays(actual)) == 2
@@ -31,11 +31,12 @@ from flwr.common import (
     parameters_to_ndarrays,
 )
 from flwr.common.logger import log
+from flwr.common.parameter import reply_tensor_type
 from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
 
 from .aggregate import aggregate
-from .fedavg import FedAvg
+from .fedavg import FedAvg, discard_prefetched
 
 
 # pylint: disable=line-too-long
@@ -71,9 +72,14 @@ class FedAvgM(FedAvg):
         Defaults to 1.0.
     server_momentum: float
         Server-side momentum factor used for FedAvgM. Defaults to 0.0.
+    inplace : bool, optional
+        Enable (True) or disable (False) in-place aggregation of model updates,
+        see `FedAvg`. Defaults to False.
+    decode_workers : Optional[int], optional
+        Number of threads decoding model updates, see `FedAvg`. Defaults to None.
     """
 
-    # pylint: disable=too-many-arguments,too-many-instance-attributes, line-too-long
+    # pylint: disable=too-many-arguments,too-many-instance-attributes,too-many-locals, line-too-long
     def __init__(
         self,
         *,
@@ -96,6 +102,8 @@ class FedAvgM(FedAvg):
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         server_learning_rate: float = 1.0,
         server_momentum: float = 0.0,
+        inplace: bool = False,
+        decode_workers: Optional[int] = None,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -110,6 +118,8 @@ class FedAvgM(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            inplace=inplace,
+            decode_workers=decode_workers,
         )
         self.server_learning_rate = server_learning_rate
         self.server_momentum = server_momentum
@@ -129,6 +139,7 @@ class FedAvgM(FedAvg):
         """Initialize global model parameters."""
         return self.initial_parameters
 
+    @discard_prefetched
     def aggregate_fit(
         self,
         server_round: int,
@@ -142,10 +153,7 @@ class FedAvgM(FedAvg):
         if not self.accept_failures and failures:
             return None, {}
         # Convert results
-        weights_results = [
-            (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
-            for _, fit_res in results
-        ]
+        weights_results = self._decode_fit_results(results)
 
         fedavg_result = aggregate(weights_results)
         # following convention described in
@@ -187,7 +195,10 @@ class FedAvgM(FedAvg):
             # Update current weights
             self.initial_parameters = ndarrays_to_parameters(fedavg_result)
 
-        parameters_aggregated = ndarrays_to_parameters(fedavg_result)
+        parameters_aggregated = ndarrays_to_parameters(
+            fedavg_result,
+            tensor_type=reply_tensor_type(results[0][1].parameters.tensor_type),
+        )
 
         # Aggregate custom metrics if aggregation fn was provided
         metrics_aggregated = {}
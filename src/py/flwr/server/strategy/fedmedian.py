@@ -19,30 +19,117 @@ Paper: arxiv.org/pdf/1803.01498v1.pdf
 
 
 from logging import WARNING
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from flwr.common import (
     FitRes,
+    MetricsAggregationFn,
+    NDArrays,
     Parameters,
     Scalar,
     ndarrays_to_parameters,
-    parameters_to_ndarrays,
 )
 from flwr.common.logger import log
+from flwr.common.parameter import reply_tensor_type
 from flwr.server.client_proxy import ClientProxy
 
 from .aggregate import aggregate_median
-from .fedavg import FedAvg
+from .fedavg import FedAvg, discard_prefetched
 
 
+# pylint: disable=line-too-long
 class FedMedian(FedAvg):
-    """Configurable FedAvg with Momentum strategy implementation."""
+    """Configurable FedMedian strategy implementation.
+
+    Parameters
+    ----------
+    fraction_fit : float, optional
+        Fraction of clients used during training. Defaults to 1.0.
+    fraction_evaluate : float, optional
+        Fraction of clients used during validation. Defaults to 1.0.
+    min_fit_clients : int, optional
+        Minimum number of clients used during training. Defaults to 2.
+    min_evaluate_clients : int, optional
+        Minimum number of clients used during validation. Defaults to 2.
+    min_available_clients : int, optional
+        Minimum number of total clients in the system. Defaults to 2.
+    evaluate_fn : Optional[Callable[[int, NDArrays, Dict[str, Scalar]], Optional[Tuple[float, Dict[str, Scalar]]]]]
+        Optional function used for validation. Defaults to None.
+    on_fit_config_fn : Callable[[int], Dict[str, Scalar]], optional
+        Function used to configure training. Defaults to None.
+    on_evaluate_config_fn : Callable[[int], Dict[str, Scalar]], optional
+        Function used to configure validation. Defaults to None.
+    accept_failures : bool, optional
+        Whether or not accept rounds containing failures. Defaults to True.
+    initial_parameters : Parameters, optional
+        Initial global model parameters.
+    fit_metrics_aggregation_fn : Optional[MetricsAggregationFn]
+        Metrics aggregation function, optional.
+    evaluate_metrics_aggregation_fn : Optional[MetricsAggregationFn]
+        Metrics aggregation function, optional.
+    block_bytes : Optional[int], optional
+        If given, each layer is aggregated in blocks of columns of at most this
+        many bytes (over all clients) to bound memory usage. Defaults to None.
+    num_threads : int, optional
+        Number of threads aggregating blocks concurrently. Defaults to 1.
+    inplace : bool, optional
+        Enable (True) or disable (False) in-place aggregation of model updates,
+        see `FedAvg`. Defaults to False.
+    decode_workers : Optional[int], optional
+        Number of threads decoding model updates, see `FedAvg`. Defaults to None.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes,too-many-locals, line-too-long
+    def __init__(
+        self,
+        *,
+        fraction_fit: float = 1.0,
+        fraction_evaluate: float = 1.0,
+        min_fit_clients: int = 2,
+        min_evaluate_clients: int = 2,
+        min_available_clients: int = 2,
+        evaluate_fn: Optional[
+            Callable[
+                [int, NDArrays, Dict[str, Scalar]],
+                Optional[Tuple[float, Dict[str, Scalar]]],
+            ]
+        ] = None,
+        on_fit_config_fn: Optional[Callable[[int], Dict[str, Scalar]]] = None,
+        on_evaluate_config_fn: Optional[Callable[[int], Dict[str, Scalar]]] = None,
+        accept_failures: bool = True,
+        initial_parameters: Optional[Parameters] = None,
+        fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
+        evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
+        block_bytes: Optional[int] = None,
+        num_threads: int = 1,
+        inplace: bool = False,
+        decode_workers: Optional[int] = None,
+    ) -> None:
+        super().__init__(
+            fraction_fit=fraction_fit,
+            fraction_evaluate=fraction_evaluate,
+            min_fit_clients=min_fit_clients,
+            min_evaluate_clients=min_evaluate_clients,
+            min_available_clients=min_available_clients,
+            evaluate_fn=evaluate_fn,
+            on_fit_config_fn=on_fit_config_fn,
+            on_evaluate_config_fn=on_evaluate_config_fn,
+            accept_failures=accept_failures,
+            initial_parameters=initial_parameters,
+            fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
+            evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            inplace=inplace,
+            decode_workers=decode_workers,
+        )
+        self.block_bytes = block_bytes
+        self.num_threads = num_threads
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
         rep = f"FedMedian(accept_failures={self.accept_failures})"
         return rep
 
+    @discard_prefetched
     def aggregate_fit(
         self,
         server_round: int,
@@ -57,12 +144,14 @@ class FedMedian(FedAvg):
             return None, {}
 
         # Convert results
-        weights_results = [
-            (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
-            for _, fit_res in results
-        ]
+        weights_results = self._decode_fit_results(results)
         parameters_aggregated = ndarrays_to_parameters(
-            aggregate_median(weights_results)
+            aggregate_median(
+                weights_results,
+                block_bytes=self.block_bytes,
+                num_threads=self.num_threads,
+            ),
+            tensor_type=reply_tensor_type(results[0][1].parameters.tensor_type),
         )
 
         # Aggregate custom metrics if aggregation fn was provided
@@ -198,3 +198,16 @@ def test_aggregate_fit() -> None:
         actual_list = parameters_to_ndarrays(actual_aggregated)
         actual = actual_list[0]
     assert (actual == expected[0]).all()
+
+
+def test_fedmedian_accepts_fedavg_arguments() -> None:
+    """Test that keyword arguments of FedAvg are passed through."""
+    # Execute
+    strategy = FedMedian(inplace=True, decode_workers=0, min_fit_clients=3)
+
+    # Assert
+    assert strategy.inplace
+    # pylint: disable-next=protected-access
+    assert strategy._decoder.max_workers == 0
+    assert strategy.min_fit_clients == 3
+    assert strategy.block_bytes is None
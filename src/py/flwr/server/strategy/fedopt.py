@@ -20,6 +20,8 @@ Paper: arxiv.org/abs/2003.00295
 
 from typing import Callable, Dict, Optional, Tuple
 
+import numpy as np
+
 from flwr.common import (
     MetricsAggregationFn,
     NDArrays,
@@ -73,6 +75,11 @@ class FedOpt(FedAvg):
         Second moment parameter. Defaults to 0.0.
     tau : float, optional
         Controls the algorithm's degree of adaptability. Defaults to 1e-9.
+    inplace : bool, optional
+        Enable (True) or disable (False) in-place aggregation of model updates,
+        see `FedAvg`. Defaults to False.
+    decode_workers : Optional[int], optional
+        Number of threads decoding model updates, see `FedAvg`. Defaults to None.
     """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes,too-many-locals, line-too-long
@@ -101,6 +108,8 @@ class FedOpt(FedAvg):
         beta_1: float = 0.0,
         beta_2: float = 0.0,
         tau: float = 1e-9,
+        inplace: bool = False,
+        decode_workers: Optional[int] = None,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -115,6 +124,8 @@ class FedOpt(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            inplace=inplace,
+            decode_workers=decode_workers,
         )
         self.current_weights = parameters_to_ndarrays(initial_parameters)
         self.eta = eta
@@ -124,8 +135,71 @@ class FedOpt(FedAvg):
         self.beta_2 = beta_2
         self.m_t: Optional[NDArrays] = None
         self.v_t: Optional[NDArrays] = None
+        self._scratch: Optional[NDArrays] = None
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
         rep = f"FedOpt(accept_failures={self.accept_failures})"
         return rep
+
+    def _compute_delta(self, fedavg_weights_aggregate: NDArrays) -> NDArrays:
+        """Compute the pseudo-gradient, reusing the FedAvg result as its buffer.
+
+        On first use, this also allocates the optimizer state: writable copies of the
+        current weights, zero-initialized moments and a scratch buffer for each layer,
+        all in the dtype of the update. The state is then updated in place every round.
+        """
+        if self._scratch is None:
+            dtypes = [
+                np.promote_types(np.result_type(x.dtype, y.dtype), np.float32)
+                for x, y in zip(self.current_weights, fedavg_weights_aggregate)
+            ]
+            self.current_weights = [
+                np.array(x, dtype=dtype)
+                for x, dtype in zip(self.current_weights, dtypes)
+            ]
+            if not self.m_t:
+                self.m_t = [np.zeros_like(x) for x in self.current_weights]
+            if not self.v_t:
+                self.v_t = [np.zeros_like(x) for x in self.current_weights]
+            self._scratch = [np.empty_like(x) for x in self.current_weights]
+
+        delta_t: NDArrays = []
+        for aggregate, weights in zip(fedavg_weights_aggregate, self.current_weights):
+            delta = (
+                aggregate
+                if aggregate.dtype == weights.dtype
+                else aggregate.astype(weights.dtype)
+            )
+            np.subtract(delta, weights, out=delta)
+            delta_t.append(delta)
+        return delta_t
+
+    def _optimizer_state(self) -> Tuple[NDArrays, NDArrays, NDArrays]:
+        """Return the moment buffers m_t and v_t and the scratch buffers."""
+        if self.m_t is None or self.v_t is None or self._scratch is None:
+            raise ValueError("The optimizer state is allocated by `_compute_delta`")
+        return self.m_t, self.v_t, self._scratch
+
+    def _update_first_moment(self, delta_t: NDArrays) -> None:
+        """Update m_t = beta_1 * m_t + (1 - beta_1) * delta_t in place."""
+        m_t, _, scratch = self._optimizer_state()
+        for moment, delta, tmp in zip(m_t, delta_t, scratch):
+            moment *= self.beta_1
+            np.multiply(delta, 1 - self.beta_1, out=tmp)
+            moment += tmp
+
+    def _update_weights(self, delta_t: NDArrays) -> None:
+        """Update the weights by eta * m_t / (sqrt(v_t) + tau) in place.
+
+        `delta_t` is no longer needed at this point and is overwritten.
+        """
+        m_t, v_t, scratch = self._optimizer_state()
+        for weights, m_layer, v_layer, delta, tmp in zip(
+            self.current_weights, m_t, v_t, delta_t, scratch
+        ):
+            np.sqrt(v_layer, out=tmp)
+            tmp += self.tau
+            np.multiply(m_layer, self.eta, out=delta)
+            np.divide(delta, tmp, out=delta)
+            weights += delta
@@ -0,0 +1,174 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""FedOpt tests."""
+
+
+from functools import partial
+from typing import Callable, List, Tuple
+from unittest.mock import MagicMock
+
+import numpy as np
+import numpy.typing as npt
+
+from flwr.common import (
+    Code,
+    FitRes,
+    NDArray,
+    NDArrays,
+    Status,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.server.client_proxy import ClientProxy
+
+from .aggregate import aggregate
+from .fedadagrad import FedAdagrad
+from .fedadam import FedAdam
+from .fedopt import FedOpt
+from .fedyogi import FedYogi
+
+ETA, TAU, BETA_1, BETA_2 = 0.1, 1e-3, 0.9, 0.99
+
+
+def _adam(v_t: NDArray, delta: NDArray) -> NDArray:
+    result: NDArray = BETA_2 * v_t + (1 - BETA_2) * np.multiply(delta, delta)
+    return result
+
+
+def _yogi(v_t: NDArray, delta: NDArray) -> NDArray:
+    delta_sq = np.multiply(delta, delta)
+    result: NDArray = v_t - (1.0 - BETA_2) * delta_sq * np.sign(v_t - delta_sq)
+    return result
+
+
+def _adagrad(v_t: NDArray, delta: NDArray) -> NDArray:
+    result: NDArray = v_t + np.multiply(delta, delta)
+    return result
+
+
+def _create_results(
+    rng: np.random.Generator, dtype: npt.DTypeLike
+) -> List[Tuple[ClientProxy, FitRes]]:
+    return [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters(
+                    [rng.standard_normal((3, 4)).astype(dtype), rng.standard_normal(5)]
+                ),
+                num_examples=i + 1,
+                metrics={},
+            ),
+        )
+        for i in range(3)
+    ]
+
+
+def _reference_round(
+    results: List[Tuple[ClientProxy, FitRes]],
+    state: Tuple[NDArrays, NDArrays, NDArrays],
+    beta_1: float,
+    update_v_t: Callable[[NDArray, NDArray], NDArray],
+) -> Tuple[NDArrays, NDArrays, NDArrays]:
+    """Compute a FedOpt round with newly allocated arrays."""
+    weights, m_t, v_t = state
+    fedavg = aggregate(
+        [
+            (parameters_to_ndarrays(res.parameters), res.num_examples)
+            for _, res in results
+        ]
+    )
+    delta_t = [x - y for x, y in zip(fedavg, weights)]
+    m_t = [beta_1 * x + (1 - beta_1) * y for x, y in zip(m_t, delta_t)]
+    v_t = [update_v_t(x, y) for x, y in zip(v_t, delta_t)]
+    weights = [x + ETA * y / (np.sqrt(z) + TAU) for x, y, z in zip(weights, m_t, v_t)]
+    return weights, m_t, v_t
+
+
+def _check_strategy(
+    strategy_fn: Callable[..., FedOpt],
+    beta_1: float,
+    update_v_t: Callable[[NDArray, NDArray], NDArray],
+    dtype: npt.DTypeLike,
+) -> None:
+    """Check three rounds of a strategy against `_reference_round`."""
+    # Prepare
+    rng = np.random.default_rng(0)
+    weights: NDArrays = [np.zeros((3, 4), dtype), np.zeros(5)]
+    zeros = [np.zeros_like(x) for x in weights]
+    state = (weights, zeros, zeros)
+    strategy = strategy_fn(
+        initial_parameters=ndarrays_to_parameters(weights), eta=ETA, tau=TAU
+    )
+
+    for server_round in range(1, 4):
+        results = _create_results(rng, dtype)
+        state = _reference_round(results, state, beta_1, update_v_t)
+
+        # Execute
+        parameters, _ = strategy.aggregate_fit(server_round, results, [])
+
+        # Assert
+        assert parameters is not None
+        for expected, actual in zip(state[0], parameters_to_ndarrays(parameters)):
+            assert actual.dtype == expected.dtype
+            # FedAvg accumulates float32 results in float64
+            np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_inplace_update_matches_reference() -> None:
+    """Test that the in-place optimizer updates match the textbook formulas."""
+    # FedAdagrad does not use momentum
+    strategies: List[
+        Tuple[Callable[..., FedOpt], float, Callable[[NDArray, NDArray], NDArray]]
+    ] = [
+        (partial(FedAdam, beta_1=BETA_1, beta_2=BETA_2), BETA_1, _adam),
+        (partial(FedYogi, beta_1=BETA_1, beta_2=BETA_2), BETA_1, _yogi),
+        (FedAdagrad, 0.0, _adagrad),
+    ]
+    for dtype in [np.float32, np.float64]:
+        for strategy_fn, beta_1, update_v_t in strategies:
+            _check_strategy(strategy_fn, beta_1, update_v_t, dtype)
+
+
+def test_fedadam_folds_results_on_arrival() -> None:
+    """Test that FedAdam aggregates the results accumulated as they arrive."""
+    # Prepare
+    rng = np.random.default_rng(0)
+    weights: NDArrays = [np.zeros((3, 4), np.float32), np.zeros(5)]
+    zeros = [np.zeros_like(x) for x in weights]
+    results = _create_results(rng, np.float32)
+    expected, _, _ = _reference_round(results, (weights, zeros, zeros), BETA_1, _adam)
+    strategy = FedAdam(
+        initial_parameters=ndarrays_to_parameters(weights),
+        eta=ETA,
+        tau=TAU,
+        beta_1=BETA_1,
+        beta_2=BETA_2,
+        inplace=True,
+    )
+
+    # Execute
+    for result in results[:2]:
+        strategy.accumulate_fit(1, result)
+    accumulated = len(strategy._accumulated_fit_res)  # pylint: disable=W0212
+    parameters, _ = strategy.aggregate_fit(1, results, [])
+
+    # Assert
+    assert accumulated == 2
+    assert parameters is not None
+    for expected_layer, actual in zip(expected, parameters_to_ndarrays(parameters)):
+        np.testing.assert_allclose(actual, expected_layer, rtol=1e-5, atol=1e-6)
@@ -26,13 +26,13 @@ from flwr.common import (
     Parameters,
     Scalar,
     ndarrays_to_parameters,
-    parameters_to_ndarrays,
 )
 from flwr.common.logger import log
+from flwr.common.parameter import reply_tensor_type
 from flwr.server.client_proxy import ClientProxy
 
 from .aggregate import aggregate_trimmed_avg
-from .fedavg import FedAvg
+from .fedavg import FedAvg, discard_prefetched
 
 
 # pylint: disable=line-too-long
@@ -65,9 +65,19 @@ class FedTrimmedAvg(FedAvg):
         Initial global model parameters.
     beta : float, optional
         Fraction to cut off of both tails of the distribution. Defaults to 0.2.
+    block_bytes : Optional[int], optional
+        If given, each layer is aggregated in blocks of columns of at most this
+        many bytes (over all clients) to bound memory usage. Defaults to None.
+    num_threads : int, optional
+        Number of threads aggregating blocks concurrently. Defaults to 1.
+    inplace : bool, optional
+        Enable (True) or disable (False) in-place aggregation of model updates,
+        see `FedAvg`. Defaults to False.
+    decode_workers : Optional[int], optional
+        Number of threads decoding model updates, see `FedAvg`. Defaults to None.
     """
 
-    # pylint: disable=too-many-arguments,too-many-instance-attributes, line-too-long
+    # pylint: disable=too-many-arguments,too-many-instance-attributes,too-many-locals, line-too-long
     def __init__(
         self,
         *,
@@ -89,6 +99,10 @@ class FedTrimmedAvg(FedAvg):
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         beta: float = 0.2,
+        block_bytes: Optional[int] = None,
+        num_threads: int = 1,
+        inplace: bool = False,
+        decode_workers: Optional[int] = None,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -103,14 +117,19 @@ class FedTrimmedAvg(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            inplace=inplace,
+            decode_workers=decode_workers,
         )
         self.beta = beta
+        self.block_bytes = block_bytes
+        self.num_threads = num_threads
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
         rep = f"FedTrimmedAvg(accept_failures={self.accept_failures})"
         return rep
 
+    @discard_prefetched
     def aggregate_fit(
         self,
         server_round: int,
@@ -125,12 +144,15 @@ class FedTrimmedAvg(FedAvg):
             return None, {}
 
         # Convert results
-        weights_results = [
-            (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
-            for _, fit_res in results
-        ]
+        weights_results = self._decode_fit_results(results)
         parameters_aggregated = ndarrays_to_parameters(
-            aggregate_trimmed_avg(weights_results, self.beta)
+            aggregate_trimmed_avg(
+                weights_results,
+                self.beta,
+                block_bytes=self.block_bytes,
+                num_threads=self.num_threads,
+            ),
+            tensor_type=reply_tensor_type(results[0][1].parameters.tensor_type),
         )
 
         # Aggregate custom metrics if aggregation fn was provided
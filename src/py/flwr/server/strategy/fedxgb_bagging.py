@@ -16,6 +16,7 @@
 
 
 import json
+import uuid
 from logging import WARNING
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
@@ -42,6 +43,8 @@ class FedXgbBagging(FedAvg):
     ):
         self.evaluate_function = evaluate_function
         self.global_model: Optional[bytes] = None
+        # Parsed form of `global_model`, kept across rounds to append trees to it
+        self._bagging_model: Optional[_BaggingModel] = None
         super().__init__(**kwargs)
 
     def aggregate_fit(
@@ -57,14 +60,29 @@ class FedXgbBagging(FedAvg):
         if not self.accept_failures and failures:
             return None, {}
 
-        # Aggregate all the client trees
+        # Aggregate all the client trees, the global model is parsed only if it
+        # was replaced since the last round and serialized once
+        bagging_model = self._bagging_model
+        if (
+            bagging_model is not None
+            and bagging_model.to_bytes() is not self.global_model
+        ):
+            bagging_model = None
         global_model = self.global_model
         for _, fit_res in results:
             update = fit_res.parameters.tensors
             for bst in update:
-                global_model = aggregate(global_model, bst)
+                if bagging_model is None and not global_model:
+                    global_model = bst
+                    continue
+                if bagging_model is None:
+                    bagging_model = _BaggingModel(cast(bytes, global_model))
+                bagging_model.append(bst)
+        if bagging_model is not None:
+            global_model = bagging_model.to_bytes()
 
         self.global_model = global_model
+        self._bagging_model = bagging_model
 
         return (
             Parameters(tensor_type="", tensors=[cast(bytes, global_model)]),
@@ -116,49 +134,55 @@ def aggregate(
     if not bst_prev_org:
         return bst_curr_org
 
-    # Get the tree numbers
-    tree_num_prev, _ = _get_tree_nums(bst_prev_org)
-    _, paral_tree_num_curr = _get_tree_nums(bst_curr_org)
-
-    bst_prev = json.loads(bytearray(bst_prev_org))
-    bst_curr = json.loads(bytearray(bst_curr_org))
-
-    bst_prev["learner"]["gradient_booster"]["model"]["gbtree_model_param"][
-        "num_trees"
-    ] = str(tree_num_prev + paral_tree_num_curr)
-    iteration_indptr = bst_prev["learner"]["gradient_booster"]["model"][
-        "iteration_indptr"
-    ]
-    bst_prev["learner"]["gradient_booster"]["model"]["iteration_indptr"].append(
-        iteration_indptr[-1] + paral_tree_num_curr
-    )
-
-    # Aggregate new trees
-    trees_curr = bst_curr["learner"]["gradient_booster"]["model"]["trees"]
-    for tree_count in range(paral_tree_num_curr):
-        trees_curr[tree_count]["id"] = tree_num_prev + tree_count
-        bst_prev["learner"]["gradient_booster"]["model"]["trees"].append(
-            trees_curr[tree_count]
-        )
-        bst_prev["learner"]["gradient_booster"]["model"]["tree_info"].append(0)
-
-    bst_prev_bytes = bytes(json.dumps(bst_prev), "utf-8")
-
-    return bst_prev_bytes
-
-
-def _get_tree_nums(xgb_model_org: bytes) -> Tuple[int, int]:
-    xgb_model = json.loads(bytearray(xgb_model_org))
-    # Get the number of trees
-    tree_num = int(
-        xgb_model["learner"]["gradient_booster"]["model"]["gbtree_model_param"][
-            "num_trees"
-        ]
-    )
-    # Get the number of parallel trees
-    paral_tree_num = int(
-        xgb_model["learner"]["gradient_booster"]["model"]["gbtree_model_param"][
-            "num_parallel_tree"
+    bagging_model = _BaggingModel(bst_prev_org)
+    bagging_model.append(bst_curr_org)
+    return bagging_model.to_bytes()
+
+
+class _BaggingModel:
+    """XGBoost model in JSON format which new trees can be appended to.
+
+    The model is parsed once. Each tree is serialized only once, when it is added,
+    and spliced into the serialized rest of the model, so `to_bytes` does not encode
+    all trees again. The result is the same as `json.dumps` of the whole model.
+    """
+
+    def __init__(self, xgb_model_org: bytes) -> None:
+        xgb_model = json.loads(bytearray(xgb_model_org))
+        self._model = xgb_model["learner"]["gradient_booster"]["model"]
+        self._tree_jsons = [json.dumps(tree) for tree in self._model["trees"]]
+        # The trees are replaced by a unique string in the remaining model
+        self._placeholder = json.dumps(uuid.uuid4().hex)
+        self._model["trees"] = json.loads(self._placeholder)
+        self._xgb_model = xgb_model
+        self._bytes: Optional[bytes] = xgb_model_org
+
+    def append(self, bst_curr_org: bytes) -> None:
+        """Append the trees of the last iteration of `bst_curr_org`."""
+        model_curr = json.loads(bytearray(bst_curr_org))["learner"]["gradient_booster"][
+            "model"
         ]
-    )
-    return tree_num, paral_tree_num
+        tree_num_prev = int(self._model["gbtree_model_param"]["num_trees"])
+        paral_tree_num_curr = int(model_curr["gbtree_model_param"]["num_parallel_tree"])
+
+        self._model["gbtree_model_param"]["num_trees"] = str(
+            tree_num_prev + paral_tree_num_curr
+        )
+        iteration_indptr = self._model["iteration_indptr"]
+        iteration_indptr.append(iteration_indptr[-1] + paral_tree_num_curr)
+
+        # Aggregate new trees
+        trees_curr = model_curr["trees"]
+        for tree_count in range(paral_tree_num_curr):
+            trees_curr[tree_count]["id"] = tree_num_prev + tree_count
+            self._tree_jsons.append(json.dumps(trees_curr[tree_count]))
+            self._model["tree_info"].append(0)
+        self._bytes = None
+
+    def to_bytes(self) -> bytes:
+        """Serialize the model, reusing the result until trees are appended."""
+        if self._bytes is None:
+            prefix, suffix = json.dumps(self._xgb_model).split(self._placeholder)
+            trees_json = "[" + ", ".join(self._tree_jsons) + "]"
+            self._bytes = bytes(prefix + trees_json + suffix, "utf-8")
+        return self._bytes
@@ -0,0 +1,112 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""FedXgbBagging tests."""
+
+
+import json
+from typing import Any, Dict, List, Tuple, cast
+from unittest.mock import MagicMock
+
+from flwr.common import Code, FitRes, Parameters, Status
+from flwr.server.client_proxy import ClientProxy
+
+from .fedxgb_bagging import FedXgbBagging, aggregate
+
+
+def _xgb_model(num_trees: int, seed: int) -> bytes:
+    """Create a JSON model in the format of XGBoost with one tree per iteration."""
+    model: Dict[str, Any] = {
+        "learner": {
+            "attributes": {},
+            "gradient_booster": {
+                "model": {
+                    "gbtree_model_param": {
+                        "num_parallel_tree": "1",
+                        "num_trees": str(num_trees),
+                    },
+                    "iteration_indptr": list(range(num_trees + 1)),
+                    "tree_info": [0] * num_trees,
+                    "trees": [
+                        {"id": i, "split_conditions": [seed * 0.5, i], "tree_param": {}}
+                        for i in range(num_trees)
+                    ],
+                },
+                "name": "gbtree",
+            },
+        },
+        "version": [1, 7, 6],
+    }
+    return bytes(json.dumps(model), "utf-8")
+
+
+def _create_results(
+    server_round: int, num_clients: int
+) -> List[Tuple[ClientProxy, FitRes]]:
+    return [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=Parameters(
+                    tensor_type="", tensors=[_xgb_model(1, server_round * 10 + i)]
+                ),
+                num_examples=1,
+                metrics={},
+            ),
+        )
+        for i in range(num_clients)
+    ]
+
+
+def test_aggregate_fit_matches_aggregate() -> None:
+    """Test that appending trees across rounds gives the result of `aggregate`."""
+    # Prepare
+    strategy = FedXgbBagging()
+    expected = None
+
+    for server_round in range(1, 5):
+        results = _create_results(server_round, 3)
+        for _, fit_res in results:
+            expected = aggregate(expected, fit_res.parameters.tensors[0])
+
+        # Execute
+        parameters, _ = strategy.aggregate_fit(server_round, results, [])
+
+        # Assert
+        assert parameters is not None
+        assert parameters.tensors == [expected]
+
+    global_model = cast(bytes, strategy.global_model)
+    model = json.loads(global_model)["learner"]["gradient_booster"]["model"]
+    assert model["gbtree_model_param"]["num_trees"] == "12"
+    assert model["iteration_indptr"] == list(range(13))
+    assert [tree["id"] for tree in model["trees"]] == list(range(12))
+    assert json.dumps(json.loads(global_model)) == global_model.decode()
+
+
+def test_aggregate_fit_uses_replaced_global_model() -> None:
+    """Test that a global model set from outside is used in the next round."""
+    # Prepare
+    strategy = FedXgbBagging()
+    strategy.aggregate_fit(1, _create_results(1, 2), [])
+    strategy.global_model = _xgb_model(5, 0)
+
+    # Execute
+    parameters, _ = strategy.aggregate_fit(2, _create_results(2, 2), [])
+
+    # Assert
+    assert parameters is not None
+    model = json.loads(parameters.tensors[0])["learner"]["gradient_booster"]["model"]
+    assert model["gbtree_model_param"]["num_trees"] == "7"
@@ -30,13 +30,13 @@ from flwr.common import (
     Parameters,
     Scalar,
     ndarrays_to_parameters,
-    parameters_to_ndarrays,
 )
 from flwr.common.logger import log
+from flwr.common.parameter import reply_tensor_type
 from flwr.server.client_proxy import ClientProxy
 
 from .aggregate import aggregate_krum
-from .fedavg import FedAvg
+from .fedavg import FedAvg, discard_prefetched
 
 
 # pylint: disable=line-too-long
@@ -72,9 +72,14 @@ class Krum(FedAvg):
         Whether or not accept rounds containing failures. Defaults to True.
     initial_parameters : Parameters, optional
         Initial global model parameters.
+    inplace : bool, optional
+        Enable (True) or disable (False) in-place aggregation of model updates,
+        see `FedAvg`. Defaults to False.
+    decode_workers : Optional[int], optional
+        Number of threads decoding model updates, see `FedAvg`. Defaults to None.
     """
 
-    # pylint: disable=too-many-arguments,too-many-instance-attributes
+    # pylint: disable=too-many-arguments,too-many-instance-attributes,too-many-locals
     def __init__(
         self,
         *,
@@ -97,6 +102,8 @@ class Krum(FedAvg):
         initial_parameters: Optional[Parameters] = None,
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
+        inplace: bool = False,
+        decode_workers: Optional[int] = None,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -111,6 +118,8 @@ class Krum(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            inplace=inplace,
+            decode_workers=decode_workers,
         )
         self.num_malicious_clients = num_malicious_clients
         self.num_clients_to_keep = num_clients_to_keep
@@ -120,6 +129,7 @@ class Krum(FedAvg):
         rep = f"Krum(accept_failures={self.accept_failures})"
         return rep
 
+    @discard_prefetched
     def aggregate_fit(
         self,
         server_round: int,
@@ -134,14 +144,12 @@ class Krum(FedAvg):
             return None, {}
 
         # Convert results
-        weights_results = [
-            (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
-            for _, fit_res in results
-        ]
+        weights_results = self._decode_fit_results(results)
         parameters_aggregated = ndarrays_to_parameters(
             aggregate_krum(
                 weights_results, self.num_malicious_clients, self.num_clients_to_keep
-            )
+            ),
+            tensor_type=reply_tensor_type(results[0][1].parameters.tensor_type),
         )
 
         # Aggregate custom metrics if aggregation fn was provided
@@ -0,0 +1,107 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Concurrent decoding of training results."""
+
+
+import concurrent.futures
+from typing import Dict, List, Optional, Tuple
+
+from flwr.common import FitRes, NDArrays, Parameters, parameters_to_ndarrays
+from flwr.server.client_proxy import ClientProxy
+
+
+class ParametersDecoder:
+    """Decode the parameters of training results on a thread pool.
+
+    `prefetch` starts decoding the parameters of a single result in the
+    background, e.g., as soon as the result arrives (see
+    `Strategy.accumulate_fit`). `decode` returns the decoded parameters of all
+    results of a round, waiting for the prefetched ones and decoding all others
+    concurrently. `clear` discards prefetched parameters which are not needed,
+    e.g., when a round is not aggregated. Decoding (`np.load` or `np.frombuffer`)
+    mostly copies memory, which releases the GIL.
+
+    Parameters
+    ----------
+    max_workers : Optional[int] (default: None)
+        Number of decoding threads. `None` uses the `ThreadPoolExecutor` default,
+        `0` decodes all results in the calling thread and disables prefetching.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = max_workers
+        # Set once `decode` was called, i.e., once prefetching is worth it
+        self.used = False
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        # Parameters are kept alongside their future, so that their id stays valid
+        self._prefetched: Dict[
+            int, Tuple[Parameters, "concurrent.futures.Future[NDArrays]"]
+        ] = {}
+
+    def prefetch(self, parameters: Parameters) -> None:
+        """Start decoding `parameters` in the background."""
+        if self.max_workers == 0 or id(parameters) in self._prefetched:
+            return
+        self._prefetched[id(parameters)] = (parameters, self._submit(parameters))
+
+    def decode(
+        self, results: List[Tuple[ClientProxy, FitRes]]
+    ) -> List[Tuple[NDArrays, int]]:
+        """Return the decoded parameters and number of examples of each result.
+
+        Prefetched parameters which are not part of `results` are discarded.
+        """
+        self.used = True
+        if self.max_workers == 0:
+            return [
+                (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
+                for _, fit_res in results
+            ]
+
+        futures = []
+        for _, fit_res in results:
+            prefetched = self._prefetched.pop(id(fit_res.parameters), None)
+            if prefetched is None:
+                futures.append(self._submit(fit_res.parameters))
+            else:
+                futures.append(prefetched[1])
+        self._prefetched.clear()
+        return [
+            (future.result(), fit_res.num_examples)
+            for future, (_, fit_res) in zip(futures, results)
+        ]
+
+    def clear(self) -> None:
+        """Discard all prefetched parameters."""
+        for _, future in self._prefetched.values():
+            future.cancel()
+        self._prefetched.clear()
+
+    def shutdown(self) -> None:
+        """Discard all prefetched parameters and stop the decoding threads.
+
+        The decoder can still be used afterwards, it then starts new threads.
+        """
+        self.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _submit(self, parameters: Parameters) -> "concurrent.futures.Future[NDArrays]":
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="flwr-decode"
+            )
+        return self._executor.submit(parameters_to_ndarrays, parameters)
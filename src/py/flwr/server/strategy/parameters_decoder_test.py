@@ -0,0 +1,136 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""ParametersDecoder tests."""
+
+
+from typing import List, Tuple
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from flwr.common import (
+    Code,
+    FitRes,
+    Status,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.server.client_proxy import ClientProxy
+
+from .fedavg import FedAvg
+from .parameters_decoder import ParametersDecoder
+
+
+def _create_results(num_results: int) -> List[Tuple[ClientProxy, FitRes]]:
+    return [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters(
+                    [np.full((2, 3), i, dtype=np.float32), np.arange(3) + i]
+                ),
+                num_examples=i + 1,
+                metrics={},
+            ),
+        )
+        for i in range(num_results)
+    ]
+
+
+def test_decode_preserves_order() -> None:
+    """Test that results are decoded in order, with and without a thread pool."""
+    # Prepare
+    results = _create_results(8)
+
+    for max_workers in [None, 0, 3]:
+        decoder = ParametersDecoder(max_workers=max_workers)
+
+        # Execute
+        decoded = decoder.decode(results)
+
+        # Assert
+        assert decoder.used
+        assert [num_examples for _, num_examples in decoded] == list(range(1, 9))
+        for i, (ndarrays, _) in enumerate(decoded):
+            np.testing.assert_array_equal(ndarrays[0], np.full((2, 3), i))
+            np.testing.assert_array_equal(ndarrays[1], np.arange(3) + i)
+
+
+def test_decode_uses_prefetched_parameters() -> None:
+    """Test that prefetched parameters are not decoded twice."""
+    # Prepare
+    results = _create_results(4)
+    decoder = ParametersDecoder(max_workers=2)
+    stale = _create_results(1)[0][1].parameters
+
+    with patch(
+        "flwr.server.strategy.parameters_decoder.parameters_to_ndarrays",
+        wraps=parameters_to_ndarrays,
+    ) as mock_decode:
+        # Execute
+        decoder.prefetch(results[1][1].parameters)
+        decoder.prefetch(results[1][1].parameters)
+        decoder.prefetch(stale)
+        decoded = decoder.decode(results)
+
+    # Assert
+    assert mock_decode.call_count == 5
+    assert len(decoded) == 4
+    assert not decoder._prefetched  # pylint: disable=protected-access
+
+
+def test_fedavg_prefetches_after_first_round() -> None:
+    """Test that FedAvg starts decoding results early once it used the decoder."""
+    # Prepare
+    strategy = FedAvg(inplace=False)
+    results = _create_results(3)
+    decoder = strategy._decoder  # pylint: disable=protected-access
+
+    # Execute
+    strategy.accumulate_fit(1, results[0])
+    prefetched_first_round = len(decoder._prefetched)  # pylint: disable=W0212
+    strategy.aggregate_fit(1, results, [])
+    for result in results:
+        strategy.accumulate_fit(2, result)
+    prefetched_second_round = len(decoder._prefetched)  # pylint: disable=W0212
+    parameters, _ = strategy.aggregate_fit(2, results, [])
+
+    # Assert
+    assert prefetched_first_round == 0
+    assert prefetched_second_round == 3
+    assert parameters is not None
+
+
+def test_fedavg_discards_prefetched_on_early_return() -> None:
+    """Test that prefetched parameters are released if a round is not aggregated."""
+    # Prepare
+    strategy = FedAvg(inplace=False, accept_failures=False)
+    results = _create_results(3)
+    decoder = strategy._decoder  # pylint: disable=protected-access
+    strategy.aggregate_fit(1, results, [])
+    for result in results:
+        strategy.accumulate_fit(2, result)
+    prefetched = len(decoder._prefetched)  # pylint: disable=W0212
+
+    # Execute
+    parameters, _ = strategy.aggregate_fit(2, results, [Exception()])
+    strategy.shutdown()
+
+    # Assert
+    assert prefetched == 3
+    assert parameters is None
+    assert not decoder._prefetched  # pylint: disable=protected-access
+    assert decoder._executor is None  # pylint: disable=protected-access
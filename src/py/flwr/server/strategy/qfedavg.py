@@ -36,16 +36,26 @@ from flwr.common import (
     parameters_to_ndarrays,
 )
 from flwr.common.logger import log
+from flwr.common.parameter import reply_tensor_type
 from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
 
 from .aggregate import aggregate_qffl, weighted_loss_avg
-from .fedavg import FedAvg
+from .fedavg import FedAvg, discard_prefetched
 
 
 # pylint: disable=too-many-locals
 class QFedAvg(FedAvg):
-    """Configurable QFedAvg strategy implementation."""
+    """Configurable QFedAvg strategy implementation.
+
+    Parameters
+    ----------
+    inplace : bool, optional
+        Enable (True) or disable (False) in-place aggregation of model updates,
+        see `FedAvg`. Defaults to False.
+    decode_workers : Optional[int], optional
+        Number of threads decoding model updates, see `FedAvg`. Defaults to None.
+    """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes
     def __init__(
@@ -70,6 +80,8 @@ class QFedAvg(FedAvg):
         initial_parameters: Optional[Parameters] = None,
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
+        inplace: bool = False,
+        decode_workers: Optional[int] = None,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -84,6 +96,8 @@ class QFedAvg(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            inplace=inplace,
+            decode_workers=decode_workers,
         )
         self.learning_rate = qffl_learning_rate
         self.q_param = q_param
@@ -111,7 +125,6 @@ class QFedAvg(FedAvg):
         """Configure the next round of training."""
         weights = parameters_to_ndarrays(parameters)
         self.pre_weights = weights
-        parameters = ndarrays_to_parameters(weights)
         config = {}
         if self.on_fit_config_fn is not None:
             # Custom fit config function provided
@@ -155,6 +168,7 @@ class QFedAvg(FedAvg):
         # Return client/config pairs
         return [(client, evaluate_ins) for client in clients]
 
+    @discard_prefetched
     def aggregate_fit(
         self,
         server_round: int,
@@ -167,22 +181,6 @@ class QFedAvg(FedAvg):
         # Do not aggregate if there are failures and failures are not accepted
         if not self.accept_failures and failures:
             return None, {}
-        # Convert results
-
-        def norm_grad(grad_list: NDArrays) -> float:
-            # input: nested gradients
-            # output: square of the L-2 norm
-            client_grads = grad_list[0]
-            for i in range(1, len(grad_list)):
-                client_grads = np.append(
-                    client_grads, grad_list[i]
-                )  # output a flattened array
-            squared = np.square(client_grads)
-            summed = np.sum(squared)
-            return float(summed)
-
-        deltas = []
-        hs_ffl = []
 
         if self.pre_weights is None:
             raise Exception("QffedAvg pre_weights are None in aggregate_fit")
@@ -193,28 +191,40 @@ class QFedAvg(FedAvg):
         )
         if eval_result is not None:
             loss, _ = eval_result
+        loss_q = np.float_power(loss + 1e-10, self.q_param)
 
-        for _, fit_res in results:
-            new_weights = parameters_to_ndarrays(fit_res.parameters)
-            # plug in the weight updates into the gradient
-            grads = [
-                np.multiply((u - v), 1.0 / self.learning_rate)
-                for u, v in zip(weights_before, new_weights)
-            ]
-            deltas.append(
-                [np.float_power(loss + 1e-10, self.q_param) * grad for grad in grads]
-            )
+        # The loss scaling the deltas is the same for all clients, so it is
+        # sufficient to sum up the gradients, one layer of one client at a time
+        grads_sum: NDArrays = []
+        hs_ffl = []
+        for new_weights, _ in self._decode_fit_results(results):
+            # square of the L-2 norm of the gradient, reduced layer by layer
+            norm_grad = 0.0
+            for i, (before, after) in enumerate(zip(weights_before, new_weights)):
+                # plug in the weight updates into the gradient
+                grad = np.multiply((before - after), 1.0 / self.learning_rate)
+                norm_grad += float(np.vdot(grad, grad))
+                if i < len(grads_sum):
+                    grads_sum[i] += grad
+                else:
+                    grads_sum.append(grad)
             # estimation of the local Lipschitz constant
             hs_ffl.append(
                 self.q_param
                 * np.float_power(loss + 1e-10, (self.q_param - 1))
-                * norm_grad(grads)
-                + (1.0 / self.learning_rate)
-                * np.float_power(loss + 1e-10, self.q_param)
+                * norm_grad
+                + (1.0 / self.learning_rate) * loss_q
             )
 
-        weights_aggregated: NDArrays = aggregate_qffl(weights_before, deltas, hs_ffl)
-        parameters_aggregated = ndarrays_to_parameters(weights_aggregated)
+        for grad in grads_sum:
+            grad *= loss_q
+        weights_aggregated: NDArrays = aggregate_qffl(
+            weights_before, [grads_sum], hs_ffl
+        )
+        parameters_aggregated = ndarrays_to_parameters(
+            weights_aggregated,
+            tensor_type=reply_tensor_type(results[0][1].parameters.tensor_type),
+        )
 
         # Aggregate custom metrics if aggregation fn was provided
         metrics_aggregated = {}
@@ -0,0 +1,98 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""QFedAvg tests."""
+
+
+from typing import Dict, List, Tuple
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from flwr.common import (
+    Code,
+    FitRes,
+    NDArrays,
+    Scalar,
+    Status,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.server.client_proxy import ClientProxy
+
+from .qfedavg import QFedAvg
+
+LOSS = 0.5
+
+
+def _evaluate(
+    server_round: int,  # pylint: disable=unused-argument
+    parameters: NDArrays,  # pylint: disable=unused-argument
+    config: Dict[str, Scalar],  # pylint: disable=unused-argument
+) -> Tuple[float, Dict[str, Scalar]]:
+    return LOSS, {}
+
+
+def test_aggregate_fit() -> None:
+    """Test q-FFL aggregation against the formulas of the paper."""
+    # Prepare
+    rng = np.random.default_rng(0)
+    loss, q_param, learning_rate = LOSS, 0.2, 0.1
+    weights_before: NDArrays = [rng.standard_normal((3, 4)), rng.standard_normal(5)]
+    clients_weights = [
+        [layer + rng.standard_normal(layer.shape) for layer in weights_before]
+        for _ in range(3)
+    ]
+    results: List[Tuple[ClientProxy, FitRes]] = [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters(weights),
+                num_examples=1,
+                metrics={},
+            ),
+        )
+        for weights in clients_weights
+    ]
+    strategy = QFedAvg(
+        q_param=q_param,
+        qffl_learning_rate=learning_rate,
+        evaluate_fn=_evaluate,
+    )
+    strategy.pre_weights = weights_before
+
+    grads = [
+        np.concatenate([(u - v).ravel() for u, v in zip(weights_before, weights)])
+        / learning_rate
+        for weights in clients_weights
+    ]
+    hs_ffl = [
+        q_param * (loss + 1e-10) ** (q_param - 1) * np.sum(np.square(grad))
+        + (loss + 1e-10) ** q_param / learning_rate
+        for grad in grads
+    ]
+    update = (loss + 1e-10) ** q_param * np.sum(grads, axis=0) / np.sum(hs_ffl)
+    expected = np.concatenate([layer.ravel() for layer in weights_before]) - update
+
+    # Execute
+    parameters, _ = strategy.aggregate_fit(1, results, [])
+
+    # Assert
+    assert parameters is not None
+    actual = parameters_to_ndarrays(parameters)
+    assert [layer.shape for layer in actual] == [(3, 4), (5,)]
+    np.testing.assert_allclose(
+        np.concatenate([layer.ravel() for layer in actual]), expected
+    )
@@ -105,6 +105,36 @@ class Strategy(ABC):
             the global model parameters remain the same.
         """
 
+    def accumulate_fit(
+        self,
+        server_round: int,
+        result: Tuple[ClientProxy, FitRes],
+    ) -> None:
+        """Receive a single training result as soon as it arrives.
+
+        The server calls this method for every successful update while it is
+        still waiting for the remaining clients of the round, i.e., before
+        `aggregate_fit` is called with the full list of results. Strategies can
+        use it to start aggregating early. If it raises, the server treats the
+        result as a failure. The default implementation does nothing.
+
+        Parameters
+        ----------
+        server_round : int
+            The current round of federated learning.
+        result : Tuple[ClientProxy, FitRes]
+            A successful update from one of the previously selected clients. The
+            same pair will be included in the `results` passed to
+            `aggregate_fit`.
+        """
+
+    def shutdown(self) -> None:
+        """Release the resources of the strategy, e.g., threads.
+
+        The server calls this method once training finished. The default implementation
+        does nothing.
+        """
+
     @abstractmethod
     def configure_evaluate(
         self, server_round: int, parameters: Parameters, client_manager: ClientManager
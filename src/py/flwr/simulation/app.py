@@ -146,6 +146,8 @@ def start_simulation(
     actor_kwargs: Optional[Dict[str, Any]] (default: None)
         If you want to create your own Actor classes, you might need to pass
         some input argument. You can use this dictionary for such purpose.
+        The `DefaultActor` accepts `client_cache_size` to reuse client instances
+        across rounds, e.g. `actor_kwargs={"client_cache_size": 100}`.
 
     actor_scheduling: Optional[Union[str, NodeAffinitySchedulingStrategy]]
         (default: "DEFAULT")
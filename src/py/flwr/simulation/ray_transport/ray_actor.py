@@ -18,6 +18,7 @@
 import threading
 import traceback
 from abc import ABC
+from collections import OrderedDict
 from logging import ERROR, WARNING
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type, Union
 
@@ -48,8 +49,64 @@ class ClientException(Exception):
         super().__init__(self.message)
 
 
+class ClientCache:
+    """A least-recently-used cache of client instances, keyed by client ID.
+
+    Parameters
+    ----------
+    max_size : int
+        Maximum number of clients kept. Once exceeded, the least recently used
+        client is dropped.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        if max_size < 1:
+            raise ValueError("`max_size` must be >= 1")
+        self.max_size = max_size
+        self._clients: "OrderedDict[str, Client]" = OrderedDict()
+
+    def get(self, client_fn: ClientFn, cid: str) -> Client:
+        """Return the cached client `cid` or create it using `client_fn`."""
+        client = self._clients.get(cid)
+        if client is not None:
+            self._clients.move_to_end(cid)
+            return client
+
+        client = check_clientfn_returns_client(client_fn(cid))
+        self._clients[cid] = client
+        if len(self._clients) > self.max_size:
+            self._clients.popitem(last=False)
+        return client
+
+    def evict(self, cid: str) -> None:
+        """Remove client `cid` from the cache, if present."""
+        if cid in self._clients:
+            del self._clients[cid]
+
+    def __len__(self) -> int:
+        """Return the number of cached clients."""
+        return len(self._clients)
+
+
 class VirtualClientEngineActor(ABC):
-    """Abstract base class for VirtualClientEngine Actors."""
+    """Abstract base class for VirtualClientEngine Actors.
+
+    Parameters
+    ----------
+    client_cache_size : int (default: 0)
+        Number of client instances the actor keeps between jobs. By default,
+        `client_fn` is called for every job. With a cache, each client is only
+        instantiated again once it was evicted, so that model construction and
+        dataset loading is not repeated every round. The `WorkloadState` is still
+        injected for every job. Only use this if your clients do not rely on being
+        re-created for each job.
+    """
+
+    client_cache: Optional[ClientCache] = None
+
+    def __init__(self, client_cache_size: int = 0) -> None:
+        if client_cache_size > 0:
+            self.client_cache = ClientCache(max_size=client_cache_size)
 
     def terminate(self) -> None:
         """Manually terminate Actor object."""
@@ -68,8 +125,11 @@ class VirtualClientEngineActor(ABC):
         # return also cid which is needed to ensure results
         # from the pool are correctly assigned to each ClientProxy
         try:
-            # Instantiate client (check 'Client' type is returned)
-            client = check_clientfn_returns_client(client_fn(cid))
+            # Instantiate client (check 'Client' type is returned) or reuse it
+            if self.client_cache is None:
+                client = check_clientfn_returns_client(client_fn(cid))
+            else:
+                client = self.client_cache.get(client_fn, cid)
             # Inject state
             client.set_state(state)
             # Run client job
@@ -77,6 +137,9 @@ class VirtualClientEngineActor(ABC):
             # Retrieve state (potentially updated)
             updated_state = client.get_state()
         except Exception as ex:
+            # Do not reuse a client that might have been left in a broken state
+            if self.client_cache is not None:
+                self.client_cache.evict(cid)
             client_trace = traceback.format_exc()
             message = (
                 "\n\tSomething went wrong when running your client workload."
@@ -100,10 +163,17 @@ class DefaultActor(VirtualClientEngineActor):
     ----------
     on_actor_init_fn: Optional[Callable[[], None]] (default: None)
         A function to execute upon actor initialization.
+    client_cache_size : int (default: 0)
+        Number of client instances to keep between jobs (see
+        `VirtualClientEngineActor`). Disabled by default.
     """
 
-    def __init__(self, on_actor_init_fn: Optional[Callable[[], None]] = None) -> None:
-        super().__init__()
+    def __init__(
+        self,
+        on_actor_init_fn: Optional[Callable[[], None]] = None,
+        client_cache_size: int = 0,
+    ) -> None:
+        super().__init__(client_cache_size=client_cache_size)
         if on_actor_init_fn:
             on_actor_init_fn()
 
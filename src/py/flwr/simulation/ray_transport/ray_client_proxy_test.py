@@ -19,12 +19,14 @@ from math import pi
 from random import shuffle
 from typing import List, Tuple, Type, cast
 
+import pytest
 import ray
 
 from flwr.client import Client, NumPyClient
 from flwr.client.workload_state import WorkloadState
 from flwr.common import Code, GetPropertiesRes, Status
 from flwr.simulation.ray_transport.ray_actor import (
+    ClientException,
     ClientRes,
     DefaultActor,
     JobFn,
@@ -173,3 +175,91 @@ def test_cid_consistency_without_proxies() -> None:
         assert int(cid) * pi == res.properties["result"]
 
     ray.shutdown()
+
+
+def test_client_cache_reuses_clients() -> None:
+    """Test that a cached client is reused and still gets the WorkloadState."""
+    # Prepare
+    created: List[str] = []
+
+    def client_fn(cid: str) -> Client:
+        created.append(cid)
+        return get_dummy_client(cid)
+
+    actor = VirtualClientEngineActor(client_cache_size=2)
+    cids = ["0", "1", "0", "2", "1", "2"]
+
+    # Execute
+    states = [
+        actor.run(client_fn, job_fn(cid), cid, WorkloadState(state={}))[2]
+        for cid in cids
+    ]
+
+    # Assert
+    # "0" is reused, "1" is evicted when "2" is created and has to be re-created
+    assert created == ["0", "1", "2", "1"]
+    for cid, state in zip(cids, states):
+        assert state.state["result"] == str(int(cid) * pi)
+
+
+def test_client_cache_evicts_least_recently_used() -> None:
+    """Test that the least recently used client is evicted."""
+    # Prepare
+    created: List[str] = []
+
+    def client_fn(cid: str) -> Client:
+        created.append(cid)
+        return get_dummy_client(cid)
+
+    actor = VirtualClientEngineActor(client_cache_size=2)
+
+    # Execute
+    for cid in ["0", "1", "2", "0"]:
+        actor.run(client_fn, job_fn(cid), cid, WorkloadState(state={}))
+
+    # Assert
+    assert created == ["0", "1", "2", "0"]
+    assert actor.client_cache is not None and len(actor.client_cache) == 2
+
+
+def test_client_cache_evicts_crashed_client() -> None:
+    """Test that a client whose job raised is not reused."""
+    # Prepare
+    created: List[str] = []
+
+    def client_fn(cid: str) -> Client:
+        created.append(cid)
+        return get_dummy_client(cid)
+
+    def failing_job(client: Client) -> ClientRes:
+        raise ValueError(f"{client} failed")
+
+    actor = VirtualClientEngineActor(client_cache_size=2)
+
+    # Execute
+    with pytest.raises(ClientException):
+        actor.run(client_fn, failing_job, "0", WorkloadState(state={}))
+    actor.run(client_fn, job_fn("0"), "0", WorkloadState(state={}))
+
+    # Assert
+    assert created == ["0", "0"]
+
+
+def test_client_cache_disabled_by_default() -> None:
+    """Test that clients are instantiated for every job without a cache."""
+    # Prepare
+    created: List[str] = []
+
+    def client_fn(cid: str) -> Client:
+        created.append(cid)
+        return get_dummy_client(cid)
+
+    actor = VirtualClientEngineActor()
+
+    # Execute
+    for _ in range(3):
+        actor.run(client_fn, job_fn("0"), "0", WorkloadState(state={}))
+
+    # Assert
+    assert actor.client_cache is None
+    assert created == ["0", "0", "0"]
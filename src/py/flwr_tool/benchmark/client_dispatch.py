@@ -0,0 +1,206 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark sending the instructions of a round to many clients.
+
+Compares `fit_clients` as it was before, which created a new thread pool for each round
+and submitted the requests of all clients at once, with the long-lived
+`ClientDispatcher` of the server, which bounds the number of requests in flight. The
+clients are stubs which respond after a fixed latency.
+
+python -m flwr_tool.benchmark.client_dispatch --num-clients 5000 --max-workers 32 1024
+"""
+
+
+import argparse
+import concurrent.futures
+import threading
+import time
+from typing import List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from flwr.common import (
+    Code,
+    DisconnectRes,
+    EvaluateIns,
+    EvaluateRes,
+    FitIns,
+    FitRes,
+    GetParametersIns,
+    GetParametersRes,
+    GetPropertiesIns,
+    GetPropertiesRes,
+    ReconnectIns,
+    Status,
+    ndarrays_to_parameters,
+)
+from flwr.server.client_dispatcher import ClientDispatcher
+from flwr.server.client_proxy import ClientProxy
+from flwr.server.server import (
+    FitResultsAndFailures,
+    _handle_finished_future_after_fit,
+    fit_client,
+    fit_clients,
+)
+
+from .utils import format_bytes, measure, print_table
+
+
+class _StubClientProxy(ClientProxy):
+    """ClientProxy responding to `fit` after a fixed latency."""
+
+    def __init__(self, cid: str, latency: float, fit_res: FitRes) -> None:
+        super().__init__(cid)
+        self.latency = latency
+        self.fit_res = fit_res
+        self.threads: Set[threading.Thread] = set()
+
+    def get_properties(
+        self, ins: GetPropertiesIns, timeout: Optional[float]
+    ) -> GetPropertiesRes:
+        """Not used in this benchmark."""
+        raise NotImplementedError()
+
+    def get_parameters(
+        self, ins: GetParametersIns, timeout: Optional[float]
+    ) -> GetParametersRes:
+        """Not used in this benchmark."""
+        raise NotImplementedError()
+
+    def fit(self, ins: FitIns, timeout: Optional[float]) -> FitRes:
+        """Wait for the latency and return the same result each time."""
+        self.threads.add(threading.current_thread())
+        time.sleep(self.latency)
+        return self.fit_res
+
+    def evaluate(self, ins: EvaluateIns, timeout: Optional[float]) -> EvaluateRes:
+        """Not used in this benchmark."""
+        raise NotImplementedError()
+
+    def reconnect(self, ins: ReconnectIns, timeout: Optional[float]) -> DisconnectRes:
+        """Not used in this benchmark."""
+        raise NotImplementedError()
+
+
+def _legacy_fit_clients(
+    client_instructions: List[Tuple[ClientProxy, FitIns]],
+    max_workers: Optional[int],
+    timeout: Optional[float],
+) -> FitResultsAndFailures:
+    """Copy of `fit_clients` with a new thread pool for each round."""
+    results: List[Tuple[ClientProxy, FitRes]] = []
+    failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        submitted_fs = {
+            executor.submit(fit_client, client_proxy, ins, timeout)
+            for client_proxy, ins in client_instructions
+        }
+        for future in concurrent.futures.as_completed(submitted_fs):
+            _handle_finished_future_after_fit(
+                future=future, results=results, failures=failures
+            )
+    return results, failures
+
+
+def _run_rounds(
+    client_instructions: List[Tuple[ClientProxy, FitIns]],
+    max_workers: int,
+    num_rounds: int,
+    dispatcher: Optional[ClientDispatcher],
+) -> List[float]:
+    """Run `num_rounds` rounds and return the p95 latency of each round."""
+    latencies_p95 = []
+    for _ in range(num_rounds):
+        if dispatcher is None:
+            results, _ = _legacy_fit_clients(client_instructions, max_workers, None)
+        else:
+            results, _ = fit_clients(
+                client_instructions, max_workers, None, dispatcher=dispatcher
+            )
+            assert dispatcher.last_metrics is not None
+            latencies_p95.append(dispatcher.last_metrics.latency_p95)
+        assert len(results) == len(client_instructions)
+    return latencies_p95
+
+
+def _benchmark(
+    name: str, max_workers: int, args: argparse.Namespace, fit_res: FitRes
+) -> List[object]:
+    """Run the rounds of one variant and return its table row."""
+    clients = [
+        _StubClientProxy(str(i), args.latency, fit_res) for i in range(args.num_clients)
+    ]
+    ins = FitIns(parameters=fit_res.parameters, config={})
+    client_instructions: List[Tuple[ClientProxy, FitIns]] = [
+        (client, ins) for client in clients
+    ]
+    dispatcher = (
+        ClientDispatcher(max_workers=max_workers) if name == "dispatcher" else None
+    )
+    latencies_p95, elapsed, peak = measure(
+        lambda: _run_rounds(
+            client_instructions, max_workers, args.num_rounds, dispatcher
+        )
+    )
+    if dispatcher is not None:
+        dispatcher.shutdown()
+    threads: Set[threading.Thread] = set().union(
+        *(client.threads for client in clients)
+    )
+    return [
+        max_workers,
+        name,
+        f"{elapsed / args.num_rounds * 1000:.1f} ms",
+        len(threads),
+        format_bytes(peak),
+        f"{max(latencies_p95) * 1000:.2f} ms" if latencies_p95 else "-",
+    ]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--num-clients", type=int, default=5000)
+    parser.add_argument("--max-workers", type=int, nargs="+", default=[32, 1024])
+    parser.add_argument("--num-rounds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.001)
+    args = parser.parse_args()
+
+    fit_res = FitRes(
+        status=Status(code=Code.OK, message="Success"),
+        parameters=ndarrays_to_parameters([np.zeros(10, dtype=np.float32)]),
+        num_examples=1,
+        metrics={},
+    )
+    rows = [
+        _benchmark(name, max_workers, args, fit_res)
+        for max_workers in args.max_workers
+        for name in ["legacy", "dispatcher"]
+    ]
+    print_table(
+        [
+            "max_workers",
+            "variant",
+            "time per round",
+            "threads started",
+            "peak memory",
+            "p95 latency",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark sampling clients from SimpleClientManager.
+
+Compares the latency of `sample` in the previous implementation, which copied the IDs
+of all clients and evaluated the criterion on every client in each call, with the
+indexed registry, for uniform sampling with and without a `PropertyCriterion`,
+weighted sampling, and stratified sampling.
+
+python -m flwr_tool.benchmark.client_sampling --num-clients 10000 100000 1000000
+"""
+
+
+import argparse
+import random
+import timeit
+from typing import Callable, Dict, List, Optional
+
+from flwr.server.client_manager import SimpleClientManager
+from flwr.server.client_proxy import ClientProxy
+from flwr.server.criterion import Criterion, PropertyCriterion
+from flwr.server.fleet.grpc_bidi.grpc_bridge import GrpcBridge
+from flwr.server.fleet.grpc_bidi.grpc_client_proxy import GrpcClientProxy
+
+from .utils import print_table
+
+
+class _LegacyClientManager(SimpleClientManager):
+    """SimpleClientManager sampling like Flower did before."""
+
+    def sample(
+        self,
+        num_clients: int,
+        min_num_clients: Optional[int] = None,
+        criterion: Optional[Criterion] = None,
+    ) -> List[ClientProxy]:
+        """Sample clients like Flower did before."""
+        self.wait_for(min_num_clients or num_clients)
+        available_cids = list(self.clients)
+        if criterion is not None:
+            available_cids = [
+                cid for cid in available_cids if criterion.select(self.clients[cid])
+            ]
+        if num_clients > len(available_cids):
+            return []
+        sampled_cids = random.sample(available_cids, num_clients)
+        return [self.clients[cid] for cid in sampled_cids]
+
+
+def _register(client_manager: SimpleClientManager, num_clients: int) -> None:
+    """Register clients with a device class, a region, and a battery level."""
+    bridge = GrpcBridge()
+    for i in range(num_clients):
+        client = GrpcClientProxy(cid=str(i), bridge=bridge)
+        client.properties = {
+            "device_class": ["phone", "tablet", "laptop"][i % 3],
+            "region": f"region-{i % 10}",
+            "battery": random.random(),
+        }
+        client_manager.register(client)
+
+
+def _time(func: Callable[[], List[ClientProxy]], repeat: int) -> str:
+    """Return the mean latency of `func` in milliseconds."""
+    start = timeit.default_timer()
+    for _ in range(repeat):
+        assert func()
+    return f"{(timeit.default_timer() - start) / repeat * 1000:.3f} ms"
+
+
+def _variants(
+    legacy: SimpleClientManager, indexed: SimpleClientManager, k: int
+) -> Dict[str, Callable[[], List[ClientProxy]]]:
+    """Return the sampling calls to benchmark."""
+    criterion = PropertyCriterion({"region": ["region-1", "region-2"]})
+    return {
+        "legacy, uniform": lambda: legacy.sample(k),
+        "legacy, criterion": lambda: legacy.sample(k, criterion=criterion),
+        "indexed, uniform": lambda: indexed.sample(k),
+        "indexed, criterion": lambda: indexed.sample(k, criterion=criterion),
+        "indexed, weighted": lambda: indexed.sample_weighted(k),
+        "indexed, stratified": lambda: indexed.sample_stratified(k, "device_class"),
+    }
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument(
+        "--num-clients", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--sample-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = []
+    for num_clients in args.num_clients:
+        legacy = _LegacyClientManager()
+        _register(legacy, num_clients)
+        indexed = SimpleClientManager(
+            index_properties=["device_class", "region"], weight_property="battery"
+        )
+        _register(indexed, num_clients)
+
+        for name, func in _variants(legacy, indexed, args.sample_size).items():
+            rows.append([num_clients, name, _time(func, args.repeat)])
+    print_table(["clients", "variant", "sample latency"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark FedAvg aggregation: `aggregate` vs. in-place aggregation.
+
+Both variants start from serialized `FitRes` parameters, just like
+`FedAvg.aggregate_fit`. The reference variant decodes all results before calling
+`aggregate`, the in-place variant decodes and folds one result at a time.
+
+    python -m flwr_tool.benchmark.fedavg_aggregation --num-clients 50 --model-mb 40
+"""
+
+
+import argparse
+from functools import partial
+from typing import List, Tuple
+
+import numpy as np
+
+from flwr.common import (
+    NDArrays,
+    Parameters,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.server.strategy.aggregate import InplaceAggregator, aggregate
+
+from .utils import format_bytes, measure, print_table
+
+
+def _create_results(
+    num_clients: int, model_mb: float, num_layers: int
+) -> List[Tuple[Parameters, int]]:
+    """Create serialized float32 models of roughly `model_mb` MiB each."""
+    rng = np.random.default_rng(0)
+    layer_size = max(1, int(model_mb * 1024 * 1024 / 4 / num_layers))
+    return [
+        (
+            ndarrays_to_parameters(
+                [
+                    rng.standard_normal(layer_size, dtype=np.float32)
+                    for _ in range(num_layers)
+                ]
+            ),
+            int(rng.integers(1, 100)),
+        )
+        for _ in range(num_clients)
+    ]
+
+
+def _reference(results: List[Tuple[Parameters, int]]) -> NDArrays:
+    weights_results = [
+        (parameters_to_ndarrays(parameters), num_examples)
+        for parameters, num_examples in results
+    ]
+    return aggregate(weights_results)
+
+
+def _inplace(results: List[Tuple[Parameters, int]]) -> NDArrays:
+    aggregator = InplaceAggregator()
+    for parameters, num_examples in results:
+        aggregator.add(parameters_to_ndarrays(parameters), num_examples)
+    return aggregator.result()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--num-clients", type=int, default=50)
+    parser.add_argument("--model-mb", type=float, default=40.0)
+    parser.add_argument("--num-layers", type=int, default=8)
+    args = parser.parse_args()
+
+    results = _create_results(args.num_clients, args.model_mb, args.num_layers)
+    total_mb = args.num_clients * args.model_mb
+    rows = []
+    outputs = []
+    for name, func in [("aggregate", _reference), ("inplace", _inplace)]:
+        output, elapsed, peak = measure(partial(func, results))
+        outputs.append(output)
+        rows.append(
+            [name, f"{elapsed:.3f} s", f"{total_mb / elapsed:.1f}", format_bytes(peak)]
+        )
+    print_table(["variant", "time", "MiB/s", "peak memory"], rows)
+
+    for ref_layer, inplace_layer in zip(*outputs):
+        np.testing.assert_allclose(ref_layer, inplace_layer, rtol=1e-4, atol=1e-6)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark a server round of FedAdam, FedYogi and FedAdagrad.
+
+Compares the previous implementation (FedAvg result serialized and deserialized again,
+new lists of moment buffers every round) against updating the optimizer state in place.
+Each round is measured after a warm-up round, so peak memory excludes the state
+allocated on first use.
+
+python -m flwr_tool.benchmark.fedopt_round --num-clients 2 --model-mb 100
+"""
+
+
+import argparse
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple, Type, Union
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from flwr.common import (
+    Code,
+    FitRes,
+    NDArrays,
+    Parameters,
+    Scalar,
+    Status,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.server.client_proxy import ClientProxy
+from flwr.server.strategy import FedAdagrad, FedAdam, FedAvg, FedYogi
+from flwr.server.strategy.fedopt import FedOpt
+
+from .utils import format_bytes, measure, print_table
+
+FitResults = List[Tuple[ClientProxy, FitRes]]
+
+
+class LegacyFedAdam(FedAdam):
+    """FedAdam as implemented before its state was updated in place."""
+
+    def aggregate_fit(
+        self,
+        server_round: int,
+        results: FitResults,
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Aggregate fit results using the Adam update rule."""
+        fedavg_parameters, metrics = FedAvg.aggregate_fit(
+            self, server_round, results, failures
+        )
+        if fedavg_parameters is None:
+            return None, {}
+        fedavg_weights = parameters_to_ndarrays(fedavg_parameters)
+        delta_t = [x - y for x, y in zip(fedavg_weights, self.current_weights)]
+        if not self.m_t:
+            self.m_t = [np.zeros_like(x) for x in delta_t]
+        self.m_t = [
+            np.multiply(self.beta_1, x) + (1 - self.beta_1) * y
+            for x, y in zip(self.m_t, delta_t)
+        ]
+        if not self.v_t:
+            self.v_t = [np.zeros_like(x) for x in delta_t]
+        self.v_t = [
+            self.beta_2 * x + (1 - self.beta_2) * np.multiply(y, y)
+            for x, y in zip(self.v_t, delta_t)
+        ]
+        self.current_weights = [
+            x + self.eta * y / (np.sqrt(z) + self.tau)
+            for x, y, z in zip(self.current_weights, self.m_t, self.v_t)
+        ]
+        return ndarrays_to_parameters(self.current_weights), metrics
+
+
+class LegacyFedYogi(FedYogi):
+    """FedYogi as implemented before its state was updated in place."""
+
+    def aggregate_fit(
+        self,
+        server_round: int,
+        results: FitResults,
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Aggregate fit results using the Yogi update rule."""
+        fedavg_parameters, metrics = FedAvg.aggregate_fit(
+            self, server_round, results, failures
+        )
+        if fedavg_parameters is None:
+            return None, {}
+        fedavg_weights = parameters_to_ndarrays(fedavg_parameters)
+        delta_t = [x - y for x, y in zip(fedavg_weights, self.current_weights)]
+        if not self.m_t:
+            self.m_t = [np.zeros_like(x) for x in delta_t]
+        self.m_t = [
+            np.multiply(self.beta_1, x) + (1 - self.beta_1) * y
+            for x, y in zip(self.m_t, delta_t)
+        ]
+        if not self.v_t:
+            self.v_t = [np.zeros_like(x) for x in delta_t]
+        self.v_t = [
+            x - (1.0 - self.beta_2) * np.multiply(y, y) * np.sign(x - np.multiply(y, y))
+            for x, y in zip(self.v_t, delta_t)
+        ]
+        self.current_weights = [
+            x + self.eta * y / (np.sqrt(z) + self.tau)
+            for x, y, z in zip(self.current_weights, self.m_t, self.v_t)
+        ]
+        return ndarrays_to_parameters(self.current_weights), metrics
+
+
+class LegacyFedAdagrad(FedAdagrad):
+    """FedAdagrad as implemented before its state was updated in place."""
+
+    def aggregate_fit(
+        self,
+        server_round: int,
+        results: FitResults,
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Aggregate fit results using the Adagrad update rule."""
+        fedavg_parameters, metrics = FedAvg.aggregate_fit(
+            self, server_round, results, failures
+        )
+        if fedavg_parameters is None:
+            return None, {}
+        fedavg_weights = parameters_to_ndarrays(fedavg_parameters)
+        delta_t = [x - y for x, y in zip(fedavg_weights, self.current_weights)]
+        if not self.m_t:
+            self.m_t = [np.zeros_like(x) for x in delta_t]
+        self.m_t = [
+            np.multiply(self.beta_1, x) + (1 - self.beta_1) * y
+            for x, y in zip(self.m_t, delta_t)
+        ]
+        if not self.v_t:
+            self.v_t = [np.zeros_like(x) for x in delta_t]
+        self.v_t = [x + np.multiply(y, y) for x, y in zip(self.v_t, delta_t)]
+        self.current_weights = [
+            x + self.eta * y / (np.sqrt(z) + self.tau)
+            for x, y, z in zip(self.current_weights, self.m_t, self.v_t)
+        ]
+        return ndarrays_to_parameters(self.current_weights), metrics
+
+
+def _create_results(
+    num_clients: int, model_mb: float, num_layers: int
+) -> Tuple[FitResults, Parameters]:
+    """Create float32 training results and zero initial parameters."""
+    rng = np.random.default_rng(0)
+    layer_size = max(1, int(model_mb * 1024 * 1024 / 4 / num_layers))
+    results: FitResults = [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters(
+                    [
+                        rng.standard_normal(layer_size, dtype=np.float32)
+                        for _ in range(num_layers)
+                    ]
+                ),
+                num_examples=1,
+                metrics={},
+            ),
+        )
+        for _ in range(num_clients)
+    ]
+    initial_parameters = ndarrays_to_parameters(
+        [np.zeros(layer_size, dtype=np.float32) for _ in range(num_layers)]
+    )
+    return results, initial_parameters
+
+
+def _run_rounds(strategy: FedOpt, results: FitResults, num_rounds: int) -> NDArrays:
+    """Run `num_rounds` server rounds and return the resulting model."""
+    for server_round in range(2, num_rounds + 2):
+        strategy.aggregate_fit(server_round, results, [])
+    return strategy.current_weights
+
+
+def _run(
+    name: str,
+    strategy_cls: Type[FedOpt],
+    results: FitResults,
+    initial_parameters: Parameters,
+    num_rounds: int,
+) -> Tuple[List[str], NDArrays]:
+    """Measure `num_rounds` rounds of `strategy_cls` after a warm-up round."""
+    strategy = strategy_cls(
+        initial_parameters=initial_parameters, fit_metrics_aggregation_fn=lambda _: {}
+    )
+    strategy.aggregate_fit(1, results, [])
+    weights, elapsed, peak = measure(
+        partial(_run_rounds, strategy, results, num_rounds)
+    )
+    row = [name, f"{elapsed / num_rounds * 1000:.1f} ms", format_bytes(peak)]
+    return row, weights
+
+
+def _compare(
+    name: str,
+    legacy_cls: Type[FedOpt],
+    strategy_cls: Type[FedOpt],
+    run: Callable[[str, Type[FedOpt]], Tuple[List[str], NDArrays]],
+) -> List[List[str]]:
+    """Run both implementations of a strategy and check that they agree."""
+    legacy_row, reference = run(f"{name}, legacy", legacy_cls)
+    row, weights = run(f"{name}, in place", strategy_cls)
+    for ref_layer, layer in zip(reference, weights):
+        np.testing.assert_allclose(layer, ref_layer, rtol=1e-4, atol=1e-6)
+    return [legacy_row, row]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--num-clients", type=int, default=2)
+    parser.add_argument("--model-mb", type=float, default=100.0)
+    parser.add_argument("--num-layers", type=int, default=4)
+    parser.add_argument("--num-rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    results, initial_parameters = _create_results(
+        args.num_clients, args.model_mb, args.num_layers
+    )
+    variants: List[Tuple[str, Type[FedOpt], Type[FedOpt]]] = [
+        ("FedAdam", LegacyFedAdam, FedAdam),
+        ("FedYogi", LegacyFedYogi, FedYogi),
+        ("FedAdagrad", LegacyFedAdagrad, FedAdagrad),
+    ]
+
+    run = partial(
+        _run,
+        results=results,
+        initial_parameters=initial_parameters,
+        num_rounds=args.num_rounds,
+    )
+    rows = []
+    for name, legacy_cls, strategy_cls in variants:
+        rows += _compare(name, legacy_cls, strategy_cls, run)
+    print_table(["variant", "time per round", "peak memory"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark FedXgbBagging aggregation over many rounds.
+
+Compares the previous aggregation, which parsed and serialized the whole global model
+for every client tree, against keeping the parsed model across rounds and appending the
+client trees to it. Every client contributes one tree per round. The previous
+implementation only runs for the first `--legacy-rounds` rounds.
+
+python -m flwr_tool.benchmark.fedxgb_bagging --num-clients 100 --num-rounds 200
+"""
+
+
+import argparse
+import json
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from flwr.common import Code, FitRes, Parameters, Status
+from flwr.server.client_proxy import ClientProxy
+from flwr.server.strategy import FedXgbBagging
+
+from .utils import format_bytes, print_table
+
+
+def _legacy_aggregate(bst_prev_org: Optional[bytes], bst_curr_org: bytes) -> bytes:
+    """Aggregate like Flower did before."""
+    if not bst_prev_org:
+        return bst_curr_org
+    tree_num_prev, _ = _legacy_get_tree_nums(bst_prev_org)
+    _, paral_tree_num_curr = _legacy_get_tree_nums(bst_curr_org)
+    bst_prev = json.loads(bytearray(bst_prev_org))
+    bst_curr = json.loads(bytearray(bst_curr_org))
+    model_prev = bst_prev["learner"]["gradient_booster"]["model"]
+    model_prev["gbtree_model_param"]["num_trees"] = str(
+        tree_num_prev + paral_tree_num_curr
+    )
+    model_prev["iteration_indptr"].append(
+        model_prev["iteration_indptr"][-1] + paral_tree_num_curr
+    )
+    trees_curr = bst_curr["learner"]["gradient_booster"]["model"]["trees"]
+    for tree_count in range(paral_tree_num_curr):
+        trees_curr[tree_count]["id"] = tree_num_prev + tree_count
+        model_prev["trees"].append(trees_curr[tree_count])
+        model_prev["tree_info"].append(0)
+    return bytes(json.dumps(bst_prev), "utf-8")
+
+
+def _legacy_get_tree_nums(xgb_model_org: bytes) -> Tuple[int, int]:
+    xgb_model = json.loads(bytearray(xgb_model_org))
+    param = xgb_model["learner"]["gradient_booster"]["model"]["gbtree_model_param"]
+    return int(param["num_trees"]), int(param["num_parallel_tree"])
+
+
+class _LegacyFedXgbBagging(FedXgbBagging):
+    """FedXgbBagging aggregating like Flower did before."""
+
+    def aggregate_fit(
+        self,
+        server_round: int,
+        results: List[Tuple[ClientProxy, FitRes]],
+        failures: List[Any],
+    ) -> Tuple[Optional[Parameters], Dict[str, Any]]:
+        """Aggregate fit results like Flower did before."""
+        global_model = self.global_model
+        for _, fit_res in results:
+            for bst in fit_res.parameters.tensors:
+                global_model = _legacy_aggregate(global_model, bst)
+        self.global_model = global_model
+        return Parameters(tensor_type="", tensors=[global_model or b""]), {}
+
+
+def _client_model(rng: np.random.Generator, num_nodes: int) -> bytes:
+    """Create a JSON model in the format of XGBoost with a single tree."""
+    tree = {
+        "base_weights": rng.standard_normal(num_nodes).tolist(),
+        "categories": [],
+        "categories_nodes": [],
+        "categories_segments": [],
+        "categories_sizes": [],
+        "default_left": [0] * num_nodes,
+        "id": 0,
+        "left_children": list(range(1, num_nodes + 1)),
+        "loss_changes": rng.standard_normal(num_nodes).tolist(),
+        "parents": list(range(-1, num_nodes - 1)),
+        "right_children": list(range(2, num_nodes + 2)),
+        "split_conditions": rng.standard_normal(num_nodes).tolist(),
+        "split_indices": rng.integers(0, 100, num_nodes).tolist(),
+        "split_type": [0] * num_nodes,
+        "sum_hessian": rng.random(num_nodes).tolist(),
+        "tree_param": {"num_deleted": "0", "num_feature": "100", "num_nodes": "15"},
+    }
+    model = {
+        "learner": {
+            "attributes": {},
+            "gradient_booster": {
+                "model": {
+                    "gbtree_model_param": {"num_parallel_tree": "1", "num_trees": "1"},
+                    "iteration_indptr": [0, 1],
+                    "tree_info": [0],
+                    "trees": [tree],
+                },
+                "name": "gbtree",
+            },
+        },
+        "version": [1, 7, 6],
+    }
+    return bytes(json.dumps(model), "utf-8")
+
+
+def _run(
+    strategy_fn: Callable[[], FedXgbBagging],
+    results: List[Tuple[ClientProxy, FitRes]],
+    num_rounds: int,
+) -> Tuple[bytes, float, float]:
+    """Return the final model, the total time and the time of the last round."""
+    strategy = strategy_fn()
+    total, elapsed, parameters = 0.0, 0.0, None
+    for server_round in range(1, num_rounds + 1):
+        start = timeit.default_timer()
+        parameters, _ = strategy.aggregate_fit(server_round, results, [])
+        elapsed = timeit.default_timer() - start
+        total += elapsed
+    assert parameters is not None
+    return parameters.tensors[0], total, elapsed
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--num-clients", type=int, default=100)
+    parser.add_argument("--num-rounds", type=int, default=200)
+    parser.add_argument("--legacy-rounds", type=int, default=10)
+    parser.add_argument("--tree-nodes", type=int, default=15)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    results: List[Tuple[ClientProxy, FitRes]] = [
+        (
+            None,  # type: ignore
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=Parameters(
+                    tensor_type="", tensors=[_client_model(rng, args.tree_nodes)]
+                ),
+                num_examples=1,
+                metrics={},
+            ),
+        )
+        for _ in range(args.num_clients)
+    ]
+
+    rows = []
+    # The models after `--legacy-rounds` rounds must be the same
+    reference: Optional[bytes] = None
+    for name, strategy_fn, num_rounds in [
+        ("legacy", _LegacyFedXgbBagging, args.legacy_rounds),
+        ("appending", FedXgbBagging, args.legacy_rounds),
+        ("appending", FedXgbBagging, args.num_rounds),
+    ]:
+        if num_rounds <= 0:
+            continue
+        model, total, last_round = _run(strategy_fn, results, num_rounds)
+        if num_rounds == args.legacy_rounds:
+            assert reference in (None, model)
+            reference = model
+        rows.append(
+            [
+                name,
+                num_rounds,
+                f"{total:.3f} s",
+                f"{last_round:.3f} s",
+                format_bytes(len(model)),
+            ]
+        )
+    print_table(["variant", "rounds", "total", "last round", "model size"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark InMemoryState operations for a growing number of pending tasks.
+
+Each pending TaskIns is addressed to one of `--num-nodes` nodes. With queues per node
+and an index of TaskRes by ancestry, the latency of pulling, answering and deleting
+tasks should stay flat as the number of pending tasks grows.
+
+python -m flwr_tool.benchmark.in_memory_state --num-pending 1000 10000 100000
+"""
+
+
+import argparse
+import logging
+import random
+import timeit
+from typing import List
+from uuid import UUID
+
+from flwr.common.logger import FLOWER_LOGGER
+from flwr.proto.node_pb2 import Node
+from flwr.proto.task_pb2 import Task, TaskIns, TaskRes
+from flwr.proto.transport_pb2 import ClientMessage, ServerMessage
+from flwr.server.state import InMemoryState
+
+from .utils import print_table
+
+
+def _task_ins(node_id: int, workload_id: int) -> TaskIns:
+    return TaskIns(
+        task_id="",
+        group_id="",
+        workload_id=workload_id,
+        task=Task(
+            producer=Node(node_id=0, anonymous=True),
+            consumer=Node(node_id=node_id, anonymous=False),
+            legacy_server_message=ServerMessage(
+                reconnect_ins=ServerMessage.ReconnectIns()
+            ),
+        ),
+    )
+
+
+def _task_res(task_ins: TaskIns) -> TaskRes:
+    return TaskRes(
+        task_id="",
+        group_id="",
+        workload_id=task_ins.workload_id,
+        task=Task(
+            producer=Node(node_id=task_ins.task.consumer.node_id, anonymous=False),
+            consumer=Node(node_id=0, anonymous=True),
+            ancestry=[task_ins.task_id],
+            legacy_client_message=ClientMessage(
+                disconnect_res=ClientMessage.DisconnectRes()
+            ),
+        ),
+    )
+
+
+# pylint: disable-next=too-many-locals
+def _bench(num_pending: int, num_nodes: int, num_ops: int) -> List[str]:
+    """Return the mean latency (us) of each operation for `num_pending` tasks."""
+    rng = random.Random(0)
+    state = InMemoryState()
+    workload_id = state.create_workload()
+    for _ in range(num_pending):
+        state.store_task_ins(_task_ins(rng.randrange(1, num_nodes + 1), workload_id))
+
+    pull_time = push_time = get_res_time = delete_time = 0.0
+    pulled = 0
+    for _ in range(num_ops):
+        node_id = rng.randrange(1, num_nodes + 1)
+        start = timeit.default_timer()
+        task_ins_list = state.get_task_ins(node_id=node_id, limit=1)
+        pull_time += timeit.default_timer() - start
+        if not task_ins_list:
+            continue
+        pulled += 1
+        task_ins = task_ins_list[0]
+
+        start = timeit.default_timer()
+        state.store_task_res(_task_res(task_ins))
+        push_time += timeit.default_timer() - start
+
+        task_ids = {UUID(task_ins.task_id)}
+        start = timeit.default_timer()
+        state.get_task_res(task_ids=task_ids, limit=None)
+        get_res_time += timeit.default_timer() - start
+
+        start = timeit.default_timer()
+        state.delete_tasks(task_ids=task_ids)
+        delete_time += timeit.default_timer() - start
+
+    return [
+        str(num_pending),
+        f"{pull_time / num_ops * 1e6:.1f}",
+        f"{push_time / max(pulled, 1) * 1e6:.1f}",
+        f"{get_res_time / max(pulled, 1) * 1e6:.1f}",
+        f"{delete_time / max(pulled, 1) * 1e6:.1f}",
+    ]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument(
+        "--num-pending", type=int, nargs="+", default=[1000, 10000, 100000]
+    )
+    parser.add_argument("--num-nodes", type=int, default=1000)
+    parser.add_argument("--num-ops", type=int, default=2000)
+    args = parser.parse_args()
+    FLOWER_LOGGER.setLevel(logging.WARNING)
+
+    rows = [
+        _bench(num_pending, args.num_nodes, args.num_ops)
+        for num_pending in args.num_pending
+    ]
+    print_table(
+        [
+            "pending TaskIns",
+            "get_task_ins (us)",
+            "store_task_res (us)",
+            "get_task_res (us)",
+            "delete_tasks (us)",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
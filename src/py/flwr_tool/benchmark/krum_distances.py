@@ -0,0 +1,147 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark the pairwise distances used by Krum, MultiKrum and Bulyan.
+
+Compares the previous implementation (a Python double loop over all pairs of flattened
+models, recomputed for every model Bulyan selects) against the blockwise Gram-matrix
+kernel, which Bulyan computes only once.
+
+python -m flwr_tool.benchmark.krum_distances --num-clients 30 --num-params 1000000
+"""
+
+
+import argparse
+from functools import partial
+from typing import Any, Callable, List, Tuple
+from unittest.mock import patch
+
+import numpy as np
+
+from flwr.common import NDArray, NDArrays
+from flwr.server.strategy import aggregate
+from flwr.server.strategy.aggregate import (
+    _compute_distances,
+    _find_reference_weights,
+    _select_krum,
+    aggregate_krum,
+)
+
+from .utils import format_bytes, measure, print_table
+
+
+def _legacy_compute_distances(weights: List[NDArrays]) -> NDArray:
+    """Compute squared distances like Flower did before the Gram-matrix kernel."""
+    flat_w = np.array([np.concatenate(p, axis=None).ravel() for p in weights])
+    distance_matrix = np.zeros((len(weights), len(weights)))
+    for i, _ in enumerate(flat_w):
+        for j, _ in enumerate(flat_w):
+            delta = flat_w[i] - flat_w[j]
+            norm = np.linalg.norm(delta)
+            distance_matrix[i, j] = norm**2
+    return distance_matrix
+
+
+def _legacy_select_krum(
+    results: List[Tuple[NDArrays, int]], num_malicious: int, num_selected: int
+) -> List[Tuple[NDArrays, int]]:
+    """Select models for Bulyan like Flower did before, one Krum call each."""
+    remaining = list(results)
+    selected = []
+    with patch.object(
+        aggregate,
+        "_compute_distances",
+        lambda weights, **_: _legacy_compute_distances(weights),
+    ):
+        for _ in range(num_selected):
+            best_model = aggregate_krum(remaining, num_malicious, to_keep=0)
+            best_idx = _find_reference_weights(
+                best_model, [weights for weights, _ in remaining]
+            )
+            selected.append(remaining.pop(best_idx))
+    return selected
+
+
+def _create_results(
+    num_clients: int, num_params: int, num_layers: int
+) -> List[Tuple[NDArrays, int]]:
+    """Create float32 models that are close to each other."""
+    rng = np.random.default_rng(0)
+    layer_size = max(1, num_params // num_layers)
+    center = [rng.standard_normal(layer_size, dtype=np.float32)] * num_layers
+    return [
+        (
+            [
+                layer + 0.01 * rng.standard_normal(layer_size, dtype=np.float32)
+                for layer in center
+            ],
+            1,
+        )
+        for _ in range(num_clients)
+    ]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--num-clients", type=int, default=30)
+    parser.add_argument("--num-params", type=int, default=1_000_000)
+    parser.add_argument("--num-layers", type=int, default=8)
+    parser.add_argument("--num-malicious", type=int, default=2)
+    parser.add_argument(
+        "--skip-legacy", action="store_true", help="Only run the new implementation"
+    )
+    args = parser.parse_args()
+
+    results = _create_results(args.num_clients, args.num_params, args.num_layers)
+    weights = [w for w, _ in results]
+    num_selected = args.num_clients - 2 * args.num_malicious
+
+    legacy = not args.skip_legacy
+    variants: List[Tuple[str, Callable[[], Any], bool]] = [
+        ("distances, legacy", partial(_legacy_compute_distances, weights), legacy),
+        ("distances, gram float64", partial(_compute_distances, weights), True),
+        (
+            "distances, gram float32",
+            partial(_compute_distances, weights, dtype=np.float32),
+            True,
+        ),
+        (
+            "bulyan selection, legacy",
+            partial(_legacy_select_krum, results, args.num_malicious, num_selected),
+            legacy,
+        ),
+        (
+            "bulyan selection, gram float64",
+            partial(_select_krum, results, args.num_malicious, num_selected),
+            True,
+        ),
+    ]
+
+    rows = []
+    reference = None
+    for name, func, enabled in variants:
+        if not enabled:
+            continue
+        output, elapsed, peak = measure(func)
+        if name.startswith("distances"):
+            if reference is None:
+                reference = output
+            np.testing.assert_allclose(output, reference, rtol=1e-2)
+        rows.append([name, f"{elapsed:.3f} s", format_bytes(peak)])
+    print_table(["variant", "time", "peak memory"], rows)
+
+
+if __name__ == "__main__":
+    main()
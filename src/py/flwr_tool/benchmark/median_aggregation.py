@@ -0,0 +1,104 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark coordinate-wise median and trimmed-mean aggregation.
+
+Compares stacking all clients' layers at once against processing each layer in column
+blocks of `--block-mb` MiB, with and without a thread pool. Peak memory excludes the
+client models themselves.
+
+python -m flwr_tool.benchmark.median_aggregation --num-clients 50 --model-mb 40
+"""
+
+
+import argparse
+from functools import partial
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from flwr.common import NDArrays
+from flwr.server.strategy.aggregate import aggregate_median, aggregate_trimmed_avg
+
+from .utils import format_bytes, measure, print_table
+
+
+def _create_results(
+    num_clients: int, model_mb: float, num_layers: int
+) -> List[Tuple[NDArrays, int]]:
+    """Create float32 models of roughly `model_mb` MiB each."""
+    rng = np.random.default_rng(0)
+    layer_size = max(1, int(model_mb * 1024 * 1024 / 4 / num_layers))
+    return [
+        (
+            [
+                rng.standard_normal(layer_size, dtype=np.float32)
+                for _ in range(num_layers)
+            ],
+            1,
+        )
+        for _ in range(num_clients)
+    ]
+
+
+def _run(
+    name: str,
+    aggregate_fn: Callable[..., NDArrays],
+    configs: List[Tuple[str, Optional[int], int]],
+) -> List[List[str]]:
+    """Run `aggregate_fn` for each config and check that the results agree."""
+    rows = []
+    reference: Optional[NDArrays] = None
+    for config, block_bytes, num_threads in configs:
+        output, elapsed, peak = measure(
+            partial(aggregate_fn, block_bytes=block_bytes, num_threads=num_threads)
+        )
+        if reference is None:
+            reference = output
+        for ref_layer, layer in zip(reference, output):
+            np.testing.assert_allclose(layer, ref_layer, rtol=1e-6)
+        rows.append([f"{name}, {config}", f"{elapsed:.3f} s", format_bytes(peak)])
+    return rows
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--num-clients", type=int, default=50)
+    parser.add_argument("--model-mb", type=float, default=40.0)
+    parser.add_argument("--num-layers", type=int, default=2)
+    parser.add_argument("--block-mb", type=float, default=8.0)
+    parser.add_argument("--num-threads", type=int, default=4)
+    args = parser.parse_args()
+
+    results = _create_results(args.num_clients, args.model_mb, args.num_layers)
+    block_bytes = int(args.block_mb * 1024 * 1024)
+    configs: List[Tuple[str, Optional[int], int]] = [
+        ("stacked", None, 1),
+        ("chunked", block_bytes, 1),
+        (f"chunked, {args.num_threads} threads", block_bytes, args.num_threads),
+    ]
+    aggregations: List[Tuple[str, Callable[..., NDArrays]]] = [
+        ("median", aggregate_median),
+        ("trimmed mean", partial(aggregate_trimmed_avg, proportiontocut=0.2)),
+    ]
+
+    rows = []
+    for name, aggregate_fn in aggregations:
+        rows += _run(name, partial(aggregate_fn, results), configs)
+    print_table(["variant", "time", "peak memory"], rows)
+
+
+if __name__ == "__main__":
+    main()
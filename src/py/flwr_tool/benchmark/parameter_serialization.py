@@ -0,0 +1,69 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark the "numpy.ndarray" and "numpy.rawbuffer" parameter codecs.
+
+python -m flwr_tool.benchmark.parameter_serialization --model-mb 100
+"""
+
+
+import argparse
+from functools import partial
+
+import numpy as np
+
+from flwr.common import ndarrays_to_parameters, parameters_to_ndarrays
+from flwr.common.parameter import TENSOR_TYPE_NDARRAY, TENSOR_TYPE_RAWBUFFER
+
+from .utils import format_bytes, measure, print_table
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--model-mb", type=float, default=100.0)
+    parser.add_argument("--num-layers", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    layer_size = max(1, int(args.model_mb * 1024 * 1024 / 4 / args.num_layers))
+    ndarrays = [
+        rng.standard_normal(layer_size, dtype=np.float32)
+        for _ in range(args.num_layers)
+    ]
+
+    rows = []
+    for tensor_type in [TENSOR_TYPE_NDARRAY, TENSOR_TYPE_RAWBUFFER]:
+        parameters, encode_time, encode_peak = measure(
+            partial(ndarrays_to_parameters, ndarrays, tensor_type=tensor_type)
+        )
+        decoded, decode_time, decode_peak = measure(
+            partial(parameters_to_ndarrays, parameters)
+        )
+        for expected, actual in zip(ndarrays, decoded):
+            np.testing.assert_array_equal(expected, actual)
+        rows.append(
+            [
+                tensor_type,
+                f"{encode_time * 1000:.1f} ms",
+                format_bytes(encode_peak),
+                f"{decode_time * 1000:.1f} ms",
+                format_bytes(decode_peak),
+            ]
+        )
+    print_table(["tensor type", "encode", "encode peak", "decode", "decode peak"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark q-FFL aggregation in QFedAvg.
+
+Compares the previous implementation (gradients flattened with repeated `np.append`,
+scaled deltas kept for every client) against reducing and summing the gradients layer
+by layer, for a grid of client counts and model sizes. Peak memory excludes the
+serialized client models.
+
+python -m flwr_tool.benchmark.qffl_aggregation --num-clients 5 10 --model-mb 10 20
+"""
+
+
+import argparse
+from functools import partial
+from itertools import product
+from typing import Dict, List, Optional, Tuple, Type, Union
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from flwr.common import (
+    Code,
+    FitRes,
+    NDArrays,
+    Parameters,
+    Scalar,
+    Status,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.server.client_proxy import ClientProxy
+from flwr.server.strategy import QFedAvg
+
+from .utils import format_bytes, measure, print_table
+
+FitResults = List[Tuple[ClientProxy, FitRes]]
+
+
+def _legacy_aggregate_qffl(
+    parameters: NDArrays, deltas: List[NDArrays], hs_fll: List[float]
+) -> NDArrays:
+    """Compute the q-FFL update like Flower did before."""
+    demominator: float = np.sum(np.asarray(hs_fll))
+    scaled_deltas = []
+    for client_delta in deltas:
+        scaled_deltas.append([layer * 1.0 / demominator for layer in client_delta])
+    updates = []
+    for i in range(len(deltas[0])):
+        tmp = scaled_deltas[0][i]
+        for j in range(1, len(deltas)):
+            tmp += scaled_deltas[j][i]
+        updates.append(tmp)
+    return [(u - v) * 1.0 for u, v in zip(parameters, updates)]
+
+
+class LegacyQFedAvg(QFedAvg):
+    """QFedAvg as implemented before its aggregation was vectorised."""
+
+    def aggregate_fit(
+        self,
+        server_round: int,
+        results: FitResults,
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Aggregate fit results using q-FFL."""
+
+        def norm_grad(grad_list: NDArrays) -> float:
+            client_grads = grad_list[0]
+            for i in range(1, len(grad_list)):
+                client_grads = np.append(client_grads, grad_list[i])
+            return float(np.sum(np.square(client_grads)))
+
+        if self.pre_weights is None:
+            raise ValueError("QffedAvg pre_weights are None in aggregate_fit")
+        weights_before = self.pre_weights
+        eval_result = self.evaluate(
+            server_round, ndarrays_to_parameters(weights_before)
+        )
+        loss = eval_result[0] if eval_result is not None else 0.0
+        deltas = []
+        hs_ffl = []
+        for _, fit_res in results:
+            new_weights = parameters_to_ndarrays(fit_res.parameters)
+            grads = [
+                np.multiply((u - v), 1.0 / self.learning_rate)
+                for u, v in zip(weights_before, new_weights)
+            ]
+            deltas.append(
+                [np.float_power(loss + 1e-10, self.q_param) * grad for grad in grads]
+            )
+            hs_ffl.append(
+                self.q_param
+                * np.float_power(loss + 1e-10, (self.q_param - 1))
+                * norm_grad(grads)
+                + (1.0 / self.learning_rate)
+                * np.float_power(loss + 1e-10, self.q_param)
+            )
+        weights_aggregated = _legacy_aggregate_qffl(weights_before, deltas, hs_ffl)
+        return ndarrays_to_parameters(weights_aggregated), {}
+
+
+def _create_round(
+    num_clients: int, model_mb: float, num_layers: int
+) -> Tuple[NDArrays, FitResults]:
+    """Create float32 global weights and training results."""
+    rng = np.random.default_rng(0)
+    layer_size = max(1, int(model_mb * 1024 * 1024 / 4 / num_layers))
+    weights = [
+        rng.standard_normal(layer_size, dtype=np.float32) for _ in range(num_layers)
+    ]
+    results: FitResults = [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters(
+                    [
+                        layer + rng.standard_normal(layer_size, dtype=np.float32)
+                        for layer in weights
+                    ]
+                ),
+                num_examples=1,
+                metrics={},
+            ),
+        )
+        for _ in range(num_clients)
+    ]
+    return weights, results
+
+
+def _evaluate(
+    server_round: int,  # pylint: disable=unused-argument
+    parameters: NDArrays,  # pylint: disable=unused-argument
+    config: Dict[str, Scalar],  # pylint: disable=unused-argument
+) -> Tuple[float, Dict[str, Scalar]]:
+    """Return a constant loss for the global model."""
+    return 1.0, {}
+
+
+def _aggregate(
+    strategy_cls: Type[QFedAvg], weights: NDArrays, results: FitResults
+) -> NDArrays:
+    """Run a single q-FFL aggregation."""
+    strategy = strategy_cls(
+        evaluate_fn=_evaluate, fit_metrics_aggregation_fn=lambda _: {}
+    )
+    strategy.pre_weights = weights
+    parameters, _ = strategy.aggregate_fit(1, results, [])
+    assert parameters is not None
+    return parameters_to_ndarrays(parameters)
+
+
+def _run(num_clients: int, model_mb: float, num_layers: int) -> List[List[str]]:
+    """Compare both implementations for a single configuration."""
+    weights, results = _create_round(num_clients, model_mb, num_layers)
+    rows = []
+    reference: Optional[NDArrays] = None
+    for name, strategy_cls in [("legacy", LegacyQFedAvg), ("vectorised", QFedAvg)]:
+        output, elapsed, peak = measure(
+            partial(_aggregate, strategy_cls, weights, results)
+        )
+        if reference is None:
+            reference = output
+        for ref_layer, layer in zip(reference, output):
+            np.testing.assert_allclose(layer, ref_layer, rtol=1e-4, atol=1e-5)
+        rows.append(
+            [
+                name,
+                str(num_clients),
+                f"{model_mb:g} MiB",
+                f"{elapsed:.3f} s",
+                format_bytes(peak),
+            ]
+        )
+    return rows
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--num-clients", type=int, nargs="+", default=[5, 10])
+    parser.add_argument("--model-mb", type=float, nargs="+", default=[10.0, 20.0])
+    parser.add_argument("--num-layers", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = []
+    for num_clients, model_mb in product(args.num_clients, args.model_mb):
+        rows += _run(num_clients, model_mb, args.num_layers)
+    print_table(["variant", "clients", "model", "time", "peak memory"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark REST Fleet API polling with and without connection reuse.
+
+Starts the REST Fleet API (`flwr.server.fleet.rest_rere.rest_api`) on localhost and
+compares one connection per request (bare `requests.post`, the previous client
+behaviour) against the pooled keep-alive session of `http_request_response`. Also
+reports the size of a compressed PushTaskRes body for each content encoding.
+
+python -m flwr_tool.benchmark.rest_client --num-polls 1000
+"""
+
+
+import argparse
+import logging
+import socket
+import threading
+import time
+import timeit
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+from unittest.mock import patch
+
+import numpy as np
+import requests
+import uvicorn
+from urllib3.connection import HTTPConnection
+
+from flwr.client.rest_client.connection import PATH_PULL_TASK_INS, http_request_response
+from flwr.common import Code, FitRes, Status, ndarrays_to_parameters, serde
+from flwr.common.compression import CONTENT_ENCODINGS, compress
+from flwr.common.logger import FLOWER_LOGGER
+from flwr.proto.fleet_pb2 import PullTaskInsRequest, PushTaskResRequest
+from flwr.proto.node_pb2 import Node
+from flwr.proto.task_pb2 import Task, TaskRes
+from flwr.proto.transport_pb2 import ClientMessage
+from flwr.server.fleet.rest_rere.rest_api import app
+from flwr.server.state import StateFactory
+
+from .utils import format_bytes, print_table
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _start_server(port: int) -> uvicorn.Server:
+    """Run the REST Fleet API in a background thread."""
+    app.state.STATE_FACTORY = StateFactory(":flwr-in-memory-state:")
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+@contextmanager
+def _count_connections() -> Iterator[List[int]]:
+    """Count the TCP connections opened by `requests`."""
+    counter = [0]
+    connect = HTTPConnection.connect
+
+    def _connect(self: HTTPConnection) -> None:
+        counter[0] += 1
+        connect(self)
+
+    with patch.object(HTTPConnection, "connect", _connect):
+        yield counter
+
+
+def _bench(poll: Callable[[], object], num_polls: int) -> List[object]:
+    """Return (polls/s, ms per poll, connections opened) of `num_polls` polls."""
+    with _count_connections() as counter:
+        start = timeit.default_timer()
+        for _ in range(num_polls):
+            poll()
+        elapsed = timeit.default_timer() - start
+    return [
+        f"{num_polls / elapsed:.0f}",
+        f"{1000 * elapsed / num_polls:.2f}",
+        counter[0],
+    ]
+
+
+def _task_res_bytes(num_params: int) -> bytes:
+    """Serialize a PushTaskResRequest carrying a FitRes of `num_params` floats."""
+    rng = np.random.default_rng(0)
+    fit_res = FitRes(
+        status=Status(code=Code.OK, message=""),
+        parameters=ndarrays_to_parameters(
+            [rng.standard_normal(num_params).astype(np.float32)]
+        ),
+        num_examples=1,
+        metrics={},
+    )
+    task_res = TaskRes(
+        task=Task(
+            legacy_client_message=ClientMessage(fit_res=serde.fit_res_to_proto(fit_res))
+        )
+    )
+    return PushTaskResRequest(task_res_list=[task_res]).SerializeToString()
+
+
+def _compression_rows(body: bytes) -> List[List[object]]:
+    """Return the compressed size and compression time for each encoding."""
+    rows: List[List[object]] = [["identity", format_bytes(len(body)), "-"]]
+    for content_encoding in CONTENT_ENCODINGS:
+        try:
+            start = timeit.default_timer()
+            compressed = compress(body, content_encoding)
+            elapsed = timeit.default_timer() - start
+        except ModuleNotFoundError:
+            rows.append([content_encoding, "not installed", "-"])
+            continue
+        rows.append(
+            [content_encoding, format_bytes(len(compressed)), f"{1000 * elapsed:.1f}"]
+        )
+    return rows
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--num-polls", type=int, default=1000)
+    parser.add_argument("--num-params", type=int, default=1_000_000)
+    args = parser.parse_args()
+    FLOWER_LOGGER.setLevel(logging.WARNING)
+
+    port = _free_port()
+    server = _start_server(port)
+    base_url = f"http://127.0.0.1:{port}"
+
+    with http_request_response(base_url, insecure=True) as conn:
+        receive, _, create_node, _ = conn
+        assert create_node is not None
+        create_node()
+
+        pull_bytes = PullTaskInsRequest(
+            node=Node(node_id=0, anonymous=True)
+        ).SerializeToString()
+
+        def _bare_post() -> requests.Response:
+            return requests.post(
+                url=f"{base_url}/{PATH_PULL_TASK_INS}",
+                headers={
+                    "Accept": "application/protobuf",
+                    "Content-Type": "application/protobuf",
+                },
+                data=pull_bytes,
+            )
+
+        rows = [
+            ["connection per request"] + _bench(_bare_post, args.num_polls),
+            ["pooled session"] + _bench(receive, args.num_polls),
+        ]
+    print_table(["variant", "polls/s", "ms/poll", "new connections"], rows)
+
+    print()
+    print_table(
+        ["content encoding", "PushTaskRes body", "compress ms"],
+        _compression_rows(_task_res_bytes(args.num_params)),
+    )
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
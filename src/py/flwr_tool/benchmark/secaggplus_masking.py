@@ -0,0 +1,126 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark masking the quantized model of a SecAgg+ client.
+
+Compares the previous implementation (a legacy `RandomState` mask per neighbour, added
+with a new full-model array each time) against generating PCG64 masks block by block
+into a single flat buffer. Key agreement is not included.
+
+python -m flwr_tool.benchmark.secaggplus_masking --num-neighbours 50
+"""
+
+
+import argparse
+import os
+from functools import partial
+from typing import List, Tuple
+
+import numpy as np
+
+from flwr.common import FlatNDArrays, NDArrays
+from flwr.common.secure_aggregation.ndarrays_arithmetic import (
+    parameters_addition,
+    parameters_mod,
+    parameters_subtraction,
+)
+from flwr.common.secure_aggregation.secaggplus_utils import add_pseudo_rand
+from flwr.common.typing import NDArrayInt
+
+from .utils import format_bytes, measure, print_table
+
+
+def _legacy_pseudo_rand_gen(
+    seed: bytes, num_range: int, dimensions_list: List[Tuple[int, ...]]
+) -> List[NDArrayInt]:
+    """Generate masks like Flower did before."""
+    seed32 = 0
+    for i in range(0, len(seed), 4):
+        seed32 ^= int.from_bytes(seed[i : i + 4], "little")
+    # pylint: disable-next=no-member
+    gen = np.random.RandomState(seed32)
+    output = []
+    for dimension in dimensions_list:
+        if len(dimension) == 0:
+            arr = np.array(gen.randint(0, num_range - 1), dtype=int)
+        else:
+            arr = gen.randint(0, num_range - 1, dimension)
+        output.append(arr)
+    return output
+
+
+def _legacy_mask(
+    quantized_parameters: NDArrays, seeds: List[bytes], num_range: int
+) -> NDArrays:
+    """Mask like Flower did before: the first seed is the private mask."""
+    dimensions_list = [a.shape for a in quantized_parameters]
+    masked = parameters_addition(
+        quantized_parameters,
+        _legacy_pseudo_rand_gen(seeds[0], num_range, dimensions_list),
+    )
+    for i, seed in enumerate(seeds[1:]):
+        pairwise_mask = _legacy_pseudo_rand_gen(seed, num_range, dimensions_list)
+        if i % 2:
+            masked = parameters_addition(masked, pairwise_mask)
+        else:
+            masked = parameters_subtraction(masked, pairwise_mask)
+    return parameters_mod(masked, num_range)
+
+
+def _mask(
+    quantized_parameters: NDArrays, seeds: List[bytes], num_range: int
+) -> NDArrays:
+    """Mask the parameters in a single flat buffer in place."""
+    masked = FlatNDArrays.from_ndarrays(quantized_parameters, np.int64)
+    add_pseudo_rand(masked.buffer, seeds[0], num_range)
+    for i, seed in enumerate(seeds[1:]):
+        add_pseudo_rand(masked.buffer, seed, num_range, subtract=not i % 2)
+    return masked
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--num-params", type=int, default=10_000_000)
+    parser.add_argument("--num-layers", type=int, default=10)
+    parser.add_argument("--num-neighbours", type=int, default=50)
+    parser.add_argument("--mod-range", type=int, default=1 << 30)
+    parser.add_argument(
+        "--skip-legacy", action="store_true", help="Only run the new implementation"
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    layer_size = max(1, args.num_params // args.num_layers)
+    quantized_parameters: NDArrays = [np.array([1])] + [
+        rng.integers(0, 1 << 20, layer_size, dtype=np.int32)
+        for _ in range(args.num_layers)
+    ]
+    seeds = [os.urandom(32) for _ in range(args.num_neighbours + 1)]
+
+    variants = [("legacy", _legacy_mask), ("flat, in place", _mask)]
+    rows = []
+    for name, mask_fn in variants[1:] if args.skip_legacy else variants:
+        masked, elapsed, peak = measure(
+            partial(mask_fn, quantized_parameters, seeds, args.mod_range)
+        )
+        assert all(
+            0 <= layer.min() and layer.max() < args.mod_range for layer in masked
+        )
+        rows.append([name, f"{elapsed:.3f} s", format_bytes(peak)])
+    print_table(["variant", "time", "peak memory"], rows)
+
+
+if __name__ == "__main__":
+    main()
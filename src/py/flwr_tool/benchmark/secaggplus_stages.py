@@ -0,0 +1,220 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark the key agreement stages of a SecAgg+ client.
+
+Measures the latency of stage 1 (share keys) and stage 2 (collect masked input) of a
+single client against the number of neighbours, comparing the previous implementation,
+which parsed the PEM encoded keys for every neighbour, with the handler, which keeps the
+deserialized keys in its state. The model is tiny, so that key agreement dominates.
+
+python -m flwr_tool.benchmark.secaggplus_stages --num-neighbours 10 50 100
+"""
+
+
+import argparse
+import os
+from typing import Callable, Dict, List, Tuple, cast
+
+import numpy as np
+
+from flwr.client import NumPyClient
+from flwr.client.secure_aggregation.secaggplus_handler import (
+    SecAggPlusHandler,
+    SecAggPlusState,
+    _collect_masked_input,
+    _setup,
+    _share_keys,
+)
+from flwr.common import FlatNDArrays, NDArrays, Scalar, ndarray_to_bytes
+from flwr.common.secure_aggregation.crypto.shamir import create_shares
+from flwr.common.secure_aggregation.crypto.symmetric_encryption import (
+    bytes_to_private_key,
+    bytes_to_public_key,
+    decrypt,
+    encrypt,
+    generate_key_pairs,
+    generate_shared_key,
+    public_key_to_bytes,
+)
+from flwr.common.secure_aggregation.ndarrays_arithmetic import (
+    factor_combine,
+    parameters_multiply,
+)
+from flwr.common.secure_aggregation.quantization import quantize
+from flwr.common.secure_aggregation.secaggplus_constants import (
+    KEY_CIPHERTEXT_LIST,
+    KEY_CLIPPING_RANGE,
+    KEY_DESTINATION_LIST,
+    KEY_MASKED_PARAMETERS,
+    KEY_MOD_RANGE,
+    KEY_PARAMETERS,
+    KEY_SAMPLE_NUMBER,
+    KEY_SECURE_ID,
+    KEY_SHARE_NUMBER,
+    KEY_SOURCE_LIST,
+    KEY_TARGET_RANGE,
+    KEY_THRESHOLD,
+)
+from flwr.common.secure_aggregation.secaggplus_utils import (
+    add_pseudo_rand,
+    share_keys_plaintext_concat,
+    share_keys_plaintext_separate,
+)
+from flwr.common.typing import Value
+
+from .utils import measure, print_table
+
+StageFn = Callable[[SecAggPlusState, Dict[str, Value]], Dict[str, Value]]
+
+
+class _Client(NumPyClient, SecAggPlusHandler):
+    """Client returning a tiny model."""
+
+    def fit(
+        self, parameters: NDArrays, config: Dict[str, Scalar]
+    ) -> Tuple[NDArrays, int, Dict[str, Scalar]]:
+        """Return a tiny model."""
+        return [np.zeros(16)], 1, {}
+
+
+def _legacy_share_keys(
+    state: SecAggPlusState, named_values: Dict[str, Value]
+) -> Dict[str, Value]:
+    """Stage 1 as implemented before, without the sanity checks."""
+    named_bytes_tuples = cast(Dict[str, Tuple[bytes, bytes]], named_values)
+    state.public_keys_dict = {
+        int(sid): (pk1, pk2) for sid, (pk1, pk2) in named_bytes_tuples.items()
+    }
+    state.rd_seed = os.urandom(32)
+    b_shares = create_shares(state.rd_seed, state.threshold, state.share_num)
+    sk1_shares = create_shares(state.sk1, state.threshold, state.share_num)
+    dsts, ciphertexts = [], []
+    for idx, (sid, (_, pk2)) in enumerate(state.public_keys_dict.items()):
+        if sid == state.sid:
+            state.rd_seed_share_dict[state.sid] = b_shares[idx]
+            state.sk1_share_dict[state.sid] = sk1_shares[idx]
+        else:
+            shared_key = generate_shared_key(
+                bytes_to_private_key(state.sk2), bytes_to_public_key(pk2)
+            )
+            state.ss2_dict[sid] = shared_key
+            plaintext = share_keys_plaintext_concat(
+                state.sid, sid, b_shares[idx], sk1_shares[idx]
+            )
+            dsts.append(sid)
+            ciphertexts.append(encrypt(shared_key, plaintext))
+    return {KEY_DESTINATION_LIST: dsts, KEY_CIPHERTEXT_LIST: ciphertexts}
+
+
+def _legacy_collect_masked_input(
+    state: SecAggPlusState, named_values: Dict[str, Value]
+) -> Dict[str, Value]:
+    """Stage 2 as implemented before, without the sanity checks."""
+    ciphertexts = cast(List[bytes], named_values[KEY_CIPHERTEXT_LIST])
+    srcs = cast(List[int], named_values[KEY_SOURCE_LIST])
+    for src, ciphertext in zip(srcs, ciphertexts):
+        _, _, rd_seed_share, sk1_share = share_keys_plaintext_separate(
+            decrypt(state.ss2_dict[src], ciphertext)
+        )
+        state.rd_seed_share_dict[src] = rd_seed_share
+        state.sk1_share_dict[src] = sk1_share
+    parameters, parameters_factor, _ = cast(NumPyClient, state.client).fit([], {})
+    quantized_parameters = factor_combine(
+        parameters_factor,
+        parameters_multiply(
+            quantize(parameters, state.clipping_range, state.target_range),
+            parameters_factor,
+        ),
+    )
+    masked_parameters = FlatNDArrays.from_ndarrays(quantized_parameters, np.int64)
+    add_pseudo_rand(masked_parameters.buffer, state.rd_seed, state.mod_range)
+    for client_id in srcs:
+        shared_key = generate_shared_key(
+            bytes_to_private_key(state.sk1),
+            bytes_to_public_key(state.public_keys_dict[client_id][0]),
+        )
+        add_pseudo_rand(
+            masked_parameters.buffer,
+            shared_key,
+            state.mod_range,
+            subtract=state.sid < client_id,
+        )
+    return {KEY_MASKED_PARAMETERS: [ndarray_to_bytes(arr) for arr in masked_parameters]}
+
+
+def _neighbour_messages(
+    state: SecAggPlusState, num_neighbours: int
+) -> Tuple[Dict[str, Value], List[bytes]]:
+    """Create the public keys of all clients and the neighbours' ciphertexts."""
+    public_keys: Dict[str, Value] = {"0": [state.pk1, state.pk2]}
+    ciphertexts = []
+    for sid in range(1, num_neighbours + 1):
+        (_, pk1), (sk2, pk2) = generate_key_pairs(), generate_key_pairs()
+        public_keys[str(sid)] = [public_key_to_bytes(pk1), public_key_to_bytes(pk2)]
+        plaintext = share_keys_plaintext_concat(sid, 0, b"share", b"share")
+        shared_key = generate_shared_key(sk2, bytes_to_public_key(state.pk2))
+        ciphertexts.append(encrypt(shared_key, plaintext))
+    return public_keys, ciphertexts
+
+
+def _run(
+    num_neighbours: int, share_keys: StageFn, collect_masked_input: StageFn
+) -> Tuple[float, float]:
+    """Run stages 0 to 2 of client 0 and return the latency of stages 1 and 2."""
+    state = SecAggPlusState(client=_Client())
+    _setup(
+        state,
+        {
+            KEY_SAMPLE_NUMBER: num_neighbours + 1,
+            KEY_SECURE_ID: 0,
+            KEY_SHARE_NUMBER: num_neighbours + 1,
+            KEY_THRESHOLD: num_neighbours // 2 + 1,
+            KEY_CLIPPING_RANGE: 1.0,
+            KEY_TARGET_RANGE: 1 << 16,
+            KEY_MOD_RANGE: 1 << 30,
+        },
+    )
+    public_keys, ciphertexts = _neighbour_messages(state, num_neighbours)
+
+    _, stage_1, _ = measure(lambda: share_keys(state, public_keys))
+    stage_2_values: Dict[str, Value] = {
+        KEY_SOURCE_LIST: list(range(1, num_neighbours + 1)),
+        KEY_CIPHERTEXT_LIST: ciphertexts,
+        KEY_PARAMETERS: [ndarray_to_bytes(np.zeros(16))],
+    }
+    _, stage_2, _ = measure(lambda: collect_masked_input(state, stage_2_values))
+    return stage_1, stage_2
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--num-neighbours", type=int, nargs="+", default=[10, 50, 100])
+    args = parser.parse_args()
+
+    variants: List[Tuple[str, StageFn, StageFn]] = [
+        ("legacy", _legacy_share_keys, _legacy_collect_masked_input),
+        ("cached keys", _share_keys, _collect_masked_input),
+    ]
+    rows = []
+    for num_neighbours in args.num_neighbours:
+        for name, share_keys, collect_masked_input in variants:
+            stage_1, stage_2 = _run(num_neighbours, share_keys, collect_masked_input)
+            rows.append([num_neighbours, name, f"{stage_1:.3f} s", f"{stage_2:.3f} s"])
+    print_table(["neighbours", "variant", "stage 1", "stage 2"], rows)
+
+
+if __name__ == "__main__":
+    main()
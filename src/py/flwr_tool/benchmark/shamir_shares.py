@@ -0,0 +1,129 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark Shamir's secret sharing of SecAgg+ secrets.
+
+Compares the previous implementation (PyCryptodome `Shamir` per 16-byte chunk on a
+thread pool, shares serialized with pickle) against the batched prime-field
+implementation with its fixed binary share layout. Each client shares a 32-byte mask
+seed and its PEM-encoded secret key (306 bytes) with all participants, and the
+server reconstructs them from `threshold` shares.
+
+python -m flwr_tool.benchmark.shamir_shares --num-participants 100 200 500 1000
+"""
+
+
+import argparse
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple, cast
+
+from Crypto.Protocol.SecretSharing import Shamir
+from Crypto.Util.Padding import pad, unpad
+
+from flwr.common.secure_aggregation.crypto.shamir import combine_shares, create_shares
+
+from .utils import format_bytes, measure, print_table
+
+
+def _legacy_create_shares(secret: bytes, threshold: int, num: int) -> List[bytes]:
+    """Create shares like Flower did before."""
+    secret_padded = pad(secret, 16)
+    secret_padded_chunk = [
+        (threshold, num, secret_padded[i : i + 16])
+        for i in range(0, len(secret_padded), 16)
+    ]
+    share_list: List[List[Tuple[int, bytes]]] = [[] for _ in range(num)]
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        for chunk_shares in executor.map(
+            lambda arg: Shamir.split(arg[0], arg[1], arg[2], ssss=False),
+            secret_padded_chunk,
+        ):
+            for idx, share in chunk_shares:
+                share_list[idx - 1].append((idx, share))
+    return [pickle.dumps(shares) for shares in share_list]
+
+
+def _legacy_combine_shares(share_list: List[bytes]) -> bytes:
+    """Reconstruct the secret like Flower did before."""
+    unpickled_share_list: List[List[Tuple[int, bytes]]] = [
+        cast(List[Tuple[int, bytes]], pickle.loads(share)) for share in share_list
+    ]
+    chunk_shares_list = [
+        [share[i] for share in unpickled_share_list]
+        for i in range(len(unpickled_share_list[0]))
+    ]
+    secret_padded = bytearray(0)
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        for chunk in executor.map(
+            lambda shares: Shamir.combine(shares, ssss=False), chunk_shares_list
+        ):
+            secret_padded += chunk
+    return bytes(unpad(secret_padded, 16))
+
+
+def _run(
+    num_participants: int,
+    create_fn: Callable[[bytes, int, int], List[bytes]],
+    combine_fn: Callable[[List[bytes]], bytes],
+) -> List[str]:
+    """Share and reconstruct the secrets of one client, return the table cells."""
+    threshold = num_participants // 2 + 1
+    secrets = [os.urandom(32), os.urandom(306)]
+    shares, split_time, _ = measure(
+        lambda: [create_fn(secret, threshold, num_participants) for secret in secrets]
+    )
+    reconstructed, combine_time, _ = measure(
+        lambda: [combine_fn(secret_shares[:threshold]) for secret_shares in shares]
+    )
+    assert reconstructed == secrets
+    share_bytes = sum(len(secret_shares[0]) for secret_shares in shares)
+    return [f"{split_time:.3f} s", f"{combine_time:.3f} s", format_bytes(share_bytes)]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument(
+        "--num-participants", type=int, nargs="+", default=[100, 200, 500, 1000]
+    )
+    parser.add_argument(
+        "--legacy-max-participants",
+        type=int,
+        default=200,
+        help="Only run the previous implementation up to this many participants",
+    )
+    args = parser.parse_args()
+
+    variants = [
+        ("legacy", _legacy_create_shares, _legacy_combine_shares),
+        ("batched", create_shares, combine_shares),
+    ]
+    rows = []
+    for num_participants in args.num_participants:
+        for name, create_fn, combine_fn in variants:
+            if name == "legacy" and num_participants > args.legacy_max_participants:
+                continue
+            rows.append(
+                [num_participants, name] + _run(num_participants, create_fn, combine_fn)
+            )
+    print_table(
+        ["participants", "variant", "split", "combine", "share size per recipient"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
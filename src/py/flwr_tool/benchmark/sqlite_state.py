@@ -0,0 +1,142 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark PullTaskIns/PushTaskRes throughput of SqliteState.
+
+Compares a new connection per request (the previous StateFactory behaviour) against the
+persistent per-thread connection of StateFactory, with and without the task indexes.
+
+python -m flwr_tool.benchmark.sqlite_state --num-nodes 10000
+"""
+
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import timeit
+from typing import Callable, List, Tuple
+
+from flwr.common.logger import FLOWER_LOGGER
+from flwr.proto.fleet_pb2 import PullTaskInsRequest, PushTaskResRequest
+from flwr.proto.node_pb2 import Node
+from flwr.proto.task_pb2 import Task, TaskIns, TaskRes
+from flwr.proto.transport_pb2 import ClientMessage, ServerMessage
+from flwr.server.fleet.message_handler import message_handler
+from flwr.server.state import SqliteState, State, StateFactory
+
+from .utils import print_table
+
+
+def _per_call_state(database: str) -> Callable[[], State]:
+    def _state() -> State:
+        state = SqliteState(database)
+        state.initialize()
+        return state
+
+    return _state
+
+
+def _setup(database: str, num_nodes: int) -> Tuple[int, List[int]]:
+    """Register nodes and schedule one TaskIns for each of them."""
+    state = StateFactory(database).state()
+    workload_id = state.create_workload()
+    node_ids = [state.create_node() for _ in range(num_nodes)]
+    for node_id in node_ids:
+        state.store_task_ins(
+            TaskIns(
+                task_id="",
+                group_id="",
+                workload_id=workload_id,
+                task=Task(
+                    producer=Node(node_id=0, anonymous=True),
+                    consumer=Node(node_id=node_id, anonymous=False),
+                    legacy_server_message=ServerMessage(
+                        reconnect_ins=ServerMessage.ReconnectIns()
+                    ),
+                ),
+            )
+        )
+    return workload_id, node_ids
+
+
+def _run(
+    get_state: Callable[[], State], workload_id: int, node_ids: List[int]
+) -> Tuple[float, float]:
+    """Pull and answer the TaskIns of each node, return (pull/s, push/s)."""
+    pull_time = 0.0
+    push_time = 0.0
+    for node_id in node_ids:
+        start = timeit.default_timer()
+        response = message_handler.pull_task_ins(
+            PullTaskInsRequest(node=Node(node_id=node_id, anonymous=False)),
+            get_state(),
+        )
+        pull_time += timeit.default_timer() - start
+
+        task_ins = response.task_ins_list[0]  # pylint: disable=no-member
+        task_res = TaskRes(
+            task_id="",
+            group_id="",
+            workload_id=workload_id,
+            task=Task(
+                producer=Node(node_id=node_id, anonymous=False),
+                consumer=Node(node_id=0, anonymous=True),
+                ancestry=[task_ins.task_id],
+                legacy_client_message=ClientMessage(
+                    disconnect_res=ClientMessage.DisconnectRes()
+                ),
+            ),
+        )
+        start = timeit.default_timer()
+        message_handler.push_task_res(
+            PushTaskResRequest(task_res_list=[task_res]), get_state()
+        )
+        push_time += timeit.default_timer() - start
+    return len(node_ids) / pull_time, len(node_ids) / push_time
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--num-nodes", type=int, default=10000)
+    parser.add_argument("--num-pulls", type=int, default=2000)
+    args = parser.parse_args()
+    FLOWER_LOGGER.setLevel(logging.WARNING)
+
+    rows = []
+    for name in ["per-call connection", "persistent, no index", "persistent"]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database = os.path.join(tmp_dir, "state.db")
+            workload_id, node_ids = _setup(database, args.num_nodes)
+            state_factory = StateFactory(database)
+            get_state = state_factory.state
+            if name == "per-call connection":
+                get_state = _per_call_state(database)
+            elif name == "persistent, no index":
+                state = state_factory.state()
+                assert isinstance(state, SqliteState)
+                for row in state.query(
+                    "SELECT name FROM sqlite_schema WHERE name LIKE 'idx_%';"
+                ):
+                    state.query(f"DROP INDEX {row['name']};")
+            sample = random.Random(0).sample(node_ids, args.num_pulls)
+            pulls, pushes = _run(get_state, workload_id, sample)
+            rows.append([name, f"{pulls:.0f}", f"{pushes:.0f}"])
+    print_table(["variant", "PullTaskIns/s", "PushTaskRes/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
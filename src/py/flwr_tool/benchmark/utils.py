@@ -0,0 +1,60 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Utilities shared by the Flower benchmarks."""
+
+
+import gc
+import timeit
+import tracemalloc
+from typing import Callable, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def measure(func: Callable[[], T]) -> Tuple[T, float, int]:
+    """Run `func` once and return its result, wall time (s) and peak memory (B).
+
+    Peak memory is traced with `tracemalloc`, which includes NumPy buffers.
+    """
+    gc.collect()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = timeit.default_timer()
+    try:
+        result = func()
+        elapsed = timeit.default_timer() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def format_bytes(num_bytes: float) -> str:
+    """Format a number of bytes in a human readable way."""
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if abs(num_bytes) < 1024.0:
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024.0
+    return f"{num_bytes:.1f} TiB"
+
+
+def print_table(header: Sequence[str], rows: Sequence[Sequence[object]]) -> None:
+    """Print a simple left-aligned table."""
+    table = [[str(cell) for cell in header]] + [
+        [str(cell) for cell in row] for row in rows
+    ]
+    widths = [max(len(row[col]) for row in table) for col in range(len(header))]
+    for row in table:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))